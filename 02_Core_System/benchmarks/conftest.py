@@ -0,0 +1,237 @@
+"""
+Benchmark fixtures: a seeded Notion stand-in, the measuring harness and the
+baseline comparison.
+
+    cd 02_Core_System
+    python -m pytest benchmarks -q                       # compare with baselines.json
+    python -m pytest benchmarks --update-baselines       # record new baselines
+    python -m pytest benchmarks --bench-strict-wall      # also fail on slower wall time
+    python -m pytest benchmarks --bench-cassette crawl.ndjson.gz --bench-root-page <id>
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+
+CORE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(CORE_DIR))
+sys.path.insert(0, str(CORE_DIR / "tools"))
+
+from notion_standin import NotionStandin, StandinConfig, StandinServer, seed_workspace  # noqa: E402
+from server_metrics import METRICS  # noqa: E402
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+# Relative headroom over the baseline before a run fails. Wall time depends
+# on the machine, so by default exceeding it only warns (see --bench-strict-wall)
+DEFAULT_TOLERANCE = {"wall_seconds": 1.0, "peak_mb": 0.25, "api_calls": 0.0}
+GATED_METRICS = ("peak_mb", "api_calls")
+
+# Absolute slack so millisecond scenarios do not fail on timer noise
+MIN_HEADROOM = {"wall_seconds": 0.05, "peak_mb": 0.5, "api_calls": 0}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--update-baselines", action="store_true",
+                    help="Write this run's measurements to baselines.json instead of comparing")
+    group.addoption("--bench-tolerance", type=float, default=None,
+                    help="Allowed wall-time increase over the baseline (default: 1.0, i.e. 2x)")
+    group.addoption("--bench-strict-wall", action="store_true",
+                    help="Fail, rather than warn, when wall time exceeds its baseline")
+    group.addoption("--bench-repeat", type=int, default=3,
+                    help="Runs per scenario; the fastest wall time is reported (default: 3)")
+    group.addoption("--bench-latency-ms", type=float, default=0.0,
+                    help="Simulated API latency of the stand-in (default: 0)")
+    group.addoption("--bench-report", default=None,
+                    help="Also write the measurements to this JSON file")
+    group.addoption("--bench-cassette", default=None,
+                    help="Replay a recorded crawl (see notion_cassette.py) for the cassette scenario")
+    group.addoption("--bench-root-page", default=None,
+                    help="Root page ID of the crawl recorded in --bench-cassette")
+
+
+def _load_baselines() -> Dict[str, Dict[str, float]]:
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class BenchmarkWarning(UserWarning):
+    """A scenario ran slower than its wall-time baseline."""
+
+
+class BenchmarkRecorder:
+    """Runs scenarios, keeps their measurements and checks them against baselines."""
+
+    def __init__(self, config):
+        self.update = config.getoption("--update-baselines")
+        self.repeat = max(1, config.getoption("--bench-repeat"))
+        self.tolerance = dict(DEFAULT_TOLERANCE)
+        if config.getoption("--bench-tolerance") is not None:
+            self.tolerance["wall_seconds"] = config.getoption("--bench-tolerance")
+        self.gated = set(GATED_METRICS)
+        if config.getoption("--bench-strict-wall"):
+            self.gated.add("wall_seconds")
+        self.report_path = config.getoption("--bench-report")
+        self.baselines = _load_baselines()
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def measure(self, name: str, function: Callable[[], Any], items: Optional[int] = None) -> Any:
+        """
+        Run `function` `repeat` times for wall time and API calls, then once
+        more under tracemalloc for peak memory; fail if the API calls or peak
+        memory exceed their baseline, warn if only the wall time does.
+
+        Returns the result of the last run.
+        """
+        walls = []
+        api_calls = 0
+        result = None
+        for _ in range(self.repeat):
+            gc.collect()
+            METRICS.reset()
+            started = time.perf_counter()
+            result = function()
+            walls.append(time.perf_counter() - started)
+            api_calls = METRICS.snapshot()["totals"]["api_calls"]
+
+        # Memory is measured separately; tracemalloc slows everything down
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        measured = {
+            "wall_seconds": round(min(walls), 4),
+            "peak_mb": round(peak / (1024 * 1024), 3),
+            "api_calls": api_calls
+        }
+        if items:
+            measured["items_per_second"] = round(items / max(min(walls), 1e-9), 1)
+        self.results[name] = measured
+
+        if not self.update:
+            self._check(name, measured)
+        return result
+
+    def _check(self, name: str, measured: Dict[str, Any]) -> None:
+        baseline = self.baselines.get(name)
+        if not baseline:
+            return
+        exceeded, slower = [], []
+        for metric, tolerance in self.tolerance.items():
+            if metric not in baseline:
+                continue
+            limit = max(baseline[metric] * (1 + tolerance), baseline[metric] + MIN_HEADROOM[metric])
+            if measured[metric] > limit:
+                message = f"{metric} {measured[metric]} > {limit:g} (baseline {baseline[metric]})"
+                (exceeded if metric in self.gated else slower).append(message)
+        if slower:
+            warnings.warn(f"{name} exceeded its baseline: " + "; ".join(slower), BenchmarkWarning)
+        if exceeded:
+            pytest.fail(f"{name} exceeded its baseline: " + "; ".join(exceeded), pytrace=False)
+
+    def finish(self) -> None:
+        if self.update and self.results:
+            baselines = dict(self.baselines)
+            for name, measured in self.results.items():
+                baselines[name] = {k: measured[k] for k in DEFAULT_TOLERANCE}
+            with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+                json.dump(dict(sorted(baselines.items())), f, indent=2)
+                f.write("\n")
+        if self.report_path and self.results:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(self.results, f, indent=2)
+
+
+def pytest_configure(config):
+    config._benchmark_recorder = BenchmarkRecorder(config)
+
+
+def pytest_unconfigure(config):
+    recorder = getattr(config, "_benchmark_recorder", None)
+    if recorder is not None:
+        recorder.finish()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    recorder = getattr(config, "_benchmark_recorder", None)
+    if recorder is None or not recorder.results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'scenario':<42}{'wall s':>10}{'peak MB':>10}{'API calls':>11}{'baseline s':>12}")
+    for name, measured in recorder.results.items():
+        baseline = recorder.baselines.get(name, {}).get("wall_seconds")
+        terminalreporter.write_line(
+            f"{name:<42}{measured['wall_seconds']:>10.4f}{measured['peak_mb']:>10.3f}"
+            f"{measured['api_calls']:>11}{baseline if baseline is not None else '-':>12}"
+        )
+    if recorder.update:
+        terminalreporter.write_line(f"Baselines written to {BASELINES_PATH}")
+
+
+@pytest.fixture(scope="session")
+def bench(pytestconfig) -> BenchmarkRecorder:
+    return pytestconfig._benchmark_recorder
+
+
+@pytest.fixture(scope="session")
+def workspace(pytestconfig):
+    """
+    A stand-in server seeded with hierarchies of several sizes, a flat
+    workspace for cleanup analysis and a database for bulk creation. The
+    tools are pointed at it through the environment for the whole session.
+    """
+    config = StandinConfig(latency_ms=pytestconfig.getoption("--bench-latency-ms"), seed=0)
+    server = StandinServer(NotionStandin(config=config)).start()
+    store = server.store
+
+    trees = {
+        size: seed_workspace(store, pages=size, fanout=5, blocks_per_page=20, seed=size)["root_page_id"]
+        for size in (10, 50, 200)
+    }
+    flat = seed_workspace(store, pages=80, fanout=80, blocks_per_page=2, seed=1)
+    hub = seed_workspace(store, pages=1, blocks_per_page=0, database_rows=1, seed=2)
+
+    cache_dir = tempfile.TemporaryDirectory(prefix="notion-bench-")
+    overrides = {
+        "NOTION_API_BASE_URL": server.base_url,
+        "NOTION_API_KEY": "secret_benchmark",
+        "NOTION_PARENT_PAGE_ID": hub["root_page_id"],
+        "NOTION_CACHE_DIR": cache_dir.name
+    }
+    saved = {key: os.environ.get(key) for key in list(overrides) + ["NOTION_CASSETTE", "NOTION_CASSETTE_MODE"]}
+    os.environ.update(overrides)
+    # A cassette selected in the environment would bypass the stand-in
+    os.environ.pop("NOTION_CASSETTE", None)
+    os.environ.pop("NOTION_CASSETTE_MODE", None)
+
+    yield {
+        "server": server,
+        "trees": trees,
+        "flat_root_id": flat["root_page_id"],
+        "database_id": hub["database_id"],
+        "data_source_id": hub["data_source_id"]
+    }
+
+    server.stop()
+    for key, value in saved.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    cache_dir.cleanup()
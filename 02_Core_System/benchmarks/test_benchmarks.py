@@ -0,0 +1,113 @@
+"""
+Benchmarks for the crawl, analysis and bulk-write paths, run against the
+local Notion stand-in (or a recorded cassette). Each scenario reports wall
+time, peak memory and Notion API calls and fails when it exceeds
+baselines.json; see conftest.py for options.
+"""
+
+import pytest
+
+from block_renderer import render_blocks
+from cleanup_tool import analyze_workspace_cleanup
+from content_extraction_tool import analyze_page_content_semantic, extract_hierarchy_with_content
+from notion_api_client import NotionTemplateClient
+from working_reorganization_tool import create_reorganization_plan_from_content
+
+BULK_PAGES = 50
+
+
+@pytest.fixture(scope="session")
+def extracted_pages(workspace):
+    """Pages of the largest seeded tree, as the extraction tool returns them."""
+    result = extract_hierarchy_with_content(workspace["trees"][200], max_depth=10)
+    assert result["status"] == "success"
+    return result["pages"]
+
+
+@pytest.mark.parametrize("size", [10, 50, 200])
+def test_hierarchy_extraction(bench, workspace, size):
+    result = bench.measure(
+        f"hierarchy_extraction_{size}",
+        lambda: extract_hierarchy_with_content(workspace["trees"][size], max_depth=10),
+        items=size
+    )
+    assert result["status"] == "success"
+    assert result["statistics"]["total_pages"] == size
+
+
+def test_block_rendering(bench, extracted_pages):
+    trees = [page["blocks"] for page in extracted_pages if page.get("blocks")]
+    block_count = sum(len(blocks) for blocks in trees)
+
+    rendered = bench.measure(
+        "block_rendering",
+        lambda: [render_blocks(blocks) for blocks in trees],
+        items=block_count
+    )
+    assert sum(r["block_count"] for r in rendered) == block_count
+
+
+def test_semantic_analysis(bench, extracted_pages):
+    result = bench.measure(
+        "analyze_page_content_semantic",
+        lambda: analyze_page_content_semantic(extracted_pages),
+        items=len(extracted_pages)
+    )
+    assert result["status"] == "success"
+
+
+def test_reorganization_plan(bench, extracted_pages):
+    result = bench.measure(
+        "create_reorganization_plan_from_content",
+        lambda: create_reorganization_plan_from_content(extracted_pages),
+        items=len(extracted_pages)
+    )
+    assert result["status"] == "success"
+
+
+def test_cleanup_analysis(bench, workspace):
+    result = bench.measure(
+        "cleanup_analysis",
+        lambda: analyze_workspace_cleanup(workspace["flat_root_id"])
+    )
+    assert result["status"] == "success"
+    assert result["analysis"]["total_pages"] == 79
+
+
+def test_bulk_page_creation(bench, workspace):
+    client = NotionTemplateClient()
+
+    def create_pages():
+        return [
+            client.create_page_in_database(
+                workspace["database_id"],
+                {
+                    "Name": {"title": [{"text": {"content": f"Benchmark row {i}"}}]},
+                    "Status": {"select": {"name": "Draft"}}
+                },
+                children=[{"type": "paragraph", "paragraph": {
+                    "rich_text": [{"type": "text", "text": {"content": f"Body of row {i}."}}]
+                }}],
+                data_source_id=workspace["data_source_id"]
+            )
+            for i in range(BULK_PAGES)
+        ]
+
+    pages = bench.measure("bulk_page_creation", create_pages, items=BULK_PAGES)
+    assert len(pages) == BULK_PAGES
+
+
+def test_hierarchy_extraction_cassette(bench, pytestconfig, monkeypatch):
+    cassette = pytestconfig.getoption("--bench-cassette")
+    root_page_id = pytestconfig.getoption("--bench-root-page")
+    if not cassette or not root_page_id:
+        pytest.skip("needs --bench-cassette and --bench-root-page")
+
+    monkeypatch.setenv("NOTION_CASSETTE", cassette)
+    monkeypatch.setenv("NOTION_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("NOTION_API_KEY", "secret_benchmark")
+    result = bench.measure(
+        "hierarchy_extraction_cassette",
+        lambda: extract_hierarchy_with_content(root_page_id, max_depth=10)
+    )
+    assert result["status"] == "success"
@@ -0,0 +1,244 @@
+"""
+Block Tree Fingerprints
+
+Merkle-style content hashes for extracted block trees. Every block gets a
+`content_hash` (its own type and content) and a `tree_hash` (its content hash
+rolled up with its children's tree hashes); a page gets a `root_hash` over its
+title and top-level tree hashes. Two versions of a page can then be compared by
+descending only into subtrees whose tree hashes differ.
+
+Snapshots of fingerprinted pages are kept in the local cache so a page can be
+compared against an earlier version or a fresh fetch.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from local_cache import get_cache_dir
+
+# Fields that change without the content changing
+VOLATILE_KEYS = {"expiry_time", "last_edited_time", "last_edited_by", "created_time", "created_by"}
+
+# Notion-hosted file URLs are re-signed on every fetch
+SIGNED_URL_PATTERN = re.compile(r"^(https://[^?]*(?:amazonaws\.com|notion-static\.com|notion\.so)[^?]*)\?.*$")
+
+
+def _normalise(value: Any) -> Any:
+    """Drop volatile fields and signature query strings before hashing."""
+    if isinstance(value, dict):
+        return {k: _normalise(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_normalise(v) for v in value]
+    if isinstance(value, str):
+        match = SIGNED_URL_PATTERN.match(value)
+        return match.group(1) if match else value
+    return value
+
+
+def combine_hashes(*parts: str) -> str:
+    """Hash an ordered sequence of strings (content hashes, child hashes, titles)."""
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def block_content_hash(block: Dict[str, Any]) -> str:
+    """
+    Hash of a single block's own content (children excluded).
+
+    Accepts processed blocks (with `raw_content`) as well as raw API blocks.
+    """
+    block_type = block.get("type", "")
+    payload = block["raw_content"] if "raw_content" in block else block.get(block_type, {})
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k != "children"}
+    serialised = json.dumps(_normalise(payload), sort_keys=True, ensure_ascii=False, default=str)
+    return combine_hashes(block_type, serialised)
+
+
+def fingerprint_blocks(blocks: List[Dict[str, Any]]) -> List[str]:
+    """
+    Annotate a block tree in place with `content_hash` and `tree_hash`.
+
+    Returns:
+        Tree hashes of the given (top-level) blocks, in order
+    """
+    tree_hashes = []
+    for block in blocks:
+        child_hashes = fingerprint_blocks(block.get("children") or [])
+        block["content_hash"] = block_content_hash(block)
+        block["tree_hash"] = combine_hashes(block["content_hash"], *child_hashes)
+        tree_hashes.append(block["tree_hash"])
+    return tree_hashes
+
+
+def page_root_hash(title: str, tree_hashes: List[str]) -> str:
+    """Root hash of a page from its title and top-level tree hashes."""
+    return combine_hashes(title or "", *tree_hashes)
+
+
+def fingerprint_page(page: Dict[str, Any]) -> str:
+    """Annotate a page's blocks and set its `root_hash`. Returns the root hash."""
+    tree_hashes = fingerprint_blocks(page.get("blocks") or [])
+    page["root_hash"] = page_root_hash(page.get("title", ""), tree_hashes)
+    return page["root_hash"]
+
+
+def _snapshot_tree(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce blocks to what a snapshot needs for diffing."""
+    return [
+        {
+            "id": block.get("id"),
+            "type": block.get("type"),
+            "content": block.get("content", ""),
+            "content_hash": block.get("content_hash"),
+            "tree_hash": block.get("tree_hash"),
+            "children": _snapshot_tree(block.get("children") or [])
+        }
+        for block in blocks
+    ]
+
+
+def diff_block_trees(old_blocks: List[Dict[str, Any]], new_blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare two fingerprinted block trees, skipping identical subtrees.
+
+    Blocks are matched by ID among siblings. A matched pair with equal tree
+    hashes is not descended into.
+
+    Returns:
+        added, removed, modified and reordered blocks plus how many nodes were compared
+    """
+    diff = {"added": [], "removed": [], "modified": [], "reordered": [], "nodes_compared": 0, "subtrees_skipped": 0}
+    _diff_siblings(old_blocks, new_blocks, None, diff)
+    return diff
+
+
+def _summary(block: Dict[str, Any], parent_id: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": block.get("id"),
+        "type": block.get("type"),
+        "parent_id": parent_id,
+        "content": (block.get("content") or "")[:200]
+    }
+
+
+def _diff_siblings(old_blocks, new_blocks, parent_id, diff) -> None:
+    old_by_id = {b.get("id"): b for b in old_blocks}
+    new_ids = {b.get("id") for b in new_blocks}
+
+    for block in old_blocks:
+        if block.get("id") not in new_ids:
+            diff["removed"].append(_summary(block, parent_id))
+
+    matched_order = []
+    for block in new_blocks:
+        old = old_by_id.get(block.get("id"))
+        if old is None:
+            diff["added"].append(_summary(block, parent_id))
+            continue
+
+        matched_order.append(block.get("id"))
+        diff["nodes_compared"] += 1
+        if old.get("tree_hash") == block.get("tree_hash"):
+            diff["subtrees_skipped"] += 1
+            continue
+
+        if old.get("content_hash") != block.get("content_hash"):
+            change = _summary(block, parent_id)
+            change["old_content"] = (old.get("content") or "")[:200]
+            diff["modified"].append(change)
+        _diff_siblings(old.get("children") or [], block.get("children") or [], block.get("id"), diff)
+
+    old_order = [b.get("id") for b in old_blocks if b.get("id") in new_ids]
+    if old_order != matched_order:
+        diff["reordered"].append({"parent_id": parent_id, "old_order": old_order, "new_order": matched_order})
+
+
+class PageSnapshotStore:
+    """Fingerprinted page versions stored as JSON files in the local cache."""
+
+    def __init__(self, directory: Optional[Path] = None, max_versions: int = 20):
+        """
+        Args:
+            directory: Snapshot directory (default: cache dir)
+            max_versions: Versions kept per page; older ones are pruned
+        """
+        self.directory = Path(directory) if directory else get_cache_dir("snapshots")
+        self.max_versions = max_versions
+
+    def _page_dir(self, page_id: str) -> Path:
+        return self.directory / page_id.replace("-", "")
+
+    def list_versions(self, page_id: str) -> List[str]:
+        """Stored version IDs for a page, oldest first."""
+        page_dir = self._page_dir(page_id)
+        if not page_dir.exists():
+            return []
+        return sorted(path.stem for path in page_dir.glob("*.json"))
+
+    def load(self, page_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Load a stored version (default: latest). Returns None if there is none."""
+        versions = self.list_versions(page_id)
+        if not versions:
+            return None
+        version = version or versions[-1]
+        path = self._page_dir(page_id) / f"{version}.json"
+        if not path.exists():
+            raise ValueError(f"Snapshot version {version} not found for page {page_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a page version unless it matches the latest stored root hash.
+
+        Returns:
+            The stored (or unchanged latest) snapshot with its version ID
+        """
+        if "root_hash" not in page:
+            fingerprint_page(page)
+
+        latest = self.load(page["page_id"])
+        if latest and latest["root_hash"] == page["root_hash"]:
+            return latest
+
+        version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        snapshot = {
+            "version": version,
+            "page_id": page["page_id"],
+            "title": page.get("title", ""),
+            "root_hash": page["root_hash"],
+            "captured_at": datetime.now().isoformat(),
+            "blocks": _snapshot_tree(page.get("blocks") or [])
+        }
+
+        page_dir = self._page_dir(page["page_id"])
+        page_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = page_dir / f"{version}.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        tmp_path.replace(page_dir / f"{version}.json")
+
+        for old_version in self.list_versions(page["page_id"])[:-self.max_versions]:
+            (page_dir / f"{old_version}.json").unlink(missing_ok=True)
+
+        return snapshot
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare two page snapshots (or fingerprinted pages)."""
+    if old.get("root_hash") == new.get("root_hash"):
+        return {
+            "changed": False,
+            "title_changed": False,
+            "added": [], "removed": [], "modified": [], "reordered": [],
+            "nodes_compared": 0, "subtrees_skipped": len(new.get("blocks") or [])
+        }
+
+    diff = diff_block_trees(old.get("blocks") or [], new.get("blocks") or [])
+    diff["changed"] = True
+    diff["title_changed"] = old.get("title") != new.get("title")
+    return diff
@@ -0,0 +1,198 @@
+"""
+Block Renderer
+
+Single block-to-text implementation shared by the extraction, reorganization
+and cleanup tools. Block types map to handlers through a dispatch table, and
+one walk over a block tree produces the plain text, word/character counts,
+content statistics, media references and Merkle fingerprints (see
+block_fingerprints.py).
+
+Works on raw API blocks (`block[block["type"]]`) and on processed blocks from
+the content extractor (`block["raw_content"]`); nested blocks are read from
+`block["children"]` when present.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterable
+
+from block_fingerprints import block_content_hash, combine_hashes
+
+# Types whose text is written by the user (counted towards text length)
+TEXT_TYPES = {
+    "paragraph", "heading_1", "heading_2", "heading_3", "quote", "callout",
+    "bulleted_list_item", "numbered_list_item", "to_do", "toggle", "code", "template"
+}
+
+MEDIA_LABELS = {
+    "image": "Image",
+    "video": "Video",
+    "audio": "Audio",
+    "file": "File",
+    "pdf": "PDF"
+}
+
+# Non-text blocks that still count as page content
+CONTENT_TYPES = set(MEDIA_LABELS) | {"bookmark", "embed", "divider"}
+
+
+def rich_text_plain(rich_text: List[Dict[str, Any]]) -> str:
+    """Plain text of a rich text array (text, mentions and equations)."""
+    return "".join(
+        rt.get("plain_text") or rt.get("text", {}).get("content", "")
+        for rt in rich_text or []
+    )
+
+
+def _file_url(payload: Dict[str, Any]) -> str:
+    source = payload.get("type")
+    if source in ("external", "file"):
+        return payload.get(source, {}).get("url", "")
+    return ""
+
+
+# Handlers return (text, media_reference or None)
+Handler = Callable[[Dict[str, Any]], Tuple[str, Optional[Dict[str, Any]]]]
+
+
+def _rich_text(payload):
+    return rich_text_plain(payload.get("rich_text", [])), None
+
+
+def _title(default):
+    return lambda payload: (payload.get("title") or default, None)
+
+
+def _media(block_type):
+    label = MEDIA_LABELS[block_type]
+
+    def handler(payload):
+        url = _file_url(payload)
+        name = payload.get("name", "")
+        ref = {"type": block_type, "url": url, "source": payload.get("type", "")}
+        if name:
+            ref["name"] = name
+        return f"{label}: {name or url}".rstrip(": "), ref
+    return handler
+
+
+def _link(label, media_type):
+    def handler(payload):
+        url = payload.get("url", "")
+        caption = rich_text_plain(payload.get("caption", []))
+        return f"{label}: {caption or url}", {"type": media_type, "url": url, "source": "external"}
+    return handler
+
+
+def _table_row(payload):
+    return " | ".join(rich_text_plain(cell) for cell in payload.get("cells", [])), None
+
+
+def _structural(payload):
+    return "", None
+
+
+BLOCK_HANDLERS: Dict[str, Handler] = {
+    **{block_type: _rich_text for block_type in TEXT_TYPES},
+    **{block_type: _media(block_type) for block_type in MEDIA_LABELS},
+    "child_page": _title("Untitled Page"),
+    "child_database": _title("Untitled Database"),
+    "bookmark": _link("Bookmark", "bookmark"),
+    "embed": _link("Embed", "embed"),
+    "link_preview": _link("Link", "link_preview"),
+    "table": lambda payload: (f"Table ({payload.get('table_width', 0)} columns)", None),
+    "table_row": _table_row,
+    "equation": lambda payload: (payload.get("expression", ""), None),
+    "divider": lambda payload: ("---", None),
+    "breadcrumb": _structural,
+    "table_of_contents": _structural,
+    "column_list": _structural,
+    "column": _structural,
+    "synced_block": _structural,
+    "unsupported": _structural,
+}
+
+
+def block_payload(block: Dict[str, Any]) -> Dict[str, Any]:
+    """Type-specific payload of a raw or processed block."""
+    block_type = block.get("type", "")
+    payload = block.get(block_type) if block_type in block else block.get("raw_content")
+    return payload if isinstance(payload, dict) else {}
+
+
+def render_block(block: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Render one block (children excluded).
+
+    Returns:
+        Tuple of (plain text, media reference or None)
+    """
+    block_type = block.get("type", "")
+    payload = block_payload(block)
+    handler = BLOCK_HANDLERS.get(block_type)
+    if handler is None:
+        # Unknown types: use rich text if the payload has any
+        return (rich_text_plain(payload["rich_text"]) if "rich_text" in payload else ""), None
+    return handler(payload)
+
+
+def render_blocks(blocks: List[Dict[str, Any]], exclude_types: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Render a block tree in one pass.
+
+    Blocks are annotated in place with `content_hash` and `tree_hash`.
+
+    Args:
+        blocks: Top-level blocks, with nested blocks under "children"
+        exclude_types: Block types left out of text and statistics (still hashed)
+
+    Returns:
+        text, word_count, char_count, block_count, content_blocks, text_length,
+        media, tree_hashes and fingerprint
+    """
+    state = {
+        "parts": [],
+        "block_count": 0,
+        "content_blocks": 0,
+        "text_length": 0,
+        "media": []
+    }
+    tree_hashes = _render_tree(blocks, set(exclude_types), state)
+    text = "\n".join(state["parts"])
+
+    return {
+        "text": text,
+        "word_count": len(text.split()),
+        "char_count": len(text),
+        "block_count": state["block_count"],
+        "content_blocks": state["content_blocks"],
+        "text_length": state["text_length"],
+        "media": state["media"],
+        "tree_hashes": tree_hashes,
+        "fingerprint": combine_hashes(*tree_hashes)
+    }
+
+
+def _render_tree(blocks: List[Dict[str, Any]], exclude_types: set, state: Dict[str, Any]) -> List[str]:
+    tree_hashes = []
+    for block in blocks:
+        block_type = block.get("type", "")
+
+        if block_type not in exclude_types:
+            text, media = render_block(block)
+            state["block_count"] += 1
+            if text:
+                state["parts"].append(text)
+            if block_type in TEXT_TYPES:
+                stripped = text.strip()
+                if stripped:
+                    state["content_blocks"] += 1
+                    state["text_length"] += len(stripped)
+            elif block_type in CONTENT_TYPES:
+                state["content_blocks"] += 1
+            if media:
+                state["media"].append({"block_id": block.get("id"), **media})
+
+        child_hashes = _render_tree(block.get("children") or [], exclude_types, state)
+        block["content_hash"] = block_content_hash(block)
+        block["tree_hash"] = combine_hashes(block["content_hash"], *child_hashes)
+        tree_hashes.append(block["tree_hash"])
+    return tree_hashes
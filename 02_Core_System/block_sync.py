@@ -0,0 +1,385 @@
+"""
+Block Tree Sync
+
+Re-applies desired content (a template page, Markdown or block payloads) to
+pages by patching only what differs, instead of clearing and re-appending.
+
+Desired blocks and each page's current blocks are fingerprinted like
+block_fingerprints.py does, but on their writable form, so a block fetched
+from the API and the payload that would create it hash the same. Sibling
+lists are aligned by tree hash (difflib's longest matching runs), and
+identical subtrees are skipped. In the stretches that differ, blocks of the
+same type are paired in order:
+
+  - a paired block whose own content differs is updated in place
+    (PATCH blocks/{id}), and its children are compared the same way
+  - current blocks left unpaired are deleted (DELETE blocks/{id})
+  - desired blocks left unpaired are inserted, as whole subtrees in batched
+    appends, right after the block that precedes them
+
+Tables, column layouts and synced blocks whose own settings differ cannot be
+updated and are replaced. Child pages, child databases and blocks the API
+cannot create are left where they are.
+
+Inserts are anchored to blocks that are kept, so the operations of a page
+never depend on each other. Pages are fetched and diffed concurrently, then
+the operations of all pages run on one bounded pool. Pages that already
+match make no writes.
+
+    sync = BlockSync()
+    sync.sync(page_ids, sync.desired_from_page(template_page_id))
+"""
+
+import os
+import time
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import progress
+from block_fingerprints import block_content_hash, combine_hashes
+from cost_estimator import APPEND_CHILDREN, DELETE_BLOCK, LIST_CHILDREN, UPDATE_BLOCK, CostEstimate
+from markdown_blocks import INSERT_AT_START, append_block_tree, block_count, plan_block_appends
+from notion_concurrency import call_with_retry, crawl, list_block_tree
+from notion_transport import get_notion_client
+from provisioning import expand_content
+from workspace_snapshot import SKIPPED_BLOCK_TYPES, writable_block
+
+# Blocks whose own settings cannot be changed by an update; they are replaced
+REPLACED_TYPES = {"table", "column_list", "column", "synced_block"}
+
+# Values the API fills in when a payload leaves them out
+DEFAULT_VALUES = {"color": "default", "is_toggleable": False, "checked": False, "caption": []}
+
+
+# ----------------------------------------------------------------------
+# Fingerprints
+# ----------------------------------------------------------------------
+
+def _canonical_rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rich text without the fields and defaults the API adds to what it returns."""
+    canonical = []
+    for item in items or []:
+        item_type = item.get("type", "text")
+        entry: Dict[str, Any] = {
+            "type": item_type,
+            item_type: {k: v for k, v in (item.get(item_type) or {}).items() if v is not None}
+        }
+        annotations = {k: v for k, v in (item.get("annotations") or {}).items() if v not in (False, "default")}
+        if annotations:
+            entry["annotations"] = annotations
+        canonical.append(entry)
+    return canonical
+
+
+def _canonical(block_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """A block's own content in one form whether it was fetched or is a payload."""
+    content = {k: v for k, v in payload.items() if k != "children" and DEFAULT_VALUES.get(k, ...) != v}
+    for key in ("rich_text", "caption"):
+        if key in content:
+            content[key] = _canonical_rich_text(content[key])
+    if block_type == "table_row":
+        content["cells"] = [_canonical_rich_text(cell) for cell in content.get("cells", [])]
+    return {"type": block_type, block_type: content}
+
+
+def sync_tree(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fingerprinted nodes for fetched blocks (children under "children") or
+    block payloads (children under the type's "children").
+
+    Blocks the API cannot create become nodes marked "preserved", without hashes.
+    """
+    nodes = []
+    for block in blocks:
+        block_type = block.get("type") or next((k for k in block if k != "object"), "")
+        fetched = block.get("object") == "block"
+        if block_type in SKIPPED_BLOCK_TYPES or block_type not in block:
+            nodes.append({"id": block.get("id"), "type": block_type, "preserved": True})
+            continue
+        if fetched:
+            payload = writable_block(block)[block_type]
+            children = block.get("children") or []
+        else:
+            payload = {k: v for k, v in block[block_type].items() if k != "children"}
+            children = block[block_type].get("children") or []
+        child_nodes = sync_tree(children)
+        content_hash = block_content_hash(_canonical(block_type, payload))
+        nodes.append({
+            "id": block.get("id"),
+            "type": block_type,
+            "payload": payload,
+            "block": block,
+            "content_hash": content_hash,
+            "tree_hash": combine_hashes(content_hash, *(n["tree_hash"] for n in child_nodes if not n.get("preserved"))),
+            "children": child_nodes
+        })
+    return nodes
+
+
+def block_payloads(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """A fetched block tree -> payloads that recreate it, children nested in place."""
+    payloads = []
+    for block in blocks:
+        writable = writable_block(block)
+        if writable is None:
+            continue
+        children = block_payloads(block.get("children") or [])
+        if children:
+            writable[writable["type"]]["children"] = children
+        payloads.append(writable)
+    return payloads
+
+
+# ----------------------------------------------------------------------
+# Diff
+# ----------------------------------------------------------------------
+
+def diff_blocks(page_id: str, current: List[Dict[str, Any]], desired: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The operations that turn a page's current block tree into the desired one.
+
+    Args:
+        page_id: The page the blocks belong to
+        current: Fetched blocks, e.g. from list_block_tree()
+        desired: Block payloads
+
+    Returns:
+        page_id, operations ({"op": "update"|"delete"|"insert", ...}), and
+        counts of updated, deleted, inserted and unchanged blocks
+    """
+    plan = {"page_id": page_id, "operations": [], "updated": 0, "deleted": 0, "inserted": 0, "unchanged": 0}
+    _diff_siblings(sync_tree(current), sync_tree(desired), page_id, plan)
+    return plan
+
+
+def _diff_siblings(current: List[Dict[str, Any]], desired: List[Dict[str, Any]], parent_id: str, plan: Dict[str, Any]) -> None:
+    has_blocks = bool(current)
+    current = [n for n in current if not n.get("preserved")]
+    desired = [n for n in desired if not n.get("preserved")]
+    matcher = SequenceMatcher(None, [n["tree_hash"] for n in current], [n["tree_hash"] for n in desired], autojunk=False)
+    # Block the next insert goes after (None: before the first block)
+    anchor: Optional[str] = None
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            plan["unchanged"] += sum(_subtree_size(n) for n in current[i1:i2])
+            anchor = current[i2 - 1]["id"]
+        else:
+            anchor = _diff_range(current[i1:i2], desired[j1:j2], parent_id, anchor, has_blocks, plan)
+
+
+def _diff_range(
+    current: List[Dict[str, Any]],
+    desired: List[Dict[str, Any]],
+    parent_id: str,
+    anchor: Optional[str],
+    has_blocks: bool,
+    plan: Dict[str, Any]
+) -> Optional[str]:
+    """Pair differing blocks by type in order; returns the anchor after the range."""
+    pending: List[Dict[str, Any]] = []
+
+    def insert() -> None:
+        if pending:
+            plan["operations"].append({
+                "op": "insert",
+                "parent_id": parent_id,
+                "after": anchor if anchor is not None else INSERT_AT_START if has_blocks else None,
+                "blocks": [n["block"] for n in pending]
+            })
+            plan["inserted"] += sum(block_count(n["block"]) for n in pending)
+            pending.clear()
+
+    start = 0
+    for node in current:
+        match = next((k for k in range(start, len(desired)) if desired[k]["type"] == node["type"]), None)
+        if match is None:
+            plan["operations"].append({"op": "delete", "block_id": node["id"]})
+            plan["deleted"] += 1
+            continue
+        pending.extend(desired[start:match])
+        start = match + 1
+        target = desired[match]
+        if target["content_hash"] != node["content_hash"] and node["type"] in REPLACED_TYPES:
+            plan["operations"].append({"op": "delete", "block_id": node["id"]})
+            plan["deleted"] += 1
+            pending.append(target)
+            continue
+        insert()
+        if target["content_hash"] != node["content_hash"]:
+            payload = dict(target["payload"])
+            # Settings left out of the payload are reset rather than kept
+            for key, value in DEFAULT_VALUES.items():
+                if key in node["payload"] and key not in payload:
+                    payload[key] = value
+            plan["operations"].append({"op": "update", "block_id": node["id"], "type": node["type"], "payload": payload})
+            plan["updated"] += 1
+        else:
+            plan["unchanged"] += 1
+        _diff_siblings(node["children"], target["children"], node["id"], plan)
+        anchor = node["id"]
+    pending.extend(desired[start:])
+    insert()
+    return anchor
+
+
+def _subtree_size(node: Dict[str, Any]) -> int:
+    return 1 + sum(_subtree_size(child) for child in node.get("children", []) if not child.get("preserved"))
+
+
+def estimate_sync(plans: List[Dict[str, Any]], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """API calls, wall time and payload volume of applying sync plans (see cost_estimator.py)."""
+    estimate = CostEstimate("sync_page_content", max_workers)
+    estimate.phase("patch", parallel=True)
+    for plan in plans:
+        for operation in plan["operations"]:
+            if operation["op"] == "update":
+                estimate.add(UPDATE_BLOCK, payload={operation["type"]: operation["payload"]})
+            elif operation["op"] == "delete":
+                estimate.add(DELETE_BLOCK)
+            else:
+                appends = plan_block_appends(operation["blocks"])
+                estimate.add(APPEND_CHILDREN, appends["appends"], request_bytes=appends["request_bytes"])
+                estimate.add(LIST_CHILDREN, appends["lookups"])
+    return estimate.result()
+
+
+# ----------------------------------------------------------------------
+# Sync
+# ----------------------------------------------------------------------
+
+class BlockSync:
+    """Brings pages' content to a desired block tree with the fewest writes."""
+
+    def __init__(self, api_key: Optional[str] = None, max_workers: Optional[int] = None, client: Optional[Any] = None):
+        """
+        Args:
+            api_key: Notion API key (default: NOTION_API_KEY)
+            max_workers: Concurrent API calls (default: NOTION_MAX_CONCURRENCY)
+            client: An existing Notion SDK client to use instead of one for api_key
+        """
+        if client is None:
+            api_key = api_key or os.getenv("NOTION_API_KEY")
+            if not api_key:
+                raise ValueError("Notion API key not found")
+            client = get_notion_client(api_key)
+        self.client = client
+        self.max_workers = max_workers
+
+    def desired_from_page(self, page_id: str) -> List[Dict[str, Any]]:
+        """A template page's content as block payloads."""
+        return block_payloads(list_block_tree(self.client, page_id.replace("-", "")))
+
+    def plan(self, page_id: str, desired: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch a page's blocks and diff them against the desired blocks."""
+        return diff_blocks(page_id, list_block_tree(self.client, page_id.replace("-", "")), desired)
+
+    def _apply(self, operation: Dict[str, Any]) -> None:
+        if operation["op"] == "update":
+            call_with_retry(self.client.blocks.update, block_id=operation["block_id"], **{operation["type"]: operation["payload"]})
+        elif operation["op"] == "delete":
+            call_with_retry(self.client.blocks.delete, block_id=operation["block_id"])
+        else:
+            append_block_tree(self.client, operation["parent_id"], operation["blocks"], self.max_workers, operation["after"])
+
+    def sync(
+        self,
+        page_ids: List[str],
+        desired: List[Union[str, Dict[str, Any]]],
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Patch every page's content to match the desired blocks.
+
+        Args:
+            page_ids: Pages to update
+            desired: Block payloads or provisioning content items (strings,
+                shorthands such as {"h1": ...}, {"markdown": ...})
+            dry_run: Diff the pages and return the operations without applying them
+
+        Returns:
+            status, per-page counts (with operations on a dry run), totals,
+            errors, cost_estimate (dry run), phase timings and message
+        """
+        desired = expand_content(desired)
+        timings: Dict[str, float] = {}
+        errors: List[Dict[str, Any]] = []
+        plans: Dict[str, Dict[str, Any]] = {}
+
+        # Phase 1: fetch and diff every page
+        started = time.perf_counter()
+
+        def diff(page_id: str) -> Tuple[Dict[str, Any], List[str]]:
+            return self.plan(page_id, desired), []
+
+        for page_id, plan, error in crawl(page_ids, diff, self.max_workers, progress.cancelled):
+            if error is not None:
+                errors.append({"page_id": page_id, "phase": "diff", "error": str(error)})
+            else:
+                plans[page_id] = plan
+        timings["diff"] = time.perf_counter() - started
+
+        ordered = [plans[page_id] for page_id in page_ids if page_id in plans]
+        totals = {key: sum(plan[key] for plan in ordered) for key in ("updated", "deleted", "inserted", "unchanged")}
+        changed = [plan for plan in ordered if plan["operations"]]
+        if dry_run:
+            estimate = estimate_sync(ordered, self.max_workers)
+            return {
+                "status": "success" if not errors else "error",
+                "dry_run": True,
+                "pages": ordered,
+                "pages_changed": len(changed),
+                **totals,
+                "errors": errors,
+                "cost_estimate": estimate,
+                "timings": {phase: round(seconds, 2) for phase, seconds in timings.items()},
+                "message": (
+                    f"Would update {totals['updated']}, delete {totals['deleted']} and insert {totals['inserted']} blocks "
+                    f"on {len(changed)} of {len(page_ids)} pages ({estimate['message']})"
+                )
+            }
+
+        # Phase 2: the operations of every page on one pool
+        started = time.perf_counter()
+        remaining = {plan["page_id"]: len(plan["operations"]) for plan in changed}
+        failed: Dict[str, int] = {}
+        tasks = [(plan["page_id"], operation) for plan in changed for operation in plan["operations"]]
+
+        def apply(task: Tuple[str, Dict[str, Any]]) -> Tuple[None, List[Any]]:
+            self._apply(task[1])
+            return None, []
+
+        done = 0
+        for (page_id, operation), _, error in crawl(tasks, apply, self.max_workers, progress.cancelled):
+            if error is not None:
+                failed[page_id] = failed.get(page_id, 0) + 1
+                errors.append({
+                    "page_id": page_id,
+                    "phase": operation["op"],
+                    "block_id": operation.get("block_id") or operation.get("parent_id"),
+                    "error": str(error)
+                })
+            remaining[page_id] -= 1
+            if not remaining[page_id]:
+                done += 1
+                progress.report_progress(done, len(changed), f"Synced page {page_id}")
+                progress.report_partial({"page_id": page_id, "failed_operations": failed.get(page_id, 0)})
+        timings["patch"] = time.perf_counter() - started
+
+        cancelled = progress.cancelled()
+        message = (
+            f"Updated {totals['updated']}, deleted {totals['deleted']} and inserted {totals['inserted']} blocks "
+            f"on {done} of {len(changed)} changed pages ({len(page_ids) - len(changed)} already matched) "
+            f"in {sum(timings.values()):.1f}s"
+            + (f" with {len(errors)} errors" if errors else "")
+            + (" (cancelled before every page was synced)" if cancelled else "")
+        )
+        return {
+            "status": "success" if not errors else "error",
+            "pages": [{k: v for k, v in plan.items() if k != "operations"} for plan in ordered],
+            "pages_changed": len(changed),
+            **totals,
+            "errors": errors,
+            "timings": {phase: round(seconds, 2) for phase, seconds in timings.items()},
+            "cancelled": cancelled,
+            "message": message
+        }
@@ -0,0 +1,438 @@
+"""
+Bulk Row Loader
+
+Loads rows from CSV, JSON or NDJSON into a Notion database and upserts them
+by a key property, so a loader script can be re-run safely:
+
+    client = NotionTemplateClient()
+    client.bulk_load(PROMPT_LIBRARY_ID, "prompts.csv", key="Prompt Name",
+                     column_map={"name": "Prompt Name", "notes": None})
+
+The data source schema is fetched once and every column is converted to its
+property type (CSV strings included: "3" -> number, "yes" -> checkbox,
+"a, b" -> multi_select). Rows are written concurrently on the bounded pool from
+notion_concurrency.py, with rate-limited calls retried.
+
+A local index in the cache directory maps each key value to its page ID and a
+hash of the row's values. Rows whose hash is unchanged are skipped without an
+API call; changed rows are updated in place and new keys are created. When
+there is no index yet (first run, another machine, a cleared cache) it is
+rebuilt from one paginated query of the database, and rows that already match
+their page are adopted without writing, so re-runs stay no-ops.
+"""
+
+import csv
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from notion_client.errors import APIErrorCode, APIResponseError
+
+from cost_estimator import CREATE_PAGE, QUERY_DATA_SOURCE, RETRIEVE_DATA_SOURCE, UPDATE_PAGE, CostEstimate, pages_of
+from local_cache import get_cache_dir
+from notion_concurrency import call_with_retry, iter_data_source_rows, parallel_map
+
+INDEX_VERSION = 1
+
+# Notion rejects rich text items longer than this
+MAX_TEXT_LENGTH = 2000
+
+DEFAULT_BATCH_SIZE = 100
+
+TRUE_STRINGS = {"true", "yes", "y", "1", "x", "✓", "✅", "checked"}
+
+SOURCE_FORMATS = {".csv": "csv", ".json": "json", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+class BulkLoadError(ValueError):
+    """The source or the database cannot be loaded; `problems` lists why."""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("Cannot load rows: " + "; ".join(problems))
+
+
+# ----------------------------------------------------------------------
+# Sources
+# ----------------------------------------------------------------------
+
+def read_rows(
+    source: Union[str, Path, Iterable[Dict[str, Any]]],
+    format: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Rows from a CSV, JSON or NDJSON file, or from an iterable of dicts.
+
+    CSV and NDJSON files are streamed; a JSON file holds a list of rows or
+    {"rows": [...]}. The format follows the file suffix unless given.
+    """
+    if not isinstance(source, (str, Path)):
+        yield from source
+        return
+
+    path = Path(source)
+    format = format or SOURCE_FORMATS.get(path.suffix.lower())
+    if format not in ("csv", "json", "ndjson"):
+        raise BulkLoadError([f"unknown source format for {path.name}; use .csv, .json or .ndjson"])
+
+    if format == "csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row
+    elif format == "ndjson":
+        with open(path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise BulkLoadError([f"{path.name} line {number}: {e.msg}"])
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = data.get("rows") if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            raise BulkLoadError([f"{path.name} must hold a list of rows or {{\"rows\": [...]}}"])
+        yield from rows
+
+
+# ----------------------------------------------------------------------
+# Values
+# ----------------------------------------------------------------------
+
+def _text(content: str) -> List[Dict[str, Any]]:
+    return [
+        {"type": "text", "text": {"content": content[start:start + MAX_TEXT_LENGTH]}}
+        for start in range(0, len(content), MAX_TEXT_LENGTH)
+    ]
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _list(value: Any) -> List[Any]:
+    if _blank(value):
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _number(value: Any) -> Optional[Union[int, float]]:
+    if _blank(value):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    number = float(str(value).replace(",", "").strip())
+    return int(number) if number.is_integer() else number
+
+
+def property_value(schema: Dict[str, Any], value: Any) -> Dict[str, Any]:
+    """
+    A plain value -> Notion property value for a property schema.
+
+    Strings are parsed for typed properties, so CSV cells load as they are;
+    blank values clear the property.
+    """
+    prop_type = schema.get("type") or next(iter(schema))
+    if prop_type in ("title", "rich_text"):
+        return {prop_type: _text("" if value is None else str(value))}
+    if prop_type in ("select", "status"):
+        return {prop_type: None if _blank(value) else {"name": str(value).strip()}}
+    if prop_type == "multi_select":
+        return {"multi_select": [{"name": str(v)} for v in _list(value)]}
+    if prop_type == "relation":
+        return {"relation": [{"id": str(v)} for v in _list(value)]}
+    if prop_type == "date":
+        if _blank(value):
+            return {"date": None}
+        return {"date": value if isinstance(value, dict) else {"start": str(value).strip()}}
+    if prop_type == "number":
+        return {"number": _number(value)}
+    if prop_type == "checkbox":
+        checked = value if isinstance(value, bool) else str(value or "").strip().lower() in TRUE_STRINGS
+        return {"checkbox": checked}
+    if prop_type in ("url", "email", "phone_number"):
+        return {prop_type: None if _blank(value) else str(value).strip()}
+    raise ValueError(f"Cannot load values of type '{prop_type}'")
+
+
+def comparable_value(prop: Dict[str, Any]) -> Any:
+    """
+    A property value (as sent, or as returned on a page) reduced to the part
+    that the loader writes, so rows can be compared with existing pages.
+    """
+    prop_type = prop.get("type") or next(iter(prop))
+    value = prop.get(prop_type)
+    if prop_type in ("title", "rich_text"):
+        return "".join(item.get("plain_text") or item.get("text", {}).get("content", "") for item in value or [])
+    if prop_type in ("select", "status"):
+        return value["name"] if value else None
+    if prop_type == "multi_select":
+        return sorted(option["name"] for option in value or [])
+    if prop_type == "relation":
+        return sorted(item["id"].replace("-", "") for item in value or [])
+    if prop_type == "date":
+        return value["start"] if value else None
+    return value
+
+
+def _row_hash(comparable: Dict[str, Any]) -> str:
+    encoded = json.dumps(comparable, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Upsert index
+# ----------------------------------------------------------------------
+
+class UpsertIndex:
+    """Key value -> {"page_id", "hash"} for one data source and key property."""
+
+    def __init__(self, data_source_id: str, key: str, directory: Optional[Path] = None):
+        self.data_source_id = data_source_id.replace("-", "")
+        self.key = key
+        key_digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+        directory = Path(directory) if directory else get_cache_dir("upsert")
+        self.path = directory / f"{self.data_source_id}-{key_digest}.json"
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("version") == INDEX_VERSION and state.get("key") == key:
+                self.rows = state["rows"]
+
+    def save(self) -> None:
+        state = {
+            "version": INDEX_VERSION,
+            "data_source_id": self.data_source_id,
+            "key": self.key,
+            "rows": self.rows
+        }
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
+
+
+# ----------------------------------------------------------------------
+# Loading
+# ----------------------------------------------------------------------
+
+class BulkLoader:
+    """Upserts rows into one data source."""
+
+    def __init__(
+        self,
+        client: Any,
+        data_source_id: str,
+        key: Optional[str] = None,
+        column_map: Optional[Dict[str, Optional[str]]] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        index_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            client: A notion_client.Client
+            data_source_id: The data source rows are written to
+            key: Property that identifies a row (default: the title property)
+            column_map: Source column -> property name; None drops a column.
+                Unmapped columns are loaded into the property of the same name.
+            max_workers: Concurrent API calls (default: NOTION_MAX_CONCURRENCY)
+            batch_size: Rows written (and checkpointed in the index) at a time
+            index_dir: Upsert index directory (default: cache dir)
+        """
+        self.client = client
+        self.data_source_id = data_source_id
+        self.column_map = column_map or {}
+        self.max_workers = max_workers
+        self.batch_size = max(1, batch_size)
+
+        data_source = call_with_retry(self.client.request, path=f"data_sources/{data_source_id}", method="GET")
+        self.schema: Dict[str, Dict[str, Any]] = data_source.get("properties", {})
+        title = next((name for name, prop in self.schema.items() if prop.get("type") == "title"), None)
+        self.key = key or title
+        if self.key not in self.schema:
+            raise BulkLoadError([f"key property '{self.key}' is not in the database"])
+        self.index = UpsertIndex(data_source_id, self.key, index_dir)
+
+    def map_row(self, row: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """(key value, Notion properties) for a source row."""
+        values = {}
+        for column, value in row.items():
+            name = self.column_map.get(column, column)
+            if name is not None:
+                values[name] = value
+        unknown = [name for name in values if name not in self.schema]
+        if unknown:
+            raise ValueError(f"unknown properties: {', '.join(unknown)}")
+        key_value = values.get(self.key)
+        if _blank(key_value):
+            raise ValueError(f"missing key '{self.key}'")
+        properties = {name: property_value(self.schema[name], value) for name, value in values.items()}
+        return str(key_value).strip(), properties
+
+    def _key_of(self, page: Dict[str, Any]) -> Optional[str]:
+        prop = page.get("properties", {}).get(self.key)
+        if not prop:
+            return None
+        value = comparable_value(prop)
+        if isinstance(value, list):
+            value = ", ".join(value)
+        return None if _blank(value) else str(value).strip()
+
+    def rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Rebuild the index from the database with one paginated query.
+
+        Returns:
+            Key value -> existing page properties, for adopting unchanged rows
+        """
+        pages: Dict[str, Dict[str, Any]] = {}
+        for page in iter_data_source_rows(self.client, self.data_source_id):
+            key_value = self._key_of(page)
+            if key_value is not None and key_value not in pages:
+                pages[key_value] = page.get("properties", {})
+                self.index.rows[key_value] = {"page_id": page["id"], "hash": None}
+        return pages
+
+    def _write(self, action: Dict[str, Any]) -> str:
+        if action["op"] == "update":
+            try:
+                call_with_retry(self.client.pages.update, page_id=action["page_id"], properties=action["properties"])
+                return action["page_id"]
+            except APIResponseError as e:
+                # The indexed page was deleted or archived in Notion: create the row again
+                if e.code != APIErrorCode.ObjectNotFound and "archived" not in str(e):
+                    raise
+        page = call_with_retry(
+            self.client.pages.create,
+            parent={"type": "data_source_id", "data_source_id": self.data_source_id},
+            properties=action["properties"]
+        )
+        return page["id"]
+
+    def load(
+        self,
+        source: Union[str, Path, Iterable[Dict[str, Any]]],
+        format: Optional[str] = None,
+        dry_run: bool = False,
+        refresh_index: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Upsert every row of a source.
+
+        Args:
+            source: CSV/JSON/NDJSON path or an iterable of row dicts
+            format: "csv", "json" or "ndjson" (default: from the file suffix)
+            dry_run: Count what would be created and updated without writing
+            refresh_index: Rebuild the index from the database even if one exists
+
+        Returns:
+            status, created, updated, unchanged, failed, errors, seconds and
+            message; dry runs add the cost_estimate of the real run
+        """
+        started = time.perf_counter()
+        existing: Dict[str, Dict[str, Any]] = {}
+        rebuilt = refresh_index or not self.index.rows
+        if rebuilt:
+            self.index.rows = {}
+            existing = self.rebuild_index()
+
+        counts = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+        errors: List[Dict[str, Any]] = []
+        seen = set()
+
+        # A dry run leaves the index unsaved, so the real run repeats any rebuild
+        estimate = CostEstimate("bulk_load", self.max_workers)
+        estimate.phase("schema").add(RETRIEVE_DATA_SOURCE)
+        if rebuilt:
+            estimate.phase("index").add(QUERY_DATA_SOURCE, pages_of(len(existing)))
+        estimate.phase("writes", parallel=True)
+
+        def flush(batch: List[Dict[str, Any]]) -> None:
+            if dry_run:
+                for action in batch:
+                    counts["created" if action["op"] == "create" else "updated"] += 1
+                    if action["op"] == "create":
+                        estimate.add(CREATE_PAGE, payload={
+                            "parent": {"type": "data_source_id", "data_source_id": self.data_source_id},
+                            "properties": action["properties"]
+                        })
+                    else:
+                        estimate.add(UPDATE_PAGE, payload={"properties": action["properties"]})
+                return
+            for action, (page_id, error) in zip(batch, parallel_map(self._write, batch, self.max_workers)):
+                if error is not None:
+                    counts["failed"] += 1
+                    errors.append({"row": action["row"], "key": action["key"], "error": str(error)})
+                    continue
+                counts["created" if action["op"] == "create" or page_id != action.get("page_id") else "updated"] += 1
+                self.index.rows[action["key"]] = {"page_id": page_id, "hash": action["hash"]}
+            self.index.save()
+
+        batch: List[Dict[str, Any]] = []
+        for number, row in enumerate(read_rows(source, format), 1):
+            try:
+                key_value, properties = self.map_row(row)
+            except (ValueError, TypeError, AttributeError) as e:
+                counts["failed"] += 1
+                errors.append({"row": number, "key": None, "error": str(e)})
+                continue
+            if key_value in seen:
+                counts["failed"] += 1
+                errors.append({"row": number, "key": key_value, "error": "duplicate key in source"})
+                continue
+            seen.add(key_value)
+
+            comparable = {name: comparable_value(prop) for name, prop in properties.items()}
+            row_hash = _row_hash(comparable)
+            entry = self.index.rows.get(key_value)
+            if entry and entry["hash"] is None and key_value in existing:
+                # Adopted from the database: unchanged if every loaded value already matches
+                current = existing[key_value]
+                if all(name in current and comparable_value(current[name]) == value for name, value in comparable.items()):
+                    entry["hash"] = row_hash
+            if entry and entry["hash"] == row_hash:
+                counts["unchanged"] += 1
+                continue
+
+            action = {"row": number, "key": key_value, "properties": properties, "hash": row_hash}
+            if entry:
+                action.update(op="update", page_id=entry["page_id"])
+            else:
+                action["op"] = "create"
+            batch.append(action)
+            if len(batch) >= self.batch_size:
+                flush(batch)
+                batch = []
+        flush(batch)
+        if not dry_run and existing:
+            # Keep adopted rows even when nothing had to be written
+            self.index.save()
+
+        seconds = time.perf_counter() - started
+        verb = "Would load" if dry_run else "Loaded"
+        message = (
+            f"{verb} {counts['created'] + counts['updated'] + counts['unchanged']} rows: "
+            f"{counts['created']} created, {counts['updated']} updated, {counts['unchanged']} unchanged"
+            + (f", {counts['failed']} failed" if counts["failed"] else "")
+            + f" in {seconds:.1f}s"
+        )
+        result = {
+            "status": "success" if not errors else "error",
+            "data_source_id": self.data_source_id,
+            "key": self.key,
+            "dry_run": dry_run,
+            **counts,
+            "errors": errors,
+            "seconds": round(seconds, 2),
+            "message": message
+        }
+        if dry_run:
+            result["cost_estimate"] = estimate.result()
+        return result
@@ -0,0 +1,231 @@
+"""
+Cost Estimates
+
+What executing a plan will cost, worked out from the plan itself (and cached
+page snapshots where the plan does not say how much content a page has)
+without calling Notion:
+
+  - API calls by type ("POST pages", "PATCH blocks/{id}/children", ...), named
+    like the endpoints in server_metrics.py
+  - expected wall time at the configured request rate
+  - request payload volume, and response volume where it has been measured
+
+Executors run in phases (e.g. create the structure, then wire relations).
+Each phase is either sequential or spread over the NOTION_MAX_CONCURRENCY
+pool, and takes whichever is longer: sending its calls at
+NOTION_REQUESTS_PER_SECOND (default 3, Notion's average limit), or their
+latency divided by the calls in flight. Latency per call type is the mean this
+server has measured (see server_metrics.py), or NOTION_ESTIMATE_LATENCY
+seconds (default 0.35) for call types it has not seen yet. Fixed pauses in an
+executor (e.g. waiting for the API to sync) are added to their phase.
+
+    estimate = CostEstimate("provision_workspace")
+    estimate.phase("rows", parallel=True)
+    estimate.add(CREATE_PAGE, payload={"parent": ..., "properties": ...})
+    estimate.result()
+"""
+
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+from block_fingerprints import PageSnapshotStore
+from notion_concurrency import DEFAULT_MAX_WORKERS
+from server_metrics import METRICS
+
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3"))
+DEFAULT_LATENCY = float(os.getenv("NOTION_ESTIMATE_LATENCY", "0.35"))
+
+# Call types, named like server_metrics endpoints
+CREATE_PAGE = "POST pages"
+UPDATE_PAGE = "PATCH pages/{id}"
+RETRIEVE_PAGE = "GET pages/{id}"
+LIST_CHILDREN = "GET blocks/{id}/children"
+APPEND_CHILDREN = "PATCH blocks/{id}/children"
+UPDATE_BLOCK = "PATCH blocks/{id}"
+DELETE_BLOCK = "DELETE blocks/{id}"
+CREATE_DATABASE = "POST databases"
+RETRIEVE_DATA_SOURCE = "GET data_sources/{id}"
+UPDATE_DATA_SOURCE = "PATCH data_sources/{id}"
+QUERY_DATA_SOURCE = "POST data_sources/{id}/query"
+
+# Blocks returned per children listing or query page
+PAGE_SIZE = 100
+
+# JSON around one block's text (type, rich_text item, annotations), for
+# sizing copies of blocks known only from their text in a snapshot
+BLOCK_OVERHEAD_BYTES = 120
+
+# Stands in for IDs that only exist once a plan runs, so payload sizes are realistic
+PLACEHOLDER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def payload_bytes(payload: Any) -> int:
+    """Size of a request body as sent (compact UTF-8 JSON)."""
+    return len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def pages_of(items: int) -> int:
+    """Paginated requests needed to list `items` results (at least one)."""
+    return max(1, math.ceil(items / PAGE_SIZE))
+
+
+def measured_api_stats() -> Dict[str, Dict[str, float]]:
+    """Mean latency (seconds) and response size (bytes) per call type measured so far."""
+    stats = {}
+    for call, entry in METRICS.snapshot()["notion_api"].items():
+        if entry["calls"] and entry["latency_ms"]["mean"] is not None:
+            stats[call] = {
+                "latency": entry["latency_ms"]["mean"] / 1000,
+                "response_bytes": entry["bytes_received"] / entry["calls"]
+            }
+    return stats
+
+
+class CostEstimate:
+    """API calls, wall time and payload volume of a plan, accumulated phase by phase."""
+
+    def __init__(
+        self,
+        operation: str,
+        max_workers: Optional[int] = None,
+        requests_per_second: Optional[float] = None
+    ):
+        """
+        Args:
+            operation: What is being estimated (reported back)
+            max_workers: Calls in flight in parallel phases (default: NOTION_MAX_CONCURRENCY)
+            requests_per_second: Sustained request rate (default: NOTION_REQUESTS_PER_SECOND)
+        """
+        self.operation = operation
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.requests_per_second = requests_per_second or DEFAULT_REQUESTS_PER_SECOND
+        self.phases: List[Dict[str, Any]] = []
+        self.assumptions: List[str] = []
+        self._measured = measured_api_stats()
+
+    def phase(self, name: str, parallel: bool = False) -> "CostEstimate":
+        """Start a phase; later calls are counted in it."""
+        self.phases.append({"name": name, "parallel": parallel, "calls": {}, "request_bytes": 0, "waits": 0.0})
+        return self
+
+    def _current(self) -> Dict[str, Any]:
+        if not self.phases:
+            self.phase("main")
+        return self.phases[-1]
+
+    def add(self, call: str, count: int = 1, payload: Any = None, request_bytes: Optional[int] = None) -> None:
+        """
+        Count `count` calls of one type.
+
+        Args:
+            call: Call type, e.g. CREATE_PAGE
+            count: Number of calls
+            payload: Body of one call, measured and multiplied by `count`
+            request_bytes: Total request bytes, when known without a payload
+        """
+        if count <= 0:
+            return
+        phase = self._current()
+        phase["calls"][call] = phase["calls"].get(call, 0) + count
+        if payload is not None:
+            phase["request_bytes"] += payload_bytes(payload) * count
+        elif request_bytes:
+            phase["request_bytes"] += request_bytes
+
+    def wait(self, seconds: float) -> None:
+        """A fixed pause the executor makes in the current phase."""
+        self._current()["waits"] += seconds
+
+    def assume(self, note: str) -> None:
+        """Record an assumption the estimate rests on."""
+        if note not in self.assumptions:
+            self.assumptions.append(note)
+
+    def _latency(self, call: str) -> float:
+        measured = self._measured.get(call)
+        return measured["latency"] if measured else DEFAULT_LATENCY
+
+    def _phase_seconds(self, phase: Dict[str, Any]) -> float:
+        calls = sum(phase["calls"].values())
+        latency = sum(self._latency(call) * count for call, count in phase["calls"].items())
+        if phase["parallel"]:
+            latency /= max(1, min(self.max_workers, calls))
+        return max(latency, calls / self.requests_per_second) + phase["waits"]
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Returns:
+            operation, api_calls, calls (by type), estimated_seconds,
+            request_bytes, response_bytes (None until every call type has
+            been measured), phases, requests_per_second, max_workers,
+            latency ("measured", "default" or "mixed"), assumptions and message
+        """
+        calls: Dict[str, int] = {}
+        phases = []
+        for phase in self.phases:
+            if not phase["calls"] and not phase["waits"]:
+                continue
+            for call, count in phase["calls"].items():
+                calls[call] = calls.get(call, 0) + count
+            phases.append({
+                "name": phase["name"],
+                "parallel": phase["parallel"],
+                "api_calls": sum(phase["calls"].values()),
+                "calls": dict(phase["calls"]),
+                "request_bytes": phase["request_bytes"],
+                "estimated_seconds": round(self._phase_seconds(phase), 2)
+            })
+
+        total_calls = sum(calls.values())
+        seconds = sum(self._phase_seconds(phase) for phase in self.phases)
+        request_bytes = sum(phase["request_bytes"] for phase in self.phases)
+        measured = [call in self._measured for call in calls]
+        response_bytes = (
+            round(sum(self._measured[call]["response_bytes"] * count for call, count in calls.items()))
+            if calls and all(measured) else None
+        )
+        latency = "measured" if measured and all(measured) else "mixed" if any(measured) else "default"
+        return {
+            "operation": self.operation,
+            "api_calls": total_calls,
+            "calls": dict(sorted(calls.items())),
+            "estimated_seconds": round(seconds, 1),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "phases": phases,
+            "requests_per_second": self.requests_per_second,
+            "max_workers": self.max_workers,
+            "latency": latency,
+            "assumptions": list(self.assumptions),
+            "message": (
+                f"~{total_calls} API calls, ~{_duration(seconds)} at {self.requests_per_second:g} requests/s, "
+                f"{request_bytes / 1024:.1f} KB sent"
+            )
+        }
+
+
+def _duration(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def snapshot_page_stats(page_id: str) -> Optional[Dict[str, int]]:
+    """
+    Top-level blocks, child pages and text size of a page's latest cached
+    snapshot (see block_fingerprints.py), or None if it was never extracted.
+    """
+    snapshot = PageSnapshotStore().load(page_id)
+    if snapshot is None:
+        return None
+    blocks = snapshot.get("blocks") or []
+    return {
+        "blocks": len(blocks),
+        "child_pages": sum(1 for b in blocks if b.get("type") == "child_page"),
+        "content_blocks": sum(1 for b in blocks if b.get("type") not in ("child_page", "child_database")),
+        "text_bytes": sum(len((b.get("content") or "").encode("utf-8")) for b in blocks)
+    }
@@ -0,0 +1,314 @@
+"""
+Background Jobs
+
+In-process job manager for long operations (hierarchy crawls, cleanup,
+reorganization). A job runs on a small bounded thread pool while the MCP
+call that started it returns a job ID straight away; clients then poll
+`job_status`, fetch `job_result` or `job_cancel` it.
+
+Jobs report progress and partial results through progress.py, so the same
+tool code works in the foreground and as a job. Cancellation is cooperative:
+running jobs stop at the next point where the tool checks
+`progress.cancelled()`; queued jobs never start.
+
+Job state is written to the local cache (`jobs/`) on every transition, so
+status and results survive a server restart. Jobs that were still queued or
+running when the previous process exited are reported as "interrupted".
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from local_cache import get_cache_dir
+from progress import ProgressReporter, reporting_to
+
+DEFAULT_JOB_WORKERS = int(os.getenv("MCP_JOB_WORKERS", "2"))
+MAX_STORED_JOBS = 100
+MAX_PARTIAL_RESULTS = 500
+PERSIST_INTERVAL = 1.0
+
+ACTIVE_STATES = ("queued", "running")
+FINISHED_STATES = ("succeeded", "failed", "cancelled", "interrupted")
+
+
+class JobManager:
+    """Bounded pool of background jobs with persisted state."""
+
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS, directory: Optional[Path] = None):
+        """
+        Args:
+            max_workers: Jobs allowed to run at once; others wait in the queue
+            directory: Where job state is persisted (default: cache dir)
+        """
+        self.max_workers = max_workers
+        self.directory = Path(directory) if directory else get_cache_dir("jobs")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-job")
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, Any] = {}
+        self._partials: Dict[str, List[Dict[str, Any]]] = {}
+        self._reporters: Dict[str, ProgressReporter] = {}
+        self._futures: Dict[str, Future] = {}
+        self._last_persisted: Dict[str, float] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.result.json"
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        tmp_path.replace(path)
+
+    def _persist(self, job_id: str, force: bool = True) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_persisted.get(job_id, 0.0) < PERSIST_INTERVAL:
+            return
+        self._last_persisted[job_id] = now
+        try:
+            self._write_json(self._state_path(job_id), self._jobs[job_id])
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        """Read persisted jobs; anything unfinished belonged to a dead process."""
+        for path in sorted(self.directory.glob("*.json")):
+            if path.name.endswith(".result.json"):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if job.get("state") in ACTIVE_STATES:
+                job["state"] = "interrupted"
+                job["finished_at"] = job.get("finished_at") or datetime.now().isoformat()
+                job["message"] = "Server stopped before the job finished"
+                self._jobs[job["job_id"]] = job
+                self._persist(job["job_id"])
+            else:
+                self._jobs[job["job_id"]] = job
+
+    def _prune(self) -> None:
+        finished = sorted(
+            (job for job in self._jobs.values() if job["state"] in FINISHED_STATES),
+            key=lambda job: job["created_at"]
+        )
+        for job in finished[:max(0, len(self._jobs) - MAX_STORED_JOBS)]:
+            job_id = job["job_id"]
+            del self._jobs[job_id]
+            self._results.pop(job_id, None)
+            self._partials.pop(job_id, None)
+            self._last_persisted.pop(job_id, None)
+            self._state_path(job_id).unlink(missing_ok=True)
+            self._result_path(job_id).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Running jobs
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        kind: str,
+        function: Callable[..., Any],
+        *args: Any,
+        description: str = "",
+        on_finish: Optional[Callable[[Any], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue `function(*args)` as a background job.
+
+        Args:
+            kind: Job type shown in listings, usually the tool name
+            description: Short human-readable summary of the arguments
+            on_finish: Called with the result (None if the job raised) once it ends
+
+        Returns:
+            The job's status record, including its job_id
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "description": description,
+            "state": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "progress": None,
+            "partial_results": 0,
+            "message": "Waiting for a free worker"
+        }
+
+        def on_progress(done: float, total: Optional[float], message: Optional[str]) -> None:
+            with self._lock:
+                job["progress"] = {"done": done, "total": total, "message": message}
+                self._persist(job_id, force=False)
+
+        def on_partial(chunk: Dict[str, Any]) -> None:
+            with self._lock:
+                partials = self._partials.setdefault(job_id, [])
+                if len(partials) < MAX_PARTIAL_RESULTS:
+                    partials.append(chunk)
+                job["partial_results"] += 1
+
+        # Every update is recorded; clients poll, so nothing needs rate limiting
+        reporter = ProgressReporter(on_progress, on_partial, min_interval=0)
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._reporters[job_id] = reporter
+            self._prune()
+            self._persist(job_id)
+            self._futures[job_id] = self._executor.submit(self._run, job_id, function, args, on_finish)
+        return dict(job)
+
+    def _run(self, job_id: str, function: Callable[..., Any], args: tuple, on_finish) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            reporter = self._reporters[job_id]
+            if reporter.cancel_event.is_set():
+                # Cancelled while waiting for the lock to start
+                job["state"] = "cancelled"
+                job["message"] = "Cancelled before it started"
+                job["finished_at"] = datetime.now().isoformat()
+                self._reporters.pop(job_id, None)
+                self._futures.pop(job_id, None)
+                self._persist(job_id)
+                return
+            job["state"] = "running"
+            job["started_at"] = datetime.now().isoformat()
+            job["message"] = "Running"
+            self._persist(job_id)
+
+        result = None
+        try:
+            with reporting_to(reporter):
+                result = function(*args)
+            failed = isinstance(result, dict) and result.get("status") == "error"
+            if reporter.cancel_event.is_set():
+                state, message = "cancelled", "Cancelled; result covers the work done before stopping"
+            elif failed:
+                state, message = "failed", result.get("message", "Job returned an error")
+            else:
+                state = "succeeded"
+                message = result.get("message", "Completed") if isinstance(result, dict) else "Completed"
+        except Exception as e:
+            state, message = "failed", f"{type(e).__name__}: {e}"
+            result = {"status": "error", "message": message, "traceback": traceback.format_exc()}
+        finally:
+            if on_finish is not None:
+                try:
+                    on_finish(result)
+                except Exception:
+                    pass
+
+        with self._lock:
+            self._results[job_id] = result
+            try:
+                self._write_json(self._result_path(job_id), result)
+            except (OSError, TypeError, ValueError):
+                pass
+            job["state"] = state
+            job["message"] = message
+            job["finished_at"] = datetime.now().isoformat()
+            self._reporters.pop(job_id, None)
+            self._futures.pop(job_id, None)
+            self._persist(job_id)
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued job, or ask a running one to stop at its next check."""
+        with self._lock:
+            job = self._require(job_id)
+            if job["state"] in FINISHED_STATES:
+                return dict(job)
+            reporter = self._reporters.get(job_id)
+            if reporter is not None:
+                reporter.cancel_event.set()
+            future = self._futures.get(job_id)
+            if job["state"] == "queued" and future is not None and future.cancel():
+                job["state"] = "cancelled"
+                job["message"] = "Cancelled before it started"
+                job["finished_at"] = datetime.now().isoformat()
+                self._reporters.pop(job_id, None)
+                self._futures.pop(job_id, None)
+            else:
+                job["message"] = "Cancellation requested; stopping at the next safe point"
+            self._persist(job_id)
+            return dict(job)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _require(self, job_id: str) -> Dict[str, Any]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return job
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            job = dict(self._require(job_id))
+        if job["started_at"]:
+            end = datetime.fromisoformat(job["finished_at"]) if job["finished_at"] else datetime.now()
+            job["elapsed_seconds"] = round((end - datetime.fromisoformat(job["started_at"])).total_seconds(), 1)
+        return job
+
+    def result(self, job_id: str) -> Any:
+        """The job's result (None while it is still running)."""
+        with self._lock:
+            job = self._require(job_id)
+            if job_id in self._results:
+                return self._results[job_id]
+            if job["state"] not in FINISHED_STATES:
+                return None
+        path = self._result_path(job_id)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def partial_results(self, job_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        """Partial results emitted by the job so far (kept in memory only)."""
+        with self._lock:
+            self._require(job_id)
+            return list(self._partials.get(job_id, [])[offset:])
+
+    def list_jobs(self, include_finished: bool = True) -> List[Dict[str, Any]]:
+        """Jobs, newest first."""
+        with self._lock:
+            jobs = [
+                dict(job) for job in self._jobs.values()
+                if include_finished or job["state"] in ACTIVE_STATES
+            ]
+        return sorted(jobs, key=lambda job: job["created_at"], reverse=True)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """The process-wide job manager, created on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
@@ -0,0 +1,28 @@
+"""
+Local Cache Directory
+
+Shared location for state the tools keep between runs (cluster assignments,
+indexes, snapshots). Defaults to `.notion_cache/` at the project root and can
+be moved with the NOTION_CACHE_DIR environment variable.
+"""
+
+import os
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".notion_cache"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Return (and create) a directory inside the local cache.
+
+    Args:
+        *parts: Optional sub-directory names, e.g. get_cache_dir("snapshots")
+
+    Returns:
+        Path to the directory
+    """
+    base = Path(os.getenv("NOTION_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    path = base.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,501 @@
+"""
+Markdown to Notion Blocks
+
+Compiles Markdown into Notion block payloads as a stream: blocks are yielded
+as soon as they are complete, so a large document never has to be held as one
+list. Supported: headings, paragraphs, bulleted/numbered/to-do lists with
+nesting, quotes (GitHub "> [!NOTE]" alerts become callouts), fenced code,
+pipe tables, dividers, standalone images, and inline **bold**, *italic*,
+~~strike~~, `code` and [links](url).
+
+Text is split into rich_text segments of at most 2,000 characters (the Notion
+limit), preferring whitespace boundaries. Consecutive lines are merged into
+one block, so a document becomes as few blocks as possible.
+
+append_block_tree() sends any block stream in as few requests as the API
+allows: up to 100 top-level blocks and 1,000 blocks in total per append, with
+children nested two levels deep inline. Deeper children are appended once
+their parents exist, concurrently across parents.
+
+    from markdown_blocks import append_block_tree, compile_markdown
+    with open("guide.md", encoding="utf-8") as f:
+        append_block_tree(client, page_id, compile_markdown(f))
+"""
+
+import io
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from notion_concurrency import call_with_retry, list_block_children, parallel_map
+
+# Notion limits for rich text and block-children appends
+MAX_TEXT_LENGTH = 2000
+MAX_RICH_TEXT_ITEMS = 100
+MAX_BLOCKS_PER_REQUEST = 100
+MAX_BLOCKS_PER_PAYLOAD = 1000
+MAX_NESTING = 2
+
+# append_block_tree(after=INSERT_AT_START) inserts before a parent's first child
+INSERT_AT_START = "start"
+
+CODE_LANGUAGES = {
+    "": "plain text", "text": "plain text", "txt": "plain text",
+    "py": "python", "python": "python",
+    "js": "javascript", "javascript": "javascript", "ts": "typescript", "typescript": "typescript",
+    "sh": "shell", "shell": "shell", "bash": "bash", "zsh": "shell",
+    "json": "json", "yaml": "yaml", "yml": "yaml", "toml": "toml",
+    "html": "html", "css": "css", "sql": "sql", "md": "markdown", "markdown": "markdown",
+    "java": "java", "go": "go", "rust": "rust", "ruby": "ruby", "c": "c", "cpp": "c++", "c++": "c++"
+}
+
+ALERT_ICONS = {"NOTE": "ℹ️", "TIP": "💡", "IMPORTANT": "❗", "WARNING": "⚠️", "CAUTION": "🛑"}
+
+FENCE_PATTERN = re.compile(r"^(```|~~~)\s*([\w+#-]*)")
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+DIVIDER_PATTERN = re.compile(r"^(\*\s*){3,}$|^(-\s*){3,}$|^(_\s*){3,}$")
+IMAGE_PATTERN = re.compile(r"^!\[([^\]]*)\]\((\S+?)(?:\s+\"[^\"]*\")?\)$")
+LIST_PATTERN = re.compile(r"^(\s*)([-*+•]|\d+[.)])\s+(.*)$")
+TODO_PATTERN = re.compile(r"^\[([ xX])\]\s+(.*)$")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$")
+ALERT_PATTERN = re.compile(r"^\[!(\w+)\]\s*(.*)$")
+
+INLINE_PATTERN = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<bold_>.+?)__"
+    r"|~~(?P<strikethrough>.+?)~~"
+    r"|(?<![\w*])\*(?P<italic>[^*\s](?:[^*]*[^*\s])?)\*(?!\*)"
+    r"|(?<![\w_])_(?P<italic_>[^_\s](?:[^_]*[^_\s])?)_(?![\w_])"
+)
+
+
+# ----------------------------------------------------------------------
+# Rich text
+# ----------------------------------------------------------------------
+
+def split_text(content: str, limit: int = MAX_TEXT_LENGTH) -> List[str]:
+    """Split text into chunks of at most `limit` characters, at whitespace where possible."""
+    chunks = []
+    while len(content) > limit:
+        cut = max(content.rfind(" ", 0, limit), content.rfind("\n", 0, limit)) + 1
+        if cut < limit // 2:
+            cut = limit
+        chunks.append(content[:cut])
+        content = content[cut:]
+    if content:
+        chunks.append(content)
+    return chunks
+
+
+def _text_items(content: str, annotations: Dict[str, bool], link: Optional[str]) -> List[Dict[str, Any]]:
+    items = []
+    for chunk in split_text(content):
+        text: Dict[str, Any] = {"content": chunk}
+        if link:
+            text["link"] = {"url": link}
+        item: Dict[str, Any] = {"type": "text", "text": text}
+        if annotations:
+            item["annotations"] = dict(annotations)
+        items.append(item)
+    return items
+
+
+def rich_text(markdown: str, annotations: Optional[Dict[str, bool]] = None, link: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Inline Markdown -> rich_text items with annotations and links."""
+    annotations = annotations or {}
+    items: List[Dict[str, Any]] = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(markdown):
+        if match.start() > position:
+            items.extend(_text_items(markdown[position:match.start()], annotations, link))
+        groups = match.groupdict()
+        if groups["code"] is not None:
+            items.extend(_text_items(groups["code"], dict(annotations, code=True), link))
+        elif groups["link_text"] is not None:
+            items.extend(rich_text(groups["link_text"], annotations, groups["link_url"]))
+        else:
+            name = next(name for name in ("bold", "bold_", "strikethrough", "italic", "italic_") if groups[name] is not None)
+            items.extend(rich_text(groups[name], dict(annotations, **{name.rstrip("_"): True}), link))
+        position = match.end()
+    if position < len(markdown):
+        items.extend(_text_items(markdown[position:], annotations, link))
+    return items
+
+
+def _plain_items(content: str) -> List[Dict[str, Any]]:
+    return _text_items(content, {}, None)
+
+
+def _blocks(block_type: str, items: List[Dict[str, Any]], **payload: Any) -> List[Dict[str, Any]]:
+    """One block, or several when the text has more than 100 rich_text items."""
+    groups = [items[start:start + MAX_RICH_TEXT_ITEMS] for start in range(0, len(items), MAX_RICH_TEXT_ITEMS)] or [[]]
+    blocks = [{"type": block_type, block_type: dict(payload, rich_text=groups[0])}]
+    # Overflow continues as plain paragraphs, except code which stays code
+    overflow_type = block_type if block_type in ("code", "paragraph") else "paragraph"
+    extra = {"language": payload["language"]} if overflow_type == "code" else {}
+    blocks.extend({"type": overflow_type, overflow_type: dict(extra, rich_text=group)} for group in groups[1:])
+    return blocks
+
+
+# ----------------------------------------------------------------------
+# Block compiler
+# ----------------------------------------------------------------------
+
+def _list_blocks(item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    payload: Dict[str, Any] = {"checked": item["checked"]} if item["type"] == "to_do" else {}
+    blocks = _blocks(item["type"], rich_text(item["text"]), **payload)
+    children = [block for child in item["children"] for block in _list_blocks(child)]
+    if children:
+        blocks[0][item["type"]]["children"] = children
+    return blocks
+
+
+def _table_block(rows: List[List[str]]) -> Dict[str, Any]:
+    width = max(len(row) for row in rows)
+    return {
+        "type": "table",
+        "table": {
+            "table_width": width,
+            "has_column_header": True,
+            "has_row_header": False,
+            "children": [
+                {"type": "table_row", "table_row": {"cells": [rich_text(cell) for cell in row + [""] * (width - len(row))]}}
+                for row in rows
+            ]
+        }
+    }
+
+
+def _table_cells(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def compile_markdown(source: Union[str, Iterable[str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Markdown (a string, a file object or any iterable of lines) -> Notion
+    blocks, yielded one top-level block at a time.
+    """
+    lines = io.StringIO(source) if isinstance(source, str) else source
+    paragraph: List[str] = []
+    quote: List[str] = []
+    table: List[str] = []
+    code: Optional[Dict[str, Any]] = None
+    list_stack: List[Tuple[int, Dict[str, Any]]] = []
+    list_root: Optional[Dict[str, Any]] = None
+    after_blank = False
+
+    def flush_paragraph() -> List[Dict[str, Any]]:
+        if not paragraph:
+            return []
+        text = ""
+        for line in paragraph:
+            hard_break = line.endswith("  ") or line.endswith("\\")
+            text += line.rstrip("\\ ").strip() + ("\n" if hard_break else " ")
+        paragraph.clear()
+        return _blocks("paragraph", rich_text(text.rstrip()))
+
+    def flush_quote() -> List[Dict[str, Any]]:
+        if not quote:
+            return []
+        alert = ALERT_PATTERN.match(quote[0])
+        if alert and alert.group(1).upper() in ALERT_ICONS:
+            text = "\n".join(([alert.group(2)] if alert.group(2) else []) + quote[1:])
+            blocks = _blocks("callout", rich_text(text), icon={"type": "emoji", "emoji": ALERT_ICONS[alert.group(1).upper()]})
+        else:
+            blocks = _blocks("quote", rich_text("\n".join(quote)))
+        quote.clear()
+        return blocks
+
+    def flush_table() -> List[Dict[str, Any]]:
+        if not table:
+            return []
+        if len(table) >= 2 and TABLE_SEPARATOR_PATTERN.match(table[1].strip()):
+            blocks = [_table_block([_table_cells(line) for i, line in enumerate(table) if i != 1])]
+        else:
+            # Not a table after all: pipes in ordinary text
+            blocks = _blocks("paragraph", rich_text(" ".join(line.strip() for line in table)))
+        table.clear()
+        return blocks
+
+    def flush_list() -> List[Dict[str, Any]]:
+        nonlocal list_root
+        if list_root is None:
+            return []
+        blocks = _list_blocks(list_root)
+        list_root = None
+        list_stack.clear()
+        return blocks
+
+    def flush_all() -> List[Dict[str, Any]]:
+        return flush_paragraph() + flush_quote() + flush_table() + flush_list()
+
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n").expandtabs(4)
+        stripped = line.strip()
+
+        if code is not None:
+            if stripped.startswith(code["fence"]):
+                yield from _blocks("code", _plain_items("\n".join(code["lines"])), language=code["language"])
+                code = None
+            else:
+                code["lines"].append(line[min(code["indent"], len(line) - len(line.lstrip())):])
+            continue
+
+        if not stripped:
+            yield from flush_paragraph() + flush_quote() + flush_table()
+            after_blank = True
+            continue
+
+        indent = len(line) - len(line.lstrip())
+        fence = FENCE_PATTERN.match(stripped)
+        if fence:
+            yield from flush_all()
+            code = {
+                "fence": fence.group(1),
+                "language": CODE_LANGUAGES.get(fence.group(2).lower(), "plain text"),
+                "indent": indent,
+                "lines": []
+            }
+            after_blank = False
+            continue
+
+        if DIVIDER_PATTERN.match(stripped):
+            yield from flush_all()
+            yield {"type": "divider", "divider": {}}
+            after_blank = False
+            continue
+
+        list_match = LIST_PATTERN.match(line)
+        if list_match:
+            yield from flush_paragraph() + flush_quote() + flush_table()
+            marker, text = list_match.group(2), list_match.group(3)
+            todo = TODO_PATTERN.match(text) if not marker[0].isdigit() else None
+            item = {
+                "type": "to_do" if todo else ("numbered_list_item" if marker[0].isdigit() else "bulleted_list_item"),
+                "text": todo.group(2) if todo else text,
+                "checked": bool(todo and todo.group(1) != " "),
+                "children": []
+            }
+            while list_stack and list_stack[-1][0] >= indent:
+                list_stack.pop()
+            if list_stack:
+                list_stack[-1][1]["children"].append(item)
+            else:
+                yield from flush_list()
+                list_root = item
+            list_stack.append((indent, item))
+            after_blank = False
+            continue
+
+        if list_stack:
+            heading_or_block = HEADING_PATTERN.match(stripped) or stripped.startswith((">", "|")) or IMAGE_PATTERN.match(stripped)
+            if not heading_or_block and (indent > 0 or not after_blank):
+                # Continuation of the last list item
+                last = list_stack[-1][1]
+                last["text"] = f"{last['text']}\n{stripped}" if after_blank else f"{last['text']} {stripped}"
+                after_blank = False
+                continue
+            yield from flush_list()
+        after_blank = False
+
+        heading = HEADING_PATTERN.match(stripped)
+        if heading:
+            yield from flush_all()
+            level = min(len(heading.group(1)), 3)
+            yield from _blocks(f"heading_{level}", rich_text(heading.group(2)))
+            continue
+
+        image = IMAGE_PATTERN.match(stripped)
+        if image:
+            yield from flush_all()
+            payload: Dict[str, Any] = {"type": "external", "external": {"url": image.group(2)}}
+            if image.group(1):
+                payload["caption"] = rich_text(image.group(1))
+            yield {"type": "image", "image": payload}
+            continue
+
+        if stripped.startswith(">"):
+            yield from flush_paragraph() + flush_table()
+            quote.append(stripped[1:].strip())
+            continue
+
+        if stripped.startswith("|"):
+            yield from flush_paragraph() + flush_quote()
+            table.append(stripped)
+            continue
+
+        yield from flush_quote() + flush_table()
+        paragraph.append(line)
+
+    if code is not None:
+        # Unterminated fence: keep what was written
+        yield from _blocks("code", _plain_items("\n".join(code["lines"])), language=code["language"])
+    yield from flush_all()
+
+
+def markdown_to_blocks(markdown: str) -> List[Dict[str, Any]]:
+    """All blocks of a Markdown string as a list."""
+    return list(compile_markdown(markdown))
+
+
+# ----------------------------------------------------------------------
+# Batched appends
+# ----------------------------------------------------------------------
+
+def block_count(block: Dict[str, Any]) -> int:
+    """A block plus all of its nested children."""
+    children = block.get(block["type"], {}).get("children") or []
+    return 1 + sum(block_count(child) for child in children)
+
+
+def block_depth(block: Dict[str, Any]) -> int:
+    """Levels of children nested below a block (0 without children)."""
+    children = block.get(block["type"], {}).get("children") or []
+    return 1 + max(block_depth(child) for child in children) if children else 0
+
+
+def block_width(block: Dict[str, Any]) -> int:
+    """The longest children list anywhere below a block (0 without children)."""
+    children = block.get(block["type"], {}).get("children") or []
+    return max([len(children)] + [block_width(child) for child in children]) if children else 0
+
+
+def _strip_nested(
+    block: Dict[str, Any],
+    level: int,
+    path: Tuple[int, ...],
+    deferred: List[Tuple[Tuple[int, ...], List[Dict[str, Any]]]],
+    budget: List[int]
+) -> Dict[str, Any]:
+    """
+    A copy of `block` that fits one append request: at most MAX_NESTING
+    levels, MAX_BLOCKS_PER_REQUEST children per list and `budget[0]` blocks
+    below it. Children left out go to `deferred`, to be appended to the
+    block at `path` once it exists.
+    """
+    block_type = block["type"]
+    payload = block.get(block_type, {})
+    children = payload.get("children")
+    if not children:
+        return block
+    # A block's children are charged before its grandchildren, so a large
+    # subtree keeps its upper levels inline and defers the deeper ones
+    inline = 0 if level == MAX_NESTING else min(len(children), MAX_BLOCKS_PER_REQUEST, budget[0])
+    budget[0] -= inline
+    nested = [_strip_nested(child, level + 1, path + (i,), deferred, budget) for i, child in enumerate(children[:inline])]
+    if inline < len(children):
+        deferred.append((path, children[inline:]))
+    if not nested:
+        return dict(block, **{block_type: {k: v for k, v in payload.items() if k != "children"}})
+    return dict(block, **{block_type: dict(payload, children=nested)})
+
+
+def _append_batches(
+    blocks: Iterable[Dict[str, Any]]
+) -> Iterator[List[Tuple[Dict[str, Any], List[Tuple[Tuple[int, ...], List[Dict[str, Any]]]]]]]:
+    """Blocks grouped into legal append requests, each block with the children deferred below it."""
+    batch: List[Tuple[Dict[str, Any], List[Any]]] = []
+    batch_size = 0
+    for block in blocks:
+        deferred: List[Tuple[Tuple[int, ...], List[Dict[str, Any]]]] = []
+        prepared = _strip_nested(block, 0, (), deferred, [MAX_BLOCKS_PER_PAYLOAD - 1])
+        size = block_count(prepared)
+        if batch and (len(batch) >= MAX_BLOCKS_PER_REQUEST or batch_size + size > MAX_BLOCKS_PER_PAYLOAD):
+            yield batch
+            batch, batch_size = [], 0
+        batch.append((prepared, deferred))
+        batch_size += size
+    if batch:
+        yield batch
+
+
+def plan_block_appends(blocks: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    The requests append_block_tree() would make for a block stream, without
+    making them.
+
+    Returns:
+        {"appends": append requests, "lookups": children listings to find the
+        parents of deferred deep children, "request_bytes": bytes sent, "blocks"}
+    """
+    plan = {"appends": 0, "lookups": 0, "request_bytes": 0, "blocks": 0}
+    for batch in _append_batches(blocks):
+        children = [b for b, _ in batch]
+        plan["appends"] += 1
+        plan["blocks"] += sum(block_count(b) for b in children)
+        plan["request_bytes"] += len(json.dumps({"children": children}, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        for _, deferred in batch:
+            for path, nested in deferred:
+                nested_plan = plan_block_appends(nested)
+                plan["lookups"] += len(path) + nested_plan["lookups"]
+                for key in ("appends", "request_bytes", "blocks"):
+                    plan[key] += nested_plan[key]
+    return plan
+
+
+def append_block_tree(
+    client: Any,
+    block_id: str,
+    blocks: Iterable[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    after: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Append a stream of blocks (with any nesting) to a page or block in as
+    few requests as possible, keeping their order.
+
+    Args:
+        client: A notion_client.Client
+        block_id: Page or block to append to
+        blocks: Block objects, e.g. from compile_markdown()
+        max_workers: Concurrent appends for deferred deep children
+        after: Insert after this child block instead of at the end, or at
+            the start with INSERT_AT_START
+
+    Returns:
+        {"blocks": blocks appended, "requests": API requests made}
+    """
+    stats = {"blocks": 0, "requests": 0}
+    pending: List[Tuple[str, Tuple[int, ...], List[Dict[str, Any]]]] = []
+
+    for batch in _append_batches(blocks):
+        children = [b for b, _ in batch]
+        if after is None:
+            response = call_with_retry(client.blocks.children.append, block_id=block_id, children=children)
+        else:
+            # Sent as is, since older SDKs drop "after" and "position" from appends
+            body: Dict[str, Any] = {"children": children}
+            if after == INSERT_AT_START:
+                body["position"] = {"type": "start"}
+            else:
+                body["after"] = after
+            response = call_with_retry(client.request, path=f"blocks/{block_id}/children", method="PATCH", body=body)
+            # Later batches follow the last block of this one
+            after = response["results"][-1]["id"]
+        stats["requests"] += 1
+        stats["blocks"] += sum(block_count(b) for b, _ in batch)
+        for (_, deferred), result in zip(batch, response.get("results", [])):
+            pending.extend((result["id"], path, children) for path, children in deferred)
+
+    def append_deferred(item: Tuple[str, Tuple[int, ...], List[Dict[str, Any]]]) -> Dict[str, int]:
+        parent_id, path, children = item
+        lookups = 0
+        for index in path:
+            parent_id = list_block_children(client, parent_id)[index]["id"]
+            lookups += 1
+        result = append_block_tree(client, parent_id, children, max_workers)
+        return {"blocks": result["blocks"], "requests": result["requests"] + lookups}
+
+    for result, error in parallel_map(append_deferred, pending, max_workers):
+        if error is not None:
+            raise error
+        stats["blocks"] += result["blocks"]
+        stats["requests"] += result["requests"]
+    return stats
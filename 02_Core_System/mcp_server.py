@@ -440,7 +440,7 @@ def modify_database(
         database_id: ID of the database to modify
         add_properties: New properties to add
         remove_properties: Property names to remove
-        modify_properties: Properties to modify
+        modify_properties: Properties to modify; {"name": new} renames, and option lists are complete (left-out options are removed)
         api_key: Optional Notion API key
     """
     return modify_database_schema(database_id, add_properties, remove_properties, modify_properties, api_key)
@@ -10,11 +10,18 @@ Note: This file is named 'notion_api_client.py' (not 'notion_client.py') to avoi
 """
 
 import os
-from typing import Dict, List, Any, Optional
-from notion_client import Client
+from typing import Dict, Iterable, List, Any, Optional, Union
 from notion_client.errors import APIResponseError
 from dotenv import load_dotenv
 
+from bulk_loader import BulkLoader
+from markdown_blocks import append_block_tree, compile_markdown
+from notion_concurrency import create_database
+from notion_transport import get_notion_client
+from provisioning import Provisioner, plan_manifest
+from schema_migrations import SchemaMigrator
+from template_compiler import load_template
+
 
 class NotionTemplateClient:
     """
@@ -22,13 +29,25 @@ class NotionTemplateClient:
     for creating templates programmatically.
     """
     
-    def __init__(self, api_key: Optional[str] = None, api_version: str = "2025-09-03"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_version: str = "2025-09-03",
+        base_url: Optional[str] = None,
+        cassette: Optional[str] = None,
+        cassette_mode: Optional[str] = None
+    ):
         """
         Initialize the Notion client.
         
         Args:
             api_key: Notion API key. If not provided, will load from environment.
             api_version: Notion API version (default: "2025-09-03")
+            base_url: API root, e.g. a local notion_standin.py server
+                (default: NOTION_API_BASE_URL, else the live Notion API)
+            cassette: Cassette file to record traffic to or replay it from
+                (default: NOTION_CASSETTE; see notion_cassette.py)
+            cassette_mode: "record" or "replay" (default: NOTION_CASSETTE_MODE)
         """
         # Load environment variables
         load_dotenv()
@@ -41,8 +60,9 @@ class NotionTemplateClient:
             )
         
         # Initialize Notion client with API version
-        self.client = Client(auth=self.api_key, notion_version=api_version)
+        self.client = get_notion_client(self.api_key, api_version, base_url, cassette, cassette_mode)
         self.api_version = api_version
+        self.base_url = base_url
         
         # Get parent page ID from environment
         self.parent_page_id = os.getenv("NOTION_PARENT_PAGE_ID")
@@ -103,7 +123,7 @@ class NotionTemplateClient:
             request_body["cover"] = cover
         
         try:
-            response = self.client.databases.create(**request_body)
+            response = create_database(self.client, request_body)
             print(f"✅ Successfully created database: {title}")
             
             # Store data source info for easy access
@@ -118,6 +138,77 @@ class NotionTemplateClient:
             print(f"❌ Error creating database '{title}': {e}")
             raise
     
+    def create_database_from_template(
+        self,
+        template: str,
+        parent_page_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a database from a template in 03_Templates/notion_templates.
+        
+        Relation properties are not created, since they need the target
+        database to exist first; they are listed in the template's "relations".
+        
+        Args:
+            template: Template name (e.g. "launch_hub") or path to a template file
+            parent_page_id: Optional parent page ID (uses default if not provided)
+        
+        Returns:
+            The created database object
+        """
+        compiled = load_template(template)
+        request_body = dict(compiled["database"])
+        request_body["parent"] = {"type": "page_id", "page_id": parent_page_id or self.parent_page_id}
+        
+        try:
+            response = create_database(self.client, request_body)
+            print(f"✅ Successfully created database from template: {compiled['template_name']}")
+            return response
+        
+        except APIResponseError as e:
+            print(f"❌ Error creating database from template '{template}': {e}")
+            raise
+    
+    def create_linked_databases(
+        self,
+        databases: List[Dict[str, Any]],
+        parent_page_id: Optional[str] = None,
+        dry_run: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create several databases that relate to each other in two waves:
+        every database concurrently, then their relation and rollup
+        properties, one data source update per database. See provisioning.py.
+        
+        Args:
+            databases: Manifest database entries: {"key", "title", "properties",
+                optional "icon", "relations", "rollups" and "rows"}
+            parent_page_id: Optional parent page ID (uses default if not provided)
+            dry_run: Return the creation plan and cost estimate without creating anything
+            max_workers: Concurrent API calls (default: NOTION_MAX_CONCURRENCY)
+        
+        Returns:
+            The provisioning result, with each database's ID and data source ID under "created"
+        
+        Example:
+            client.create_linked_databases([
+                {"key": "pillars", "title": "Pillars", "properties": {"Name": {"title": {}}},
+                 "relations": [{"property": "Posts", "target": "hub", "dual": True}],
+                 "rollups": [{"property": "Post Count", "relation": "Posts",
+                              "rollup_property": "Title", "function": "count"}]},
+                {"key": "hub", "title": "Hub", "properties": {"Title": {"title": {}}}}
+            ])
+        """
+        manifest = {"databases": databases}
+        if dry_run:
+            return plan_manifest(manifest, max_workers)
+        result = Provisioner(max_workers=max_workers, client=self.client).provision(
+            manifest, parent_page_id or self.parent_page_id
+        )
+        print(f"{'✅' if result['status'] == 'success' else '⚠️'} {result['message']}")
+        return result
+    
     def create_page(
         self,
         parent_id: str,
@@ -241,6 +332,33 @@ class NotionTemplateClient:
             print(f"❌ Error appending blocks: {e}")
             raise
     
+    def append_markdown(
+        self,
+        block_id: str,
+        markdown: Union[str, Iterable[str]]
+    ) -> Dict[str, Any]:
+        """
+        Append Markdown to a page or block as native Notion blocks.
+        
+        The Markdown is compiled as a stream and sent in batched appends
+        (see markdown_blocks.py), so long documents need few requests.
+        
+        Args:
+            block_id: ID of the parent block or page
+            markdown: Markdown text, or an open file / iterable of lines
+        
+        Returns:
+            {"blocks": blocks appended, "requests": API requests made}
+        """
+        try:
+            stats = append_block_tree(self.client, block_id, compile_markdown(markdown))
+            print(f"✅ Successfully appended {stats['blocks']} blocks in {stats['requests']} requests")
+            return stats
+        
+        except APIResponseError as e:
+            print(f"❌ Error appending Markdown: {e}")
+            raise
+    
     def get_database(self, database_id: str) -> Dict[str, Any]:
         """
         Retrieve a database by ID (returns data_sources in 2025-09-03).
@@ -380,6 +498,74 @@ class NotionTemplateClient:
             print(f"❌ Error updating data source: {e}")
             raise
 
+    def bulk_load(
+        self,
+        database_id: str,
+        source: Union[str, Iterable[Dict[str, Any]]],
+        key: Optional[str] = None,
+        column_map: Optional[Dict[str, Optional[str]]] = None,
+        data_source_id: Optional[str] = None,
+        format: Optional[str] = None,
+        dry_run: bool = False,
+        refresh_index: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Upsert rows from a CSV/JSON/NDJSON file (or a list of dicts) into a
+        database; unchanged rows are skipped, so re-runs are no-ops.
+        See bulk_loader.py.
+
+        Args:
+            database_id: The database ID (used if data_source_id not provided)
+            source: File path or an iterable of row dicts
+            key: Property that identifies a row (default: the title property)
+            column_map: Source column -> property name (None drops the column)
+            data_source_id: Optional data source ID (auto-fetched if not provided)
+            format: "csv", "json" or "ndjson" (default: from the file suffix)
+            dry_run: Count what would be created and updated without writing
+            refresh_index: Rebuild the local upsert index from the database
+            max_workers: Concurrent API calls (default: NOTION_MAX_CONCURRENCY)
+
+        Returns:
+            Counts of created, updated, unchanged and failed rows with errors
+        """
+        if not data_source_id:
+            data_source_id = self.get_data_source_id(database_id)
+
+        loader = BulkLoader(
+            self.client,
+            data_source_id,
+            key=key,
+            column_map=column_map,
+            max_workers=max_workers
+        )
+        result = loader.load(source, format=format, dry_run=dry_run, refresh_index=refresh_index)
+        print(f"{'✅' if result['status'] == 'success' else '⚠️'} {result['message']}")
+        return result
+
+    def migrate_schemas(
+        self,
+        migrations: List[Dict[str, Any]],
+        dry_run: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Bring data source schemas to a desired state, sending only the
+        properties and options that differ. See schema_migrations.py.
+
+        Args:
+            migrations: {"database_id" or "data_source_id", "properties", optional
+                "renames" (old -> new name), "remove" and "remove_missing"}
+            dry_run: Return the PATCH bodies without sending them
+            max_workers: Concurrent migrations (default: NOTION_MAX_CONCURRENCY)
+
+        Returns:
+            One plan per migration with its body, changes and warnings, and counts
+        """
+        result = SchemaMigrator(self.client, max_workers=max_workers).migrate(migrations, dry_run=dry_run)
+        print(f"{'✅' if result['status'] == 'success' else '⚠️'} {result['message']}")
+        return result
+
 
 # Helper functions for all Notion block types
 
@@ -979,56 +1165,62 @@ class AdvancedNotionClient(NotionTemplateClient):
         """
         Modify database schema by adding, removing, or modifying properties.
         
+        Only the properties and select options that differ from the current
+        schema are sent (see schema_migrations.py).
+        
         Args:
             database_id: ID of the database to modify
             add_properties: New properties to add
             remove_properties: Property names to remove
-            modify_properties: Properties to modify
+            modify_properties: Properties to modify, in the Notion format: a
+                {"name": new} entry renames, null removes, and a select or
+                multi-select option list is complete (options left out are removed)
         
         Returns:
             Dictionary with modification results
         """
         try:
-            # Get current data source
-            data_source_id = self.get_data_source_id(database_id)
-            current_data_source = self.retrieve_data_source(data_source_id)
-            current_properties = current_data_source.get("schema", {}).get("properties", {})
-            
-            # Create updated properties
-            updated_properties = current_properties.copy()
-            
-            # Add new properties
-            if add_properties:
-                updated_properties.update(add_properties)
-                print(f"➕ Adding {len(add_properties)} new properties")
-            
-            # Remove properties
-            if remove_properties:
-                for prop_name in remove_properties:
-                    if prop_name in updated_properties:
-                        del updated_properties[prop_name]
-                        print(f"➖ Removing property: {prop_name}")
-            
-            # Modify properties
-            if modify_properties:
-                updated_properties.update(modify_properties)
-                print(f"✏️ Modifying {len(modify_properties)} properties")
-            
-            # Update the data source
-            response = self.update_data_source(
-                data_source_id=data_source_id,
-                properties=updated_properties
-            )
+            properties = dict(add_properties or {})
+            renames: Dict[str, str] = {}
+            removals = list(remove_properties or [])
+            for name, spec in (modify_properties or {}).items():
+                if spec is None:
+                    removals.append(name)
+                    continue
+                new_name = spec.get("name", name)
+                if new_name != name:
+                    renames[name] = new_name
+                # A {"name": ...}-only entry is just a rename
+                if any(key != "name" for key in spec):
+                    properties[new_name] = {k: v for k, v in spec.items() if k != "name"}
+            migrator = SchemaMigrator(self.client)
+            migration = {
+                "database_id": database_id,
+                "properties": properties,
+                "renames": renames,
+                "remove": removals,
+                "exact_options": [renames.get(name, name) for name in (modify_properties or {})]
+            }
+            result = migrator.apply(migration)
             
-            print(f"✅ Successfully modified database schema")
+            changes = result["changes"]
+            sent = result["body"].get("properties", {})
+            for warning in result["warnings"]:
+                print(f"⚠️  {warning}")
+            if result["status"] == "unchanged":
+                print(f"✅ Database schema already up to date")
+            else:
+                print(f"✅ Successfully modified database schema ({len(sent)} properties sent)")
             return {
                 "status": "success",
                 "database_id": database_id,
-                "data_source_id": data_source_id,
-                "properties_added": len(add_properties) if add_properties else 0,
-                "properties_removed": len(remove_properties) if remove_properties else 0,
-                "properties_modified": len(modify_properties) if modify_properties else 0,
-                "total_properties": len(updated_properties)
+                "data_source_id": result["data_source_id"],
+                "properties_added": len(changes.get("added", [])),
+                "properties_removed": len(changes.get("removed", [])),
+                "properties_modified": len(sent) - len(changes.get("added", [])) - len(changes.get("removed", [])),
+                "changes": changes,
+                "warnings": result["warnings"],
+                "body": result["body"]
             }
             
         except Exception as e:
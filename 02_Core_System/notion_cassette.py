@@ -0,0 +1,233 @@
+"""
+Notion API Cassettes
+
+Record every request/response pair the shared Notion client makes against a
+real workspace, then replay them offline. A replayed crawl makes the same
+calls and gets the same answers without network noise, so CPU-side work
+(block processing, rendering, analysis) can be measured on its own.
+
+A cassette is gzip-compressed NDJSON: a header line followed by one line per
+interaction holding the method, path, query, a hash of the request body,
+status, a few response headers, the JSON response body and the recorded
+latency. Authorization headers are never stored.
+
+Replay matches on method, path, query and body hash. Identical requests are
+answered in recorded order; once a key's recordings are used up its last
+response is repeated, so the same crawl can be replayed any number of times.
+
+Select a cassette with NOTION_CASSETTE (path) and NOTION_CASSETTE_MODE
+(record | replay), or pass them to notion_transport.get_notion_client.
+NOTION_CASSETTE_LATENCY adds latency on replay: milliseconds per request, or
+"recorded" to sleep for each interaction's recorded time.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+CASSETTE_VERSION = 1
+
+# Response headers worth keeping; everything else is transport noise
+KEPT_HEADERS = ("content-type", "retry-after", "x-notion-request-id")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def body_hash(content: bytes) -> str:
+    """Hash of a request body, insensitive to JSON key order."""
+    if not content:
+        return ""
+    try:
+        canonical = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        canonical = content.decode("utf-8", "replace")
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def _query(request: httpx.Request) -> str:
+    return request.url.query.decode("ascii")
+
+
+def interaction_key(method: str, path: str, query: str, content: bytes) -> Tuple[str, str, str, str]:
+    return (method, path, query, body_hash(content))
+
+
+def read_cassette(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Header and interactions of a cassette. A truncated file yields what was complete."""
+    header: Dict[str, Any] = {}
+    interactions = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("type") == "header":
+                    header = record
+                else:
+                    interactions.append(record)
+        except (EOFError, ValueError):
+            pass
+    return header, interactions
+
+
+class CassetteWriter:
+    """Append-only cassette file, shared by every client recording to it."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({
+            "type": "header",
+            "version": CASSETTE_VERSION,
+            "recorded_at": datetime.now().isoformat()
+        }) + "\n")
+        self.recorded = 0
+        atexit.register(self.close)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+                self.recorded += 1
+
+    def close(self) -> None:
+        """Finish the gzip stream; the cassette is only complete after this."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_writers: Dict[Path, CassetteWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(path: Path) -> CassetteWriter:
+    """The writer for a cassette path, starting a new cassette on first use."""
+    path = Path(path).resolve()
+    with _writers_lock:
+        writer = _writers.get(path)
+        if writer is None:
+            writer = _writers[path] = CassetteWriter(path)
+        return writer
+
+
+def close_cassettes() -> None:
+    """Finish every cassette being recorded (also done at exit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Passes requests through to `inner` and appends each interaction to a cassette."""
+
+    def __init__(self, inner: httpx.BaseTransport, path: Path):
+        self.inner = inner
+        self.writer = get_writer(path)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        body = response.read()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            payload: Any = json.loads(body) if body else None
+            text = None
+        except ValueError:
+            payload, text = None, body.decode("utf-8", "replace")
+
+        record = {
+            "method": request.method,
+            "path": request.url.path,
+            "query": _query(request),
+            "body_hash": body_hash(request.content),
+            "notion_version": request.headers.get("notion-version", ""),
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            "json": payload,
+            "elapsed_ms": round(elapsed_ms, 1)
+        }
+        if text is not None:
+            record["text"] = text
+
+        self.writer.write(record)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Answers requests from a cassette without touching the network."""
+
+    def __init__(self, path: Path, latency: Optional[str] = None):
+        """
+        Args:
+            path: Cassette file
+            latency: None/"0" for none, "recorded", or milliseconds per request
+        """
+        self.path = Path(path)
+        self.header, interactions = read_cassette(self.path)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str, str, str], Deque[Dict[str, Any]]] = {}
+        self._last: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+        for record in interactions:
+            key = (record["method"], record["path"], record["query"], record["body_hash"])
+            self._queues.setdefault(key, deque()).append(record)
+        self.replayed = 0
+
+    def _delay(self, record: Dict[str, Any]) -> None:
+        if not self.latency or self.latency == "0":
+            return
+        seconds = record.get("elapsed_ms", 0) / 1000 if self.latency == "recorded" else float(self.latency) / 1000
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        query = _query(request)
+        key = interaction_key(request.method, request.url.path, query, request.content)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                record = queue.popleft()
+                self._last[key] = record
+            else:
+                record = self._last.get(key)
+            if record is None:
+                raise CassetteMiss(
+                    f"No recorded response for {request.method} {request.url.path}"
+                    f"{'?' + query if query else ''} in {self.path}"
+                )
+            self.replayed += 1
+
+        self._delay(record)
+        if "text" in record:
+            content = record["text"].encode("utf-8")
+        else:
+            content = json.dumps(record["json"]).encode("utf-8") if record["json"] is not None else b""
+        return httpx.Response(record["status"], headers=record["headers"], content=content, request=request)
+
+    def remaining(self) -> int:
+        """Recorded interactions not yet replayed once."""
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
@@ -0,0 +1,207 @@
+"""
+Notion Concurrency Helpers
+
+Bounded parallel execution for independent Notion API calls, a work queue for
+crawling trees whose shape is only known as it is fetched, plus fully
+paginated block-children and data source listing. The Notion client's underlying httpx.Client
+is thread-safe, so one client can be shared across worker threads.
+
+Notion allows an average of about three requests per second per integration,
+so the default worker count is small and rate-limited calls are retried after
+the `Retry-After` interval the API sends back.
+"""
+
+import contextvars
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from notion_client.errors import APIResponseError, APIErrorCode
+
+from server_metrics import METRICS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = int(os.getenv("NOTION_MAX_CONCURRENCY", "4"))
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def call_with_retry(function: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Call a Notion API function, retrying when the API answers 429."""
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        try:
+            return function(*args, **kwargs)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.RateLimited or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            METRICS.record_retry(getattr(function, "__qualname__", "notion_call"))
+            retry_after = e.headers.get("Retry-After")
+            time.sleep(float(retry_after) if retry_after else 2 ** attempt * 0.5)
+    raise RuntimeError("unreachable")
+
+
+def create_database(client: Any, body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    POST a databases.create body as is, retrying when the API answers 429.
+
+    notion-client 2.x (still allowed by requirements.txt) keeps only the
+    keys it knows from databases.create arguments and drops
+    `initial_data_source`; 3.x keeps it. Sending the body through
+    client.request works with both.
+    """
+    return call_with_retry(client.request, path="databases", method="POST", body=body)
+
+
+def parallel_map(
+    function: Callable[[T], R],
+    items: Sequence[T],
+    max_workers: Optional[int] = None
+) -> List[Tuple[Optional[R], Optional[Exception]]]:
+    """
+    Run `function` over `items` on a bounded thread pool.
+
+    Returns:
+        One (result, error) pair per item, in input order; exactly one of the two is None
+    """
+    if not items:
+        return []
+
+    # Workers run in the caller's context so API calls stay attributed to its tool
+    context = contextvars.copy_context()
+
+    def run(item: T) -> Tuple[Optional[R], Optional[Exception]]:
+        try:
+            return context.copy().run(function, item), None
+        except Exception as e:
+            return None, e
+
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, len(items))
+    if workers <= 1:
+        return [run(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, items))
+
+
+def crawl(
+    roots: Sequence[T],
+    visit: Callable[[T], Tuple[R, List[T]]],
+    max_workers: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None
+) -> Iterator[Tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Visit a tree of tasks on a bounded thread pool, as the tree is discovered.
+
+    `visit` returns its result and the child tasks it found; children are
+    queued as soon as their parent finishes, so a wide tree keeps every worker
+    busy instead of waiting for a whole level. Nothing below a failed task is
+    visited.
+
+    Args:
+        roots: Tasks to start from
+        visit: Task -> (result, child tasks)
+        max_workers: Tasks in flight at once (default: NOTION_MAX_CONCURRENCY)
+        should_stop: Checked before each task is started; when it returns
+            True, running tasks finish and nothing new is started
+
+    Yields:
+        (task, result, error) in completion order, on the calling thread;
+        exactly one of result and error is None
+    """
+    workers = max_workers or DEFAULT_MAX_WORKERS
+    # Workers run in the caller's context so API calls stay attributed to its tool
+    context = contextvars.copy_context()
+    queue = list(reversed(roots))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running: Dict[Any, T] = {}
+        while queue or running:
+            while queue and len(running) < workers and not (should_stop and should_stop()):
+                task = queue.pop()
+                running[executor.submit(context.copy().run, visit, task)] = task
+            if not running:
+                return
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    result, children = future.result()
+                except Exception as e:
+                    yield task, None, e
+                    continue
+                queue.extend(reversed(children))
+                yield task, result, None
+
+
+def list_block_children(client: Any, block_id: str) -> List[Dict[str, Any]]:
+    """All children of a block, following pagination cursors."""
+    children = []
+    cursor = None
+    while True:
+        kwargs = {"block_id": block_id, "page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        response = call_with_retry(client.blocks.children.list, **kwargs)
+        children.extend(response.get("results", []))
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            return children
+
+
+def list_block_tree(
+    client: Any,
+    block_id: str,
+    skip_types: Sequence[str] = ("child_page", "child_database"),
+    max_workers: Optional[int] = None,
+    on_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    All blocks below a page or block, with nested blocks under "children".
+
+    Children are fetched level by level: every container block at one depth
+    is listed concurrently before moving to the next depth. Blocks of
+    `skip_types` (by default child pages and databases, which are separate
+    objects) keep `has_children` but are not descended into.
+
+    Args:
+        max_workers: Concurrent listings per level (default: DEFAULT_MAX_WORKERS)
+        on_error: Called with a block and the error when listing its
+            children fails; the block is then left without "children".
+            Without it the first error is raised.
+    """
+    blocks = list_block_children(client, block_id)
+    level = [b for b in blocks if b.get("has_children") and b.get("type") not in skip_types]
+    while level:
+        results = parallel_map(lambda block: list_block_children(client, block["id"]), level, max_workers)
+        next_level = []
+        for block, (children, error) in zip(level, results):
+            if error is not None:
+                if on_error is None:
+                    raise error
+                on_error(block, error)
+                continue
+            block["children"] = children
+            next_level.extend(
+                child for child in children
+                if child.get("has_children") and child.get("type") not in skip_types
+            )
+        level = next_level
+    return blocks
+
+
+def iter_data_source_rows(
+    client: Any,
+    data_source_id: str,
+    query: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Every row (page) of a data source, one query page at a time."""
+    cursor = None
+    while True:
+        body: Dict[str, Any] = dict(query or {}, page_size=100)
+        if cursor:
+            body["start_cursor"] = cursor
+        response = call_with_retry(client.request, path=f"data_sources/{data_source_id}/query", method="POST", body=body)
+        yield from response.get("results", [])
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            return
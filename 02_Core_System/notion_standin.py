@@ -0,0 +1,971 @@
+#!/usr/bin/env python3
+"""
+Notion API Stand-in
+
+A local, in-memory HTTP server that answers the parts of the Notion API this
+project uses, for offline testing and benchmarking:
+
+- pages: create, retrieve, update (properties, icon, archive, move)
+- blocks: retrieve, update, delete, children list (paginated) and append
+- databases: create, retrieve, update (+ legacy `databases/{id}/query`)
+- data sources: retrieve, update, `query` with simple filters and sorts
+- search by title
+
+Responses follow the Notion object shapes closely enough for the SDK and the
+tools, not exactly (no users, comments, files or formulas).
+
+Latency, maximum page size, a token-bucket rate limit and random 429s can be
+configured, so the effect of concurrency, batching and retry changes can be
+measured without touching a real workspace.
+
+Point the tools at it with NOTION_API_BASE_URL (see notion_transport.py), or
+`NotionTemplateClient(base_url=...)`:
+
+    python notion_standin.py --port 8787 --seed-pages 200 --latency-ms 120
+    NOTION_API_BASE_URL=http://127.0.0.1:8787 NOTION_API_KEY=secret_standin ...
+"""
+
+import argparse
+import copy
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$")
+
+@dataclass
+class StandinConfig:
+    """Behaviour of the stand-in server."""
+    latency_ms: float = 0.0          # Added to every request
+    jitter_ms: float = 0.0           # Uniform random extra latency
+    max_page_size: int = 100         # Cap on page_size for paginated endpoints
+    rate_limit: Optional[float] = None  # Requests per second (token bucket), None = unlimited
+    burst: Optional[int] = None      # Bucket size (default: max(1, rate_limit))
+    inject_429: float = 0.0          # Probability of answering any request with 429
+    retry_after: float = 1.0         # Retry-After sent with injected 429s
+    seed: int = 0                    # Random seed for jitter and 429 injection
+
+
+class StandinError(Exception):
+    """An error response in Notion's format."""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def _dashed(object_id: str) -> str:
+    """Any Notion ID form -> dashed lowercase UUID."""
+    if not ID_PATTERN.match(object_id or ""):
+        raise StandinError(400, "validation_error", f"Invalid ID: {object_id}")
+    return str(uuid.UUID(object_id.replace("-", "")))
+
+
+def rich_text(items: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Fill in the fields Notion adds to rich text it returns."""
+    result = []
+    for item in items or []:
+        item = copy.deepcopy(item)
+        kind = item.setdefault("type", "text")
+        if kind == "text":
+            text = item.setdefault("text", {"content": ""})
+            text.setdefault("link", None)
+            item.setdefault("plain_text", text.get("content", ""))
+            item.setdefault("href", (text.get("link") or {}).get("url"))
+        else:
+            item.setdefault("plain_text", "")
+            item.setdefault("href", None)
+        annotations = item.setdefault("annotations", {})
+        for flag in ("bold", "italic", "strikethrough", "underline", "code"):
+            annotations.setdefault(flag, False)
+        annotations.setdefault("color", "default")
+        result.append(item)
+    return result
+
+
+def plain(items: Optional[List[Dict[str, Any]]]) -> str:
+    return "".join(item.get("plain_text", "") for item in items or [])
+
+
+class NotionStore:
+    """In-memory workspace: pages, blocks, databases and data sources."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        # Ordered child block IDs of every page and block
+        self.children: Dict[str, List[str]] = {}
+        # Ordered page IDs of every data source
+        self.rows: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def get(self, object_id: str, *kinds: str) -> Dict[str, Any]:
+        obj = self.objects.get(_dashed(object_id))
+        if obj is None or (kinds and obj["object"] not in kinds):
+            raise StandinError(
+                404, "object_not_found",
+                f"Could not find {'/'.join(kinds) or 'object'} with ID: {object_id}. "
+                "Make sure the relevant pages and databases are shared with your integration."
+            )
+        return obj
+
+    def _touch(self, obj: Dict[str, Any]) -> None:
+        obj["last_edited_time"] = _now()
+
+    def _base(self, kind: str, object_id: Optional[str] = None) -> Dict[str, Any]:
+        now = _now()
+        return {
+            "object": kind,
+            "id": object_id or _new_id(),
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": {"object": "user", "id": "00000000-0000-0000-0000-000000000000"},
+            "last_edited_by": {"object": "user", "id": "00000000-0000-0000-0000-000000000000"},
+            "archived": False,
+            "in_trash": False
+        }
+
+    def _normalise_parent(self, parent: Dict[str, Any]) -> Dict[str, Any]:
+        if not parent:
+            raise StandinError(400, "validation_error", "body.parent should be defined")
+        if parent.get("workspace"):
+            return {"type": "workspace", "workspace": True}
+        for key in ("page_id", "database_id", "data_source_id", "block_id"):
+            if parent.get(key):
+                target = self.get(parent[key])
+                if key == "database_id":
+                    # Pages created in a database go to its first data source
+                    source_id = target["data_sources"][0]["id"]
+                    return {"type": "data_source_id", "data_source_id": source_id, "database_id": target["id"]}
+                if key == "data_source_id":
+                    return {"type": key, key: target["id"], "database_id": target["parent"]["database_id"]}
+                return {"type": key, key: target["id"]}
+        raise StandinError(400, "validation_error", "body.parent should have a page_id, database_id or data_source_id")
+
+    def _parent_container(self, parent: Dict[str, Any]) -> Tuple[str, str]:
+        """('children' | 'rows', container ID) for a normalised parent."""
+        if parent["type"] == "data_source_id":
+            return "rows", parent["data_source_id"]
+        if parent["type"] in ("page_id", "block_id"):
+            return "children", parent[parent["type"]]
+        return "none", ""
+
+    def _attach(self, parent: Dict[str, Any], object_id: str, after: Optional[str] = None, start: bool = False) -> None:
+        kind, container = self._parent_container(parent)
+        if kind == "none":
+            return
+        ids = (self.children if kind == "children" else self.rows).setdefault(container, [])
+        if start:
+            ids.insert(0, object_id)
+        elif after and after in ids:
+            ids.insert(ids.index(after) + 1, object_id)
+        else:
+            ids.append(object_id)
+        if kind == "children":
+            owner = self.objects.get(container)
+            if owner is not None and owner["object"] == "block":
+                owner["has_children"] = True
+
+    def _detach(self, parent: Dict[str, Any], object_id: str) -> None:
+        kind, container = self._parent_container(parent)
+        ids = (self.children if kind == "children" else self.rows).get(container, [])
+        if object_id in ids:
+            ids.remove(object_id)
+
+    def _visible(self, object_id: str) -> bool:
+        obj = self.objects.get(object_id)
+        return obj is not None and not obj.get("archived")
+
+    def _normalise_properties(self, properties: Dict[str, Any], schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        result = {}
+        for name, value in (properties or {}).items():
+            if isinstance(value, list):
+                # Shorthand accepted by the API: {"title": [...]}
+                value = {"title": value}
+            prop_type = value.get("type") or next((k for k in value if k not in ("id", "type")), None)
+            if schema is not None and name in schema:
+                prop_type = schema[name]["type"]
+            if prop_type is None:
+                continue
+            payload = value.get(prop_type)
+            if prop_type in ("title", "rich_text"):
+                payload = rich_text(payload)
+            prop_id = schema[name]["id"] if schema and name in schema else ("title" if prop_type == "title" else name[:4])
+            result[name] = {"id": prop_id, "type": prop_type, prop_type: payload}
+        return result
+
+    def _page_url(self, page: Dict[str, Any]) -> str:
+        title = plain(next(
+            (p["title"] for p in page["properties"].values() if p.get("type") == "title"), []
+        ))
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", title).strip("-")
+        return f"https://www.notion.so/{slug + '-' if slug else ''}{page['id'].replace('-', '')}"
+
+    def _schema_for(self, parent: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if parent["type"] == "data_source_id":
+            return self.objects[parent["data_source_id"]]["properties"]
+        return None
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    def create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            parent = self._normalise_parent(body.get("parent"))
+            page = self._base("page")
+            page.update({
+                "parent": parent,
+                "icon": body.get("icon"),
+                "cover": body.get("cover"),
+                "properties": self._normalise_properties(body.get("properties"), self._schema_for(parent)),
+                "public_url": None
+            })
+            page["url"] = self._page_url(page)
+            self.objects[page["id"]] = page
+            self.children[page["id"]] = []
+
+            if parent["type"] in ("page_id", "block_id"):
+                # A page under a page also appears as a child_page block
+                block = self._base("block", page["id"])
+                block.update({
+                    "parent": parent,
+                    "type": "child_page",
+                    "has_children": False,
+                    "child_page": {"title": self.page_title(page)}
+                })
+                self.objects[page["id"] + ":block"] = block
+            self._attach(parent, page["id"])
+
+            if body.get("children"):
+                self.append_children(page["id"], {"children": body["children"]})
+            return self.render(page["id"])
+
+    def page_title(self, page: Dict[str, Any]) -> str:
+        return plain(next(
+            (p["title"] for p in page["properties"].values() if p.get("type") == "title"), []
+        ))
+
+    def update_page(self, page_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            page = self.get(page_id, "page")
+            if "properties" in body:
+                schema = self._schema_for(page["parent"])
+                page["properties"].update(self._normalise_properties(body["properties"], schema))
+                page["url"] = self._page_url(page)
+                block = self.objects.get(page["id"] + ":block")
+                if block:
+                    block["child_page"]["title"] = self.page_title(page)
+            for key in ("icon", "cover"):
+                if key in body:
+                    page[key] = body[key]
+            for key in ("archived", "in_trash"):
+                if key in body:
+                    page["archived"] = page["in_trash"] = bool(body[key])
+            if body.get("parent"):
+                new_parent = self._normalise_parent(body["parent"])
+                self._detach(page["parent"], page["id"])
+                page["parent"] = new_parent
+                self._attach(new_parent, page["id"])
+                block = self.objects.get(page["id"] + ":block")
+                if block:
+                    block["parent"] = new_parent
+            self._touch(page)
+            return self.render(page["id"])
+
+    # ------------------------------------------------------------------
+    # Blocks
+    # ------------------------------------------------------------------
+
+    def _create_block(self, parent: Dict[str, Any], payload: Dict[str, Any]) -> str:
+        block_type = payload.get("type") or next((k for k in payload if k not in ("object", "type")), None)
+        if block_type is None or block_type not in payload:
+            raise StandinError(400, "validation_error", "Block has no type")
+        if block_type in ("child_page", "child_database"):
+            raise StandinError(400, "validation_error", f"Cannot append {block_type} blocks; create the page or database instead")
+        content = copy.deepcopy(payload[block_type]) or {}
+        nested = content.pop("children", None)
+        for key in ("rich_text", "caption"):
+            if key in content:
+                content[key] = rich_text(content[key])
+
+        block = self._base("block")
+        block.update({"parent": parent, "type": block_type, "has_children": False, block_type: content})
+        self.objects[block["id"]] = block
+        self.children[block["id"]] = []
+        for child in nested or []:
+            child_id = self._create_block({"type": "block_id", "block_id": block["id"]}, child)
+            self.children[block["id"]].append(child_id)
+            block["has_children"] = True
+        return block["id"]
+
+    def _check_children(self, children: List[Dict[str, Any]], path: str) -> int:
+        """Reject children arrays over 100 at any depth, like Notion; returns the blocks in the payload."""
+        if len(children) > 100:
+            raise StandinError(400, "validation_error", f"{path}.length should be ≤ `100`")
+        total = len(children)
+        for i, child in enumerate(children):
+            block_type = child.get("type")
+            nested = (child.get(block_type) or {}).get("children") if block_type else None
+            if nested:
+                total += self._check_children(nested, f"{path}[{i}].{block_type}.children")
+        return total
+
+    def append_children(self, block_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            target = self.get(block_id, "page", "block")
+            children = body.get("children") or []
+            if self._check_children(children, "body.children") > 1000:
+                raise StandinError(400, "validation_error", "body.children should contain at most 1000 blocks")
+            parent_type = "page_id" if target["object"] == "page" else "block_id"
+            parent = {"type": parent_type, parent_type: target["id"]}
+            # "after" and the newer "position" ({"type": "start"} or "after_block")
+            position = body.get("position") or {}
+            after = body.get("after") or position.get("after_block", {}).get("id")
+            after = _dashed(after) if after else None
+            start = position.get("type") == "start"
+            created = []
+            for child in children:
+                child_id = self._create_block(parent, child)
+                self._attach(parent, child_id, after, start)
+                after = child_id if after or start else None
+                start = False
+                created.append(self.render_block(child_id))
+            self._touch(target)
+            return {"object": "list", "results": created, "next_cursor": None, "has_more": False,
+                    "type": "block", "block": {}}
+
+    def list_children(self, block_id: str, page_size: int, cursor: Optional[str]) -> Dict[str, Any]:
+        with self.lock:
+            target = self.get(block_id, "page", "block")
+            ids = [i for i in self.children.get(target["id"], []) if self._visible(i)]
+            window, next_cursor = _paginate(ids, page_size, cursor)
+            return {
+                "object": "list",
+                "results": [self.render_block(i) for i in window],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "type": "block",
+                "block": {}
+            }
+
+    def render_block(self, object_id: str) -> Dict[str, Any]:
+        obj = self.objects[object_id]
+        if obj["object"] == "page":
+            block = copy.deepcopy(self.objects[object_id + ":block"])
+            block["has_children"] = any(self._visible(i) for i in self.children.get(object_id, []))
+            return block
+        if obj["object"] == "database":
+            return {
+                **self._base("block", object_id),
+                "parent": obj["parent"],
+                "type": "child_database",
+                "has_children": False,
+                "child_database": {"title": plain(obj["title"])}
+            }
+        block = copy.deepcopy(obj)
+        block["has_children"] = any(self._visible(i) for i in self.children.get(object_id, []))
+        return block
+
+    def update_block(self, block_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            block = self.get(block_id, "block")
+            block_type = block["type"]
+            if block_type in body:
+                content = copy.deepcopy(body[block_type])
+                for key in ("rich_text", "caption"):
+                    if key in content:
+                        content[key] = rich_text(content[key])
+                block[block_type].update(content)
+            if "archived" in body or "in_trash" in body:
+                block["archived"] = block["in_trash"] = bool(body.get("archived", body.get("in_trash")))
+            self._touch(block)
+            return self.render_block(block["id"])
+
+    def delete_block(self, block_id: str) -> Dict[str, Any]:
+        with self.lock:
+            obj = self.get(block_id)
+            obj["archived"] = obj["in_trash"] = True
+            self._touch(obj)
+            return self.render_block(obj["id"]) if obj["object"] != "data_source" else obj
+
+    # ------------------------------------------------------------------
+    # Databases and data sources
+    # ------------------------------------------------------------------
+
+    def _normalise_schema(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        schema = {}
+        for name, definition in (properties or {}).items():
+            if definition is None:
+                continue
+            prop_type = definition.get("type") or next((k for k in definition if k not in ("id", "name", "type")), None)
+            if prop_type is None:
+                continue
+            schema[name] = {
+                "id": "title" if prop_type == "title" else uuid.uuid4().hex[:4],
+                "name": name,
+                "type": prop_type,
+                prop_type: copy.deepcopy(definition.get(prop_type) or {})
+            }
+        if not any(p["type"] == "title" for p in schema.values()):
+            schema["Name"] = {"id": "title", "name": "Name", "type": "title", "title": {}}
+        return schema
+
+    def create_database(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            parent = self._normalise_parent(body.get("parent"))
+            database = self._base("database")
+            source = self._base("data_source")
+            properties = (body.get("initial_data_source") or {}).get("properties") or body.get("properties")
+            title = rich_text(body.get("title"))
+            source.update({
+                "parent": {"type": "database_id", "database_id": database["id"]},
+                "database_parent": parent,
+                "title": title,
+                "properties": self._normalise_schema(properties)
+            })
+            database.update({
+                "parent": parent,
+                "title": title,
+                "description": rich_text(body.get("description")),
+                "icon": body.get("icon"),
+                "cover": body.get("cover"),
+                "is_inline": bool(body.get("is_inline")),
+                "data_sources": [{"id": source["id"], "name": plain(title)}],
+                "url": f"https://www.notion.so/{database['id'].replace('-', '')}",
+                "public_url": None
+            })
+            self.objects[database["id"]] = database
+            self.objects[source["id"]] = source
+            self.rows[source["id"]] = []
+            self._attach(parent, database["id"])
+            return self.render(database["id"])
+
+    def update_database(self, database_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            database = self.get(database_id, "database")
+            for key in ("title", "description"):
+                if key in body:
+                    database[key] = rich_text(body[key])
+            for key in ("icon", "cover", "is_inline"):
+                if key in body:
+                    database[key] = body[key]
+            if "archived" in body or "in_trash" in body:
+                database["archived"] = database["in_trash"] = bool(body.get("archived", body.get("in_trash")))
+            if "properties" in body:
+                # Older API versions edit the schema through the database
+                self._update_schema(self.objects[database["data_sources"][0]["id"]], body["properties"])
+            self._touch(database)
+            return self.render(database["id"])
+
+    def _update_schema(self, source: Dict[str, Any], properties: Dict[str, Any]) -> None:
+        schema = source["properties"]
+        for name, definition in properties.items():
+            if definition is None:
+                schema.pop(name, None)
+                continue
+            new_name = definition.get("name")
+            existing = schema.pop(name, None)
+            if existing is not None and set(definition) <= {"name"}:
+                schema[new_name or name] = {**existing, "name": new_name or name}
+                continue
+            updated = self._normalise_schema({new_name or name: definition})
+            entry = updated.get(new_name or name) or next(iter(updated.values()))
+            if existing is not None:
+                entry["id"] = existing["id"]
+            schema[new_name or name] = entry
+        self._touch(source)
+
+    def update_data_source(self, source_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            source = self.get(source_id, "data_source")
+            if "title" in body:
+                source["title"] = rich_text(body["title"])
+            if "properties" in body:
+                self._update_schema(source, body["properties"])
+            return self.render(source["id"])
+
+    def query(self, source_id: str, body: Dict[str, Any], page_size: int) -> Dict[str, Any]:
+        with self.lock:
+            source = self.get(source_id, "data_source", "database")
+            if source["object"] == "database":
+                source = self.objects[source["data_sources"][0]["id"]]
+            pages = [self.objects[i] for i in self.rows.get(source["id"], []) if self._visible(i)]
+            if body.get("filter"):
+                pages = [p for p in pages if _matches(p, body["filter"])]
+            for sort in reversed(body.get("sorts") or []):
+                pages.sort(key=lambda p: _sort_key(p, sort), reverse=sort.get("direction") == "descending")
+            window, next_cursor = _paginate([p["id"] for p in pages], page_size, body.get("start_cursor"))
+            return {
+                "object": "list",
+                "results": [self.render(i) for i in window],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "type": "page_or_data_source",
+                "page_or_data_source": {}
+            }
+
+    # ------------------------------------------------------------------
+    # Search and rendering
+    # ------------------------------------------------------------------
+
+    def search(self, body: Dict[str, Any], page_size: int) -> Dict[str, Any]:
+        with self.lock:
+            query = (body.get("query") or "").lower()
+            wanted = (body.get("filter") or {}).get("value")
+            kinds = {"page"} if wanted == "page" else {"data_source", "database"} if wanted else {"page", "data_source"}
+            matches = []
+            for obj in self.objects.values():
+                if obj["object"] not in kinds or obj.get("archived"):
+                    continue
+                title = self.page_title(obj) if obj["object"] == "page" else plain(obj.get("title"))
+                if query in title.lower():
+                    matches.append(obj)
+            sort = body.get("sort") or {"timestamp": "last_edited_time", "direction": "descending"}
+            matches.sort(key=lambda o: o.get(sort.get("timestamp", "last_edited_time"), ""),
+                         reverse=sort.get("direction") != "ascending")
+            window, next_cursor = _paginate([o["id"] for o in matches], page_size, body.get("start_cursor"))
+            return {
+                "object": "list",
+                "results": [self.render(i) for i in window],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+                "type": "page_or_data_source",
+                "page_or_data_source": {}
+            }
+
+    def render(self, object_id: str) -> Dict[str, Any]:
+        obj = copy.deepcopy(self.objects[object_id])
+        if obj["object"] == "database":
+            # Older API versions read the schema straight off the database
+            obj["properties"] = copy.deepcopy(self.objects[obj["data_sources"][0]["id"]]["properties"])
+        return obj
+
+
+def _paginate(ids: List[str], page_size: int, cursor: Optional[str]) -> Tuple[List[str], Optional[str]]:
+    start = 0
+    if cursor:
+        try:
+            start = ids.index(_dashed(cursor))
+        except ValueError:
+            raise StandinError(400, "validation_error", f"Invalid start_cursor: {cursor}")
+    window = ids[start:start + page_size]
+    next_cursor = ids[start + page_size] if start + page_size < len(ids) else None
+    return window, next_cursor
+
+
+def _property_plain(page: Dict[str, Any], name: str) -> Any:
+    prop = page["properties"].get(name)
+    if prop is None:
+        return None
+    value = prop.get(prop["type"])
+    if prop["type"] in ("title", "rich_text"):
+        return plain(value)
+    if prop["type"] in ("select", "status"):
+        return (value or {}).get("name")
+    if prop["type"] == "multi_select":
+        return [option.get("name") for option in value or []]
+    if prop["type"] == "date":
+        return (value or {}).get("start")
+    return value
+
+
+def _matches(page: Dict[str, Any], condition: Dict[str, Any]) -> bool:
+    """Evaluate the subset of Notion filters used in practice."""
+    if "and" in condition:
+        return all(_matches(page, c) for c in condition["and"])
+    if "or" in condition:
+        return any(_matches(page, c) for c in condition["or"])
+    if "timestamp" in condition:
+        value = page.get(condition["timestamp"])
+        operators = condition.get(condition["timestamp"], {})
+    else:
+        value = _property_plain(page, condition.get("property", ""))
+        operators = next((v for k, v in condition.items() if k != "property" and isinstance(v, dict)), {})
+    for operator, expected in operators.items():
+        if operator == "equals" and value != expected:
+            return False
+        if operator == "does_not_equal" and value == expected:
+            return False
+        if operator == "contains":
+            if isinstance(value, list) and expected not in value:
+                return False
+            if isinstance(value, str) and str(expected).lower() not in value.lower():
+                return False
+        if operator == "is_empty" and expected and value not in (None, "", []):
+            return False
+        if operator == "is_not_empty" and expected and value in (None, "", []):
+            return False
+        if operator in ("after", "greater_than") and not (value is not None and value > expected):
+            return False
+        if operator in ("before", "less_than") and not (value is not None and value < expected):
+            return False
+    return True
+
+
+def _sort_key(page: Dict[str, Any], sort: Dict[str, Any]) -> Tuple[int, Any]:
+    value = page.get(sort["timestamp"]) if "timestamp" in sort else _property_plain(page, sort.get("property", ""))
+    if isinstance(value, list):
+        value = ",".join(str(v) for v in value)
+    return (value is None, value if value is not None else "")
+
+
+class RateLimiter:
+    """Token bucket; `acquire` returns 0 or the seconds to wait before retrying."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, math.ceil(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class NotionStandin:
+    """Routes API requests to the store and applies latency and rate limits."""
+
+    def __init__(self, store: Optional[NotionStore] = None, config: Optional[StandinConfig] = None):
+        self.store = store or NotionStore()
+        self.config = config or StandinConfig()
+        self.limiter = RateLimiter(self.config.rate_limit, self.config.burst) if self.config.rate_limit else None
+        self.random = random.Random(self.config.seed)
+        self.stats_lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.rate_limited = 0
+
+    def _count(self, route: str) -> None:
+        with self.stats_lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            return {
+                "requests": dict(sorted(self.requests.items())),
+                "total_requests": sum(self.requests.values()),
+                "rate_limited": self.rate_limited
+            }
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, List[str]],
+        body: Dict[str, Any],
+        headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Returns (status, JSON body, extra headers)."""
+        delay = self.config.latency_ms + (self.random.uniform(0, self.config.jitter_ms) if self.config.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if not headers.get("authorization", "").startswith("Bearer "):
+            return _error(StandinError(401, "unauthorized", "API token is invalid."))
+
+        wait = self.limiter.acquire() if self.limiter else 0.0
+        if not wait and self.config.inject_429 and self.random.random() < self.config.inject_429:
+            wait = self.config.retry_after
+        if wait:
+            with self.stats_lock:
+                self.rate_limited += 1
+            status, payload, extra = _error(StandinError(
+                429, "rate_limited", "You have been rate limited. Please try again in a few minutes."
+            ))
+            extra["Retry-After"] = f"{max(wait, 0.05):.2f}"
+            return status, payload, extra
+
+        segments = [s for s in path.split("/") if s]
+        if segments[:1] == ["v1"]:
+            segments = segments[1:]
+        route = "/".join("{id}" if ID_PATTERN.match(s) else s for s in segments)
+        self._count(f"{method} {route}")
+
+        page_size = min(int((query.get("page_size") or [body.get("page_size") or 100])[0]), self.config.max_page_size)
+        cursor = (query.get("start_cursor") or [None])[0]
+        store = self.store
+        try:
+            ids = [s for s in segments if ID_PATTERN.match(s)]
+            routes = {
+                ("POST", "pages"): lambda: store.create_page(body),
+                ("GET", "pages/{id}"): lambda: store.render(store.get(ids[0], "page")["id"]),
+                ("PATCH", "pages/{id}"): lambda: store.update_page(ids[0], body),
+                ("GET", "blocks/{id}"): lambda: store.render_block(store.get(ids[0], "block", "page", "database")["id"]),
+                ("PATCH", "blocks/{id}"): lambda: store.update_block(ids[0], body),
+                ("DELETE", "blocks/{id}"): lambda: store.delete_block(ids[0]),
+                ("GET", "blocks/{id}/children"): lambda: store.list_children(ids[0], page_size, cursor),
+                ("PATCH", "blocks/{id}/children"): lambda: store.append_children(ids[0], body),
+                ("POST", "databases"): lambda: store.create_database(body),
+                ("GET", "databases/{id}"): lambda: store.render(store.get(ids[0], "database")["id"]),
+                ("PATCH", "databases/{id}"): lambda: store.update_database(ids[0], body),
+                ("POST", "databases/{id}/query"): lambda: store.query(ids[0], body, page_size),
+                ("GET", "data_sources/{id}"): lambda: store.render(store.get(ids[0], "data_source")["id"]),
+                ("PATCH", "data_sources/{id}"): lambda: store.update_data_source(ids[0], body),
+                ("POST", "data_sources/{id}/query"): lambda: store.query(ids[0], body, page_size),
+                ("POST", "search"): lambda: store.search(body, page_size),
+            }
+            handler = routes.get((method, route))
+            if handler is None:
+                raise StandinError(400, "invalid_request_url", f"Invalid request URL: {method} {path}")
+            return 200, handler(), {}
+        except StandinError as e:
+            return _error(e)
+
+
+def _error(error: StandinError) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    return error.status, {
+        "object": "error",
+        "status": error.status,
+        "code": error.code,
+        "message": error.message,
+        "request_id": _new_id()
+    }, {}
+
+
+def _make_handler(standin: NotionStandin):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40 ms to every keep-alive request
+        disable_nagle_algorithm = True
+
+        def _respond(self) -> None:
+            parsed = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                status, payload, extra = _error(StandinError(400, "invalid_json", "Error parsing JSON body."))
+            else:
+                headers = {k.lower(): v for k, v in self.headers.items()}
+                status, payload, extra = standin.handle(
+                    self.command, parsed.path, parse_qs(parsed.query), body, headers
+                )
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in extra.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = _respond
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+class StandinServer:
+    """A running stand-in on a background thread (use as a context manager)."""
+
+    def __init__(
+        self,
+        standin: Optional[NotionStandin] = None,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.standin = standin or NotionStandin()
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self.standin))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="notion-standin", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def store(self) -> NotionStore:
+        return self.standin.store
+
+    def start(self) -> "StandinServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+# ----------------------------------------------------------------------
+# Synthetic workspaces
+# ----------------------------------------------------------------------
+
+WORDS = (
+    "brand strategy content calendar linkedin audience growth analytics metrics "
+    "automation workflow template database research notes meeting roadmap launch "
+    "campaign newsletter pillar idea draft review publish engagement insight voice"
+).split()
+
+
+def seed_workspace(
+    store: NotionStore,
+    pages: int = 50,
+    fanout: int = 5,
+    blocks_per_page: int = 20,
+    database_rows: int = 0,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Fill a store with a page tree of `pages` pages (breadth first, `fanout`
+    children each) carrying paragraph, heading and to-do blocks, plus an
+    optional database with `database_rows` rows under the root.
+
+    Returns:
+        {"root_page_id", "page_ids", "database_id", "data_source_id"}
+    """
+    rng = random.Random(seed)
+
+    def sentence(n: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    def text(content: str) -> List[Dict[str, Any]]:
+        return [{"type": "text", "text": {"content": content}}]
+
+    def blocks() -> List[Dict[str, Any]]:
+        result = []
+        for i in range(blocks_per_page):
+            if i % 10 == 0:
+                result.append({"type": "heading_2", "heading_2": {"rich_text": text(sentence(3))}})
+            elif i % 7 == 0:
+                result.append({"type": "to_do", "to_do": {"rich_text": text(sentence(5)), "checked": rng.random() < 0.5}})
+            else:
+                result.append({"type": "paragraph", "paragraph": {"rich_text": text(sentence(rng.randint(8, 30)))}})
+        return result
+
+    def create(parent: Dict[str, Any], title: str) -> str:
+        page = store.create_page({"parent": parent, "properties": {"title": {"title": text(title)}}})
+        content = blocks()
+        for start in range(0, len(content), 100):
+            store.append_children(page["id"], {"children": content[start:start + 100]})
+        return page["id"]
+
+    root_id = create({"workspace": True}, "Stand-in Workspace")
+    page_ids = [root_id]
+    queue = [root_id]
+    while queue and len(page_ids) < pages:
+        parent_id = queue.pop(0)
+        for _ in range(fanout):
+            if len(page_ids) >= pages:
+                break
+            child_id = create({"page_id": parent_id}, f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {len(page_ids)}")
+            page_ids.append(child_id)
+            queue.append(child_id)
+
+    database_id = data_source_id = None
+    if database_rows:
+        database = store.create_database({
+            "parent": {"page_id": root_id},
+            "title": text("Content Hub"),
+            "initial_data_source": {"properties": {
+                "Name": {"title": {}},
+                "Status": {"select": {"options": [{"name": s} for s in ("Idea", "Draft", "Published")]}},
+                "Tags": {"multi_select": {"options": [{"name": w} for w in WORDS[:8]]}},
+                "Publish Date": {"date": {}}
+            }}
+        })
+        database_id = database["id"]
+        data_source_id = database["data_sources"][0]["id"]
+        for i in range(database_rows):
+            store.create_page({
+                "parent": {"data_source_id": data_source_id},
+                "properties": {
+                    "Name": {"title": text(sentence(4))},
+                    "Status": {"select": {"name": rng.choice(("Idea", "Draft", "Published"))}},
+                    "Tags": {"multi_select": [{"name": w} for w in rng.sample(WORDS[:8], 2)]},
+                    "Publish Date": {"date": {"start": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}"}}
+                }
+            })
+
+    return {
+        "root_page_id": root_id,
+        "page_ids": page_ids,
+        "database_id": database_id,
+        "data_source_id": data_source_id
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Notion API stand-in for offline tests and benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=100, help="Maximum page size for paginated endpoints")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before answering 429")
+    parser.add_argument("--burst", type=int, default=None)
+    parser.add_argument("--inject-429", type=float, default=0.0, help="Probability of a random 429")
+    parser.add_argument("--seed-pages", type=int, default=50)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--blocks-per-page", type=int, default=20)
+    parser.add_argument("--database-rows", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        max_page_size=args.page_size,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        inject_429=args.inject_429
+    )
+    standin = NotionStandin(config=config)
+    seeded = seed_workspace(
+        standin.store, args.seed_pages, args.fanout, args.blocks_per_page, args.database_rows
+    )
+    server = StandinServer(standin, args.host, args.port)
+    print(f"Notion stand-in listening on {server.base_url}")
+    print(f"  NOTION_API_BASE_URL={server.base_url}")
+    print(f"  NOTION_PARENT_PAGE_ID={seeded['root_page_id']}")
+    if seeded["database_id"]:
+        print(f"  Database: {seeded['database_id']} (data source {seeded['data_source_id']})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
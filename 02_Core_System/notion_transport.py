@@ -0,0 +1,205 @@
+"""
+Notion Transport
+
+Shared construction of Notion SDK clients. Every client built here sends its
+requests through an instrumented httpx transport that records latency, status,
+bytes received and rate limiting per endpoint (see server_metrics.py), and
+clients are reused per API key and version so connections are kept alive
+across tool calls.
+
+Clients can record their traffic to a cassette or replay it offline (see
+notion_cassette.py). Concurrent identical GET requests are coalesced: while one is in flight,
+later callers wait for it and receive a copy of its response instead of
+sending their own (single flight). Only requests that overlap in time are
+shared; nothing is cached once the response has been delivered.
+"""
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+from notion_client import Client
+
+from notion_cassette import RecordingTransport, ReplayTransport
+from server_metrics import METRICS
+
+NOTION_API_VERSION = "2025-09-03"
+DEFAULT_BASE_URL = "https://api.notion.com"
+
+# IDs in paths are collapsed so metrics group by endpoint, not by object
+ID_SEGMENT_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$")
+
+
+def endpoint_template(path: str) -> str:
+    """'/v1/blocks/<uuid>/children' -> 'blocks/{id}/children'."""
+    segments = [s for s in path.split("/") if s]
+    if segments and segments[0] == "v1":
+        segments = segments[1:]
+    return "/".join("{id}" if ID_SEGMENT_PATTERN.match(s) else s for s in segments)
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """httpx transport that records every Notion API call in METRICS."""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        endpoint = endpoint_template(request.url.path)
+        try:
+            response = self.inner.handle_request(request)
+            # The SDK parses every body anyway; reading here lets us count bytes
+            body = response.read()
+        except Exception:
+            METRICS.observe_api(request.method, endpoint, 0, time.perf_counter() - started, 0)
+            raise
+        METRICS.observe_api(request.method, endpoint, response.status_code, time.perf_counter() - started, len(body))
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _Flight:
+    """One in-flight request shared by its leader and any followers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.status_code = 0
+        self.headers: Optional[httpx.Headers] = None
+        self.body = b""
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightTransport(httpx.BaseTransport):
+    """
+    httpx transport that lets concurrent identical GETs share one request.
+
+    Requests are identical when method, URL and the auth and version headers
+    match. The first caller sends the request; callers arriving before it
+    completes block until it does and get their own copy of the response
+    (or the same exception).
+    """
+
+    COALESCED_METHODS = ("GET",)
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[str, ...], _Flight] = {}
+
+    @staticmethod
+    def _key(request: httpx.Request) -> Tuple[str, ...]:
+        return (
+            request.method,
+            str(request.url),
+            request.headers.get("authorization", ""),
+            request.headers.get("notion-version", "")
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in self.COALESCED_METHODS:
+            return self.inner.handle_request(request)
+
+        key = self._key(request)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            METRICS.record_coalesced(endpoint_template(request.url.path))
+            if flight.error is not None:
+                raise flight.error
+            # The body is already decoded, so drop headers describing the wire encoding
+            headers = [
+                (name, value) for name, value in flight.headers.multi_items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            ]
+            return httpx.Response(flight.status_code, headers=headers, content=flight.body, request=request)
+
+        try:
+            response = self.inner.handle_request(request)
+            flight.body = response.read()
+            flight.status_code = response.status_code
+            flight.headers = response.headers
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def build_transport(cassette: Optional[str] = None, cassette_mode: Optional[str] = None) -> httpx.BaseTransport:
+    """
+    The transport stack used by every shared Notion client.
+
+    With a cassette, requests are recorded to it (mode "record") or answered
+    from it without network access (mode "replay"); see notion_cassette.py.
+    """
+    if cassette and cassette_mode == "replay":
+        base: httpx.BaseTransport = ReplayTransport(Path(cassette), os.getenv("NOTION_CASSETTE_LATENCY"))
+    elif cassette and cassette_mode == "record":
+        base = RecordingTransport(httpx.HTTPTransport(), Path(cassette))
+    elif cassette:
+        raise ValueError(f"Unknown cassette mode '{cassette_mode}' (use 'record' or 'replay')")
+    else:
+        base = httpx.HTTPTransport()
+    # Coalescing sits outside instrumentation so only real API calls are recorded
+    return SingleFlightTransport(InstrumentedTransport(base))
+
+
+_clients: Dict[Tuple[str, ...], Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_notion_client(
+    auth: Optional[str] = None,
+    notion_version: str = NOTION_API_VERSION,
+    base_url: Optional[str] = None,
+    cassette: Optional[str] = None,
+    cassette_mode: Optional[str] = None
+) -> Client:
+    """
+    Shared, instrumented Notion SDK client for an API key and version.
+
+    Args:
+        auth: Integration token (default: NOTION_API_KEY)
+        notion_version: Notion-Version header (default: 2025-09-03)
+        base_url: API root (default: NOTION_API_BASE_URL, else https://api.notion.com),
+            e.g. a local notion_standin.py server
+        cassette: Cassette file to record to or replay from (default: NOTION_CASSETTE)
+        cassette_mode: "record" or "replay" (default: NOTION_CASSETTE_MODE, else "replay")
+    """
+    cassette = cassette or os.getenv("NOTION_CASSETTE") or None
+    cassette_mode = (cassette_mode or os.getenv("NOTION_CASSETTE_MODE") or "replay") if cassette else None
+    auth = auth or os.getenv("NOTION_API_KEY")
+    if not auth:
+        raise ValueError("Notion API key not found")
+    base_url = (base_url or os.getenv("NOTION_API_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+
+    key = (auth, notion_version, base_url, cassette or "", cassette_mode or "")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Client(
+                auth=auth,
+                notion_version=notion_version,
+                base_url=base_url,
+                client=httpx.Client(transport=build_transport(cassette, cassette_mode))
+            )
+            _clients[key] = client
+        return client
@@ -0,0 +1,600 @@
+"""
+Page Tree Exporter
+
+Writes a page and everything below it to Markdown or static HTML files:
+
+    export/
+      LinkedIn Content OS.md
+      LinkedIn Content OS/
+        Getting Started.md
+        Content Hub.md              # database: a table of its rows
+        Content Hub/
+          First Post.md             # row page, properties listed first
+
+Pages are exported concurrently on a bounded pool: when a page's blocks have
+arrived, it is rendered and written to disk at once, and the child pages and
+databases it links to are queued. Only the pages currently being exported are
+held in memory, so exporting a large wiki is bounded by the API rate limit, not
+by serial fetching. Rate-limited calls are retried (see notion_concurrency.py).
+
+Media are referenced by URL, not downloaded. URLs of files uploaded to Notion
+are signed and expire after about an hour.
+"""
+
+import html
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+import progress
+from block_renderer import rich_text_plain
+from notion_concurrency import DEFAULT_MAX_WORKERS, call_with_retry, crawl, iter_data_source_rows, list_block_tree
+from notion_transport import get_notion_client
+
+FORMATS = {"markdown": ".md", "html": ".html"}
+
+UNSAFE_NAME_PATTERN = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+HTML_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ max-width: 46rem; margin: 2rem auto; padding: 0 1rem; font-family: -apple-system, "Segoe UI", sans-serif; line-height: 1.5; }}
+aside {{ background: #f1f1ef; border-radius: 4px; padding: 0.75rem 1rem; }}
+blockquote {{ border-left: 3px solid #ccc; margin-left: 0; padding-left: 1rem; }}
+pre {{ background: #f7f6f3; padding: 1rem; overflow-x: auto; }}
+table {{ border-collapse: collapse; }} td, th {{ border: 1px solid #ddd; padding: 0.3rem 0.6rem; }}
+img {{ max-width: 100%; }} .properties td:first-child {{ font-weight: 600; }}
+</style>
+</head>
+<body>
+"""
+
+
+def safe_name(title: str) -> str:
+    """A file name for a page title."""
+    name = UNSAFE_NAME_PATTERN.sub("", title).strip().strip(".")
+    return name[:100] or "Untitled"
+
+
+def _media_url(payload: Dict[str, Any]) -> str:
+    source = payload.get("type")
+    if source in ("external", "file"):
+        return payload.get(source, {}).get("url", "")
+    return payload.get("url", "")
+
+
+def _page_title(page: Dict[str, Any]) -> str:
+    for prop in page.get("properties", {}).values():
+        if prop.get("type") == "title":
+            return rich_text_plain(prop.get("title", [])) or "Untitled"
+    return "Untitled"
+
+
+def property_text(prop: Dict[str, Any]) -> str:
+    """A page property value as plain text."""
+    prop_type = prop.get("type", "")
+    value = prop.get(prop_type)
+    if value is None:
+        return ""
+    if prop_type in ("title", "rich_text"):
+        return rich_text_plain(value)
+    if prop_type in ("select", "status"):
+        return value.get("name", "")
+    if prop_type == "multi_select":
+        return ", ".join(option.get("name", "") for option in value)
+    if prop_type == "date":
+        return value.get("start", "") + (f" → {value['end']}" if value.get("end") else "")
+    if prop_type == "people":
+        return ", ".join(person.get("name") or person.get("id", "") for person in value)
+    if prop_type == "relation":
+        return ", ".join(item.get("id", "") for item in value)
+    if prop_type == "files":
+        return ", ".join(f.get("name") or _media_url(f) for f in value)
+    if prop_type == "formula":
+        return str(value.get(value.get("type", ""), "") or "")
+    if prop_type == "rollup":
+        inner = value.get(value.get("type", ""))
+        return str(len(inner)) + " items" if isinstance(inner, list) else str(inner if inner is not None else "")
+    if prop_type in ("created_by", "last_edited_by"):
+        return value.get("name") or value.get("id", "")
+    if prop_type == "checkbox":
+        return "Yes" if value else "No"
+    if prop_type == "unique_id":
+        return f"{value.get('prefix') or ''}{'-' if value.get('prefix') else ''}{value.get('number', '')}"
+    return str(value)
+
+
+# ----------------------------------------------------------------------
+# Markdown
+# ----------------------------------------------------------------------
+
+def markdown_text(rich_text: List[Dict[str, Any]]) -> str:
+    """A rich text array as inline Markdown."""
+    parts = []
+    for item in rich_text or []:
+        if item.get("type") == "equation":
+            parts.append(f"${item['equation'].get('expression', '')}$")
+            continue
+        text = item.get("plain_text") or item.get("text", {}).get("content", "")
+        core = text.strip()
+        if not core:
+            parts.append(text)
+            continue
+        annotations = item.get("annotations") or {}
+        if annotations.get("code"):
+            core = f"`{core}`"
+        if annotations.get("bold"):
+            core = f"**{core}**"
+        if annotations.get("italic"):
+            core = f"*{core}*"
+        if annotations.get("strikethrough"):
+            core = f"~~{core}~~"
+        href = item.get("href") or (item.get("text", {}).get("link") or {}).get("url")
+        if href:
+            core = f"[{core}]({href})"
+        # Markers must hug the text, so surrounding spaces stay outside
+        lead = text[:len(text) - len(text.lstrip())]
+        trail = text[len(text.rstrip()):]
+        parts.append(f"{lead}{core}{trail}")
+    return "".join(parts)
+
+
+def _md_link(label: str, href: str) -> str:
+    return f"[{label}]({href})" if href else label
+
+
+def _md_media(label: str) -> Callable[[Dict[str, Any], Dict[str, Any]], str]:
+    def handler(payload, context):
+        caption = markdown_text(payload.get("caption", []))
+        url = _media_url(payload)
+        if label == "Image":
+            return f"![{caption}]({url})"
+        return _md_link(caption or payload.get("name") or f"{label}: {url}", url)
+    return handler
+
+
+def _md_table(payload: Dict[str, Any], context: Dict[str, Any]) -> str:
+    rows = [
+        "| " + " | ".join(markdown_text(cell).replace("|", "\\|").replace("\n", " ") for cell in row["table_row"].get("cells", [])) + " |"
+        for row in context["children"] if row.get("type") == "table_row"
+    ]
+    if not rows:
+        return ""
+    width = payload.get("table_width") or rows[0].count(" | ") + 1
+    separator = "| " + " | ".join(["---"] * width) + " |"
+    if payload.get("has_column_header"):
+        return "\n".join([rows[0], separator] + rows[1:])
+    return "\n".join(["| " + " | ".join([" "] * width) + " |", separator] + rows)
+
+
+def _md_quote(prefix: str) -> Callable[[Dict[str, Any], Dict[str, Any]], str]:
+    def handler(payload, context):
+        icon = (payload.get("icon") or {}).get("emoji", "") if prefix else ""
+        text = (f"{icon} " if icon else "") + markdown_text(payload.get("rich_text", []))
+        return "\n".join(f"> {line}" for line in text.split("\n"))
+    return handler
+
+
+MARKDOWN_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]] = {
+    "paragraph": lambda p, c: markdown_text(p.get("rich_text", [])),
+    "heading_1": lambda p, c: "# " + markdown_text(p.get("rich_text", [])),
+    "heading_2": lambda p, c: "## " + markdown_text(p.get("rich_text", [])),
+    "heading_3": lambda p, c: "### " + markdown_text(p.get("rich_text", [])),
+    "bulleted_list_item": lambda p, c: "- " + markdown_text(p.get("rich_text", [])),
+    "numbered_list_item": lambda p, c: f"{c['number']}. " + markdown_text(p.get("rich_text", [])),
+    "to_do": lambda p, c: f"- [{'x' if p.get('checked') else ' '}] " + markdown_text(p.get("rich_text", [])),
+    "toggle": lambda p, c: "- " + markdown_text(p.get("rich_text", [])),
+    "quote": _md_quote(""),
+    "callout": _md_quote("callout"),
+    "code": lambda p, c: f"```{'' if p.get('language') == 'plain text' else p.get('language', '')}\n{rich_text_plain(p.get('rich_text', []))}\n```",
+    "equation": lambda p, c: f"$$\n{p.get('expression', '')}\n$$",
+    "divider": lambda p, c: "---",
+    "image": _md_media("Image"),
+    "video": _md_media("Video"),
+    "audio": _md_media("Audio"),
+    "file": _md_media("File"),
+    "pdf": _md_media("PDF"),
+    "bookmark": lambda p, c: _md_link(markdown_text(p.get("caption", [])) or p.get("url", ""), p.get("url", "")),
+    "embed": lambda p, c: _md_link(markdown_text(p.get("caption", [])) or p.get("url", ""), p.get("url", "")),
+    "link_preview": lambda p, c: _md_link(p.get("url", ""), p.get("url", "")),
+    "child_page": lambda p, c: _md_link("📄 " + (p.get("title") or "Untitled"), c["href"]),
+    "child_database": lambda p, c: _md_link("🗄️ " + (p.get("title") or "Untitled"), c["href"]),
+    "table": _md_table,
+}
+
+# Blocks that only group their children
+TRANSPARENT_TYPES = {"column_list", "column", "synced_block"}
+
+LIST_TYPES = {"bulleted_list_item", "numbered_list_item", "to_do", "toggle"}
+
+
+def render_markdown(blocks: List[Dict[str, Any]], links: Dict[str, str], indent: str = "") -> Iterator[str]:
+    """
+    Markdown chunks for a block tree (children under "children"), one per block.
+
+    Args:
+        blocks: Blocks with their children attached
+        links: Block ID -> relative file link for child pages and databases
+        indent: Prefix for nested blocks
+    """
+    number = 0
+    previous = None
+    for block in blocks:
+        block_type = block.get("type", "")
+        children = block.get("children") or []
+        if block_type in TRANSPARENT_TYPES:
+            yield from render_markdown(children, links, indent)
+            previous = None
+            continue
+        handler = MARKDOWN_HANDLERS.get(block_type)
+        if handler is None:
+            continue
+        number = number + 1 if block_type == "numbered_list_item" else 0
+        context = {"number": number, "children": children, "href": links.get(block.get("id", ""), "")}
+        text = handler(block.get(block_type, {}), context)
+        # List items follow each other directly; everything else is a paragraph of its own
+        separator = "\n" if previous in LIST_TYPES and block_type in LIST_TYPES else "\n\n"
+        chunk = "\n".join(indent + line if line else line for line in text.split("\n"))
+        yield (separator if previous is not None else "") + chunk
+        previous = block_type
+        if children and block_type != "table":
+            child_indent = indent + ("   " if block_type == "numbered_list_item" else "  ")
+            nested = "".join(render_markdown(children, links, child_indent))
+            if nested:
+                yield "\n" + ("\n" if block_type not in LIST_TYPES else "") + nested
+        if block_type not in LIST_TYPES:
+            previous = block_type
+
+
+# ----------------------------------------------------------------------
+# HTML
+# ----------------------------------------------------------------------
+
+def html_text(rich_text: List[Dict[str, Any]]) -> str:
+    """A rich text array as inline HTML."""
+    parts = []
+    for item in rich_text or []:
+        if item.get("type") == "equation":
+            parts.append(f"<code>{html.escape(item['equation'].get('expression', ''))}</code>")
+            continue
+        text = html.escape(item.get("plain_text") or item.get("text", {}).get("content", "")).replace("\n", "<br>")
+        annotations = item.get("annotations") or {}
+        for flag, tag in (("code", "code"), ("bold", "strong"), ("italic", "em"), ("strikethrough", "s"), ("underline", "u")):
+            if annotations.get(flag):
+                text = f"<{tag}>{text}</{tag}>"
+        href = item.get("href") or (item.get("text", {}).get("link") or {}).get("url")
+        if href:
+            text = f'<a href="{html.escape(href)}">{text}</a>'
+        parts.append(text)
+    return "".join(parts)
+
+
+def _html_link(label: str, href: str) -> str:
+    return f'<a href="{html.escape(href)}">{label}</a>' if href else label
+
+
+def _html_media(label: str) -> Callable[[Dict[str, Any], Dict[str, Any]], str]:
+    def handler(payload, context):
+        caption = html_text(payload.get("caption", []))
+        url = _media_url(payload)
+        if label == "Image":
+            figure = f'<img src="{html.escape(url)}" alt="{html.escape(rich_text_plain(payload.get("caption", [])))}">'
+            return f"<figure>{figure}<figcaption>{caption}</figcaption></figure>" if caption else figure
+        return f"<p>{_html_link(caption or html.escape(payload.get('name') or f'{label}: {url}'), url)}</p>"
+    return handler
+
+
+def _html_table(payload: Dict[str, Any], context: Dict[str, Any]) -> str:
+    rows = [row["table_row"].get("cells", []) for row in context["children"] if row.get("type") == "table_row"]
+    lines = ["<table>"]
+    for index, cells in enumerate(rows):
+        tag = "th" if index == 0 and payload.get("has_column_header") else "td"
+        lines.append("<tr>" + "".join(f"<{tag}>{html_text(cell)}</{tag}>" for cell in cells) + "</tr>")
+    lines.append("</table>")
+    return "\n".join(lines)
+
+
+HTML_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]] = {
+    "paragraph": lambda p, c: f"<p>{html_text(p.get('rich_text', []))}</p>",
+    "heading_1": lambda p, c: f"<h1>{html_text(p.get('rich_text', []))}</h1>",
+    "heading_2": lambda p, c: f"<h2>{html_text(p.get('rich_text', []))}</h2>",
+    "heading_3": lambda p, c: f"<h3>{html_text(p.get('rich_text', []))}</h3>",
+    "bulleted_list_item": lambda p, c: f"<li>{html_text(p.get('rich_text', []))}{c['nested']}</li>",
+    "numbered_list_item": lambda p, c: f"<li>{html_text(p.get('rich_text', []))}{c['nested']}</li>",
+    "to_do": lambda p, c: f"<li><input type=\"checkbox\" disabled{' checked' if p.get('checked') else ''}> {html_text(p.get('rich_text', []))}{c['nested']}</li>",
+    "toggle": lambda p, c: f"<details><summary>{html_text(p.get('rich_text', []))}</summary>{c['nested']}</details>",
+    "quote": lambda p, c: f"<blockquote>{html_text(p.get('rich_text', []))}{c['nested']}</blockquote>",
+    "callout": lambda p, c: f"<aside>{html.escape((p.get('icon') or {}).get('emoji', ''))} {html_text(p.get('rich_text', []))}{c['nested']}</aside>",
+    "code": lambda p, c: f"<pre><code class=\"language-{html.escape(p.get('language', ''))}\">{html.escape(rich_text_plain(p.get('rich_text', [])))}</code></pre>",
+    "equation": lambda p, c: f"<pre>{html.escape(p.get('expression', ''))}</pre>",
+    "divider": lambda p, c: "<hr>",
+    "image": _html_media("Image"),
+    "video": _html_media("Video"),
+    "audio": _html_media("Audio"),
+    "file": _html_media("File"),
+    "pdf": _html_media("PDF"),
+    "bookmark": lambda p, c: f"<p>{_html_link(html_text(p.get('caption', [])) or html.escape(p.get('url', '')), p.get('url', ''))}</p>",
+    "embed": lambda p, c: f"<p>{_html_link(html_text(p.get('caption', [])) or html.escape(p.get('url', '')), p.get('url', ''))}</p>",
+    "link_preview": lambda p, c: f"<p>{_html_link(html.escape(p.get('url', '')), p.get('url', ''))}</p>",
+    "child_page": lambda p, c: f"<p>{_html_link('📄 ' + html.escape(p.get('title') or 'Untitled'), c['href'])}</p>",
+    "child_database": lambda p, c: f"<p>{_html_link('🗄️ ' + html.escape(p.get('title') or 'Untitled'), c['href'])}</p>",
+    "table": _html_table,
+}
+
+# Children rendered inside the block's own element; others follow it in a <div>
+HTML_NESTING_TYPES = {"bulleted_list_item", "numbered_list_item", "to_do", "toggle", "quote", "callout"}
+
+HTML_LIST_TAGS = {"bulleted_list_item": "ul", "to_do": "ul", "numbered_list_item": "ol"}
+
+
+def render_html(blocks: List[Dict[str, Any]], links: Dict[str, str]) -> Iterator[str]:
+    """HTML fragments for a block tree, one per block (list items grouped into lists)."""
+    open_list = None
+    for block in blocks:
+        block_type = block.get("type", "")
+        children = block.get("children") or []
+        list_tag = HTML_LIST_TAGS.get(block_type)
+        if open_list and open_list != list_tag:
+            yield f"</{open_list}>\n"
+            open_list = None
+        if block_type in TRANSPARENT_TYPES:
+            yield from render_html(children, links)
+            continue
+        handler = HTML_HANDLERS.get(block_type)
+        if handler is None:
+            continue
+        if list_tag and not open_list:
+            yield f"<{list_tag}>\n"
+            open_list = list_tag
+        nested = "".join(render_html(children, links)) if children and block_type != "table" else ""
+        context = {
+            "children": children,
+            "href": links.get(block.get("id", ""), ""),
+            "nested": nested if block_type in HTML_NESTING_TYPES else ""
+        }
+        yield handler(block.get(block_type, {}), context) + "\n"
+        if nested and block_type not in HTML_NESTING_TYPES:
+            yield f'<div style="margin-left: 1.5rem">\n{nested}</div>\n'
+    if open_list:
+        yield f"</{open_list}>\n"
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+class PageExporter:
+    """Exports a page tree to files, page by page, on a bounded pool."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        format: str = "markdown",
+        api_key: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        include_databases: bool = True
+    ):
+        """
+        Args:
+            output_dir: Directory the files are written to (created if needed)
+            format: "markdown" or "html"
+            api_key: Notion API key (default: NOTION_API_KEY)
+            max_workers: Pages exported at once (default: NOTION_MAX_CONCURRENCY)
+            include_databases: Export databases as row tables plus one file per row
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format '{format}'; use one of: {', '.join(FORMATS)}")
+        self.api_key = api_key or os.getenv("NOTION_API_KEY")
+        if not self.api_key:
+            raise ValueError("Notion API key not found")
+        self.client = get_notion_client(self.api_key)
+        self.output_dir = Path(output_dir)
+        self.format = format
+        self.suffix = FORMATS[format]
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.include_databases = include_databases
+
+    # -- writing -------------------------------------------------------
+
+    def _child_tasks(
+        self,
+        blocks: List[Dict[str, Any]],
+        directory: Path,
+        depth: int
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """Tasks for the child pages and databases in a block tree, and links to their files."""
+        tasks, links, used = [], {}, set()
+
+        def walk(items: List[Dict[str, Any]]) -> None:
+            for block in items:
+                block_type = block.get("type")
+                if block_type == "child_page" or (block_type == "child_database" and self.include_databases):
+                    title = block.get(block_type, {}).get("title") or "Untitled"
+                    name = self._allocate(title, used)
+                    tasks.append({
+                        "kind": "page" if block_type == "child_page" else "database",
+                        "id": block["id"],
+                        "title": title,
+                        "path": directory / name,
+                        "depth": depth
+                    })
+                    links[block["id"]] = quote(f"{directory.name}/{name}{self.suffix}")
+                walk(block.get("children") or [])
+
+        walk(blocks)
+        return tasks, links
+
+    @staticmethod
+    def _allocate(title: str, used: Set[str]) -> str:
+        name = base = safe_name(title)
+        counter = 2
+        while name.lower() in used:
+            name = f"{base} ({counter})"
+            counter += 1
+        used.add(name.lower())
+        return name
+
+    def _write(
+        self,
+        path: Path,
+        title: str,
+        chunks: Iterator[str],
+        properties: Optional[List[Tuple[str, str]]] = None
+    ) -> Path:
+        file_path = path.with_name(path.name + self.suffix)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            if self.format == "markdown":
+                f.write(f"# {title}\n\n")
+                if properties:
+                    f.write("".join(f"- **{name}**: {value}\n" for name, value in properties) + "\n")
+                for chunk in chunks:
+                    f.write(chunk)
+                f.write("\n")
+            else:
+                f.write(HTML_PAGE.format(title=html.escape(title)))
+                f.write(f"<h1>{html.escape(title)}</h1>\n")
+                if properties:
+                    rows = "".join(f"<tr><td>{html.escape(n)}</td><td>{html.escape(v)}</td></tr>" for n, v in properties)
+                    f.write(f'<table class="properties">{rows}</table>\n')
+                for chunk in chunks:
+                    f.write(chunk)
+                f.write("</body>\n</html>\n")
+        return file_path
+
+    def _export_page(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        blocks = list_block_tree(self.client, task["id"])
+        children, links = self._child_tasks(blocks, task["path"], task["depth"] + 1)
+        render = render_markdown if self.format == "markdown" else render_html
+        file_path = self._write(task["path"], task["title"], render(blocks, links), task.get("properties"))
+        return {"file": str(file_path), "blocks": _count_blocks(blocks), "children": children}
+
+    def _export_database(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        database = call_with_retry(self.client.databases.retrieve, database_id=task["id"])
+        title = rich_text_plain(database.get("title", [])) or task["title"]
+        rows = [
+            row for source in database.get("data_sources", [])
+            for row in iter_data_source_rows(self.client, source["id"])
+        ]
+
+        used: Set[str] = set()
+        children, table_rows = [], []
+        columns = list(rows[0].get("properties", {})) if rows else []
+        title_column = next(
+            (name for name, prop in rows[0].get("properties", {}).items() if prop.get("type") == "title"), None
+        ) if rows else None
+        for row in rows:
+            row_title = _page_title(row)
+            name = self._allocate(row_title, used)
+            properties = [(column, property_text(prop)) for column, prop in row.get("properties", {}).items()]
+            children.append({
+                "kind": "page",
+                "id": row["id"],
+                "title": row_title,
+                "path": task["path"] / name,
+                "depth": task["depth"] + 1,
+                "properties": [(n, v) for n, v in properties if v]
+            })
+            table_rows.append((quote(f"{task['path'].name}/{name}{self.suffix}"), dict(properties)))
+
+        file_path = self._write(task["path"], title, self._database_chunks(columns, title_column, table_rows))
+        return {"file": str(file_path), "blocks": 0, "children": children}
+
+    def _database_chunks(
+        self,
+        columns: List[str],
+        title_column: Optional[str],
+        rows: List[Tuple[str, Dict[str, str]]]
+    ) -> Iterator[str]:
+        """The row table of a database; title cells link to the row files."""
+        if not rows:
+            yield "_No rows_\n" if self.format == "markdown" else "<p><em>No rows</em></p>\n"
+            return
+        if self.format == "markdown":
+            cell = lambda value: value.replace("|", "\\|").replace("\n", " ")
+            yield "| " + " | ".join(cell(c) for c in columns) + " |\n"
+            yield "| " + " | ".join("---" for _ in columns) + " |\n"
+            for href, values in rows:
+                yield "| " + " | ".join(
+                    f"[{cell(values[c])}]({href})" if c == title_column else cell(values.get(c, "")) for c in columns
+                ) + " |\n"
+        else:
+            yield "<table>\n<tr>" + "".join(f"<th>{html.escape(c)}</th>" for c in columns) + "</tr>\n"
+            for href, values in rows:
+                yield "<tr>" + "".join(
+                    f"<td>{_html_link(html.escape(values[c]), href)}</td>" if c == title_column
+                    else f"<td>{html.escape(values.get(c, ''))}</td>"
+                    for c in columns
+                ) + "</tr>\n"
+            yield "</table>\n"
+
+    def export(self, root_page_id: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export a page and its subtree.
+
+        Args:
+            root_page_id: Page to export
+            max_depth: Levels of child pages to follow (default: all)
+
+        Returns:
+            status, output_dir, root_file, pages, databases, blocks, errors,
+            cancelled, seconds and message
+        """
+        started = time.perf_counter()
+        root = call_with_retry(self.client.pages.retrieve, page_id=root_page_id)
+        title = _page_title(root)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        root_task = {"kind": "page", "id": root["id"], "title": title, "path": self.output_dir / safe_name(title), "depth": 0}
+
+        counts = {"pages": 0, "databases": 0, "blocks": 0}
+        errors: List[Dict[str, Any]] = []
+        root_file = None
+        discovered = 1
+
+        def visit(task: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+            result = self._export_page(task) if task["kind"] == "page" else self._export_database(task)
+            result["children"] = [c for c in result["children"] if max_depth is None or c["depth"] <= max_depth]
+            return result, result["children"]
+
+        for task, result, error in crawl([root_task], visit, self.max_workers, progress.cancelled):
+            if error is not None:
+                errors.append({"id": task["id"], "title": task["title"], "error": str(error)})
+            else:
+                counts["pages" if task["kind"] == "page" else "databases"] += 1
+                counts["blocks"] += result["blocks"]
+                if task is root_task:
+                    root_file = result["file"]
+                discovered += len(result["children"])
+                progress.report_partial({"id": task["id"], "title": task["title"], "file": result["file"]})
+            done_count = counts["pages"] + counts["databases"] + len(errors)
+            progress.report_progress(done_count, discovered, f"Exported '{task['title']}'")
+
+        seconds = time.perf_counter() - started
+        cancelled = progress.cancelled()
+        message = (
+            f"Exported {counts['pages']} pages and {counts['databases']} databases "
+            f"({counts['blocks']} blocks) to {self.output_dir} in {seconds:.1f}s"
+            + (f" with {len(errors)} errors" if errors else "")
+            + (" (cancelled before the export finished)" if cancelled else "")
+        )
+        return {
+            "status": "success" if not errors else "error",
+            "format": self.format,
+            "output_dir": str(self.output_dir),
+            "root_file": root_file,
+            **counts,
+            "errors": errors,
+            "cancelled": cancelled,
+            "seconds": round(seconds, 2),
+            "message": message
+        }
+
+
+def _count_blocks(blocks: List[Dict[str, Any]]) -> int:
+    return sum(1 + _count_blocks(block.get("children") or []) for block in blocks)
@@ -0,0 +1,97 @@
+"""
+Progress Reporting
+
+Long-running tools report progress through the module-level functions here
+without knowing who is listening. The MCP server installs a reporter for the
+duration of a tool call (see `run_with_progress` in mcp_server.py) that turns
+updates into MCP progress notifications and partial results into log
+notifications; outside the server every call is a no-op.
+
+Cancellation is cooperative: when the client cancels a call, `cancelled()`
+starts returning True and tools stop at the next safe point (between pages),
+returning what they have done so far.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+ProgressCallback = Callable[[float, Optional[float], Optional[str]], None]
+PartialCallback = Callable[[Dict[str, Any]], None]
+
+
+class ProgressReporter:
+    """Forwards progress updates and partial results, rate limited."""
+
+    def __init__(
+        self,
+        on_progress: Optional[ProgressCallback] = None,
+        on_partial: Optional[PartialCallback] = None,
+        min_interval: float = 0.25
+    ):
+        self.on_progress = on_progress
+        self.on_partial = on_partial
+        self.min_interval = min_interval
+        self.cancel_event = threading.Event()
+        self._last_sent = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Always send the final update; drop intermediate ones that come too fast
+            final = total is not None and progress >= total
+            if not final and now - self._last_sent < self.min_interval:
+                return
+            self._last_sent = now
+        self.on_progress(progress, total, message)
+
+    def partial(self, chunk: Dict[str, Any]) -> None:
+        if self.on_partial is not None:
+            self.on_partial(chunk)
+
+
+_reporter: contextvars.ContextVar[Optional[ProgressReporter]] = contextvars.ContextVar(
+    "progress_reporter", default=None
+)
+
+
+@contextmanager
+def reporting_to(reporter: ProgressReporter) -> Iterator[ProgressReporter]:
+    """Route progress from code run inside the block to `reporter`."""
+    token = _reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _reporter.reset(token)
+
+
+def report_progress(progress: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report `progress` out of `total` (total may grow as work is discovered)."""
+    reporter = _reporter.get()
+    if reporter is not None:
+        try:
+            reporter.update(progress, total, message)
+        except Exception:
+            # A client that went away must not fail the operation itself
+            pass
+
+
+def report_partial(chunk: Dict[str, Any]) -> None:
+    """Emit a partial result chunk, if the caller asked for them."""
+    reporter = _reporter.get()
+    if reporter is not None:
+        try:
+            reporter.partial(chunk)
+        except Exception:
+            pass
+
+
+def cancelled() -> bool:
+    """True once the caller has cancelled the running tool call."""
+    reporter = _reporter.get()
+    return reporter is not None and reporter.cancel_event.is_set()
@@ -0,0 +1,140 @@
+"""
+Prompt Registry
+
+In-memory cache of the `.prompt` knowledge documents, indexed by markdown
+heading so a single section can be served instead of the whole file. Each
+document is read once and re-read only when its modification time changes.
+Lines inside fenced code blocks are never treated as headings (the guides
+contain Python comments that start with '#').
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+SLUG_STRIP_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(title: str) -> str:
+    """URL-safe section key: 'Getting Data Source ID (NEW)' -> 'getting-data-source-id-new'."""
+    return SLUG_STRIP_PATTERN.sub("-", title.lower()).strip("-")
+
+
+def _terms(text: str) -> List[str]:
+    # Crude singularisation so "data sources" finds "Data Source"
+    return [t[:-1] if len(t) > 3 and t.endswith("s") else t for t in slugify(text).split("-") if t]
+
+
+def index_sections(text: str) -> List[Dict[str, Any]]:
+    """
+    Split a markdown document into heading sections.
+
+    A section runs from its heading to the next heading of the same or higher
+    level, so it includes its sub-sections.
+
+    Returns:
+        Sections with slug, title, level and character offsets (start, end)
+    """
+    headings = []
+    in_fence = False
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = HEADING_PATTERN.match(line)
+            if match:
+                headings.append((len(match.group(1)), match.group(2), offset))
+        offset += len(line)
+
+    sections = []
+    seen: Dict[str, int] = {}
+    for i, (level, title, start) in enumerate(headings):
+        end = len(text)
+        for next_level, _, next_start in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+
+        slug = slugify(title) or f"section-{i + 1}"
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1:
+            slug = f"{slug}-{seen[slug]}"
+
+        sections.append({"slug": slug, "title": title, "level": level, "start": start, "end": end})
+    return sections
+
+
+class PromptRegistry:
+    """Cached, sectioned access to the prompt documents in a directory."""
+
+    def __init__(self, directory: Path, suffix: str = ".prompt"):
+        """
+        Args:
+            directory: Directory containing the prompt files
+            suffix: Prompt file extension
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+    def names(self) -> List[str]:
+        """Available prompt names (file stems)."""
+        return sorted(path.stem for path in self.directory.glob(f"*{self.suffix}"))
+
+    def _load(self, name: str) -> Dict[str, Any]:
+        path = self.directory / f"{name}{self.suffix}"
+        if path.parent != self.directory or not path.exists():
+            raise KeyError(f"Unknown prompt: {name}")
+
+        mtime = path.stat().st_mtime_ns
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry and entry["mtime"] == mtime:
+                return entry
+
+            text = path.read_text(encoding="utf-8")
+            entry = {"mtime": mtime, "text": text, "sections": index_sections(text)}
+            self._cache[name] = entry
+            return entry
+
+    def get(self, name: str) -> str:
+        """Full text of a prompt."""
+        return self._load(name)["text"]
+
+    def sections(self, name: str) -> List[Dict[str, Any]]:
+        """Table of contents for a prompt: slug, title, level and size of each section."""
+        return [
+            {"slug": s["slug"], "title": s["title"], "level": s["level"], "chars": s["end"] - s["start"]}
+            for s in self._load(name)["sections"]
+        ]
+
+    def find_section(self, name: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a section by slug, or by words from its heading.
+
+        Word matches prefer the highest-level (shallowest) heading, then the first.
+        """
+        sections = self._load(name)["sections"]
+        key = slugify(query)
+        for section in sections:
+            if section["slug"] == key:
+                return section
+
+        wanted = set(_terms(query))
+        if not wanted:
+            return None
+        matches = [s for s in sections if wanted <= set(_terms(s["title"]))]
+        return min(matches, key=lambda s: s["level"]) if matches else None
+
+    def get_section(self, name: str, query: str) -> str:
+        """Text of a single section (heading included)."""
+        entry = self._load(name)
+        section = self.find_section(name, query)
+        if section is None:
+            raise KeyError(f"No section matching '{query}' in prompt '{name}'")
+        return entry["text"][section["start"]:section["end"]].rstrip() + "\n"
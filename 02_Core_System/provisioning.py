@@ -0,0 +1,627 @@
+"""
+Workspace Provisioning
+
+Builds a workspace from a declarative manifest of pages, databases,
+relations, seed rows and page content:
+
+    {
+      "name": "LinkedIn Content OS",
+      "content": ["Welcome!"],                          # appended to the parent page
+      "pages": [
+        {"key": "start", "title": "🚀 Getting Started", "icon": "🚀",
+         "content": [{"h1": "Getting Started"}, "Set up your workspace."],
+         "pages": [{"title": "📋 Setup Checklist"}]}
+      ],
+      "databases": [
+        {"key": "hub", "title": "Content Hub", "parent": "start",
+         "properties": {"Title": {"title": {}}, ...},      # or "template": "launch_hub"
+         "relations": [{"property": "Pillar", "target": "pillars", "dual": true}],
+         "rollups": [{"property": "Pillar Owner", "relation": "Pillar",
+                      "rollup_property": "Owner", "function": "show_original"}],
+         "rows": [{"key": "welcome", "Title": "Welcome", "Status": "Draft", "Pillar": ["brand"]}]}
+      ]
+    }
+
+Provisioning runs in phases. Pages and databases are created in waves by
+depth: everything whose parent already exists is created concurrently on the
+bounded pool from notion_concurrency.py, with rate-limited calls retried.
+Relation properties are then added to every database at once (one data
+source update per database), followed by a second concurrent round of
+updates for the rollups that read them, since a rollup can only name a
+relation that already exists. Seed rows are created concurrently, and
+finally rows that point at other rows get their relation values.
+
+Content items are Notion block objects or shorthands: a string (paragraph),
+{"h1"|"h2"|"h3"|"p"|"bullet"|"numbered"|"quote"|"toggle": text},
+{"todo": text, "checked": bool}, {"callout": text, "icon": emoji},
+{"divider": true} or {"markdown": text} (any number of blocks, see
+markdown_blocks.py). Row values are plain values converted according to the
+database schema (a select takes its option name, a date an ISO string, a
+relation a list of row keys of its target database; row keys are unique per
+database).
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from bulk_loader import property_value
+from cost_estimator import (
+    APPEND_CHILDREN, CREATE_DATABASE, CREATE_PAGE, LIST_CHILDREN, UPDATE_DATA_SOURCE, UPDATE_PAGE,
+    PLACEHOLDER_ID, CostEstimate
+)
+from markdown_blocks import (
+    MAX_BLOCKS_PER_PAYLOAD, MAX_BLOCKS_PER_REQUEST, MAX_NESTING,
+    append_block_tree, block_count, block_depth, block_width, markdown_to_blocks, plan_block_appends
+)
+from notion_concurrency import call_with_retry, create_database, parallel_map
+from notion_transport import get_notion_client
+from template_compiler import ROLLUP_FUNCTIONS, load_template, relation_property, rollup_property
+
+MANIFESTS_DIR = Path(__file__).parent.parent / "03_Templates" / "manifests"
+
+BLOCK_SHORTHANDS = {
+    "h1": "heading_1",
+    "h2": "heading_2",
+    "h3": "heading_3",
+    "p": "paragraph",
+    "bullet": "bulleted_list_item",
+    "numbered": "numbered_list_item",
+    "quote": "quote",
+    "toggle": "toggle",
+    "todo": "to_do",
+    "callout": "callout"
+}
+
+
+class ProvisioningError(ValueError):
+    """The manifest is invalid; `problems` lists every issue found."""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__("Invalid manifest: " + "; ".join(problems))
+
+
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{"type": "text", "text": {"content": content}}]
+
+
+# ----------------------------------------------------------------------
+# Manifest handling
+# ----------------------------------------------------------------------
+
+def manifest_path(name_or_path: Union[str, Path]) -> Path:
+    """A manifest file from a path or a name in MANIFESTS_DIR ("linkedin_content_os")."""
+    path = Path(name_or_path)
+    if path.suffix == ".json" and path.exists():
+        return path
+    return MANIFESTS_DIR / f"{path.stem}.json"
+
+
+def load_manifest(name_or_path: Union[str, Path]) -> Dict[str, Any]:
+    with open(manifest_path(name_or_path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def expand_block(item: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """A content shorthand (or a full block object) -> Notion block."""
+    if isinstance(item, str):
+        return {"type": "paragraph", "paragraph": {"rich_text": _rich_text(item)}}
+    if "type" in item:
+        return item
+    if item.get("divider"):
+        return {"type": "divider", "divider": {}}
+    for shorthand, block_type in BLOCK_SHORTHANDS.items():
+        if shorthand in item:
+            payload: Dict[str, Any] = {"rich_text": _rich_text(item[shorthand])}
+            if block_type == "to_do":
+                payload["checked"] = bool(item.get("checked", False))
+            elif block_type == "callout" and item.get("icon"):
+                payload["icon"] = {"type": "emoji", "emoji": item["icon"]}
+            return {"type": block_type, block_type: payload}
+    raise ValueError(f"Unknown content item: {item}")
+
+
+def expand_content(items: List[Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Content items -> Notion blocks; a {"markdown": text} item expands to many."""
+    blocks = []
+    for item in items:
+        if isinstance(item, dict) and "markdown" in item:
+            blocks.extend(markdown_to_blocks(item["markdown"]))
+        else:
+            blocks.append(expand_block(item))
+    return blocks
+
+
+def _flatten(manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pages and databases as a flat list of nodes with keys, parents and depths."""
+    nodes: List[Dict[str, Any]] = []
+    counter = {"page": 0, "database": 0}
+
+    def add(kind: str, spec: Dict[str, Any], parent: Optional[str], depth: int) -> None:
+        counter[kind] += 1
+        key = spec.get("key") or f"{kind}-{counter[kind]}"
+        nodes.append({"kind": kind, "key": key, "spec": spec, "parent": spec.get("parent", parent), "depth": depth})
+        for child in spec.get("pages", []):
+            add("page", child, key, depth + 1)
+        for child in spec.get("databases", []):
+            add("database", child, key, depth + 1)
+
+    for page in manifest.get("pages", []):
+        add("page", page, None, 0)
+    for database in manifest.get("databases", []):
+        add("database", database, None, 0)
+
+    # Explicit "parent" keys can point anywhere, so depth follows the parent chain
+    by_key = {node["key"]: node for node in nodes}
+    for node in nodes:
+        depth, parent, seen = 0, node["parent"], set()
+        while parent is not None and parent in by_key and parent not in seen:
+            seen.add(parent)
+            depth += 1
+            parent = by_key[parent]["parent"]
+        node["depth"] = depth
+    return nodes
+
+
+def _database_schema(spec: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(create-database body without parent, relations) for a database node."""
+    if spec.get("template"):
+        compiled = load_template(spec["template"])
+        body = compiled["database"]
+        # Template relations name a template; they are dropped if the manifest has no such database
+        relations = [
+            {"property": r["property"], "target": r["target"], "dual": r["dual"], "optional": True}
+            for r in compiled["relations"] if r.get("target")
+        ]
+        if spec.get("title"):
+            body["title"] = _rich_text(spec["title"])
+    else:
+        body = {
+            "title": _rich_text(spec.get("title", "Untitled")),
+            "initial_data_source": {"properties": spec.get("properties", {})}
+        }
+        relations = []
+    if spec.get("description"):
+        body["description"] = _rich_text(spec["description"])
+    if spec.get("icon"):
+        body["icon"] = {"type": "emoji", "emoji": spec["icon"]}
+    relations += spec.get("relations", [])
+    return body, relations
+
+
+def _relations(node: Dict[str, Any], databases: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """A database's relations with targets resolved to database keys (or template names)."""
+    by_template = {n["spec"]["template"]: key for key, n in databases.items() if n["spec"].get("template")}
+    resolved = []
+    for relation in _database_schema(node["spec"])[1]:
+        target = relation.get("target")
+        target = target if target in databases else by_template.get(target, target)
+        if target in databases or not relation.get("optional"):
+            resolved.append(dict(relation, target=target))
+    return resolved
+
+
+def _rollup_problems(node: Dict[str, Any], databases: Dict[str, Dict[str, Any]], where: str) -> List[str]:
+    """Problems with a database's rollups: each must read a declared relation and a property of its target."""
+    problems = []
+    relations = {r["property"]: r["target"] for r in _relations(node, databases)}
+    for rollup in node["spec"].get("rollups", []):
+        name = rollup.get("property")
+        if not name:
+            problems.append(f"{where} has a rollup without a property name")
+            continue
+        if rollup.get("relation") not in relations:
+            problems.append(f"{where} rollup '{name}' reads unknown relation '{rollup.get('relation')}'")
+        elif relations[rollup["relation"]] in databases:
+            target = databases[relations[rollup["relation"]]]
+            try:
+                readable = set(_database_schema(target["spec"])[0]["initial_data_source"]["properties"])
+            except (OSError, ValueError):
+                continue  # reported for the target database
+            readable |= {r["property"] for r in _relations(target, databases)}
+            if rollup.get("rollup_property") not in readable:
+                problems.append(
+                    f"{where} rollup '{name}' reads unknown property '{rollup.get('rollup_property')}' of '{target['key']}'"
+                )
+        if rollup.get("function", "show_original") not in ROLLUP_FUNCTIONS:
+            problems.append(f"{where} rollup '{name}' has unknown function '{rollup.get('function')}'")
+    return problems
+
+
+def validate_manifest(manifest: Dict[str, Any]) -> List[str]:
+    """Every problem with a manifest (empty when it is valid)."""
+    problems = []
+    try:
+        nodes = _flatten(manifest)
+    except (AttributeError, TypeError):
+        return ["pages and databases must be lists of objects"]
+
+    keys = [node["key"] for node in nodes]
+    duplicates = sorted({k for k in keys if keys.count(k) > 1})
+    if duplicates:
+        problems.append(f"duplicate keys: {', '.join(duplicates)}")
+    known = set(keys)
+    databases = {node["key"]: node for node in nodes if node["kind"] == "database"}
+
+    for node in nodes:
+        spec, where = node["spec"], f"{node['kind']} '{node['key']}'"
+        if node["parent"] is not None and node["parent"] not in known:
+            problems.append(f"{where} has unknown parent '{node['parent']}'")
+        elif node["parent"] in databases:
+            problems.append(f"{where} cannot be created inside database '{node['parent']}'")
+        if node["kind"] == "page":
+            if not spec.get("title"):
+                problems.append(f"{where} needs a title")
+        else:
+            try:
+                body = _database_schema(spec)[0]
+                relations = _relations(node, databases)
+            except (OSError, ValueError) as e:
+                problems.append(f"{where}: {e}")
+                continue
+            properties = body["initial_data_source"]["properties"]
+            if sum(1 for p in properties.values() if "title" in p) != 1:
+                problems.append(f"{where} needs exactly one title property")
+            for relation in relations:
+                if relation.get("target") not in databases:
+                    problems.append(f"{where} relation '{relation.get('property')}' targets unknown database '{relation.get('target')}'")
+            problems.extend(_rollup_problems(node, databases, where))
+            relation_names = {r.get("property") for r in relations}
+            for row in spec.get("rows", []):
+                unknown = [k for k in row if k != "key" and k not in properties and k not in relation_names]
+                if unknown:
+                    problems.append(f"{where} row has unknown properties: {', '.join(unknown)}")
+            row_keys = [row["key"] for row in spec.get("rows", []) if row.get("key")]
+            duplicate_rows = sorted({k for k in row_keys if row_keys.count(k) > 1})
+            if duplicate_rows:
+                problems.append(f"{where} has duplicate row keys: {', '.join(duplicate_rows)}")
+        for item in spec.get("content", []):
+            try:
+                expand_content([item])
+            except (ValueError, TypeError):
+                problems.append(f"{where} has an unknown content item: {item}")
+    for item in manifest.get("content", []):
+        try:
+            expand_content([item])
+        except (ValueError, TypeError):
+            problems.append(f"manifest has an unknown content item: {item}")
+    return problems
+
+
+def _page_body(spec: Dict[str, Any], parent_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(pages.create body, blocks to append after creation) for a page node."""
+    blocks = expand_content(spec.get("content", []))
+    # Leading blocks go into the create request as far as the append limits allow
+    inline, size = [], 0
+    for block in blocks[:MAX_BLOCKS_PER_REQUEST]:
+        size += block_count(block)
+        too_deep = block_depth(block) > MAX_NESTING or block_width(block) > MAX_BLOCKS_PER_REQUEST
+        if too_deep or size > MAX_BLOCKS_PER_PAYLOAD:
+            break
+        inline.append(block)
+    body: Dict[str, Any] = {
+        "parent": {"type": "page_id", "page_id": parent_id},
+        "properties": {"title": {"title": _rich_text(spec["title"])}},
+        "children": inline
+    }
+    if spec.get("icon"):
+        body["icon"] = {"type": "emoji", "emoji": spec["icon"]}
+    return body, blocks[len(inline):]
+
+
+# ----------------------------------------------------------------------
+# Provisioning
+# ----------------------------------------------------------------------
+
+class Provisioner:
+    """Creates a manifest's objects in concurrent waves."""
+
+    def __init__(self, api_key: Optional[str] = None, max_workers: Optional[int] = None, client: Optional[Any] = None):
+        """
+        Args:
+            api_key: Notion API key (default: NOTION_API_KEY)
+            max_workers: Concurrent API calls (default: NOTION_MAX_CONCURRENCY)
+            client: An existing Notion SDK client to use instead of one for api_key
+        """
+        if client is None:
+            self.api_key = api_key or os.getenv("NOTION_API_KEY")
+            if not self.api_key:
+                raise ValueError("Notion API key not found")
+            client = get_notion_client(self.api_key)
+        self.client = client
+        self.max_workers = max_workers
+
+    def _create_page(self, node: Dict[str, Any], parent_id: str) -> Dict[str, Any]:
+        body, overflow = _page_body(node["spec"], parent_id)
+        page = call_with_retry(self.client.pages.create, **body)
+        if overflow:
+            append_block_tree(self.client, page["id"], overflow, self.max_workers)
+        return {"type": "page", "id": page["id"], "url": page.get("url")}
+
+    def _create_database(self, node: Dict[str, Any], parent_id: str) -> Dict[str, Any]:
+        body, _ = _database_schema(node["spec"])
+        body["parent"] = {"type": "page_id", "page_id": parent_id}
+        database = create_database(self.client, body)
+        return {
+            "type": "database",
+            "id": database["id"],
+            "url": database.get("url"),
+            "data_source_id": database["data_sources"][0]["id"]
+        }
+
+    def provision(
+        self,
+        manifest: Dict[str, Any],
+        parent_page_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create everything in a manifest under a parent page.
+
+        Failures are collected rather than raised: objects whose parent
+        failed are skipped and reported, everything else is still created.
+
+        Returns:
+            status, created ({key: {"type", "id", "url", ["data_source_id"]}}),
+            rows ({database key: {row key: page ID}}), errors, phase timings and message
+        """
+        problems = validate_manifest(manifest)
+        if problems:
+            raise ProvisioningError(problems)
+        parent_page_id = (parent_page_id or manifest.get("parent_page_id") or os.getenv("NOTION_PARENT_PAGE_ID") or "").replace("-", "")
+        if not parent_page_id:
+            raise ValueError("No parent page: pass parent_page_id or set NOTION_PARENT_PAGE_ID")
+
+        nodes = _flatten(manifest)
+        created: Dict[str, Dict[str, Any]] = {}
+        errors: List[Dict[str, Any]] = []
+        timings: Dict[str, float] = {}
+
+        # Phase 1: pages and databases, one concurrent wave per depth
+        started = time.perf_counter()
+        for depth in range(max((n["depth"] for n in nodes), default=-1) + 1):
+            wave = []
+            for node in (n for n in nodes if n["depth"] == depth):
+                if node["parent"] is None:
+                    wave.append((node, parent_page_id))
+                elif node["parent"] in created:
+                    wave.append((node, created[node["parent"]]["id"]))
+                else:
+                    errors.append({"key": node["key"], "phase": "structure", "error": f"parent '{node['parent']}' was not created"})
+
+            def create(item: Tuple[Dict[str, Any], str]) -> Dict[str, Any]:
+                node, parent_id = item
+                if node["kind"] == "page":
+                    return self._create_page(node, parent_id)
+                return self._create_database(node, parent_id)
+
+            for (node, _), (result, error) in zip(wave, parallel_map(create, wave, self.max_workers)):
+                if error is not None:
+                    errors.append({"key": node["key"], "phase": "structure", "error": str(error)})
+                else:
+                    created[node["key"]] = result
+        if manifest.get("content"):
+            try:
+                append_block_tree(self.client, parent_page_id, expand_content(manifest["content"]), self.max_workers)
+            except Exception as e:
+                errors.append({"key": None, "phase": "structure", "error": f"parent page content: {e}"})
+        timings["structure"] = time.perf_counter() - started
+
+        all_databases = {n["key"]: n for n in nodes if n["kind"] == "database"}
+        databases = [n for n in all_databases.values() if n["key"] in created]
+
+        # Phase 2: relation properties, one data source update per database
+        started = time.perf_counter()
+        updates = []
+        for node in databases:
+            relations = _relations(node, all_databases)
+            properties = {
+                r["property"]: relation_property(created[r["target"]]["data_source_id"], r.get("dual", False))
+                for r in relations if r["target"] in created
+            }
+            if properties:
+                updates.append((node, properties))
+
+        def update_schema(item: Tuple[Dict[str, Any], Dict[str, Any]]) -> None:
+            node, properties = item
+            call_with_retry(
+                self.client.request,
+                path=f"data_sources/{created[node['key']]['data_source_id']}",
+                method="PATCH",
+                body={"properties": properties}
+            )
+
+        failed = set()
+        for (node, _), (_, error) in zip(updates, parallel_map(update_schema, updates, self.max_workers)):
+            if error is not None:
+                failed.add(node["key"])
+                errors.append({"key": node["key"], "phase": "relations", "error": str(error)})
+
+        # Rollups read relations by name, so they go in a second round of updates
+        rollup_updates = []
+        for node in databases:
+            targets = {r["property"]: r["target"] for r in _relations(node, all_databases)}
+            properties = {}
+            for rollup in node["spec"].get("rollups", []):
+                if node["key"] in failed or targets[rollup["relation"]] not in created:
+                    errors.append({
+                        "key": node["key"],
+                        "phase": "rollups",
+                        "error": f"rollup '{rollup['property']}': relation '{rollup['relation']}' was not added"
+                    })
+                    continue
+                properties[rollup["property"]] = rollup_property(
+                    rollup["relation"], rollup["rollup_property"], rollup.get("function", "show_original")
+                )
+            if properties:
+                rollup_updates.append((node, properties))
+
+        for (node, _), (_, error) in zip(rollup_updates, parallel_map(update_schema, rollup_updates, self.max_workers)):
+            if error is not None:
+                errors.append({"key": node["key"], "phase": "rollups", "error": str(error)})
+        timings["relations"] = time.perf_counter() - started
+
+        # Phase 3: seed rows, then relation values between rows
+        started = time.perf_counter()
+        rows = []
+        for node in databases:
+            schema = _database_schema(node["spec"])[0]["initial_data_source"]["properties"]
+            relation_targets = {r["property"]: r["target"] for r in _relations(node, all_databases)}
+            for index, row in enumerate(node["spec"].get("rows", [])):
+                rows.append({
+                    "database": node["key"],
+                    "key": row.get("key") or f"{node['key']}-row-{index + 1}",
+                    "properties": {
+                        name: property_value(schema[name], value)
+                        for name, value in row.items() if name != "key" and name not in relation_targets
+                    },
+                    # Row keys are unique per database, so links resolve in the relation's target
+                    "links": {
+                        name: (relation_targets[name], value)
+                        for name, value in row.items() if name in relation_targets
+                    }
+                })
+
+        def create_row(row: Dict[str, Any]) -> str:
+            data_source_id = created[row["database"]]["data_source_id"]
+            page = call_with_retry(
+                self.client.pages.create,
+                parent={"type": "data_source_id", "data_source_id": data_source_id},
+                properties=row["properties"]
+            )
+            return page["id"]
+
+        row_ids: Dict[str, Dict[str, str]] = {}
+        for row, (page_id, error) in zip(rows, parallel_map(create_row, rows, self.max_workers)):
+            if error is not None:
+                errors.append({"key": row["key"], "phase": "rows", "error": str(error)})
+            else:
+                row_ids.setdefault(row["database"], {})[row["key"]] = page_id
+
+        linked = [row for row in rows if row["links"] and row["key"] in row_ids.get(row["database"], {})]
+
+        def link_row(row: Dict[str, Any]) -> None:
+            properties = {}
+            for name, (database, targets) in row["links"].items():
+                targets = targets if isinstance(targets, list) else [targets]
+                target_ids = row_ids.get(database, {})
+                missing = [t for t in targets if t not in target_ids]
+                if missing:
+                    raise ValueError(f"unknown rows of '{database}' for '{name}': {', '.join(missing)}")
+                properties[name] = {"relation": [{"id": target_ids[t]} for t in targets]}
+            call_with_retry(self.client.pages.update, page_id=row_ids[row["database"]][row["key"]], properties=properties)
+
+        for row, (_, error) in zip(linked, parallel_map(link_row, linked, self.max_workers)):
+            if error is not None:
+                errors.append({"key": row["key"], "phase": "row_relations", "error": str(error)})
+        timings["rows"] = time.perf_counter() - started
+
+        pages = sum(1 for c in created.values() if c["type"] == "page")
+        message = (
+            f"Provisioned {pages} pages, {len(databases)} databases and "
+            f"{sum(len(ids) for ids in row_ids.values())} rows in {sum(timings.values()):.1f}s"
+            + (f" with {len(errors)} errors" if errors else "")
+        )
+        return {
+            "status": "success" if not errors else "error",
+            "parent_page_id": parent_page_id,
+            "created": created,
+            "rows": row_ids,
+            "errors": errors,
+            "timings": {phase: round(seconds, 2) for phase, seconds in timings.items()},
+            "message": message
+        }
+
+
+def estimate_manifest(manifest: Dict[str, Any], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    API calls, wall time and payload volume of provisioning a valid manifest,
+    phase by phase as Provisioner.provision() runs them (see cost_estimator.py).
+    """
+    nodes = _flatten(manifest)
+    databases = {n["key"]: n for n in nodes if n["kind"] == "database"}
+    estimate = CostEstimate("provision_workspace", max_workers)
+
+    def add_appends(blocks: List[Dict[str, Any]]) -> None:
+        appends = plan_block_appends(blocks)
+        estimate.add(APPEND_CHILDREN, appends["appends"], request_bytes=appends["request_bytes"])
+        estimate.add(LIST_CHILDREN, appends["lookups"])
+
+    for depth in range(max((n["depth"] for n in nodes), default=-1) + 1):
+        estimate.phase(f"structure wave {depth + 1}", parallel=True)
+        for node in (n for n in nodes if n["depth"] == depth):
+            if node["kind"] == "page":
+                body, overflow = _page_body(node["spec"], PLACEHOLDER_ID)
+                estimate.add(CREATE_PAGE, payload=body)
+                add_appends(overflow)
+            else:
+                body = dict(_database_schema(node["spec"])[0], parent={"type": "page_id", "page_id": PLACEHOLDER_ID})
+                estimate.add(CREATE_DATABASE, payload=body)
+    if manifest.get("content"):
+        estimate.phase("parent page content")
+        add_appends(expand_content(manifest["content"]))
+
+    estimate.phase("relations", parallel=True)
+    for node in databases.values():
+        relations = _relations(node, databases)
+        if relations:
+            properties = {r["property"]: relation_property(PLACEHOLDER_ID, r.get("dual", False)) for r in relations}
+            estimate.add(UPDATE_DATA_SOURCE, payload={"properties": properties})
+
+    estimate.phase("rollups", parallel=True)
+    for node in databases.values():
+        properties = {
+            r["property"]: rollup_property(r["relation"], r["rollup_property"], r.get("function", "show_original"))
+            for r in node["spec"].get("rollups", [])
+        }
+        if properties:
+            estimate.add(UPDATE_DATA_SOURCE, payload={"properties": properties})
+
+    estimate.phase("rows", parallel=True)
+    linked = []
+    for node in databases.values():
+        schema = _database_schema(node["spec"])[0]["initial_data_source"]["properties"]
+        relation_names = {r["property"] for r in _relations(node, databases)}
+        for row in node["spec"].get("rows", []):
+            properties = {
+                name: property_value(schema[name], value)
+                for name, value in row.items() if name != "key" and name not in relation_names
+            }
+            estimate.add(CREATE_PAGE, payload={
+                "parent": {"type": "data_source_id", "data_source_id": PLACEHOLDER_ID},
+                "properties": properties
+            })
+            links = {name: value for name, value in row.items() if name in relation_names}
+            if links:
+                linked.append(links)
+
+    estimate.phase("row relations", parallel=True)
+    for links in linked:
+        estimate.add(UPDATE_PAGE, payload={"properties": {
+            name: {"relation": [{"id": PLACEHOLDER_ID}] * len(targets if isinstance(targets, list) else [targets])}
+            for name, targets in links.items()
+        }})
+    return estimate.result()
+
+
+def plan_manifest(manifest: Dict[str, Any], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """What provisioning a manifest would create, wave by wave, and what it would cost, without API calls."""
+    problems = validate_manifest(manifest)
+    if problems:
+        raise ProvisioningError(problems)
+    nodes = _flatten(manifest)
+    waves = {}
+    for node in nodes:
+        waves.setdefault(node["depth"], []).append(f"{node['kind']}:{node['key']}")
+    databases = {n["key"]: n for n in nodes if n["kind"] == "database"}
+    return {
+        "waves": [waves[d] for d in sorted(waves)],
+        "pages": sum(1 for n in nodes if n["kind"] == "page"),
+        "databases": len(databases),
+        "relations": sum(len(_relations(n, databases)) for n in databases.values()),
+        "rollups": sum(len(n["spec"].get("rollups", [])) for n in databases.values()),
+        "rows": sum(len(n["spec"].get("rows", [])) for n in databases.values()),
+        "cost_estimate": estimate_manifest(manifest, max_workers)
+    }
@@ -0,0 +1,280 @@
+"""
+Result Cache
+
+Read-through cache for read-only MCP tools. Results are kept for a TTL in a
+size-bounded LRU, keyed by tool name and call arguments.
+
+Every entry is tagged with the Notion IDs it depends on: the IDs passed as
+arguments plus every ID that appears in the result (so a cached hierarchy is
+tagged with each page in its subtree). Mutating tools invalidate every entry
+tagged with an ID they touched, which covers the changed page or database,
+its cached subtrees and hierarchies that contain it.
+
+Changes made outside this server are only picked up once the TTL expires.
+Set MCP_RESULT_CACHE_TTL=0 to disable caching.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+DEFAULT_TTL = float(os.getenv("MCP_RESULT_CACHE_TTL", "120"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("MCP_RESULT_CACHE_SIZE", "256"))
+
+NOTION_ID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+)
+
+
+def normalise_id(value: str) -> str:
+    """Dashed or dashless Notion ID -> lowercase 32-hex form."""
+    return value.replace("-", "").lower()
+
+
+def ids_in_arguments(values: Iterable[Any]) -> Set[str]:
+    """Notion IDs found in argument values (IDs may be embedded in URLs)."""
+    found = set()
+    for value in values:
+        if isinstance(value, str):
+            found.update(normalise_id(m) for m in NOTION_ID_PATTERN.findall(value))
+        elif isinstance(value, (list, tuple)):
+            found |= ids_in_arguments(value)
+    return found
+
+
+def ids_in_result(result: Any) -> Set[str]:
+    """Every string in a result that is exactly a Notion ID."""
+    found = set()
+    stack = [result]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, str) and len(item) in (32, 36) and NOTION_ID_PATTERN.fullmatch(item):
+            found.add(normalise_id(item))
+    return found
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache with tag-based invalidation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_ttl > 0 and self.max_entries > 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry["tags"]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """The live entry for `key` ({"value", "stored_at"}), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, value: Any, tags: Iterable[str], ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._drop(key)
+            tags = frozenset(tags)
+            self._entries[key] = {
+                "value": value,
+                "tags": tags,
+                "stored_at": now,
+                "expires_at": now + ttl
+            }
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry tagged with any of `tags`. Returns the number dropped."""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.default_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+RESULT_CACHE = ResultCache()
+
+
+# Arguments that do not change what a tool returns
+IGNORED_ARGUMENTS = frozenset({"ctx", "stream_partial", "run_in_background"})
+
+
+def _bound_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name not in IGNORED_ARGUMENTS}
+
+
+def _cache_key(name: str, arguments: Dict[str, Any]) -> str:
+    # Hashed so API keys passed as arguments are not kept in the clear
+    payload = json.dumps([name, arguments], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def cached_tool(function: Optional[Callable[..., Any]] = None, *, ttl: Optional[float] = None):
+    """
+    Serve repeated calls of a read-only tool from RESULT_CACHE.
+
+    Only complete results with status "success" are stored. Hits are
+    returned as a shallow copy with a "cache" entry giving the age of the
+    result. Works on plain and async functions.
+    """
+    def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+        name = function.__name__
+        signature = inspect.signature(function)
+
+        def lookup(args: tuple, kwargs: dict):
+            arguments = _bound_arguments(signature, args, kwargs)
+            key = _cache_key(name, arguments)
+            entry = RESULT_CACHE.get(key)
+            if entry is None:
+                return arguments, key, None
+            result = dict(entry["value"])
+            result["cache"] = {
+                "hit": True,
+                "age_seconds": round(time.monotonic() - entry["stored_at"], 1)
+            }
+            return arguments, key, result
+
+        def store(arguments: Dict[str, Any], key: str, result: Any) -> None:
+            if isinstance(result, dict) and result.get("status") == "success" and not result.get("cancelled"):
+                tags = ids_in_arguments(arguments.values()) | ids_in_result(result)
+                RESULT_CACHE.put(key, result, tags, ttl)
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not RESULT_CACHE.enabled:
+                    return await function(*args, **kwargs)
+                arguments, key, cached = lookup(args, kwargs)
+                if cached is not None:
+                    return cached
+                result = await function(*args, **kwargs)
+                store(arguments, key, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not RESULT_CACHE.enabled:
+                return function(*args, **kwargs)
+            arguments, key, cached = lookup(args, kwargs)
+            if cached is not None:
+                return cached
+            result = function(*args, **kwargs)
+            store(arguments, key, result)
+            return result
+
+        return wrapper
+
+    return decorate(function) if function is not None else decorate
+
+
+def invalidate_ids(arguments: Iterable[Any], result: Any = None) -> int:
+    """Invalidate entries referencing IDs in `arguments` or in a mutating call's result."""
+    tags = ids_in_arguments(arguments)
+    if result is not None:
+        tags |= ids_in_result(result)
+    return RESULT_CACHE.invalidate(tags)
+
+
+def invalidates(function: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Invalidate cached results touched by a mutating tool.
+
+    Tags come from the IDs in the tool's arguments and in its result. The
+    cache is invalidated even when the tool fails, since a failed bulk
+    operation may still have changed part of the workspace.
+    """
+    signature = inspect.signature(function)
+
+    def invalidate(args: tuple, kwargs: dict, result: Any) -> None:
+        invalidate_ids(_bound_arguments(signature, args, kwargs).values(), result)
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = None
+            try:
+                result = await function(*args, **kwargs)
+                return result
+            finally:
+                invalidate(args, kwargs, result)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result = None
+        try:
+            result = function(*args, **kwargs)
+            return result
+        finally:
+            invalidate(args, kwargs, result)
+
+    return wrapper
@@ -0,0 +1,446 @@
+"""
+Schema Migrations
+
+Brings data source schemas to a desired state with the smallest possible
+`PATCH data_sources/{id}` bodies:
+
+    migrator = SchemaMigrator(client.client)
+    migrator.migrate([
+        {"database_id": CONTENT_HUB_ID, "properties": {
+            "Post Idea": {"title": {}},
+            "Status": {"select": {"options": [{"name": "💡 Idea"}, {"name": "🚀 Published"}]}},
+            "Draft": {"rich_text": {}}
+        }},
+        {"database_id": WEEKLY_REVIEW_ID, "properties": {...}, "renames": {"Wins": "Wins This Week"}}
+    ], dry_run=True)
+
+A desired schema maps property names to definitions in the Notion format
+({"select": {...}}, with or without "type"/"id") or the simplified template
+format of template_compiler.py ({"type": "select", "options": ["A", "B"]}).
+It is diffed against the current schema and only the differences are sent:
+
+  - new properties, with their full definition
+  - renames ({"name": new}), from `renames` or when the title property has a
+    new name
+  - type and setting changes (number format, formula expression, relation
+    target)
+  - option deltas: a select is only sent when options are added (or removed
+    with remove_missing, or for properties listed in `exact_options`), and
+    existing options are referenced by ID so they keep their colour and the
+    values that use them
+  - removals ({name: null}), from `remove` or with remove_missing=True
+
+Properties that already match are left out, so re-running a migration makes no
+writes. Option colours and status options cannot be changed through the API;
+differences are reported as warnings.
+
+Current schemas are cached in memory and in the local cache (`schemas/`) for
+NOTION_SCHEMA_CACHE_TTL seconds (default 300), and replaced by the schema each
+PATCH returns. A migration planned from a cached schema that the API rejects
+is planned again from a fresh one. Migrations for different data sources run
+concurrently on the notion_concurrency pool.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from notion_client.errors import APIErrorCode, APIResponseError
+
+from local_cache import get_cache_dir
+from notion_concurrency import call_with_retry, parallel_map
+from template_compiler import OPTION_TYPES, SUPPORTED_TYPES, compile_property, relation_property
+from workspace_snapshot import writable_schema
+
+DEFAULT_CACHE_TTL = float(os.getenv("NOTION_SCHEMA_CACHE_TTL", "300"))
+
+# Keys of a retrieved property that are not its type settings
+PROPERTY_META_KEYS = ("id", "name", "type", "description")
+
+
+# ----------------------------------------------------------------------
+# Desired schemas
+# ----------------------------------------------------------------------
+
+def property_definition(name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A desired property in the Notion or simplified template format -> {type: settings}.
+
+    Raises:
+        ValueError: the type cannot be told from the definition
+    """
+    prop_type = spec.get("type")
+    if prop_type and prop_type in spec:
+        return {prop_type: spec[prop_type] or {}}
+    if prop_type in OPTION_TYPES:
+        # Options without a colour keep theirs, or get one from Notion when new
+        options = [o if isinstance(o, dict) else {"name": o} for o in spec.get("options", [])]
+        return {prop_type: {"options": options}}
+    if prop_type == "relation" and spec.get("data_source_id"):
+        return relation_property(spec["data_source_id"], bool(spec.get("dual", False)))
+    if prop_type in SUPPORTED_TYPES and prop_type != "relation":
+        return compile_property(spec)
+    types = [key for key in spec if key not in PROPERTY_META_KEYS]
+    if prop_type is None and len(types) == 1:
+        return {types[0]: spec[types[0]] or {}}
+    raise ValueError(f"Cannot tell the type of property '{name}'")
+
+
+def _schema_type(definition: Dict[str, Any]) -> str:
+    return next(iter(definition))
+
+
+def _settings(prop_type: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Comparable settings of one property, as writable_schema normalises them."""
+    if prop_type == "relation":
+        return {"data_source_id": config.get("data_source_id"), "type": config.get("type", "single_property")}
+    return writable_schema({"property": {"type": prop_type, prop_type: config}})["property"][prop_type]
+
+
+# ----------------------------------------------------------------------
+# Diffing
+# ----------------------------------------------------------------------
+
+def _option_delta(
+    name: str,
+    existing: Dict[str, Any],
+    desired: Dict[str, Any],
+    remove_missing: bool,
+    changes: Dict[str, Any],
+    warnings: List[str]
+) -> Optional[Dict[str, Any]]:
+    prop_type = existing["type"]
+    current = existing.get(prop_type, {}).get("options", [])
+    wanted = desired.get("options", [])
+    current_by_name = {option["name"]: option for option in current}
+    wanted_names = {option["name"] for option in wanted}
+
+    added = [option for option in wanted if option["name"] not in current_by_name]
+    removed = [option["name"] for option in current if option["name"] not in wanted_names] if remove_missing else []
+    for option in wanted:
+        old = current_by_name.get(option["name"])
+        if old and option.get("color") and option["color"] != old.get("color"):
+            warnings.append(
+                f"'{name}' option '{option['name']}' stays {old.get('color')}: "
+                "option colours cannot be changed through the API"
+            )
+    if not added and not removed:
+        return None
+
+    # The options sent are the full list; existing ones are referenced by ID
+    kept = [
+        {"id": option["id"], "name": option["name"]} if option.get("id") else {"name": option["name"]}
+        for option in current if option["name"] not in removed
+    ]
+    new = [{k: v for k, v in option.items() if k in ("name", "color")} for option in added]
+    if added:
+        changes["options_added"][name] = [option["name"] for option in added]
+    if removed:
+        changes["options_removed"][name] = removed
+    return {prop_type: {"options": kept + new}}
+
+
+def diff_schema(
+    current: Dict[str, Any],
+    desired: Dict[str, Dict[str, Any]],
+    renames: Optional[Dict[str, str]] = None,
+    remove: Optional[List[str]] = None,
+    remove_missing: bool = False,
+    exact_options: Optional[List[str]] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+    """
+    The minimal PATCH properties body taking a schema from `current` to `desired`.
+
+    Args:
+        current: Retrieved data source properties (name -> property object)
+        desired: Property name -> {type: settings} (see property_definition)
+        renames: Current name -> new name
+        remove: Property names to remove
+        remove_missing: Also remove properties and select options that
+            `desired` leaves out
+        exact_options: Properties whose desired option lists are complete;
+            options they leave out are removed
+
+    Returns:
+        (body, changes, warnings); the body is empty when nothing changes
+    """
+    renames = dict(renames or {})
+    warnings: List[str] = []
+    changes: Dict[str, Any] = {
+        "added": [], "renamed": [], "changed": [], "removed": [],
+        "options_added": {}, "options_removed": {}
+    }
+
+    # A data source has one title property, so a differently named one is a rename
+    desired_titles = [n for n, d in desired.items() if _schema_type(d) == "title"]
+    current_titles = [n for n, p in current.items() if p.get("type") == "title"]
+    if desired_titles and current_titles:
+        old, new = current_titles[0], desired_titles[0]
+        if old != new and new not in current and old not in desired and old not in renames:
+            renames[old] = new
+
+    renamed_to = {}
+    for old, new in renames.items():
+        if old not in current:
+            warnings.append(f"Cannot rename '{old}': no such property")
+        elif new in current and new not in renames:
+            warnings.append(f"Cannot rename '{old}' to '{new}': the name is taken")
+        else:
+            renamed_to[new] = old
+
+    body: Dict[str, Any] = {}
+    for name, definition in desired.items():
+        old = renamed_to.get(name, name)
+        existing = current.get(old)
+        prop_type = _schema_type(definition)
+        if existing is None:
+            body[name] = definition
+            changes["added"].append(name)
+            continue
+
+        update: Dict[str, Any] = {}
+        if old != name:
+            update["name"] = name
+            changes["renamed"].append([old, name])
+        config = definition[prop_type] or {}
+        if prop_type != existing.get("type"):
+            if existing.get("type") == "title":
+                warnings.append(f"'{old}' is the title property; its type cannot change")
+            else:
+                update[prop_type] = config
+                changes["changed"].append(name)
+        elif prop_type in OPTION_TYPES:
+            prune = remove_missing or name in (exact_options or ())
+            delta = _option_delta(name, existing, config, prune, changes, warnings)
+            if delta:
+                update.update(delta)
+        elif prop_type == "status":
+            current_names = {o["name"] for o in existing.get("status", {}).get("options", [])}
+            wanted_names = {o["name"] for o in config.get("options", [])}
+            if wanted_names - current_names:
+                warnings.append(f"'{name}' status options cannot be changed through the API")
+        elif _settings(prop_type, config) != _settings(prop_type, existing.get(prop_type) or {}):
+            update[prop_type] = config
+            changes["changed"].append(name)
+        if update:
+            body[old] = update
+
+    # Renames of properties `desired` does not describe change only the name
+    for new, old in renamed_to.items():
+        if new in desired:
+            continue
+        if old in desired:
+            warnings.append(f"Cannot rename '{old}' to '{new}': '{old}' is still in the desired schema")
+            continue
+        body[old] = {"name": new}
+        changes["renamed"].append([old, new])
+
+    removals = list(remove or [])
+    if remove_missing:
+        removals += [n for n in current if n not in desired and n not in renames]
+    for name in dict.fromkeys(removals):
+        if name not in current:
+            continue
+        if current[name].get("type") == "title":
+            warnings.append(f"'{name}' is the title property and cannot be removed")
+            continue
+        body[name] = None
+        changes["removed"].append(name)
+    return body, changes, warnings
+
+
+# ----------------------------------------------------------------------
+# Schema cache
+# ----------------------------------------------------------------------
+
+_schemas: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_schemas_lock = threading.Lock()
+
+
+def _cache_file(data_source_id: str):
+    return get_cache_dir("schemas") / f"{data_source_id.replace('-', '')}.json"
+
+
+def cache_schema(data_source: Dict[str, Any], fetched: Optional[float] = None) -> None:
+    """Remember a data source's schema, e.g. one returned by a create or update."""
+    fetched = fetched or time.time()
+    data_source_id = data_source["id"]
+    entry = {"id": data_source_id, "properties": data_source.get("properties", {})}
+    with _schemas_lock:
+        _schemas[data_source_id.replace("-", "")] = (fetched, entry)
+    cache_file = _cache_file(data_source_id)
+    tmp_file = cache_file.with_suffix(".tmp")
+    try:
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"fetched": fetched, "data_source": entry}, f, ensure_ascii=False)
+        tmp_file.replace(cache_file)
+    except OSError:
+        pass
+
+
+def invalidate_schema(data_source_id: str) -> None:
+    """Forget a cached schema, so the next migration fetches it again."""
+    with _schemas_lock:
+        _schemas.pop(data_source_id.replace("-", ""), None)
+    _cache_file(data_source_id).unlink(missing_ok=True)
+
+
+def cached_schema(data_source_id: str, max_age: float = DEFAULT_CACHE_TTL) -> Optional[Dict[str, Any]]:
+    """A cached schema no older than `max_age` seconds, or None."""
+    key = data_source_id.replace("-", "")
+    with _schemas_lock:
+        entry = _schemas.get(key)
+    if entry is None:
+        try:
+            with open(_cache_file(data_source_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entry = (data["fetched"], data["data_source"])
+        except (OSError, ValueError, KeyError):
+            return None
+        with _schemas_lock:
+            _schemas[key] = entry
+    fetched, data_source = entry
+    return data_source if time.time() - fetched <= max_age else None
+
+
+# ----------------------------------------------------------------------
+# Migrations
+# ----------------------------------------------------------------------
+
+class SchemaMigrator:
+    """Plans and applies minimal schema migrations, concurrently across data sources."""
+
+    def __init__(self, client: Any, max_workers: Optional[int] = None, cache_ttl: Optional[float] = None):
+        """
+        Args:
+            client: notion_client.Client
+            max_workers: Concurrent migrations (default: NOTION_MAX_CONCURRENCY)
+            cache_ttl: Seconds a cached schema is trusted (default: NOTION_SCHEMA_CACHE_TTL)
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.cache_ttl = DEFAULT_CACHE_TTL if cache_ttl is None else cache_ttl
+
+    def data_source_id(self, migration: Dict[str, Any]) -> str:
+        if migration.get("data_source_id"):
+            return migration["data_source_id"]
+        if not migration.get("database_id"):
+            raise ValueError("A migration needs a database_id or a data_source_id")
+        database = call_with_retry(self.client.databases.retrieve, database_id=migration["database_id"])
+        sources = database.get("data_sources", [])
+        if not sources:
+            raise ValueError(f"No data sources found for database {migration['database_id']}")
+        return sources[0]["id"]
+
+    def current_schema(self, data_source_id: str, refresh: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """(properties, whether they came from the cache)."""
+        if not refresh:
+            cached = cached_schema(data_source_id, self.cache_ttl)
+            if cached is not None:
+                return cached["properties"], True
+        data_source = call_with_retry(self.client.request, path=f"data_sources/{data_source_id}", method="GET")
+        cache_schema(data_source)
+        return data_source.get("properties", {}), False
+
+    def plan(self, migration: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
+        """
+        The PATCH body for one migration, without applying it.
+
+        Args:
+            migration: {"database_id" or "data_source_id", "properties",
+                optional "renames", "remove", "remove_missing" and "exact_options"}
+            refresh: Fetch the current schema even when a cached one is fresh
+        """
+        data_source_id = self.data_source_id(migration)
+        desired = {
+            name: property_definition(name, spec)
+            for name, spec in (migration.get("properties") or {}).items()
+        }
+        current, from_cache = self.current_schema(data_source_id, refresh)
+        body, changes, warnings = diff_schema(
+            current,
+            desired,
+            migration.get("renames"),
+            migration.get("remove"),
+            bool(migration.get("remove_missing", False)),
+            migration.get("exact_options")
+        )
+        return {
+            "database_id": migration.get("database_id"),
+            "data_source_id": data_source_id,
+            "status": "planned" if body else "unchanged",
+            "body": {"properties": body} if body else {},
+            "changes": {k: v for k, v in changes.items() if v},
+            "warnings": warnings,
+            "cached_schema": from_cache
+        }
+
+    def apply(self, migration: Dict[str, Any], dry_run: bool = False) -> Dict[str, Any]:
+        """Plan one migration and send its PATCH, unless nothing changes or dry_run is set."""
+        plan = self.plan(migration)
+        if dry_run or not plan["body"]:
+            return plan
+        try:
+            response = self._patch(plan)
+        except APIResponseError as e:
+            if e.code != APIErrorCode.ValidationError or not plan["cached_schema"]:
+                raise
+            # The cached schema may be stale (e.g. an option was deleted in Notion)
+            plan = self.plan(migration, refresh=True)
+            if not plan["body"]:
+                return plan
+            response = self._patch(plan)
+        cache_schema(response)
+        return dict(plan, status="applied")
+
+    def _patch(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return call_with_retry(
+                self.client.request, path=f"data_sources/{plan['data_source_id']}", method="PATCH", body=plan["body"]
+            )
+        except APIResponseError:
+            invalidate_schema(plan["data_source_id"])
+            raise
+
+    def migrate(self, migrations: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Apply migrations concurrently (one per data source).
+
+        Returns:
+            status, migrations (one plan or error per migration, in order),
+            applied, unchanged, planned and failed counts, dry_run, seconds
+            and message
+        """
+        started = time.perf_counter()
+        results = []
+        for migration, (result, error) in zip(
+            migrations, parallel_map(lambda m: self.apply(m, dry_run), migrations, self.max_workers)
+        ):
+            if error is not None:
+                result = {
+                    "database_id": migration.get("database_id"),
+                    "data_source_id": migration.get("data_source_id"),
+                    "status": "error",
+                    "error": str(error)
+                }
+            results.append(result)
+
+        counts = {status: sum(1 for r in results if r["status"] == status) for status in ("applied", "unchanged", "planned")}
+        failed = sum(1 for r in results if r["status"] == "error")
+        seconds = time.perf_counter() - started
+        if dry_run:
+            message = f"{counts['planned']} of {len(results)} schemas would change"
+        else:
+            message = f"Migrated {counts['applied']} schemas, {counts['unchanged']} already up to date"
+        message += (f", {failed} failed" if failed else "") + f" in {seconds:.1f}s"
+        return {
+            "status": "success" if not failed else "error",
+            "migrations": results,
+            **counts,
+            "failed": failed,
+            "dry_run": dry_run,
+            "seconds": round(seconds, 2),
+            "message": message
+        }
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Add detailed prompt templates as rich text content to each prompt page
+Add detailed prompt templates as formatted page content to each prompt page
 """
 
 import sys
@@ -10,7 +10,6 @@ load_dotenv()
 sys.path.insert(0, '.')
 
 from notion_api_client import NotionTemplateClient
-from tools import update_notion_page
 
 print("="*70)
 print("  🚀 Adding Detailed Prompt Templates to Prompt Pages")
@@ -369,35 +368,10 @@ for page in prompt_pages:
         template_content = prompt_templates[prompt_name]
         
         try:
-            # Add the template as content blocks to the page
-            content = {
-                "children": [
-                    {
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {"content": template_content}
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-            
-            result = update_notion_page(
-                page_id=page_id,
-                content=content,
-                api_key=api_key
-            )
-            
-            if result.get("status") == "success":
-                print(f"✅ Added template to: {prompt_name}")
-                updated_count += 1
-            else:
-                print(f"❌ Failed to add template to {prompt_name}: {result.get('error')}")
-                failed_count += 1
+            # Compile the Markdown template into native blocks (headings, nested lists)
+            client.append_markdown(page_id, template_content)
+            print(f"✅ Added template to: {prompt_name}")
+            updated_count += 1
                 
         except Exception as e:
             print(f"❌ Failed to add template to {prompt_name}: {str(e)}")
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 Configure existing LinkedIn Content OS databases with proper properties
+
+Only the properties and options that differ from each database's current
+schema are sent, and the five databases are migrated concurrently. Pass
+--dry-run to print the changes without making them.
 """
 
 import sys
@@ -24,13 +28,11 @@ print("="*70)
 print("  🔧 Configuring Your LinkedIn Content OS Databases")
 print("="*70)
 
-# 1. Configure Content Hub
-print("\n1️⃣  Configuring Content Hub...")
-print("-" * 70)
-try:
-    client.client.databases.update(
-        database_id=CONTENT_HUB_ID,
-        properties={
+# Desired schemas; only properties and options that differ are sent
+MIGRATIONS = [
+    ("Content Hub", {
+        "database_id": CONTENT_HUB_ID,
+        "properties": {
             "Post Idea": {"title": {}},
             "Status": {
                 "select": {
@@ -56,18 +58,10 @@ try:
                 }
             }
         }
-    )
-    print("   ✅ Content Hub configured with 7 properties")
-except Exception as e:
-    print(f"   ❌ Failed: {str(e)}")
-
-# 2. Configure Content Pillars
-print("\n2️⃣  Configuring Content Pillars...")
-print("-" * 70)
-try:
-    client.client.databases.update(
-        database_id=CONTENT_PILLARS_ID,
-        properties={
+    }),
+    ("Content Pillars", {
+        "database_id": CONTENT_PILLARS_ID,
+        "properties": {
             "Pillar Name": {"title": {}},
             "Description": {"rich_text": {}},
             "Target Audience": {"rich_text": {}},
@@ -90,18 +84,10 @@ try:
                 }
             }
         }
-    )
-    print("   ✅ Content Pillars configured with 5 properties")
-except Exception as e:
-    print(f"   ❌ Failed: {str(e)}")
-
-# 3. Configure Prompt Library
-print("\n3️⃣  Configuring Prompt Library...")
-print("-" * 70)
-try:
-    client.client.databases.update(
-        database_id=PROMPT_LIBRARY_ID,
-        properties={
+    }),
+    ("Prompt Library", {
+        "database_id": PROMPT_LIBRARY_ID,
+        "properties": {
             "Prompt Name": {"title": {}},
             "Category": {
                 "select": {
@@ -125,18 +111,10 @@ try:
                 }
             }
         }
-    )
-    print("   ✅ Prompt Library configured with 5 properties")
-except Exception as e:
-    print(f"   ❌ Failed: {str(e)}")
-
-# 4. Configure Voice Discovery
-print("\n4️⃣  Configuring Voice Discovery...")
-print("-" * 70)
-try:
-    client.client.databases.update(
-        database_id=VOICE_DISCOVERY_ID,
-        properties={
+    }),
+    ("Voice Discovery", {
+        "database_id": VOICE_DISCOVERY_ID,
+        "properties": {
             "Question": {"title": {}},
             "Your Answer": {"rich_text": {}},
             "Category": {
@@ -151,18 +129,10 @@ try:
             },
             "Completed": {"checkbox": {}}
         }
-    )
-    print("   ✅ Voice Discovery configured with 4 properties")
-except Exception as e:
-    print(f"   ❌ Failed: {str(e)}")
-
-# 5. Configure Weekly Review
-print("\n5️⃣  Configuring Weekly Review...")
-print("-" * 70)
-try:
-    client.client.databases.update(
-        database_id=WEEKLY_REVIEW_ID,
-        properties={
+    }),
+    ("Weekly Review", {
+        "database_id": WEEKLY_REVIEW_ID,
+        "properties": {
             "Week": {"title": {}},
             "Date Range": {"date": {}},
             "Wins This Week": {"rich_text": {}},
@@ -180,13 +150,26 @@ try:
                 }
             }
         }
-    )
-    print("   ✅ Weekly Review configured with 7 properties")
-except Exception as e:
-    print(f"   ❌ Failed: {str(e)}")
+    })
+]
+
+dry_run = "--dry-run" in sys.argv
+result = client.migrate_schemas([migration for _, migration in MIGRATIONS], dry_run=dry_run)
+
+for number, ((name, _), plan) in enumerate(zip(MIGRATIONS, result["migrations"]), 1):
+    print(f"\n{number}️⃣  {name}")
+    print("-" * 70)
+    if plan["status"] == "error":
+        print(f"   ❌ Failed: {plan['error']}")
+    elif plan["status"] == "unchanged":
+        print("   ✅ Already up to date")
+    else:
+        verb = "Would change" if dry_run else "Changed"
+        for change, items in plan["changes"].items():
+            print(f"   {verb} ({change}): {items}")
+    for warning in plan.get("warnings", []):
+        print(f"   ⚠️  {warning}")
 
 print("\n" + "="*70)
-print("  ✅ Configuration Complete!")
+print(f"  {'✅' if result['status'] == 'success' else '⚠️'} {result['message']}")
 print("="*70)
-print("\nAll 5 databases now have proper properties and are ready for content!")
-
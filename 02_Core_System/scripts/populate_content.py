@@ -24,6 +24,14 @@ print("="*70)
 print("  📝 Populating LinkedIn Content OS with Sample Content")
 print("="*70)
 
+
+def load(database_id, rows, column_map):
+    """Upsert sample rows by their title, so re-running the script adds no duplicates."""
+    result = client.bulk_load(database_id, rows, column_map=column_map)
+    for error in result["errors"]:
+        print(f"   ❌ Failed to add {error['key'] or 'row ' + str(error['row'])}: {error['error']}")
+
+
 # 1. Add Content Pillars
 print("\n1️⃣  Adding Content Pillars...")
 print("-" * 70)
@@ -52,21 +60,13 @@ pillars = [
     }
 ]
 
-for pillar in pillars:
-    try:
-        client.client.pages.create(
-            parent={"database_id": CONTENT_PILLARS_ID},
-            properties={
-                "Pillar Name": {"title": [{"text": {"content": pillar["name"]}}]},
-                "Description": {"rich_text": [{"text": {"content": pillar["description"]}}]},
-                "Target Audience": {"rich_text": [{"text": {"content": pillar["audience"]}}]},
-                "Post Frequency": {"select": {"name": pillar["frequency"]}},
-                "Performance": {"select": {"name": pillar["performance"]}}
-            }
-        )
-        print(f"   ✅ Added: {pillar['name']}")
-    except Exception as e:
-        print(f"   ❌ Failed to add {pillar['name']}: {str(e)}")
+load(CONTENT_PILLARS_ID, pillars, {
+    "name": "Pillar Name",
+    "description": "Description",
+    "audience": "Target Audience",
+    "frequency": "Post Frequency",
+    "performance": "Performance"
+})
 
 # 2. Add Prompts
 print("\n2️⃣  Adding Prompt Library...")
@@ -103,21 +103,13 @@ prompts = [
     }
 ]
 
-for prompt in prompts:
-    try:
-        client.client.pages.create(
-            parent={"database_id": PROMPT_LIBRARY_ID},
-            properties={
-                "Prompt Name": {"title": [{"text": {"content": prompt["name"]}}]},
-                "Category": {"select": {"name": prompt["category"]}},
-                "Prompt Template": {"rich_text": [{"text": {"content": prompt["template"]}}]},
-                "Use Case": {"rich_text": [{"text": {"content": prompt["use_case"]}}]},
-                "Effectiveness": {"select": {"name": prompt["effectiveness"]}}
-            }
-        )
-        print(f"   ✅ Added: {prompt['name']}")
-    except Exception as e:
-        print(f"   ❌ Failed to add {prompt['name']}: {str(e)}")
+load(PROMPT_LIBRARY_ID, prompts, {
+    "name": "Prompt Name",
+    "category": "Category",
+    "template": "Prompt Template",
+    "use_case": "Use Case",
+    "effectiveness": "Effectiveness"
+})
 
 # 3. Add Content Ideas
 print("\n3️⃣  Adding Content Hub Ideas...")
@@ -147,25 +139,13 @@ ideas = [
     }
 ]
 
-for idea in ideas:
-    try:
-        props = {
-            "Post Idea": {"title": [{"text": {"content": idea["title"]}}]},
-            "Status": {"select": {"name": idea["status"]}},
-            "Content Pillar": {"select": {"name": idea["pillar"]}},
-            "Approved": {"checkbox": idea["approved"]}
-        }
-        
-        if idea["draft"]:
-            props["Draft"] = {"rich_text": [{"text": {"content": idea["draft"]}}]}
-        
-        client.client.pages.create(
-            parent={"database_id": CONTENT_HUB_ID},
-            properties=props
-        )
-        print(f"   ✅ Added: {idea['title']}")
-    except Exception as e:
-        print(f"   ❌ Failed to add {idea['title']}: {str(e)}")
+load(CONTENT_HUB_ID, ideas, {
+    "title": "Post Idea",
+    "status": "Status",
+    "pillar": "Content Pillar",
+    "draft": "Draft",
+    "approved": "Approved"
+})
 
 # 4. Add Voice Discovery Questions
 print("\n4️⃣  Adding Voice Discovery Workbook...")
@@ -194,20 +174,12 @@ questions = [
     }
 ]
 
-for q in questions:
-    try:
-        client.client.pages.create(
-            parent={"database_id": VOICE_DISCOVERY_ID},
-            properties={
-                "Question": {"title": [{"text": {"content": q["question"]}}]},
-                "Category": {"select": {"name": q["category"]}},
-                "Your Answer": {"rich_text": [{"text": {"content": q["answer"]}}]},
-                "Completed": {"checkbox": False}
-            }
-        )
-        print(f"   ✅ Added: {q['question'][:50]}...")
-    except Exception as e:
-        print(f"   ❌ Failed: {str(e)}")
+load(VOICE_DISCOVERY_ID, [dict(q, completed=False) for q in questions], {
+    "question": "Question",
+    "category": "Category",
+    "answer": "Your Answer",
+    "completed": "Completed"
+})
 
 print("\n" + "="*70)
 print("  ✅ Content Population Complete!")
@@ -10,7 +10,6 @@ load_dotenv()
 sys.path.insert(0, '.')
 
 from notion_api_client import NotionTemplateClient
-from tools import query_notion_database
 
 print("="*70)
 print("  🚀 Populating Prompt Library with Detailed Properties")
@@ -23,17 +22,6 @@ PROMPT_LIBRARY_ID = "2830da0a-a5c8-8105-adab-e20090bb6046"
 
 client = NotionTemplateClient(api_key=api_key)
 
-# Get all prompts from the database
-print("\n📋 Retrieving existing prompts...")
-try:
-    # Use client directly to avoid the sorts parameter issue
-    prompt_pages = client.query_database(database_id=PROMPT_LIBRARY_ID)
-    print(f"✅ Found {len(prompt_pages)} prompts to update")
-        
-except Exception as e:
-    print(f"❌ Error retrieving prompts: {str(e)}")
-    sys.exit(1)
-
 # Define comprehensive prompt data
 prompt_data = {
     "The LinkedIn Hook Generator": {
@@ -218,62 +206,29 @@ prompt_data = {
     }
 }
 
-# Update each prompt with detailed properties
-print(f"\n🔄 Updating {len(prompt_pages)} prompts with detailed properties...")
+# Upsert each prompt by name; prompts whose properties already match are skipped
+print(f"\n🔄 Loading {len(prompt_data)} prompts with detailed properties...")
 print("-" * 70)
 
-updated_count = 0
-failed_count = 0
+rows = [
+    {"Prompt Name": name, "Category": data["category"], "Use Case": data["use_case"]}
+    for name, data in prompt_data.items()
+]
+result = client.bulk_load(PROMPT_LIBRARY_ID, rows, key="Prompt Name")
 
-for page in prompt_pages:
-    page_id = page["id"]
-    prompt_name = ""
-    
-    # Get the prompt name from the title property
-    title_prop = page["properties"].get("Prompt Name", {})
-    if title_prop and "title" in title_prop and len(title_prop["title"]) > 0:
-        prompt_name = title_prop["title"][0]["plain_text"]
-    
-    if prompt_name in prompt_data:
-        data = prompt_data[prompt_name]
-        
-        try:
-            # Update the page with existing properties only
-            client.client.pages.update(
-                page_id=page_id,
-                properties={
-                    "Category": {
-                        "select": {"name": data["category"]}
-                    },
-                    "Use Case": {
-                        "rich_text": [
-                            {
-                                "type": "text", 
-                                "text": {"content": data["use_case"]}
-                            }
-                        ]
-                    }
-                }
-            )
-            print(f"✅ Updated: {prompt_name}")
-            updated_count += 1
-            
-        except Exception as e:
-            print(f"❌ Failed to update {prompt_name}: {str(e)}")
-            failed_count += 1
-    else:
-        print(f"⚠️  No data found for: {prompt_name}")
-        failed_count += 1
+for error in result["errors"]:
+    print(f"❌ Failed to update {error['key']}: {error['error']}")
 
 print("\n" + "="*70)
 print(f"  📊 UPDATE COMPLETE!")
 print("="*70)
-print(f"✅ Successfully updated: {updated_count} prompts")
-print(f"❌ Failed updates: {failed_count} prompts")
-print(f"📋 Total prompts processed: {len(prompt_pages)}")
+print(f"✅ Successfully updated: {result['updated']} prompts")
+print(f"🆕 Added: {result['created']} prompts")
+print(f"⏭️  Already up to date: {result['unchanged']} prompts")
+print(f"❌ Failed updates: {result['failed']} prompts")
 
-if updated_count > 0:
-    print(f"\n🎉 Your Prompt Library now has complete information for {updated_count} prompts!")
+if result["status"] == "success":
+    print(f"\n🎉 Your Prompt Library now has complete information for {len(rows)} prompts!")
     print("📝 Each prompt now includes:")
     print("   • Category classification")
     print("   • Specific use case guidance")
@@ -284,6 +239,6 @@ if updated_count > 0:
     print(f"\n🚀 Ready to create amazing LinkedIn content!")
 
 else:
-    print(f"\n⚠️  No prompts were updated. Please check the error messages above.")
+    print(f"\n⚠️  Some prompts were not updated. Please check the error messages above.")
 
 print("="*70)
@@ -2,6 +2,9 @@
 """
 Interactive test - Creates real content in your Notion workspace
 This lets you see the tools working end-to-end
+
+Run with --standin to create the content in a local notion_standin.py
+server instead of your workspace.
 """
 
 import os
@@ -219,6 +222,10 @@ def test_update_generation():
 
 def main():
     """Run interactive tests"""
+    if "--standin" in sys.argv:
+        from test_tools import start_standin
+        start_standin()
+    
     print("\n" + "="*60)
     print("  🧪 MCP Server - Interactive Tool Testing")
     print("="*60)
@@ -2,6 +2,9 @@
 """
 Comprehensive test script for all MCP server tools
 Tests each tool with the actual Notion API
+
+Run with --standin to test against a local, seeded notion_standin.py server
+instead (no credentials or network needed).
 """
 
 import os
@@ -185,8 +188,23 @@ def test_database_tools():
     print("\n   💡 To test database tools, you need a database ID")
     print("   Get it from any Notion database URL")
 
+def start_standin():
+    """Serve a seeded local Notion stand-in and point the tools at it."""
+    from notion_standin import StandinServer, seed_workspace
+    
+    server = StandinServer().start()
+    seeded = seed_workspace(server.store, pages=20, database_rows=10)
+    os.environ["NOTION_API_BASE_URL"] = server.base_url
+    os.environ["NOTION_API_KEY"] = "secret_standin"
+    os.environ["NOTION_PARENT_PAGE_ID"] = seeded["root_page_id"]
+    print(f"🧪 Using Notion stand-in at {server.base_url}")
+    return server
+
 def main():
     """Run all tests"""
+    if "--standin" in sys.argv:
+        start_standin()
+    
     print("\n")
     print("╔" + "="*58 + "╗")
     print("║" + " "*10 + "MCP Server Tools - Comprehensive Test" + " "*11 + "║")
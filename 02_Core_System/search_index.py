@@ -0,0 +1,324 @@
+"""
+Workspace Full-Text Search Index
+
+On-disk inverted index over extracted page text with BM25 ranking. Postings are
+stored in SQLite (one row per term/page pair, clustered by term) so a query only
+reads the posting lists of its own terms. Pages are indexed incrementally: a page
+whose content fingerprint is unchanged is skipped, and a changed page only has
+its own postings rewritten.
+
+Notion's search endpoint matches titles only; this index covers the block text
+the extraction tools already pull down.
+"""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+from local_cache import get_cache_dir
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "with", "this", "that", "from",
+    "was", "were", "its", "into", "has", "have", "had", "of", "to", "in", "on",
+    "at", "by", "an", "or", "as", "is", "it", "be", "if", "so"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    page_id TEXT UNIQUE NOT NULL,
+    title TEXT,
+    url TEXT,
+    content TEXT,
+    length INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_by_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase search tokens without stopwords."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def default_index_path() -> Path:
+    """Default location of the workspace index."""
+    return get_cache_dir("search") / "workspace_index.sqlite3"
+
+
+class WorkspaceSearchIndex:
+    """BM25-ranked inverted index of workspace pages stored in SQLite."""
+
+    def __init__(self, index_path: Optional[Path] = None, k1: float = 1.2, b: float = 0.75, title_weight: int = 3):
+        """
+        Args:
+            index_path: SQLite file holding the index (default: cache dir)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalisation
+            title_weight: How many times title terms are counted
+        """
+        self.index_path = Path(index_path) if index_path else default_index_path()
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Posting inserts land all over the term-ordered B-tree; a larger page cache keeps bulk indexing fast
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._doc_lengths: Optional[Dict[int, int]] = None
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def _meta(self, key: str) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump_meta(self, key: str, delta: int) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (key, delta)
+        )
+
+    def _delete_document(self, doc_id: int, length: int) -> None:
+        self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+        self._bump_meta("doc_count", -1)
+        self._bump_meta("total_length", -length)
+
+    def _index_one(self, page: Dict[str, Any]) -> str:
+        page_id = page.get("page_id") or page.get("id")
+        title = page.get("title") or ""
+        content = page.get("content_text") or ""
+        fingerprint = hashlib.sha1(f"{title}\n{content}".encode("utf-8")).hexdigest()
+
+        existing = self._conn.execute(
+            "SELECT doc_id, length, fingerprint FROM documents WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        if existing and existing[2] == fingerprint:
+            return "unchanged"
+        if existing:
+            self._delete_document(existing[0], existing[1])
+
+        counts: Dict[str, int] = {}
+        for token in tokenize(title):
+            counts[token] = counts.get(token, 0) + self.title_weight
+        content_tokens = tokenize(content)
+        for token in content_tokens:
+            counts[token] = counts.get(token, 0) + 1
+        length = sum(counts.values())
+
+        cursor = self._conn.execute(
+            "INSERT INTO documents (page_id, title, url, content, length, fingerprint, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (page_id, title, page.get("url", ""), content, length, fingerprint, datetime.now().isoformat())
+        )
+        doc_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+            [(term, doc_id, tf) for term, tf in counts.items()]
+        )
+        self._bump_meta("doc_count", 1)
+        self._bump_meta("total_length", length)
+        return "updated" if existing else "added"
+
+    def index_pages(self, pages: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Add or refresh pages in the index (single transaction).
+
+        Args:
+            pages: Page dicts with page_id, title, url and content_text
+
+        Returns:
+            Counts of added, updated, unchanged and skipped pages
+        """
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        with self._lock, self._conn:
+            for page in pages:
+                if page.get("error") or not (page.get("page_id") or page.get("id")):
+                    stats["skipped"] += 1
+                    continue
+                stats[self._index_one(page)] += 1
+            if stats["added"] or stats["updated"]:
+                self._doc_lengths = None
+        return stats
+
+    def remove_pages(self, page_ids: Iterable[str]) -> int:
+        """Remove pages from the index. Returns the number removed."""
+        removed = 0
+        with self._lock, self._conn:
+            for page_id in page_ids:
+                row = self._conn.execute(
+                    "SELECT doc_id, length FROM documents WHERE page_id = ?", (page_id,)
+                ).fetchone()
+                if row:
+                    self._delete_document(row[0], row[1])
+                    removed += 1
+            if removed:
+                self._doc_lengths = None
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size information."""
+        with self._lock:
+            doc_count = self._meta("doc_count")
+            term_count = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+            return {
+                "index_path": str(self.index_path),
+                "documents": doc_count,
+                "terms": term_count,
+                "average_length": round(self._meta("total_length") / doc_count, 2) if doc_count else 0
+            }
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def _lengths(self) -> Dict[int, int]:
+        # Document lengths are needed for every scored posting; keep them in memory
+        if self._doc_lengths is None:
+            self._doc_lengths = dict(self._conn.execute("SELECT doc_id, length FROM documents"))
+        return self._doc_lengths
+
+    def search(self, query: str, k: int = 10, snippet_chars: int = 200) -> List[Dict[str, Any]]:
+        """
+        Rank pages for a query with BM25.
+
+        Args:
+            query: Free-text query
+            k: Number of results to return
+            snippet_chars: Approximate snippet length
+
+        Returns:
+            Ranked results with page_id, title, url, score and highlighted snippet
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count = self._meta("doc_count")
+            if doc_count == 0:
+                return []
+            avg_length = self._meta("total_length") / doc_count
+            lengths = self._lengths()
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._conn.execute(
+                    "SELECT doc_id, tf FROM postings WHERE term = ?", (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings:
+                    norm = self.k1 * (1 - self.b + self.b * lengths.get(doc_id, avg_length) / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            top = sorted(scores.items(), key=lambda item: -item[1])[:k]
+            results = []
+            for doc_id, score in top:
+                page_id, title, url, content = self._conn.execute(
+                    "SELECT page_id, title, url, content FROM documents WHERE doc_id = ?", (doc_id,)
+                ).fetchone()
+                results.append({
+                    "page_id": page_id,
+                    "title": title,
+                    "url": url,
+                    "score": round(score, 4),
+                    "snippet": make_snippet(content or title or "", terms, snippet_chars)
+                })
+            return results
+
+
+# One open index per path for the lifetime of the process, shared by the
+# search tools and the extraction tools that feed it
+_indexes: Dict[str, WorkspaceSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(index_path: Optional[str] = None) -> WorkspaceSearchIndex:
+    """Return the shared index instance for a path (default: cache dir)."""
+    key = index_path or ""
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = WorkspaceSearchIndex(Path(index_path) if index_path else None)
+        return _indexes[key]
+
+
+def index_extracted_pages(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Feed freshly extracted pages into the default index.
+
+    Called by the extraction tools; indexing problems are reported, never raised,
+    so an extraction result is never lost to a search-index failure.
+    """
+    try:
+        return get_search_index().index_pages(pages)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def make_snippet(text: str, terms: List[str], max_chars: int = 200) -> str:
+    """
+    Pick the passage with the most query-term hits and highlight them with **bold**.
+
+    Args:
+        text: Full page text
+        terms: Query terms (already tokenized)
+        max_chars: Approximate snippet length
+    """
+    if not text:
+        return ""
+
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\b", re.IGNORECASE)
+    matches = [m.start() for m in pattern.finditer(text)]
+    if not matches:
+        snippet = text[:max_chars]
+        return snippet + ("…" if len(text) > max_chars else "")
+
+    # Densest window: the match followed by the most other matches within max_chars
+    best_start, best_hits = matches[0], 0
+    right = 0
+    for left, position in enumerate(matches):
+        while right < len(matches) and matches[right] < position + max_chars:
+            right += 1
+        if right - left > best_hits:
+            best_start, best_hits = position, right - left
+
+    start = max(0, best_start - max_chars // 4)
+    end = min(len(text), start + max_chars)
+    snippet = " ".join(text[start:end].split())
+    snippet = pattern.sub(lambda m: f"**{m.group(0)}**", snippet)
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
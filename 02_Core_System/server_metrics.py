@@ -0,0 +1,347 @@
+"""
+Server Metrics
+
+Lightweight in-process instrumentation for the MCP server:
+
+- Tool calls: wall time, result size, outcome and the number of Notion API
+  calls each one triggered (via the `track_tool` decorator)
+- Notion API calls: latency, status codes, bytes received, 429s and retries
+  per endpoint, and GETs coalesced into an identical in-flight request
+  (recorded by the transport in notion_transport.py)
+
+Everything is kept in fixed-bucket histograms, so memory stays constant no
+matter how long the server runs. Metrics can be read as a JSON snapshot or
+in the Prometheus text exposition format; set MCP_METRICS_PROM_FILE to have
+the text file rewritten periodically for a node_exporter textfile collector.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Counter for the tool call currently running in this context (None outside tools)
+_current_tool: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "current_tool", default=None
+)
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else min(self.min, self.buckets[0])
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return max(self.min, min(self.max, estimate))
+            seen += bucket_count
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Any]:
+        """count/sum/min/max/mean and p50/p95/p99, multiplied by `scale`."""
+        def scaled(value):
+            return None if value is None else round(value * scale, 3)
+        return {
+            "count": self.count,
+            "sum": scaled(self.sum),
+            "mean": scaled(self.sum / self.count) if self.count else None,
+            "min": scaled(self.min),
+            "max": scaled(self.max),
+            "p50": scaled(self.quantile(0.5)),
+            "p95": scaled(self.quantile(0.95)),
+            "p99": scaled(self.quantile(0.99))
+        }
+
+    def prometheus_lines(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        sep = "," if labels else ""
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class MetricsRegistry:
+    """Thread-safe store for tool and Notion API metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+        self._export_path = os.getenv("MCP_METRICS_PROM_FILE")
+        self._export_interval = float(os.getenv("MCP_METRICS_EXPORT_INTERVAL", "10"))
+        self._last_export = 0.0
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self.started_at = time.time()
+            self.tools: Dict[str, Dict[str, Any]] = {}
+            self.endpoints: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            self.retries: Dict[str, int] = {}
+            self.coalesced: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def observe_tool(self, tool: str, seconds: float, result_bytes: int, api_calls: int, outcome: str) -> None:
+        with self._lock:
+            entry = self.tools.get(tool)
+            if entry is None:
+                entry = self.tools[tool] = {
+                    "outcomes": {},
+                    "latency": Histogram(LATENCY_BUCKETS),
+                    "result_bytes": Histogram(SIZE_BUCKETS),
+                    "api_calls": Histogram(COUNT_BUCKETS)
+                }
+            entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+            entry["latency"].observe(seconds)
+            entry["result_bytes"].observe(result_bytes)
+            entry["api_calls"].observe(api_calls)
+
+    def observe_api(self, method: str, endpoint: str, status: int, seconds: float, bytes_received: int) -> None:
+        counter = _current_tool.get()
+        with self._lock:
+            if counter is not None:
+                counter["api_calls"] += 1
+            entry = self.endpoints.get((method, endpoint))
+            if entry is None:
+                entry = self.endpoints[(method, endpoint)] = {
+                    "statuses": {},
+                    "bytes_received": 0,
+                    "latency": Histogram(LATENCY_BUCKETS)
+                }
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            entry["bytes_received"] += bytes_received
+            entry["latency"].observe(seconds)
+
+    def record_retry(self, operation: str) -> None:
+        with self._lock:
+            self.retries[operation] = self.retries.get(operation, 0) + 1
+
+    def record_coalesced(self, endpoint: str) -> None:
+        with self._lock:
+            self.coalesced[endpoint] = self.coalesced.get(endpoint, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain data (latencies in milliseconds)."""
+        with self._lock:
+            tools = {
+                name: {
+                    "calls": entry["latency"].count,
+                    "outcomes": dict(entry["outcomes"]),
+                    "latency_ms": entry["latency"].summary(1000),
+                    "result_bytes": entry["result_bytes"].summary(),
+                    "api_calls": entry["api_calls"].summary()
+                }
+                for name, entry in sorted(self.tools.items())
+            }
+            endpoints = {
+                f"{method} {endpoint}": {
+                    "calls": entry["latency"].count,
+                    "statuses": {str(k): v for k, v in sorted(entry["statuses"].items())},
+                    "bytes_received": entry["bytes_received"],
+                    "latency_ms": entry["latency"].summary(1000)
+                }
+                for (method, endpoint), entry in sorted(self.endpoints.items())
+            }
+            totals = {
+                "tool_calls": sum(t["calls"] for t in tools.values()),
+                "api_calls": sum(e["calls"] for e in endpoints.values()),
+                "rate_limited": sum(e["statuses"].get("429", 0) for e in endpoints.values()),
+                "retries": sum(self.retries.values()),
+                "coalesced": sum(self.coalesced.values()),
+                "bytes_received": sum(e["bytes_received"] for e in endpoints.values())
+            }
+            return {
+                "since": self.started_at,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "totals": totals,
+                "tools": tools,
+                "notion_api": endpoints,
+                "retries": dict(self.retries),
+                "coalesced": dict(self.coalesced)
+            }
+
+    def prometheus_text(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += ["# HELP notion_mcp_tool_calls_total MCP tool calls by outcome",
+                      "# TYPE notion_mcp_tool_calls_total counter"]
+            for tool, entry in sorted(self.tools.items()):
+                for outcome, count in sorted(entry["outcomes"].items()):
+                    lines.append(f'notion_mcp_tool_calls_total{{tool="{_label(tool)}",outcome="{outcome}"}} {count}')
+
+            for metric, key, help_text in (
+                ("notion_mcp_tool_duration_seconds", "latency", "MCP tool wall time"),
+                ("notion_mcp_tool_result_bytes", "result_bytes", "Serialised MCP tool result size"),
+                ("notion_mcp_tool_api_calls", "api_calls", "Notion API calls per MCP tool call"),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for tool, entry in sorted(self.tools.items()):
+                    lines += entry[key].prometheus_lines(metric, f'tool="{_label(tool)}"')
+
+            lines += ["# HELP notion_mcp_api_requests_total Notion API requests by status",
+                      "# TYPE notion_mcp_api_requests_total counter"]
+            for (method, endpoint), entry in sorted(self.endpoints.items()):
+                for status, count in sorted(entry["statuses"].items()):
+                    lines.append(
+                        f'notion_mcp_api_requests_total{{method="{method}",endpoint="{_label(endpoint)}",status="{status}"}} {count}'
+                    )
+
+            lines += ["# HELP notion_mcp_api_response_bytes_total Bytes received from the Notion API",
+                      "# TYPE notion_mcp_api_response_bytes_total counter"]
+            for (method, endpoint), entry in sorted(self.endpoints.items()):
+                lines.append(
+                    f'notion_mcp_api_response_bytes_total{{method="{method}",endpoint="{_label(endpoint)}"}} {entry["bytes_received"]}'
+                )
+
+            lines += ["# HELP notion_mcp_api_request_duration_seconds Notion API request latency",
+                      "# TYPE notion_mcp_api_request_duration_seconds histogram"]
+            for (method, endpoint), entry in sorted(self.endpoints.items()):
+                lines += entry["latency"].prometheus_lines(
+                    "notion_mcp_api_request_duration_seconds", f'method="{method}",endpoint="{_label(endpoint)}"'
+                )
+
+            lines += ["# HELP notion_mcp_api_retries_total Notion API calls retried after rate limiting",
+                      "# TYPE notion_mcp_api_retries_total counter"]
+            for operation, count in sorted(self.retries.items()):
+                lines.append(f'notion_mcp_api_retries_total{{operation="{_label(operation)}"}} {count}')
+
+            lines += ["# HELP notion_mcp_api_coalesced_total GET requests served by an identical in-flight request",
+                      "# TYPE notion_mcp_api_coalesced_total counter"]
+            for endpoint, count in sorted(self.coalesced.items()):
+                lines.append(f'notion_mcp_api_coalesced_total{{endpoint="{_label(endpoint)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[str] = None) -> str:
+        """Write the Prometheus text file atomically. Returns the path written."""
+        target = Path(path or self._export_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        tmp_path.write_text(self.prometheus_text(), encoding="utf-8")
+        tmp_path.replace(target)
+        return str(target)
+
+    def maybe_export(self) -> None:
+        """Rewrite MCP_METRICS_PROM_FILE if configured and the interval has passed."""
+        if not self._export_path:
+            return
+        now = time.monotonic()
+        if now - self._last_export < self._export_interval:
+            return
+        self._last_export = now
+        try:
+            self.write_prometheus()
+        except OSError:
+            pass
+
+
+METRICS = MetricsRegistry()
+
+
+def _result_size(result: Any) -> int:
+    try:
+        return len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        return len(str(result))
+
+
+def track_tool(function: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Record wall time, result size, outcome and Notion API calls of a tool.
+
+    Works on plain and async functions. The wrapper keeps the wrapped
+    signature, so FastMCP builds the same schema.
+    """
+    name = function.__name__
+
+    def start() -> Tuple[Dict[str, int], contextvars.Token, float]:
+        counter = {"api_calls": 0}
+        return counter, _current_tool.set(counter), time.perf_counter()
+
+    def finish(counter, token, started, result, outcome) -> None:
+        _current_tool.reset(token)
+        METRICS.observe_tool(
+            name,
+            time.perf_counter() - started,
+            _result_size(result) if result is not None else 0,
+            counter["api_calls"],
+            str(outcome)
+        )
+        METRICS.maybe_export()
+
+    def outcome_of(result: Any) -> str:
+        return result.get("status", "success") if isinstance(result, dict) else "success"
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            counter, token, started = start()
+            result, outcome = None, "exception"
+            try:
+                result = await function(*args, **kwargs)
+                outcome = outcome_of(result)
+                return result
+            finally:
+                finish(counter, token, started, result, outcome)
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        counter, token, started = start()
+        result, outcome = None, "exception"
+        try:
+            result = function(*args, **kwargs)
+            outcome = outcome_of(result)
+            return result
+        finally:
+            finish(counter, token, started, result, outcome)
+
+    return wrapper
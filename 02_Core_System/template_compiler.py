@@ -0,0 +1,389 @@
+"""
+Template Compiler
+
+Turns the database templates in `03_Templates/notion_templates/` into
+ready-to-send Notion payloads. Templates use a simplified schema:
+
+    "Status": {"type": "select", "options": ["Draft", "Shipped"]},
+    "Hypothesis": {"type": "text"},
+    "Duration": {"type": "formula", "formula": "dateBetween(...)"},
+    "Linked Product": {"type": "relation", "target": "ai_product_spec"}
+
+Compiling validates the template and produces the create-database body
+(title, icon, description and `initial_data_source` properties with option
+colours assigned; only the parent is missing), page content blocks for
+`page_template` sections, and the list of relation properties to add once
+their target databases exist (relations need the target's data source ID, so
+they cannot be part of the initial payload).
+
+Compiled templates are cached in memory and in the local cache
+(`templates/`), keyed by a hash of the file and the compiler version, so a
+template is only compiled again after it changes.
+
+Files without a `properties` object (e.g. `update_template.json`, an input
+for the weekly update generator) are not database templates and are skipped.
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from local_cache import get_cache_dir
+
+# Bump when the compiled format changes so cached output is rebuilt
+COMPILER_VERSION = 1
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "03_Templates" / "notion_templates"
+
+# Colours handed out in order to options that do not name one
+OPTION_COLORS = ("gray", "brown", "orange", "yellow", "green", "blue", "purple", "pink", "red")
+VALID_COLORS = frozenset(OPTION_COLORS) | {"default"}
+
+MAX_OPTION_NAME = 100
+
+# Template type -> Notion property type, for types whose payload has no settings
+SIMPLE_TYPES = {
+    "title": "title",
+    "text": "rich_text",
+    "rich_text": "rich_text",
+    "date": "date",
+    "people": "people",
+    "files": "files",
+    "checkbox": "checkbox",
+    "url": "url",
+    "email": "email",
+    "phone_number": "phone_number",
+    "created_time": "created_time",
+    "created_by": "created_by",
+    "last_edited_time": "last_edited_time",
+    "last_edited_by": "last_edited_by",
+    # The API creates status properties with Notion's default groups only
+    "status": "status"
+}
+OPTION_TYPES = ("select", "multi_select")
+SUPPORTED_TYPES = frozenset(SIMPLE_TYPES) | set(OPTION_TYPES) | {"number", "formula", "relation"}
+
+
+class TemplateError(ValueError):
+    """A template failed validation; `problems` lists every issue found."""
+
+    def __init__(self, name: str, problems: List[str]):
+        self.name = name
+        self.problems = problems
+        super().__init__(f"Invalid template {name}: " + "; ".join(problems))
+
+
+def is_database_template(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("properties"), dict)
+
+
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    return [{"type": "text", "text": {"content": content}}]
+
+
+# ----------------------------------------------------------------------
+# Validation
+# ----------------------------------------------------------------------
+
+def _option_names(options: List[Any]) -> List[str]:
+    return [o.get("name", "") if isinstance(o, dict) else o for o in options]
+
+
+def validate_template(data: Dict[str, Any]) -> List[str]:
+    """Every problem with a database template (empty when it is valid)."""
+    problems = []
+    if not isinstance(data.get("template_name"), str) or not data["template_name"].strip():
+        problems.append("template_name is missing")
+    properties = data.get("properties")
+    if not isinstance(properties, dict) or not properties:
+        return problems + ["properties must be a non-empty object"]
+
+    titles = [name for name, spec in properties.items() if isinstance(spec, dict) and spec.get("type") == "title"]
+    if len(titles) != 1:
+        problems.append(f"exactly one title property is required (found {len(titles)})")
+
+    for name, spec in properties.items():
+        where = f"property '{name}'"
+        if not name.strip():
+            problems.append("property names must not be empty")
+            continue
+        if not isinstance(spec, dict):
+            problems.append(f"{where} must be an object")
+            continue
+        prop_type = spec.get("type")
+        if prop_type not in SUPPORTED_TYPES:
+            problems.append(f"{where} has unsupported type '{prop_type}'")
+            continue
+
+        if prop_type in OPTION_TYPES:
+            options = spec.get("options")
+            if not isinstance(options, list) or not options:
+                problems.append(f"{where} needs a non-empty options list")
+                continue
+            names = _option_names(options)
+            for option, option_name in zip(options, names):
+                if not isinstance(option_name, str) or not option_name.strip():
+                    problems.append(f"{where} has an option without a name")
+                elif "," in option_name:
+                    problems.append(f"{where} option '{option_name}' contains a comma")
+                elif len(option_name) > MAX_OPTION_NAME:
+                    problems.append(f"{where} option '{option_name[:20]}...' is longer than {MAX_OPTION_NAME} characters")
+                if isinstance(option, dict) and option.get("color", "default") not in VALID_COLORS:
+                    problems.append(f"{where} option '{option_name}' has unknown colour '{option['color']}'")
+            duplicates = sorted({n for n in names if isinstance(n, str) and names.count(n) > 1})
+            if duplicates:
+                problems.append(f"{where} has duplicate options: {', '.join(duplicates)}")
+        elif prop_type == "formula":
+            if not isinstance(spec.get("formula"), str) or not spec["formula"].strip():
+                problems.append(f"{where} needs a formula expression")
+        elif prop_type == "relation":
+            target = spec.get("target")
+            if target is not None and not isinstance(target, str):
+                problems.append(f"{where} target must be a template name")
+
+    sections = data.get("page_template", {}).get("sections", [])
+    if not isinstance(sections, list) or any(not isinstance(s, dict) or not s.get("heading") for s in sections):
+        problems.append("page_template.sections must be a list of objects with a heading")
+    return problems
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+
+def compile_options(options: List[Any]) -> List[Dict[str, str]]:
+    """Bare names or {"name", "color"} objects -> Notion options with colours."""
+    compiled = []
+    for index, option in enumerate(options):
+        if isinstance(option, dict):
+            name, color = option["name"], option.get("color")
+        else:
+            name, color = option, None
+        compiled.append({"name": name, "color": color or OPTION_COLORS[index % len(OPTION_COLORS)]})
+    return compiled
+
+
+def compile_property(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """One template property -> Notion property schema (relations excluded)."""
+    prop_type = spec["type"]
+    if prop_type in SIMPLE_TYPES:
+        return {SIMPLE_TYPES[prop_type]: {}}
+    if prop_type in OPTION_TYPES:
+        return {prop_type: {"options": compile_options(spec["options"])}}
+    if prop_type == "number":
+        return {"number": {"format": spec.get("format", "number")}}
+    if prop_type == "formula":
+        return {"formula": {"expression": spec["formula"]}}
+    raise ValueError(f"Property type '{prop_type}' is not compiled into the initial schema")
+
+
+def relation_property(data_source_id: str, dual: bool = False) -> Dict[str, Any]:
+    """Schema for a relation property once the target data source exists."""
+    if dual:
+        return {"relation": {"data_source_id": data_source_id, "type": "dual_property", "dual_property": {}}}
+    return {"relation": {"data_source_id": data_source_id, "type": "single_property", "single_property": {}}}
+
+
+# Aggregations a rollup property can compute over its related pages
+ROLLUP_FUNCTIONS = frozenset({
+    "show_original", "show_unique", "count", "count_values", "unique", "empty", "not_empty",
+    "percent_empty", "percent_not_empty", "sum", "average", "median", "min", "max", "range",
+    "earliest_date", "latest_date", "date_range", "checked", "unchecked", "percent_checked",
+    "percent_unchecked", "count_per_group", "percent_per_group"
+})
+
+
+def rollup_property(relation: str, rollup_property_name: str, function: str = "show_original") -> Dict[str, Any]:
+    """Schema for a rollup property once the relation it reads exists."""
+    return {"rollup": {
+        "relation_property_name": relation,
+        "rollup_property_name": rollup_property_name,
+        "function": function
+    }}
+
+
+def compile_page_template(page_template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Sections -> heading blocks, with subsections as sub-headings and fields as bullets."""
+    blocks = []
+    for section in page_template.get("sections", []):
+        blocks.append({"type": "heading_2", "heading_2": {"rich_text": _rich_text(section["heading"])}})
+        for subsection in section.get("subsections", []):
+            blocks.append({"type": "heading_3", "heading_3": {"rich_text": _rich_text(subsection)}})
+            blocks.append({"type": "paragraph", "paragraph": {"rich_text": []}})
+        for field in section.get("fields", []):
+            blocks.append({"type": "bulleted_list_item", "bulleted_list_item": {"rich_text": _rich_text(f"{field}: ")}})
+    return blocks
+
+
+def compile_template(data: Dict[str, Any], name: str = "template") -> Dict[str, Any]:
+    """
+    Validate and compile a parsed database template.
+
+    Returns:
+        name, template_name, database (the create-database body without its
+        parent), relations (properties to add after creation) and page_children
+
+    Raises:
+        TemplateError: listing every validation problem
+    """
+    problems = validate_template(data)
+    if problems:
+        raise TemplateError(name, problems)
+
+    properties = {}
+    relations = []
+    for prop_name, spec in data["properties"].items():
+        if spec["type"] == "relation":
+            relations.append({
+                "property": prop_name,
+                "target": spec.get("target"),
+                "dual": bool(spec.get("dual", False)),
+                "description": spec.get("description", "")
+            })
+        else:
+            properties[prop_name] = compile_property(spec)
+
+    database = {
+        "title": _rich_text(data["template_name"]),
+        "initial_data_source": {"properties": properties}
+    }
+    if data.get("description"):
+        database["description"] = _rich_text(data["description"])
+    if data.get("icon"):
+        database["icon"] = {"type": "emoji", "emoji": data["icon"]}
+
+    return {
+        "name": name,
+        "template_name": data["template_name"],
+        "database": database,
+        "relations": relations,
+        "page_children": compile_page_template(data.get("page_template", {}))
+    }
+
+
+# ----------------------------------------------------------------------
+# Cached loading
+# ----------------------------------------------------------------------
+
+_memory: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+_memory_lock = threading.Lock()
+
+
+def template_path(name_or_path: Union[str, Path]) -> Path:
+    """A template file from a path or a name in TEMPLATES_DIR ("launch_hub")."""
+    path = Path(name_or_path)
+    if path.suffix == ".json" and path.exists():
+        return path
+    return TEMPLATES_DIR / f"{path.stem}.json"
+
+
+def _content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw + f"\0compiler-v{COMPILER_VERSION}".encode("utf-8")).hexdigest()[:16]
+
+
+def load_template(name_or_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Compiled template, served from cache while the file is unchanged.
+
+    Returns a copy, so callers may modify the payload before sending it.
+
+    Raises:
+        FileNotFoundError: no such template
+        TemplateError: the template is invalid or not a database template
+    """
+    path = template_path(name_or_path)
+    raw = path.read_bytes()
+    digest = _content_hash(raw)
+    key = str(path.resolve())
+
+    with _memory_lock:
+        cached = _memory.get(key)
+    if cached is not None and cached[0] == digest:
+        return copy.deepcopy(cached[1])
+
+    cache_file = get_cache_dir("templates") / f"{path.stem}-{digest}.json"
+    compiled = None
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                compiled = json.load(f)
+        except (OSError, ValueError):
+            compiled = None
+
+    if compiled is None:
+        data = json.loads(raw)
+        if not is_database_template(data):
+            raise TemplateError(path.stem, ["not a database template (no properties object)"])
+        compiled = compile_template(data, path.stem)
+        compiled["source_hash"] = digest
+        for stale in cache_file.parent.glob(f"{path.stem}-*.json"):
+            stale.unlink(missing_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(compiled, f, ensure_ascii=False)
+        tmp_file.replace(cache_file)
+
+    with _memory_lock:
+        _memory[key] = (digest, compiled)
+    return copy.deepcopy(compiled)
+
+
+def compile_all(directory: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Compile every template in a directory.
+
+    Returns:
+        {"templates": {name: compiled}, "skipped": {name: reason}, "errors": {name: problems}}
+    """
+    directory = Path(directory) if directory else TEMPLATES_DIR
+    templates, skipped, errors = {}, {}, {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            templates[path.stem] = load_template(path)
+        except TemplateError as e:
+            if e.problems == ["not a database template (no properties object)"]:
+                skipped[path.stem] = e.problems[0]
+            else:
+                errors[path.stem] = e.problems
+        except ValueError as e:
+            errors[path.stem] = [f"invalid JSON: {e}"]
+    return {"templates": templates, "skipped": skipped, "errors": errors}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate and compile Notion database templates")
+    parser.add_argument("templates", nargs="*", help="Template names or paths (default: all in 03_Templates)")
+    parser.add_argument("--print", action="store_true", help="Print the compiled payloads as JSON")
+    args = parser.parse_args()
+
+    if args.templates:
+        result = {"templates": {}, "skipped": {}, "errors": {}}
+        for name in args.templates:
+            try:
+                compiled = load_template(name)
+                result["templates"][compiled["name"]] = compiled
+            except (OSError, ValueError) as e:
+                result["errors"][Path(name).stem] = e.problems if isinstance(e, TemplateError) else [str(e)]
+    else:
+        result = compile_all()
+
+    if args.print:
+        print(json.dumps(result["templates"], indent=2, ensure_ascii=False))
+    for name, compiled in result["templates"].items():
+        properties = compiled["database"]["initial_data_source"]["properties"]
+        print(f"✅ {name}: {len(properties)} properties, {len(compiled['relations'])} relations, "
+              f"{len(compiled['page_children'])} page blocks")
+    for name, reason in result["skipped"].items():
+        print(f"⏭️  {name}: {reason}")
+    for name, problems in result["errors"].items():
+        for problem in problems:
+            print(f"❌ {name}: {problem}")
+    raise SystemExit(1 if result["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
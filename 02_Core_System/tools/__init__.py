@@ -5,66 +5,127 @@ This package contains all the callable tools exposed by the MCP server.
 Each tool module provides specific capabilities for AI assistants.
 """
 
-from .notion_tool import (
-    update_notion_page,
-    query_notion_database,
-    create_notion_database,
-    get_database_schema,
-    # Advanced Notion tools
-    upload_file_to_notion,
-    modify_database_schema,
-    delete_notion_page,
-    restore_notion_page,
-    move_notion_page,
-    duplicate_notion_page
-)
-from .research_tool import search_web, analyze_content
-from .update_tool import (
-    generate_multi_format_update,
-    create_update_template,
-    validate_update_data
-)
-from .database_tool import (
-    analyze_database,
-    enhance_database,
-    export_database_structure,
-    compare_databases
-)
-from .comprehensive_page_manager import (
-    create_notion_page_comprehensive,
-    get_page_hierarchy_comprehensive,
-    extract_page_properties_comprehensive,
-    update_page_property_comprehensive,
-    move_page_comprehensive,
-    analyze_page_structure_intelligent_tool
-)
-from .content_extraction_tool import (
-    extract_page_content,
-    extract_hierarchy_with_content,
-    analyze_page_content_semantic
-)
-from .working_reorganization_tool import (
-    reorganize_notion_pages_intelligent,
-    extract_pages_with_full_content,
-    create_reorganization_plan_from_content
-)
-from .cleanup_tool import (
-    analyze_workspace_cleanup,
-    execute_workspace_cleanup,
-    fix_emoji_consistency
-)
-
-from .wiki_management_tool import (
-    create_notion_wiki,
-    verify_notion_page,
-    remove_notion_page_verification,
-    undo_notion_wiki,
-    get_all_verified_pages
-)
+import importlib
+import sys
+from typing import Any, Callable, Dict
+
+# Tool modules are imported on first use, not when the package is imported.
+# Each module loads .env, adjusts sys.path and may probe optional analysis
+# libraries, so importing them all up front slows down server start.
+_TOOL_MODULES: Dict[str, list] = {
+    "notion_tool": [
+        "update_notion_page",
+        "append_markdown_to_notion_page",
+        "query_notion_database",
+        "create_notion_database",
+        "get_database_schema",
+        # Advanced Notion tools
+        "upload_file_to_notion",
+        "modify_database_schema",
+        "delete_notion_page",
+        "restore_notion_page",
+        "move_notion_page",
+        "duplicate_notion_page",
+    ],
+    "research_tool": ["search_web", "analyze_content"],
+    "update_tool": [
+        "generate_multi_format_update",
+        "create_update_template",
+        "validate_update_data",
+    ],
+    "database_tool": [
+        "analyze_database",
+        "enhance_database",
+        "export_database_structure",
+        "compare_databases",
+        "load_database_rows",
+        "migrate_database_schemas",
+    ],
+    "comprehensive_page_manager": [
+        "create_notion_page_comprehensive",
+        "get_page_hierarchy_comprehensive",
+        "extract_page_properties_comprehensive",
+        "update_page_property_comprehensive",
+        "move_page_comprehensive",
+        "analyze_page_structure_intelligent_tool",
+    ],
+    "content_extraction_tool": [
+        "extract_page_content",
+        "extract_hierarchy_with_content",
+        "analyze_page_content_semantic",
+        "cluster_pages_incremental",
+        "diff_page_snapshots",
+    ],
+    "search_tool": ["search_workspace_content", "index_workspace_pages"],
+    "metrics_tool": ["get_server_metrics"],
+    "job_tool": ["get_job_status", "get_job_result", "cancel_job"],
+    "provisioning_tool": ["provision_workspace_from_manifest"],
+    "export_tool": ["export_page_tree"],
+    "snapshot_tool": ["create_workspace_snapshot", "restore_workspace_snapshot"],
+    "block_sync_tool": ["sync_page_blocks"],
+    "working_reorganization_tool": [
+        "reorganize_notion_pages_intelligent",
+        "extract_pages_with_full_content",
+        "create_reorganization_plan_from_content",
+    ],
+    "cleanup_tool": [
+        "analyze_workspace_cleanup",
+        "execute_workspace_cleanup",
+        "fix_emoji_consistency",
+    ],
+    "wiki_management_tool": [
+        "create_notion_wiki",
+        "verify_notion_page",
+        "remove_notion_page_verification",
+        "undo_notion_wiki",
+        "get_all_verified_pages",
+    ],
+}
+
+_TOOL_LOCATIONS = {name: module for module, names in _TOOL_MODULES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the tool's module the first time the tool is accessed."""
+    module_name = _TOOL_LOCATIONS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_TOOL_LOCATIONS))
+
+
+def lazy_tool(name: str) -> Callable[..., Any]:
+    """
+    Return a callable that forwards to a tool, importing it on the first call.
+
+    Lets the MCP server bind tool implementations without importing them.
+    """
+    if name not in _TOOL_LOCATIONS:
+        raise AttributeError(f"Unknown tool: {name}")
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(sys.modules[__name__], name)(*args, **kwargs)
+
+    call.__name__ = name
+    call.__qualname__ = name
+    return call
+
+
+def loaded_tool_modules() -> list:
+    """Names of tool modules imported so far."""
+    return [module for module in _TOOL_MODULES if f"{__name__}.{module}" in sys.modules]
+
 
 __all__ = [
     # Notion tools
     'update_notion_page',
+    'append_markdown_to_notion_page',
     'query_notion_database',
     'create_notion_database',
     'get_database_schema',
@@ -87,6 +148,8 @@ __all__ = [
     'enhance_database',
     'export_database_structure',
     'compare_databases',
+    'load_database_rows',
+    'migrate_database_schemas',
     # Comprehensive Page Management tools
     'create_notion_page_comprehensive',
     'get_page_hierarchy_comprehensive',
@@ -98,6 +161,26 @@ __all__ = [
     'extract_page_content',
     'extract_hierarchy_with_content',
     'analyze_page_content_semantic',
+    'cluster_pages_incremental',
+    'diff_page_snapshots',
+    # Workspace Search tools
+    'search_workspace_content',
+    'index_workspace_pages',
+    # Server metrics tools
+    'get_server_metrics',
+    # Background job tools
+    'get_job_status',
+    'get_job_result',
+    'cancel_job',
+    # Provisioning tools
+    'provision_workspace_from_manifest',
+    # Export tools
+    'export_page_tree',
+    # Snapshot tools
+    'create_workspace_snapshot',
+    'restore_workspace_snapshot',
+    # Block sync tools
+    'sync_page_blocks',
     # Working Reorganization tools
     'reorganize_notion_pages_intelligent',
     'extract_pages_with_full_content',
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Block Sync Tool for Notion Template Generator MCP
+Re-applies template content to pages by patching only changed blocks (see block_sync.py)
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from block_sync import BlockSync
+
+
+# MCP Tool Functions
+def sync_page_blocks(
+    page_ids: List[str],
+    template_page_id: Optional[str] = None,
+    content: Optional[Union[str, List[Union[str, Dict[str, Any]]]]] = None,
+    dry_run: bool = False,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Patch pages' content to match a template page, Markdown or content items."""
+    try:
+        if (template_page_id is None) == (content is None):
+            return {"status": "error", "message": "Pass either template_page_id or content"}
+        sync = BlockSync(max_workers=max_workers)
+        if template_page_id is not None:
+            desired = sync.desired_from_page(template_page_id)
+        elif isinstance(content, str):
+            desired = [{"markdown": content}]
+        else:
+            desired = content
+        return sync.sync(page_ids, desired, dry_run)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error syncing page content: {e}"
+        }
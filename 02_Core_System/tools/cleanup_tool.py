@@ -15,7 +15,6 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from notion_client import Client
     from notion_client.errors import APIResponseError
     from dotenv import load_dotenv
     
@@ -27,6 +26,14 @@ except ImportError as e:
     print(f"Error importing required modules: {e}")
     sys.exit(1)
 
+from block_renderer import render_blocks
+from cost_estimator import (
+    BLOCK_OVERHEAD_BYTES, CREATE_PAGE, LIST_CHILDREN, UPDATE_PAGE,
+    CostEstimate, pages_of, payload_bytes, snapshot_page_stats
+)
+from notion_transport import get_notion_client
+import progress
+
 class NotionCleanupManager:
     """Manages cleanup of duplicate and unnecessary pages."""
     
@@ -35,7 +42,7 @@ class NotionCleanupManager:
         if not self.api_key:
             raise ValueError("Notion API key not found")
         
-        self.client = Client(auth=self.api_key, notion_version="2025-09-03")
+        self.client = get_notion_client(self.api_key)
         
         # Define the correct categories we want to keep
         self.target_categories = {
@@ -246,35 +253,10 @@ class NotionCleanupManager:
             blocks_response = self.client.blocks.children.list(block_id=page_id, page_size=100)
             blocks = blocks_response.get("results", [])
             
-            # Count meaningful content blocks
-            content_blocks = 0
-            total_text_length = 0
-            
-            for block in blocks:
-                block_type = block.get("type")
-                
-                # Skip child_page blocks for this count
-                if block_type == "child_page":
-                    continue
-                
-                # Count blocks with actual content
-                if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", 
-                                "bulleted_list_item", "numbered_list_item", "quote", 
-                                "callout", "to_do", "code"]:
-                    block_content = block.get(block_type, {})
-                    rich_text = block_content.get("rich_text", [])
-                    
-                    # Extract text content
-                    text_content = ""
-                    for rt in rich_text:
-                        text_content += rt.get("text", {}).get("content", "")
-                    
-                    if text_content.strip():
-                        content_blocks += 1
-                        total_text_length += len(text_content.strip())
-                
-                elif block_type in ["image", "video", "file", "bookmark", "embed", "divider"]:
-                    content_blocks += 1
+            # Count meaningful content blocks (child pages are handled separately)
+            rendered = render_blocks(blocks, exclude_types={"child_page"})
+            content_blocks = rendered["content_blocks"]
+            total_text_length = rendered["text_length"]
             
             # Consider page empty if:
             # 1. No content blocks at all
@@ -292,6 +274,22 @@ class NotionCleanupManager:
             print(f"   ⚠️  Error checking if page is empty: {e}")
             return False
     
+    def is_duplicate_category(self, title: str) -> bool:
+        """Check if a title looks like a duplicate or old category rather than a target one."""
+        # Look for similar category names or old categories
+        category_keywords = [
+            "Brand Strategy", "Content Planning", "Content Creation",
+            "Calendar", "Scheduling", "Performance", "Analytics", 
+            "Automation", "Systems", "Strategy & Performance",
+            "Performance & Automation", "Content Management"
+        ]
+        
+        if any(keyword.lower() in title.lower() for keyword in category_keywords):
+            return True
+        
+        # Also check for pages that look like categories but aren't our targets
+        return any(emoji in title for emoji in ["🎯", "📝", "📅", "📈", "🤖", "❤️", "📋", "🚀", "🗄️"]) and title not in self.target_categories
+    
     def identify_pages_to_delete(self, all_pages: List[Dict[str, Any]]) -> tuple:
         """Identify which pages should be deleted."""
         pages_to_delete = []
@@ -313,27 +311,7 @@ class NotionCleanupManager:
                     break
             
             if not is_target_category:
-                # Check if it's a duplicate or old category
-                is_duplicate_category = False
-                
-                # Look for similar category names or old categories
-                category_keywords = [
-                    "Brand Strategy", "Content Planning", "Content Creation",
-                    "Calendar", "Scheduling", "Performance", "Analytics", 
-                    "Automation", "Systems", "Strategy & Performance",
-                    "Performance & Automation", "Content Management"
-                ]
-                
-                for keyword in category_keywords:
-                    if keyword.lower() in title.lower():
-                        is_duplicate_category = True
-                        break
-                
-                # Also check for pages that look like categories but aren't our targets
-                if any(emoji in title for emoji in ["🎯", "📝", "📅", "📈", "🤖", "❤️", "📋", "🚀", "🗄️"]) and title not in self.target_categories:
-                    is_duplicate_category = True
-                
-                if is_duplicate_category:
+                if self.is_duplicate_category(title):
                     pages_to_delete.append(page)
                 elif self.is_page_empty_or_duplicate(page):
                     # Also delete empty or minimal content pages
@@ -345,6 +323,58 @@ class NotionCleanupManager:
         
         return pages_to_delete, pages_to_keep, found_categories
     
+    def estimate_cleanup(self, pages_to_delete: List[Dict[str, Any]], all_pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        What execute_cleanup() would cost, from the analysis and cached page
+        snapshots, without API calls (see cost_estimator.py).
+        """
+        estimate = CostEstimate("execute_notion_workspace_cleanup")
+        
+        # execute_cleanup analyses again: root listing, content checks, root listing
+        content_checks = sum(
+            1 for p in all_pages
+            if p["title"] not in self.target_categories and not self.is_duplicate_category(p["title"])
+        )
+        estimate.phase("analysis").add(LIST_CHILDREN, 2 + content_checks)
+        
+        estimate.phase("migration")
+        unknown = 0
+        has_targets = any(p["title"] in self.target_categories for p in all_pages)
+        for page in pages_to_delete:
+            stats = snapshot_page_stats(page["id"])
+            if stats is None:
+                unknown += 1
+                stats = {"blocks": 1, "child_pages": 0, "content_blocks": 1, "text_bytes": 0}
+            
+            # Child pages are listed, then moved to their target category
+            estimate.add(LIST_CHILDREN)
+            if has_targets:
+                estimate.add(UPDATE_PAGE, stats["child_pages"], payload={"parent": {"type": "page_id", "page_id": page["id"]}})
+            
+            # Content is read and copied into a new page under the page's target category
+            if self.find_target_category_for_page(page["title"], all_pages):
+                estimate.add(LIST_CHILDREN, pages_of(stats["blocks"]))
+                if stats["content_blocks"]:
+                    copied = min(stats["content_blocks"], 50)
+                    title = {"title": [{"type": "text", "text": {"content": page["title"]}}]}
+                    estimate.add(CREATE_PAGE, request_bytes=(
+                        payload_bytes({"parent": {"type": "page_id", "page_id": page["id"]}, "properties": title})
+                        + stats["text_bytes"] + copied * BLOCK_OVERHEAD_BYTES
+                    ))
+            
+            estimate.add(UPDATE_PAGE, payload={"archived": True})
+            estimate.wait(0.5)
+        
+        estimate.phase("verification").add(LIST_CHILDREN)
+        estimate.wait(2)
+        
+        if unknown:
+            estimate.assume(
+                f"{unknown} of {len(pages_to_delete)} pages have no cached snapshot "
+                "(extract them first); assumed one block and no child pages each"
+            )
+        return estimate.result()
+    
     def analyze_cleanup_needed(self, root_page_id: str) -> Dict[str, Any]:
         """Analyze what cleanup is needed without executing it."""
         try:
@@ -366,6 +396,7 @@ class NotionCleanupManager:
                 "pages_to_delete": [{"title": p["title"], "id": p["id"]} for p in pages_to_delete],
                 "pages_to_keep": [{"title": p["title"], "id": p["id"]} for p in pages_to_keep],
                 "found_categories": list(found_categories),
+                "cost_estimate": self.estimate_cleanup(pages_to_delete, all_pages),
                 "message": f"Found {len(pages_to_delete)} pages that need cleanup"
             }
             
@@ -409,8 +440,12 @@ class NotionCleanupManager:
             migrated_content_count = 0
             migrated_child_pages_count = 0
             failed_pages = []
+            processed_count = 0
             
             for page in pages_to_delete:
+                # Stop between pages, never halfway through migrating one
+                if progress.cancelled():
+                    break
                 print(f"\n🔄 Processing '{page['title']}'...")
                 
                 # Step 1: Migrate child pages to appropriate categories
@@ -418,19 +453,37 @@ class NotionCleanupManager:
                 migrated_child_pages_count += child_pages_migrated
                 
                 # Step 2: Migrate content to appropriate target category
+                content_migrated = False
                 target_category_id = self.find_target_category_for_page(page["title"], all_pages)
                 if target_category_id:
                     if self.migrate_content_to_target_category(page, target_category_id):
                         migrated_content_count += 1
+                        content_migrated = True
                 
                 # Step 3: Delete the now-empty duplicate page
-                if self.delete_page(page["id"], page["title"]):
+                deleted = self.delete_page(page["id"], page["title"])
+                if deleted:
                     deleted_count += 1
                     print(f"🗑️  Deleted '{page['title']}' after migration")
                     time.sleep(0.5)  # Brief pause between deletions
                 else:
                     failed_count += 1
                     failed_pages.append(page["title"])
+                
+                processed_count += 1
+                progress.report_progress(
+                    processed_count, len(pages_to_delete),
+                    f"Processed '{page['title']}' ({deleted_count} deleted, {failed_count} failed)"
+                )
+                progress.report_partial({
+                    "page_id": page["id"],
+                    "title": page["title"],
+                    "deleted": deleted,
+                    "content_migrated": content_migrated,
+                    "child_pages_migrated": child_pages_migrated
+                })
+            
+            cancelled = progress.cancelled()
             
             # Wait for API sync and verify
             time.sleep(2)
@@ -438,7 +491,8 @@ class NotionCleanupManager:
             
             return {
                 "status": "success",
-                "message": f"Cleanup completed: {deleted_count} pages deleted, {migrated_content_count} content migrated, {migrated_child_pages_count} child pages migrated",
+                "message": f"Cleanup {'cancelled' if cancelled else 'completed'}: {deleted_count} pages deleted, {migrated_content_count} content migrated, {migrated_child_pages_count} child pages migrated",
+                "cancelled": cancelled,
                 "results": {
                     "deleted_count": deleted_count,
                     "failed_count": failed_count,
@@ -446,6 +500,7 @@ class NotionCleanupManager:
                     "migrated_content_count": migrated_content_count,
                     "migrated_child_pages_count": migrated_child_pages_count,
                     "failed_pages": failed_pages,
+                    "unprocessed_count": len(pages_to_delete) - processed_count,
                     "success_rate": (deleted_count / len(pages_to_delete)) * 100 if pages_to_delete else 100
                 },
                 "remaining_pages": [{"title": p["title"], "id": p["id"]} for p in remaining_pages]
@@ -18,7 +18,6 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / "02_Core_System"))
 
 try:
-    from notion_client import Client
     from dotenv import load_dotenv
     from notion_api_client import NotionTemplateClient, AdvancedNotionClient
     
@@ -42,6 +41,9 @@ except ImportError:
     print("⚠️  Intelligent analysis components not available")
     INTELLIGENT_ANALYSIS_AVAILABLE = False
 
+from workspace_clustering import IncrementalClusterer
+from notion_transport import get_notion_client
+
 @dataclass
 class PagePropertyValue:
     """Represents a comprehensive page property value with all Notion types."""
@@ -72,7 +74,7 @@ class ComprehensivePageManager:
         if not self.api_key:
             raise ValueError("Notion API key not found")
         
-        self.client = Client(auth=self.api_key, notion_version="2025-09-03")
+        self.client = get_notion_client(self.api_key)
         self.template_client = NotionTemplateClient(self.api_key)
         self.advanced_client = AdvancedNotionClient(self.api_key)
         
@@ -525,12 +527,18 @@ class ComprehensivePageManager:
             if self.semantic_analyzer:
                 self.semantic_analyzer.generate_embeddings(pages)
                 relationships = self.semantic_analyzer.find_similar_pages(pages, threshold=0.4)
-                clusters = self.semantic_analyzer.cluster_pages(pages)
+                
+                # Incremental clustering: only pages changed since the last run are re-assigned.
+                # State is kept per root, so the full sync drops only pages gone from this tree
+                clusterer = IncrementalClusterer.load(scope=root_page_id)
+                cluster_result = clusterer.update([asdict(page) for page in pages])
+                clusterer.save()
                 
                 return {
                     "pages": [asdict(page) for page in pages],
                     "relationships": [asdict(rel) for rel in relationships],
-                    "clusters": {str(k): [asdict(p) for p in v] for k, v in clusters.items()},
+                    "clusters": cluster_result["clusters"],
+                    "cluster_drift": cluster_result["drift"],
                     "analysis_timestamp": datetime.now().isoformat()
                 }
             
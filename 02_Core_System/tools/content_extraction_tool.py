@@ -16,7 +16,6 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from notion_client import Client
     from dotenv import load_dotenv
     
     # Load environment variables
@@ -27,6 +26,14 @@ except ImportError as e:
     print(f"Error importing required modules: {e}")
     sys.exit(1)
 
+from workspace_clustering import IncrementalClusterer
+from search_index import index_extracted_pages
+from block_fingerprints import PageSnapshotStore, page_root_hash, diff_snapshots
+from block_renderer import render_block, render_blocks, block_payload, rich_text_plain
+from notion_concurrency import list_block_tree
+from notion_transport import get_notion_client
+import progress
+
 class NotionContentExtractor:
     """Comprehensive content extraction from Notion pages."""
     
@@ -35,7 +42,7 @@ class NotionContentExtractor:
         if not self.api_key:
             raise ValueError("Notion API key not found")
         
-        self.client = Client(auth=self.api_key, notion_version="2025-09-03")
+        self.client = get_notion_client(self.api_key)
     
     def extract_page_content_full(self, page_id: str) -> Dict[str, Any]:
         """Extract complete page content including properties, blocks, and metadata."""
@@ -45,8 +52,12 @@ class NotionContentExtractor:
             # Get page details
             page = self.client.pages.retrieve(page_id=clean_page_id)
             
-            # Get page blocks (content)
-            blocks = self.client.blocks.children.list(block_id=clean_page_id, page_size=100)
+            # Get page blocks (content) with their nested children
+            blocks = list_block_tree(
+                self.client,
+                clean_page_id,
+                on_error=lambda block, error: print(f"⚠️  Error getting children for block {block['id']}: {error}")
+            )
             
             # Extract all content
             content_data = {
@@ -57,23 +68,21 @@ class NotionContentExtractor:
                 "last_edited_time": page.get("last_edited_time", ""),
                 "parent": page.get("parent", {}),
                 "properties": self._extract_all_properties(page),
-                "blocks": self._extract_all_blocks(blocks.get("results", [])),
+                "blocks": self._extract_all_blocks(blocks),
                 "content_text": "",  # Will be populated
                 "metadata": {
-                    "total_blocks": len(blocks.get("results", [])),
+                    "total_blocks": len(blocks),
                     "extraction_time": datetime.now().isoformat(),
-                    "has_children": blocks.get("has_more", False)
+                    "has_children": any(block.get("has_children") for block in blocks)
                 }
             }
             
-            # Extract plain text content
-            content_data["content_text"] = self._extract_plain_text_from_blocks(content_data["blocks"])
-            
-            # Get additional pages if has_more
-            if blocks.get("has_more"):
-                content_data["blocks"].extend(self._get_remaining_blocks(clean_page_id, blocks.get("next_cursor")))
-                content_data["content_text"] = self._extract_plain_text_from_blocks(content_data["blocks"])
-                content_data["metadata"]["total_blocks"] = len(content_data["blocks"])
+            # Text, counts, media and Merkle hashes in one pass
+            rendered = render_blocks(content_data["blocks"])
+            content_data["content_text"] = rendered["text"]
+            content_data["root_hash"] = page_root_hash(content_data["title"], rendered["tree_hashes"])
+            content_data["metadata"]["word_count"] = rendered["word_count"]
+            content_data["metadata"]["media"] = rendered["media"]
             
             return content_data
             
@@ -85,29 +94,6 @@ class NotionContentExtractor:
                 "extraction_time": datetime.now().isoformat()
             }
     
-    def _get_remaining_blocks(self, page_id: str, start_cursor: str) -> List[Dict]:
-        """Get remaining blocks if pagination is needed."""
-        all_blocks = []
-        cursor = start_cursor
-        
-        try:
-            while cursor:
-                response = self.client.blocks.children.list(
-                    block_id=page_id,
-                    start_cursor=cursor,
-                    page_size=100
-                )
-                all_blocks.extend(response.get("results", []))
-                cursor = response.get("next_cursor")
-                
-                if not response.get("has_more"):
-                    break
-                    
-        except Exception as e:
-            print(f"⚠️  Error getting remaining blocks: {e}")
-        
-        return all_blocks
-    
     def _extract_title(self, page: Dict) -> str:
         """Extract title from page."""
         try:
@@ -199,32 +185,29 @@ class NotionContentExtractor:
     
     def _extract_rich_text_content(self, rich_text_data: List[Dict]) -> str:
         """Extract plain text from rich text objects."""
-        try:
-            return "".join([
-                rt.get("text", {}).get("content", "") 
-                for rt in rich_text_data
-            ])
-        except:
-            return ""
+        return rich_text_plain(rich_text_data)
     
     def _extract_all_blocks(self, blocks: List[Dict]) -> List[Dict]:
-        """Extract and process all blocks from a page."""
+        """
+        Process all blocks from a page, including nested children.
+        
+        Expects the tree from list_block_tree(), children under "children".
+        """
+        processed_blocks = self._process_blocks(blocks)
+        
+        for block, processed in zip(blocks, processed_blocks):
+            if "children" in block:
+                processed["children"] = self._extract_all_blocks(block["children"])
+        
+        return processed_blocks
+    
+    def _process_blocks(self, blocks: List[Dict]) -> List[Dict]:
+        """Process a list of sibling blocks without fetching their children."""
         processed_blocks = []
         
         for block in blocks:
             try:
-                block_data = self._process_block(block)
-                processed_blocks.append(block_data)
-                
-                # If block has children, get them too
-                if block.get("has_children"):
-                    try:
-                        children_response = self.client.blocks.children.list(block_id=block["id"])
-                        children = self._extract_all_blocks(children_response.get("results", []))
-                        block_data["children"] = children
-                    except Exception as e:
-                        print(f"⚠️  Error getting children for block {block['id']}: {e}")
-                        
+                processed_blocks.append(self._process_block(block))
             except Exception as e:
                 print(f"⚠️  Error processing block: {e}")
                 processed_blocks.append({
@@ -250,108 +233,19 @@ class NotionContentExtractor:
             "raw_content": {}
         }
         
-        # Extract content based on block type
-        if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", "quote", "callout"]:
-            block_content = block.get(block_type, {})
-            rich_text = block_content.get("rich_text", [])
-            processed["content"] = self._extract_rich_text_content(rich_text)
-            processed["raw_content"] = block_content
-            
-        elif block_type in ["bulleted_list_item", "numbered_list_item", "to_do"]:
-            block_content = block.get(block_type, {})
-            rich_text = block_content.get("rich_text", [])
-            processed["content"] = self._extract_rich_text_content(rich_text)
-            if block_type == "to_do":
-                processed["checked"] = block_content.get("checked", False)
-            processed["raw_content"] = block_content
-            
+        processed["content"], _ = render_block(block)
+        processed["raw_content"] = block_payload(block)
+        if block_type == "to_do":
+            processed["checked"] = processed["raw_content"].get("checked", False)
         elif block_type == "code":
-            code_content = block.get("code", {})
-            rich_text = code_content.get("rich_text", [])
-            processed["content"] = self._extract_rich_text_content(rich_text)
-            processed["language"] = code_content.get("language", "")
-            processed["raw_content"] = code_content
-            
-        elif block_type == "child_page":
-            child_page = block.get("child_page", {})
-            processed["content"] = child_page.get("title", "Untitled Page")
-            processed["raw_content"] = child_page
-            
-        elif block_type == "child_database":
-            child_db = block.get("child_database", {})
-            processed["content"] = child_db.get("title", "Untitled Database")
-            processed["raw_content"] = child_db
-            
-        elif block_type == "image":
-            image_content = block.get("image", {})
-            if image_content.get("type") == "external":
-                processed["content"] = f"Image: {image_content.get('external', {}).get('url', '')}"
-            elif image_content.get("type") == "file":
-                processed["content"] = f"Image: {image_content.get('file', {}).get('url', '')}"
-            processed["raw_content"] = image_content
-            
-        elif block_type == "video":
-            video_content = block.get("video", {})
-            if video_content.get("type") == "external":
-                processed["content"] = f"Video: {video_content.get('external', {}).get('url', '')}"
-            processed["raw_content"] = video_content
-            
-        elif block_type == "file":
-            file_content = block.get("file", {})
-            if file_content.get("type") == "external":
-                processed["content"] = f"File: {file_content.get('external', {}).get('url', '')}"
-            elif file_content.get("type") == "file":
-                processed["content"] = f"File: {file_content.get('file', {}).get('url', '')}"
-            processed["raw_content"] = file_content
-            
-        elif block_type == "bookmark":
-            bookmark_content = block.get("bookmark", {})
-            processed["content"] = f"Bookmark: {bookmark_content.get('url', '')}"
-            processed["raw_content"] = bookmark_content
-            
-        elif block_type == "embed":
-            embed_content = block.get("embed", {})
-            processed["content"] = f"Embed: {embed_content.get('url', '')}"
-            processed["raw_content"] = embed_content
-            
-        elif block_type == "table":
-            processed["content"] = "Table"
-            processed["raw_content"] = block.get("table", {})
-            
-        elif block_type == "divider":
-            processed["content"] = "---"
-            processed["raw_content"] = {}
-            
-        else:
-            # For unknown block types, try to extract any rich_text content
-            block_content = block.get(block_type, {})
-            if isinstance(block_content, dict) and "rich_text" in block_content:
-                processed["content"] = self._extract_rich_text_content(block_content["rich_text"])
-            else:
-                processed["content"] = f"[{block_type}]"
-            processed["raw_content"] = block_content
+            processed["language"] = processed["raw_content"].get("language", "")
         
         return processed
     
-    def _extract_plain_text_from_blocks(self, blocks: List[Dict]) -> str:
-        """Extract all plain text content from blocks."""
-        text_parts = []
-        
-        for block in blocks:
-            if block.get("content"):
-                text_parts.append(block["content"])
-            
-            # Add children content recursively
-            if block.get("children"):
-                children_text = self._extract_plain_text_from_blocks(block["children"])
-                if children_text:
-                    text_parts.append(children_text)
-        
-        return "\n".join(text_parts)
-    
     def extract_page_hierarchy_with_content(self, root_page_id: str, max_depth: int = 5) -> List[Dict[str, Any]]:
         """Extract complete page hierarchy with full content."""
         try:
+            self._pages_discovered = 1
             return self._extract_hierarchy_recursive(root_page_id, max_depth, 0, set())
         except Exception as e:
             print(f"❌ Error extracting hierarchy: {e}")
@@ -359,7 +253,7 @@ class NotionContentExtractor:
     
     def _extract_hierarchy_recursive(self, page_id: str, max_depth: int, current_depth: int, visited: set) -> List[Dict[str, Any]]:
         """Recursively extract page hierarchy with content."""
-        if current_depth >= max_depth or page_id in visited:
+        if current_depth >= max_depth or page_id in visited or progress.cancelled():
             return []
         
         visited.add(page_id)
@@ -371,18 +265,21 @@ class NotionContentExtractor:
             page_content["depth"] = current_depth
             pages.append(page_content)
             
-            # Get child pages
-            if not page_content.get("error"):
-                clean_page_id = page_id.replace("-", "")
-                blocks_response = self.client.blocks.children.list(block_id=clean_page_id)
-                
-                for block in blocks_response.get("results", []):
-                    if block.get("type") == "child_page":
-                        child_page_id = block["id"]
-                        child_pages = self._extract_hierarchy_recursive(
-                            child_page_id, max_depth, current_depth + 1, visited
-                        )
-                        pages.extend(child_pages)
+            child_page_ids = []
+            if not page_content.get("error") and current_depth + 1 < max_depth:
+                child_page_ids = [
+                    block["id"] for block in page_content.get("blocks", [])
+                    if block.get("type") == "child_page"
+                ]
+            self._pages_discovered += len(child_page_ids)
+            self._report_page_done(page_content, len(visited))
+            
+            # Get child pages from the blocks already fetched
+            for child_page_id in child_page_ids:
+                child_pages = self._extract_hierarchy_recursive(
+                    child_page_id, max_depth, current_depth + 1, visited
+                )
+                pages.extend(child_pages)
             
         except Exception as e:
             print(f"❌ Error processing page {page_id}: {e}")
@@ -393,6 +290,19 @@ class NotionContentExtractor:
             })
         
         return pages
+    
+    def _report_page_done(self, page_content: Dict[str, Any], pages_done: int) -> None:
+        """Progress (pages crawled / discovered so far) and a per-page partial result."""
+        title = page_content.get("title", "Untitled")
+        progress.report_progress(pages_done, self._pages_discovered, f"Crawled '{title}'")
+        progress.report_partial({
+            "page_id": page_content.get("page_id"),
+            "title": title,
+            "url": page_content.get("url"),
+            "depth": page_content.get("depth"),
+            "word_count": page_content.get("metadata", {}).get("word_count", 0),
+            "error": page_content.get("error")
+        })
 
 # MCP Tool Functions
 def extract_page_content(page_id: str) -> Dict[str, Any]:
@@ -400,6 +310,9 @@ def extract_page_content(page_id: str) -> Dict[str, Any]:
     try:
         extractor = NotionContentExtractor()
         content = extractor.extract_page_content_full(page_id)
+        index_extracted_pages([content])
+        if not content.get("error"):
+            PageSnapshotStore().save(content)
         
         return {
             "status": "success",
@@ -424,6 +337,15 @@ def extract_hierarchy_with_content(root_page_id: str, max_depth: int = 5) -> Dic
         total_blocks = sum(page.get("metadata", {}).get("total_blocks", 0) for page in pages if not page.get("error"))
         total_content_length = sum(len(page.get("content_text", "")) for page in pages if not page.get("error"))
         
+        # Keep the workspace search index current with what was just fetched
+        search_index = index_extracted_pages(pages)
+        
+        # Snapshot every page so later runs can diff against this version
+        store = PageSnapshotStore()
+        for page in pages:
+            if not page.get("error"):
+                store.save(page)
+        
         return {
             "status": "success",
             "pages": pages,
@@ -433,7 +355,10 @@ def extract_hierarchy_with_content(root_page_id: str, max_depth: int = 5) -> Dic
                 "total_content_length": total_content_length,
                 "pages_with_errors": len([p for p in pages if p.get("error")])
             },
+            "search_index": search_index,
+            "cancelled": progress.cancelled(),
             "message": f"Extracted content from {total_pages} pages"
+            + (" (cancelled before the crawl finished)" if progress.cancelled() else "")
         }
         
     except Exception as e:
@@ -529,6 +454,126 @@ def analyze_page_content_semantic(pages_data: List[Dict[str, Any]]) -> Dict[str,
             "message": f"Error analyzing content: {e}"
         }
 
+def cluster_pages_incremental(
+    pages_data: List[Dict[str, Any]],
+    state_file: Optional[str] = None,
+    full_sync: bool = True,
+    rebalance: bool = False
+) -> Dict[str, Any]:
+    """Update topic clusters incrementally and report drift since the last run."""
+    try:
+        clusterer = IncrementalClusterer.load(Path(state_file) if state_file else None)
+        result = clusterer.update(pages_data, full_sync=full_sync)
+        
+        drift = result["drift"]
+        message = (
+            f"{drift['pages_added']} added, {drift['pages_changed']} changed, "
+            f"{drift['pages_unchanged']} unchanged, {len(drift['pages_moved'])} moved"
+        )
+        
+        # Optional full pass when streaming order has skewed assignments;
+        # its drift is reported on its own, against the state after the update
+        rebalance_drift = None
+        if rebalance:
+            rebalance_result = clusterer.rebalance()
+            result["clusters"] = rebalance_result["clusters"]
+            result["assignments"] = rebalance_result["assignments"]
+            rebalance_drift = rebalance_result["drift"]
+            message += f"; rebalance moved {len(rebalance_drift['pages_moved'])}"
+        
+        clusterer.save()
+        
+        response = {
+            "status": "success",
+            "clusters": result["clusters"],
+            "assignments": result["assignments"],
+            "drift": drift,
+            "message": f"{len(result['clusters'])} clusters; {message}"
+        }
+        if rebalance_drift is not None:
+            response["rebalance_drift"] = rebalance_drift
+        return response
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error clustering pages: {e}"
+        }
+
+def diff_page_snapshots(
+    page_id: str,
+    from_version: Optional[str] = None,
+    to_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """Compare two stored versions of a page, or a stored version against a fresh fetch."""
+    try:
+        store = PageSnapshotStore()
+        
+        def missing(version: str) -> Dict[str, Any]:
+            versions = store.list_versions(page_id)
+            return {
+                "status": "error",
+                "page_id": page_id,
+                "versions": versions,
+                "message": (
+                    f"No snapshot '{version}' of page {page_id}; stored versions: "
+                    + (", ".join(versions) if versions else "none")
+                )
+            }
+        
+        if to_version:
+            new = store.load(page_id, to_version)
+            if new is None:
+                return missing(to_version)
+        else:
+            # Re-fetch the live page; the fetch becomes the newest snapshot
+            content = NotionContentExtractor().extract_page_content_full(page_id)
+            if content.get("error"):
+                return {
+                    "status": "error",
+                    "message": f"Error fetching page {page_id}: {content['error']}"
+                }
+            previous = store.load(page_id)
+            new = store.save(content)
+            if not from_version and previous:
+                from_version = previous["version"]
+        
+        if not from_version:
+            versions = store.list_versions(page_id)
+            earlier = [v for v in versions if v < new["version"]]
+            if not earlier:
+                return {
+                    "status": "success",
+                    "page_id": page_id,
+                    "versions": versions,
+                    "diff": None,
+                    "message": "No earlier snapshot to compare against; current version stored"
+                }
+            from_version = earlier[-1]
+        
+        old = store.load(page_id, from_version)
+        if old is None:
+            return missing(from_version)
+        diff = diff_snapshots(old, new)
+        
+        return {
+            "status": "success",
+            "page_id": page_id,
+            "from_version": old["version"],
+            "to_version": new["version"],
+            "diff": diff,
+            "message": (
+                f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+                f"{len(diff['modified'])} modified blocks" if diff["changed"] else "No changes"
+            )
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error diffing page versions: {e}"
+        }
+
 def extract_key_topics(content: str, title: str) -> List[str]:
     """Extract key topics from content and title."""
     # Simple keyword extraction
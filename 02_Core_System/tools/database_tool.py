@@ -7,7 +7,7 @@ Leverages existing notion_enhancer.py functionality.
 
 import sys
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from datetime import datetime
 
@@ -16,8 +16,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from notion_api_client import NotionTemplateClient
+    from bulk_loader import BulkLoadError
 except ImportError:
     NotionTemplateClient = None
+    BulkLoadError = ValueError
     print("Warning: notion_api_client not found. Database tools will operate in placeholder mode.")
 
 
@@ -325,3 +327,109 @@ def compare_databases(
         }
     }
 
+
+
+def load_database_rows(
+    database_id: str,
+    source: Union[str, List[Dict[str, Any]]],
+    key: Optional[str] = None,
+    column_map: Optional[Dict[str, Optional[str]]] = None,
+    dry_run: bool = False,
+    refresh_index: bool = False,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Upsert rows from a CSV/JSON/NDJSON file or a list of dicts into a database.
+    
+    Rows are matched on the key property through a local index; unchanged
+    rows are skipped, so loading the same source again makes no writes.
+    
+    Args:
+        database_id: The ID of the database to load into
+        source: Path to a .csv, .json or .ndjson file, or a list of row dicts
+        key: Property that identifies a row (default: the title property)
+        column_map: Source column -> property name (None drops the column)
+        dry_run: Count what would be created and updated without writing
+        refresh_index: Rebuild the local upsert index from the database
+        api_key: Optional Notion API key
+        
+    Returns:
+        Dictionary with created, updated, unchanged and failed counts
+    """
+    if NotionTemplateClient is None:
+        return {
+            "status": "placeholder",
+            "message": "Notion client not available. Would load rows.",
+            "database_id": database_id
+        }
+    
+    try:
+        client = NotionTemplateClient(api_key=api_key)
+        result = client.bulk_load(
+            database_id,
+            source,
+            key=key,
+            column_map=column_map,
+            dry_run=dry_run,
+            refresh_index=refresh_index
+        )
+        return dict(result, database_id=database_id)
+    
+    except BulkLoadError as e:
+        return {
+            "status": "error",
+            "problems": e.problems,
+            "message": str(e),
+            "database_id": database_id
+        }
+    except FileNotFoundError as e:
+        return {
+            "status": "error",
+            "message": f"Source not found: {e.filename}",
+            "database_id": database_id
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e),
+            "database_id": database_id
+        }
+
+
+def migrate_database_schemas(
+    migrations: List[Dict[str, Any]],
+    dry_run: bool = False,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Migrate database schemas to a desired state with minimal PATCH bodies.
+    
+    Each schema is diffed against the cached current one; only added,
+    renamed, changed and removed properties and new select options are sent.
+    Migrations for different databases run concurrently.
+    
+    Args:
+        migrations: {"database_id" or "data_source_id", "properties",
+            optional "renames", "remove" and "remove_missing"} per database
+        dry_run: Return the PATCH bodies without sending them
+        api_key: Optional Notion API key
+        
+    Returns:
+        Dictionary with one plan per migration and applied/unchanged/failed counts
+    """
+    if NotionTemplateClient is None:
+        return {
+            "status": "placeholder",
+            "message": "Notion client not available. Would migrate schemas.",
+            "migrations": len(migrations)
+        }
+    
+    try:
+        client = NotionTemplateClient(api_key=api_key)
+        return client.migrate_schemas(migrations, dry_run=dry_run)
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e)
+        }
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Export Tool for Notion Template Generator MCP
+Writes page trees to Markdown or HTML files (see page_exporter.py)
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from local_cache import get_cache_dir
+from page_exporter import PageExporter
+
+
+# MCP Tool Functions
+def export_page_tree(
+    page_id: str,
+    output_dir: Optional[str] = None,
+    format: str = "markdown",
+    max_depth: Optional[int] = None,
+    include_databases: bool = True,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Export a page and its subtree to Markdown or HTML files, one file per page."""
+    try:
+        directory = output_dir or str(get_cache_dir("exports", page_id.replace("-", "")))
+        exporter = PageExporter(
+            directory, format=format, max_workers=max_workers, include_databases=include_databases
+        )
+        return exporter.export(page_id, max_depth)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error exporting page tree: {e}"
+        }
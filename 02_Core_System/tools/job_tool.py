@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Background Job Tool for Notion Template Generator MCP
+Status, results and cancellation of jobs run by job_manager
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from job_manager import get_job_manager, FINISHED_STATES
+
+
+# MCP Tool Functions
+def get_job_status(job_id: Optional[str] = None, include_finished: bool = True) -> Dict[str, Any]:
+    """Status of one job, or of all known jobs when no job_id is given."""
+    try:
+        manager = get_job_manager()
+        if job_id:
+            job = manager.status(job_id)
+            return {
+                "status": "success",
+                "job": job,
+                "message": f"Job {job_id} is {job['state']}"
+            }
+
+        jobs = manager.list_jobs(include_finished)
+        active = len([job for job in jobs if job["state"] not in FINISHED_STATES])
+        return {
+            "status": "success",
+            "jobs": jobs,
+            "message": f"{len(jobs)} jobs, {active} queued or running"
+        }
+
+    except KeyError as e:
+        return {"status": "error", "message": str(e.args[0])}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error reading job status: {e}"
+        }
+
+
+def get_job_result(job_id: str, partial_offset: int = 0) -> Dict[str, Any]:
+    """Result of a finished job, plus the partial results it emitted from partial_offset on."""
+    try:
+        manager = get_job_manager()
+        job = manager.status(job_id)
+        partial = manager.partial_results(job_id, partial_offset)
+        finished = job["state"] in FINISHED_STATES
+
+        return {
+            "status": "success",
+            "job": job,
+            "finished": finished,
+            "result": manager.result(job_id) if finished else None,
+            "partial_results": partial,
+            "next_partial_offset": partial_offset + len(partial),
+            "message": (
+                f"Job {job_id} {job['state']}" if finished
+                else f"Job {job_id} is {job['state']}; {len(partial)} new partial results"
+            )
+        }
+
+    except KeyError as e:
+        return {"status": "error", "message": str(e.args[0])}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error reading job result: {e}"
+        }
+
+
+def cancel_job(job_id: str) -> Dict[str, Any]:
+    """Cancel a queued job or ask a running job to stop."""
+    try:
+        job = get_job_manager().cancel(job_id)
+        return {
+            "status": "success",
+            "job": job,
+            "message": job["message"]
+        }
+
+    except KeyError as e:
+        return {"status": "error", "message": str(e.args[0])}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error cancelling job: {e}"
+        }
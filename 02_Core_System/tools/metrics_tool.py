@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Server Metrics Tool for Notion Template Generator MCP
+Per-tool latency and Notion API call statistics recorded by server_metrics,
+plus result cache statistics
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server_metrics import METRICS
+from result_cache import RESULT_CACHE
+
+
+# MCP Tool Functions
+def get_server_metrics(
+    reset: bool = False,
+    output_format: str = "json",
+    export_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Return recorded tool and Notion API metrics, optionally exporting or resetting them."""
+    try:
+        if output_format not in ("json", "prometheus"):
+            return {
+                "status": "error",
+                "message": f"Unknown format '{output_format}' (use 'json' or 'prometheus')"
+            }
+
+        result: Dict[str, Any] = {"status": "success"}
+        if output_format == "prometheus":
+            result["prometheus"] = METRICS.prometheus_text()
+        else:
+            result["metrics"] = METRICS.snapshot()
+            result["result_cache"] = RESULT_CACHE.stats()
+
+        if export_path:
+            result["exported_to"] = METRICS.write_prometheus(export_path)
+
+        totals = METRICS.snapshot()["totals"]
+        result["message"] = (
+            f"{totals['tool_calls']} tool calls, {totals['api_calls']} Notion API calls, "
+            f"{totals['rate_limited']} rate limited, {totals['retries']} retries"
+        )
+        cache = RESULT_CACHE.stats()
+        if cache["hits"] or cache["misses"]:
+            result["message"] += f", result cache hit rate {cache['hit_rate']:.0%}"
+
+        if reset:
+            METRICS.reset()
+            result["message"] += " (metrics reset)"
+
+        return result
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error reading metrics: {e}"
+        }
@@ -84,6 +84,53 @@ def update_notion_page(
         }
 
 
+def append_markdown_to_notion_page(
+    page_id: str,
+    markdown: str,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Append Markdown to a Notion page as native blocks.
+    
+    Headings, nested lists, to-dos, quotes, code, tables, dividers, images and
+    inline formatting are converted; long text is split into 2,000-character
+    segments and the blocks are sent in batched appends.
+    
+    Args:
+        page_id: The ID of the Notion page to append to
+        markdown: Markdown text
+        api_key: Optional Notion API key (defaults to NOTION_API_KEY env var)
+    
+    Returns:
+        Dictionary with status, blocks added and API requests made
+    """
+    if NotionTemplateClient is None:
+        return {
+            "status": "placeholder",
+            "message": "Notion client not available. Would append Markdown.",
+            "page_id": page_id,
+            "content_preview": markdown[:200]
+        }
+    
+    try:
+        client = NotionTemplateClient(api_key=api_key)
+        stats = client.append_markdown(page_id, markdown)
+        
+        return {
+            "status": "success",
+            "page_id": page_id,
+            "blocks_added": stats["blocks"],
+            "requests": stats["requests"]
+        }
+        
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e),
+            "page_id": page_id
+        }
+
+
 def query_notion_database(
     database_id: str,
     filter_conditions: Optional[Dict[str, Any]] = None,
@@ -342,7 +389,7 @@ def modify_database_schema(
         database_id: ID of the database to modify
         add_properties: New properties to add
         remove_properties: Property names to remove
-        modify_properties: Properties to modify
+        modify_properties: Properties to modify; {"name": new} renames, and option lists are complete (left-out options are removed)
         api_key: Optional Notion API key
     """
     if AdvancedNotionClient is None:
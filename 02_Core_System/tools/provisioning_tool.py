@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Provisioning Tool for Notion Template Generator MCP
+Builds workspaces from declarative manifests (see provisioning.py)
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from provisioning import Provisioner, ProvisioningError, load_manifest, plan_manifest
+
+
+# MCP Tool Functions
+def provision_workspace_from_manifest(
+    manifest: Union[str, Dict[str, Any]],
+    parent_page_id: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Create the pages, databases, relations and rows of a manifest under a parent page."""
+    try:
+        data = manifest if isinstance(manifest, dict) else load_manifest(manifest)
+        if dry_run:
+            plan = plan_manifest(data)
+            return {
+                "status": "success",
+                "dry_run": True,
+                "plan": plan,
+                "message": (
+                    f"Would create {plan['pages']} pages, {plan['databases']} databases, "
+                    f"{plan['relations']} relations, {plan['rollups']} rollups and {plan['rows']} rows in {len(plan['waves'])} waves "
+                    f"({plan['cost_estimate']['message']})"
+                )
+            }
+        return Provisioner().provision(data, parent_page_id)
+
+    except ProvisioningError as e:
+        return {
+            "status": "error",
+            "problems": e.problems,
+            "message": f"Manifest has {len(e.problems)} problems"
+        }
+    except FileNotFoundError as e:
+        return {"status": "error", "message": f"Manifest not found: {e.filename}"}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error provisioning workspace: {e}"
+        }
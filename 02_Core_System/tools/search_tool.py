@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Workspace Search Tool for Notion Template Generator MCP
+BM25 full-text search over page content captured by the extraction tools
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from search_index import get_search_index
+
+
+# MCP Tool Functions
+def search_workspace_content(query: str, k: int = 10) -> Dict[str, Any]:
+    """Full-text search across indexed workspace pages, ranked by BM25."""
+    try:
+        if not query or not query.strip():
+            return {
+                "status": "error",
+                "message": "Query must not be empty"
+            }
+
+        index = get_search_index()
+        results = index.search(query, k=max(1, int(k)))
+
+        return {
+            "status": "success",
+            "query": query,
+            "results": results,
+            "indexed_pages": index.stats()["documents"],
+            "message": f"Found {len(results)} matching pages"
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error searching workspace: {e}"
+        }
+
+
+def index_workspace_pages(pages_data: List[Dict[str, Any]], remove_page_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Add extracted pages to the search index and drop deleted ones."""
+    try:
+        index = get_search_index()
+        counts = index.index_pages(pages_data)
+        removed = index.remove_pages(remove_page_ids or [])
+
+        return {
+            "status": "success",
+            "indexing": {**counts, "removed": removed},
+            "index": index.stats(),
+            "message": (
+                f"Indexed {counts['added']} new and {counts['updated']} changed pages "
+                f"({counts['unchanged']} unchanged, {removed} removed)"
+            )
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error indexing pages: {e}"
+        }
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Snapshot Tool for Notion Template Generator MCP
+Backs up page trees to compressed archives and restores them (see workspace_snapshot.py)
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Add paths
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from workspace_snapshot import WorkspaceSnapshot
+
+
+# MCP Tool Functions
+def create_workspace_snapshot(
+    page_id: str,
+    path: Optional[str] = None,
+    compression: str = "gzip",
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Archive a page, its subtree, databases and rows to one compressed NDJSON file."""
+    try:
+        return WorkspaceSnapshot(max_workers=max_workers).snapshot(page_id, path, compression)
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error creating snapshot: {e}"
+        }
+
+
+def restore_workspace_snapshot(
+    path: str,
+    parent_page_id: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Recreate an archived page tree under a parent page."""
+    try:
+        return WorkspaceSnapshot(max_workers=max_workers).restore(path, parent_page_id)
+
+    except FileNotFoundError as e:
+        return {"status": "error", "message": f"Snapshot not found: {e.filename}"}
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error restoring snapshot: {e}"
+        }
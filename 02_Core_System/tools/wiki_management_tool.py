@@ -12,10 +12,12 @@ import os
 import sys
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
-from notion_client import Client
 from notion_client.errors import APIResponseError
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from notion_transport import get_notion_client
+
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
 
@@ -23,9 +25,10 @@ class WikiManager:
     """Enhanced wiki management with verification and ownership features."""
     
     def __init__(self):
-        self.client = Client(auth=os.getenv("NOTION_API_KEY"))
         if not os.getenv("NOTION_API_KEY"):
             raise ValueError("NOTION_API_KEY environment variable is required")
+        # Wiki calls still use the SDK default API version
+        self.client = get_notion_client(os.getenv("NOTION_API_KEY"), notion_version="2022-06-28")
     
     def create_wiki(self, page_id: str, wiki_title: str = None, description: str = None) -> Dict[str, Any]:
         """
@@ -16,7 +16,6 @@ sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from notion_client import Client
     from notion_client.errors import APIResponseError
     from dotenv import load_dotenv
     
@@ -28,6 +27,108 @@ except ImportError as e:
     print(f"Error importing required modules: {e}")
     sys.exit(1)
 
+from search_index import index_extracted_pages
+from block_renderer import render_blocks
+from block_fingerprints import page_root_hash
+from notion_transport import get_notion_client
+from cost_estimator import CREATE_PAGE, LIST_CHILDREN, PLACEHOLDER_ID, CostEstimate
+import progress
+
+def category_blocks(category_name: str, description: str) -> List[Dict[str, Any]]:
+    """Heading, description and divider that open a category page."""
+    return [
+        {
+            "type": "heading_1",
+            "heading_1": {
+                "rich_text": [{"type": "text", "text": {"content": category_name}}]
+            }
+        },
+        {
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [{"type": "text", "text": {"content": description}}]
+            }
+        },
+        {
+            "type": "divider",
+            "divider": {}
+        }
+    ]
+
+
+def category_emoji(category_name: str) -> str:
+    """Extract emoji from category name for icon."""
+    return category_name.split()[0] if category_name.split() else "📁"
+
+
+def copyable_blocks_for(title: str, blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Blocks of a page that are copied when it is reorganized (a placeholder if none are)."""
+    copyable_blocks = []
+    for block in blocks[:20]:  # Limit to first 20 blocks to avoid API limits
+        block_type = block.get("type")
+        
+        # Only copy certain block types to avoid issues
+        if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", "bulleted_list_item", "numbered_list_item", "quote"]:
+            try:
+                block_content = block.get(block_type, {})
+                if "rich_text" in block_content:
+                    copyable_blocks.append({
+                        "type": block_type,
+                        block_type: {
+                            "rich_text": block_content["rich_text"]
+                        }
+                    })
+            except Exception as e:
+                print(f"⚠️  Skipping block due to error: {e}")
+    
+    # If no copyable blocks, create a simple content block
+    if not copyable_blocks:
+        copyable_blocks = [
+            {
+                "type": "paragraph",
+                "paragraph": {
+                    "rich_text": [{"text": {"content": f"Content from '{title}' - reorganized for better structure."}}]
+                }
+            }
+        ]
+    return copyable_blocks
+
+
+def estimate_reorganization(reorganization_plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    What execute_intelligent_reorganization() would cost for a plan, built
+    from the same payloads without API calls (see cost_estimator.py).
+    """
+    estimate = CostEstimate("reorganize_notion_pages_intelligent")
+    categories = reorganization_plan.get("suggested_categories", {})
+    
+    estimate.phase("categories")
+    for category_name, category_info in categories.items():
+        description = category_info.get("description", f"Pages related to {category_name}")
+        estimate.add(CREATE_PAGE, payload={
+            "parent": {"type": "page_id", "page_id": PLACEHOLDER_ID},
+            "properties": {"title": [{"type": "text", "text": {"content": category_name}}]},
+            "icon": {"type": "emoji", "emoji": category_emoji(category_name)},
+            "children": category_blocks(category_name, description)
+        })
+    estimate.wait(3)
+    
+    # Pages are copied one by one, only into categories the plan creates
+    estimate.phase("pages")
+    for page_info in reorganization_plan.get("pages_to_organize", []):
+        if page_info.get("suggested_category") not in categories:
+            continue
+        title = page_info.get("title", "Untitled")
+        estimate.add(CREATE_PAGE, payload={
+            "parent": {"type": "page_id", "page_id": PLACEHOLDER_ID},
+            "properties": {"title": [{"type": "text", "text": {"content": title}}]},
+            "children": copyable_blocks_for(title, page_info.get("blocks", []))
+        })
+    
+    estimate.phase("verification").add(LIST_CHILDREN, len(categories))
+    return estimate.result()
+
+
 class WorkingNotionReorganizer:
     """Notion reorganizer that uses correct API endpoints and formats."""
     
@@ -36,7 +137,7 @@ class WorkingNotionReorganizer:
         if not self.api_key:
             raise ValueError("Notion API key not found")
         
-        self.client = Client(auth=self.api_key, notion_version="2025-09-03")
+        self.client = get_notion_client(self.api_key)
     
     def extract_page_content_with_blocks(self, page_id: str) -> Dict[str, Any]:
         """Extract complete page content including all blocks."""
@@ -62,8 +163,8 @@ class WorkingNotionReorganizer:
             # Extract title
             title = self._extract_title_from_page(page)
             
-            # Extract text content from blocks
-            content_text = self._extract_text_from_blocks(blocks)
+            # Text, counts, media and Merkle hashes in one pass
+            rendered = render_blocks(blocks)
             
             return {
                 "page_id": page_id,
@@ -73,9 +174,11 @@ class WorkingNotionReorganizer:
                 "created_time": page.get("created_time", ""),
                 "last_edited_time": page.get("last_edited_time", ""),
                 "blocks": blocks,
-                "content_text": content_text,
+                "content_text": rendered["text"],
                 "block_count": len(blocks),
-                "word_count": len(content_text.split()) if content_text else 0
+                "word_count": rendered["word_count"],
+                "media": rendered["media"],
+                "root_hash": page_root_hash(title, rendered["tree_hashes"])
             }
             
         except Exception as e:
@@ -98,201 +201,6 @@ class WorkingNotionReorganizer:
         except:
             return "Untitled"
     
-    def _extract_text_from_blocks(self, blocks: List[Dict]) -> str:
-        """Extract plain text from all supported block types."""
-        text_parts = []
-        
-        for block in blocks:
-            try:
-                block_type = block.get("type")
-                
-                # Handle text-containing blocks with rich_text
-                if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", "quote", "callout"]:
-                    block_content = block.get(block_type, {})
-                    rich_text = block_content.get("rich_text", [])
-                    text = self._extract_rich_text(rich_text)
-                    if text:
-                        text_parts.append(text)
-                
-                elif block_type in ["bulleted_list_item", "numbered_list_item", "to_do"]:
-                    block_content = block.get(block_type, {})
-                    rich_text = block_content.get("rich_text", [])
-                    text = self._extract_rich_text(rich_text)
-                    if text:
-                        # Add checkbox status for to_do items
-                        if block_type == "to_do":
-                            checked = block_content.get("checked", False)
-                            text = f"{'☑️' if checked else '☐'} {text}"
-                        text_parts.append(text)
-                
-                elif block_type == "toggle":
-                    toggle_content = block.get("toggle", {})
-                    rich_text = toggle_content.get("rich_text", [])
-                    text = self._extract_rich_text(rich_text)
-                    if text:
-                        text_parts.append(f"▶️ {text}")
-                
-                elif block_type == "code":
-                    code_content = block.get("code", {})
-                    rich_text = code_content.get("rich_text", [])
-                    language = code_content.get("language", "")
-                    text = self._extract_rich_text(rich_text)
-                    if text:
-                        text_parts.append(f"Code ({language}): {text}")
-                
-                elif block_type == "child_page":
-                    child_page = block.get("child_page", {})
-                    title = child_page.get("title", "Untitled Page")
-                    text_parts.append(f"📄 {title}")
-                
-                elif block_type == "child_database":
-                    child_db = block.get("child_database", {})
-                    title = child_db.get("title", "Untitled Database")
-                    text_parts.append(f"🗄️ {title}")
-                
-                elif block_type == "bookmark":
-                    bookmark = block.get("bookmark", {})
-                    url = bookmark.get("url", "")
-                    caption = self._extract_rich_text(bookmark.get("caption", []))
-                    text_parts.append(f"🔖 {caption or url}")
-                
-                elif block_type == "embed":
-                    embed = block.get("embed", {})
-                    url = embed.get("url", "")
-                    text_parts.append(f"🔗 Embed: {url}")
-                
-                elif block_type == "image":
-                    image = block.get("image", {})
-                    if image.get("type") == "external":
-                        url = image.get("external", {}).get("url", "")
-                    elif image.get("type") == "file":
-                        url = image.get("file", {}).get("url", "")
-                    else:
-                        url = "Image"
-                    text_parts.append(f"🖼️ {url}")
-                
-                elif block_type == "video":
-                    video = block.get("video", {})
-                    if video.get("type") == "external":
-                        url = video.get("external", {}).get("url", "")
-                    elif video.get("type") == "file":
-                        url = video.get("file", {}).get("url", "")
-                    else:
-                        url = "Video"
-                    text_parts.append(f"🎥 {url}")
-                
-                elif block_type == "audio":
-                    audio = block.get("audio", {})
-                    if audio.get("type") == "external":
-                        url = audio.get("external", {}).get("url", "")
-                    elif audio.get("type") == "file":
-                        url = audio.get("file", {}).get("url", "")
-                    else:
-                        url = "Audio"
-                    text_parts.append(f"🎵 {url}")
-                
-                elif block_type == "file":
-                    file_obj = block.get("file", {})
-                    name = file_obj.get("name", "File")
-                    if file_obj.get("type") == "external":
-                        url = file_obj.get("external", {}).get("url", "")
-                    elif file_obj.get("type") == "file":
-                        url = file_obj.get("file", {}).get("url", "")
-                    else:
-                        url = ""
-                    text_parts.append(f"📎 {name} {url}".strip())
-                
-                elif block_type == "pdf":
-                    pdf = block.get("pdf", {})
-                    if pdf.get("type") == "external":
-                        url = pdf.get("external", {}).get("url", "")
-                    elif pdf.get("type") == "file":
-                        url = pdf.get("file", {}).get("url", "")
-                    else:
-                        url = "PDF"
-                    text_parts.append(f"📄 PDF: {url}")
-                
-                elif block_type == "table":
-                    table = block.get("table", {})
-                    width = table.get("table_width", 0)
-                    text_parts.append(f"📊 Table ({width} columns)")
-                
-                elif block_type == "table_row":
-                    table_row = block.get("table_row", {})
-                    cells = table_row.get("cells", [])
-                    cell_texts = []
-                    for cell in cells:
-                        cell_text = self._extract_rich_text(cell)
-                        cell_texts.append(cell_text)
-                    text_parts.append(" | ".join(cell_texts))
-                
-                elif block_type == "equation":
-                    equation = block.get("equation", {})
-                    expression = equation.get("expression", "")
-                    text_parts.append(f"🧮 {expression}")
-                
-                elif block_type == "divider":
-                    text_parts.append("---")
-                
-                elif block_type == "breadcrumb":
-                    text_parts.append("🍞 Breadcrumb")
-                
-                elif block_type == "table_of_contents":
-                    text_parts.append("📋 Table of Contents")
-                
-                elif block_type == "link_preview":
-                    link_preview = block.get("link_preview", {})
-                    url = link_preview.get("url", "")
-                    text_parts.append(f"🔗 {url}")
-                
-                elif block_type == "template":
-                    template = block.get("template", {})
-                    rich_text = template.get("rich_text", [])
-                    text = self._extract_rich_text(rich_text)
-                    if text:
-                        text_parts.append(f"📝 Template: {text}")
-                
-                elif block_type == "synced_block":
-                    synced = block.get("synced_block", {})
-                    if synced.get("synced_from") is None:
-                        text_parts.append("🔄 Original Synced Block")
-                    else:
-                        text_parts.append("🔄 Synced Block")
-                
-                elif block_type == "column_list":
-                    text_parts.append("📐 Column Layout")
-                
-                elif block_type == "column":
-                    column = block.get("column", {})
-                    width_ratio = column.get("width_ratio", "auto")
-                    text_parts.append(f"📐 Column ({width_ratio})")
-                
-                elif block_type == "unsupported":
-                    text_parts.append("❓ Unsupported Block")
-                
-                # Handle blocks with children recursively
-                if block.get("has_children") and "children" in block:
-                    children = block.get("children", [])
-                    if children:
-                        children_text = self._extract_text_from_blocks(children)
-                        if children_text:
-                            text_parts.append(children_text)
-                            
-            except Exception as e:
-                print(f"⚠️  Error extracting text from {block_type} block: {e}")
-        
-        return "\n".join(text_parts)
-    
-    def _extract_rich_text(self, rich_text_data: List[Dict]) -> str:
-        """Extract plain text from rich text objects."""
-        try:
-            return "".join([
-                rt.get("text", {}).get("content", "") 
-                for rt in rich_text_data
-            ])
-        except:
-            return ""
-    
     def get_page_hierarchy_with_content(self, root_page_id: str, max_depth: int = 5) -> List[Dict[str, Any]]:
         """Get complete page hierarchy with content extraction."""
         try:
@@ -440,36 +348,7 @@ class WorkingNotionReorganizer:
         try:
             title = source_page.get("title", "Untitled")
             blocks = source_page.get("blocks", [])
-            
-            # Filter and prepare blocks for copying
-            copyable_blocks = []
-            for block in blocks[:20]:  # Limit to first 20 blocks to avoid API limits
-                block_type = block.get("type")
-                
-                # Only copy certain block types to avoid issues
-                if block_type in ["paragraph", "heading_1", "heading_2", "heading_3", "bulleted_list_item", "numbered_list_item", "quote"]:
-                    try:
-                        block_content = block.get(block_type, {})
-                        if "rich_text" in block_content:
-                            copyable_blocks.append({
-                                "type": block_type,
-                                block_type: {
-                                    "rich_text": block_content["rich_text"]
-                                }
-                            })
-                    except Exception as e:
-                        print(f"⚠️  Skipping block due to error: {e}")
-            
-            # If no copyable blocks, create a simple content block
-            if not copyable_blocks:
-                copyable_blocks = [
-                    {
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"text": {"content": f"Content from '{title}' - reorganized for better structure."}}]
-                        }
-                    }
-                ]
+            copyable_blocks = copyable_blocks_for(title, blocks)
             
             # Create the new page
             new_page_id = self.create_page_correctly(target_parent_id, title, copyable_blocks)
@@ -509,33 +388,21 @@ class WorkingNotionReorganizer:
             
             print(f"📋 Plan: Create {len(categories)} categories")
             
+            # Progress counts operations: category pages to create, then pages to copy
+            pages_to_organize = reorganization_plan.get("pages_to_organize", [])
+            operations_planned = len(categories) + len(pages_to_organize)
+            operations_done = 0
+            
             # Step 1: Create category pages
             category_ids = {}
             for category_name, category_info in categories.items():
+                if progress.cancelled():
+                    break
                 description = category_info.get("description", f"Pages related to {category_name}")
                 
                 # Create category page with description and emoji icon
-                content_blocks = [
-                    {
-                        "type": "heading_1",
-                        "heading_1": {
-                            "rich_text": [{"type": "text", "text": {"content": category_name}}]
-                        }
-                    },
-                    {
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"type": "text", "text": {"content": description}}]
-                        }
-                    },
-                    {
-                        "type": "divider",
-                        "divider": {}
-                    }
-                ]
-                
-                # Extract emoji from category name for icon
-                emoji = category_name.split()[0] if category_name.split() else "📁"
+                content_blocks = category_blocks(category_name, description)
+                emoji = category_emoji(category_name)
                 
                 category_id = self.create_page_with_icon(root_page_id, category_name, content_blocks, emoji)
                 if category_id:
@@ -546,16 +413,26 @@ class WorkingNotionReorganizer:
                     error_msg = f"Failed to create category: {category_name}"
                     results["errors"].append(error_msg)
                     print(f"❌ {error_msg}")
+                
+                operations_done += 1
+                progress.report_progress(operations_done, operations_planned, f"Category '{category_name}'")
+                progress.report_partial({
+                    "operation": "create_category",
+                    "category": category_name,
+                    "page_id": category_ids.get(category_name)
+                })
             
             # Step 2: Wait for API sync
-            print("\n⏳ Waiting for API synchronization...")
-            time.sleep(3)
+            if not progress.cancelled():
+                print("\n⏳ Waiting for API synchronization...")
+                time.sleep(3)
             
             # Step 3: Copy pages to categories
-            pages_to_organize = reorganization_plan.get("pages_to_organize", [])
-            
             for page_info in pages_to_organize:
+                if progress.cancelled():
+                    break
                 page_id = page_info.get("page_id")
+                new_page_id = None
                 suggested_category = page_info.get("suggested_category")
                 
                 if suggested_category in category_ids:
@@ -575,6 +452,21 @@ class WorkingNotionReorganizer:
                     error_msg = f"Category not found for page: {page_info.get('title', 'Unknown')}"
                     results["errors"].append(error_msg)
                     print(f"⚠️  {error_msg}")
+                
+                operations_done += 1
+                progress.report_progress(
+                    operations_done, operations_planned, f"Organized '{page_info.get('title', 'Unknown')}'"
+                )
+                progress.report_partial({
+                    "operation": "copy_page",
+                    "page_id": page_id,
+                    "title": page_info.get("title", "Unknown"),
+                    "category": suggested_category,
+                    "new_page_id": new_page_id
+                })
+            
+            results["operations_planned"] = operations_planned
+            results["operations_completed"] = operations_done
             
             # Step 4: Verify the new structure
             print(f"\n🔍 VERIFICATION")
@@ -610,6 +502,7 @@ class WorkingNotionReorganizer:
             
             return {
                 "status": "success",
+                "cancelled": progress.cancelled(),
                 "results": results
             }
             
@@ -648,6 +541,9 @@ def extract_pages_with_full_content(
         total_words = sum(page.get("word_count", 0) for page in pages if not page.get("error"))
         total_blocks = sum(page.get("block_count", 0) for page in pages if not page.get("error"))
         
+        # Keep the workspace search index current with what was just fetched
+        search_index = index_extracted_pages(pages)
+        
         return {
             "status": "success",
             "pages": pages,
@@ -657,6 +553,7 @@ def extract_pages_with_full_content(
                 "total_blocks": total_blocks,
                 "pages_with_errors": len([p for p in pages if p.get("error")])
             },
+            "search_index": search_index,
             "message": f"Extracted {total_pages} pages with complete content"
         }
         
@@ -731,14 +628,17 @@ def create_reorganization_plan_from_content(pages_data: List[Dict[str, Any]]) ->
                 "content_text": page.get("content_text", "")[:200] + "..." if len(page.get("content_text", "")) > 200 else page.get("content_text", "")
             })
         
+        reorganization_plan = {
+            "suggested_categories": categories,
+            "pages_to_organize": pages_to_organize,
+            "total_pages": len(pages_to_organize),
+            "categories_count": len(categories)
+        }
+        
         return {
             "status": "success",
-            "reorganization_plan": {
-                "suggested_categories": categories,
-                "pages_to_organize": pages_to_organize,
-                "total_pages": len(pages_to_organize),
-                "categories_count": len(categories)
-            },
+            "reorganization_plan": reorganization_plan,
+            "cost_estimate": estimate_reorganization(reorganization_plan),
             "message": f"Created reorganization plan for {len(pages_to_organize)} pages into {len(categories)} categories"
         }
         
@@ -0,0 +1,380 @@
+"""
+Incremental Workspace Clustering
+
+Keeps topic clusters for workspace pages up to date without reclustering from
+scratch. Each page is turned into a sparse term vector and assigned to the
+nearest centroid (streaming centroid assignment). Centroids are stored as
+running sums, so adding, moving or removing a page only touches that page's
+terms. Pages whose content fingerprint has not changed since the last run are
+skipped entirely, which keeps a refresh after every sync cheap.
+
+Every update returns a drift report: which pages moved between clusters, which
+clusters appeared or dissolved, and how far each touched centroid shifted.
+"""
+
+import hashlib
+import json
+import math
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+from local_cache import get_cache_dir
+
+STATE_VERSION = 1
+
+# Pages without any terms (e.g. "Untitled") share one catch-all cluster
+EMPTY_CLUSTER_ID = "c0"
+
+STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "your", "with", "this",
+    "that", "from", "have", "has", "was", "were", "will", "can", "all", "any",
+    "our", "out", "into", "about", "what", "when", "how", "who", "why", "which",
+    "their", "there", "them", "they", "then", "than", "more", "most", "some",
+    "such", "only", "also", "just", "each", "other", "over", "like", "use",
+    "using", "used", "page", "pages", "untitled"
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]{3,}")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def page_fingerprint(title: str, content: str) -> str:
+    """Content fingerprint used to decide whether a page needs re-assignment."""
+    return hashlib.sha1(f"{title}\n{content}".encode("utf-8")).hexdigest()
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity of two sparse vectors."""
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(weight * b.get(term, 0.0) for term, weight in a.items())
+    norm_a = math.sqrt(sum(w * w for w in a.values()))
+    norm_b = math.sqrt(sum(w * w for w in b.values()))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class IncrementalClusterer:
+    """Streaming centroid clustering with persistent state and drift reporting."""
+
+    def __init__(
+        self,
+        state_file: Optional[Path] = None,
+        similarity_threshold: float = 0.2,
+        max_clusters: int = 12,
+        max_terms_per_page: int = 50,
+        title_weight: int = 3,
+        scope: Optional[str] = None
+    ):
+        """
+        Args:
+            state_file: Where assignments are persisted (default: cache dir)
+            similarity_threshold: Minimum cosine similarity to join an existing cluster
+            max_clusters: Upper bound on clusters; beyond it pages join the nearest one
+            max_terms_per_page: Terms kept per page vector (bounds centroid size)
+            title_weight: How many times title terms are counted
+            scope: Keep a separate default state file for this key, e.g. a
+                root page ID, so a full sync of one tree leaves others alone
+        """
+        default_name = f"clusters-{scope.replace('-', '')}.json" if scope else "clusters.json"
+        self.state_file = Path(state_file) if state_file else get_cache_dir("clustering") / default_name
+        self.similarity_threshold = similarity_threshold
+        self.max_clusters = max_clusters
+        self.max_terms_per_page = max_terms_per_page
+        self.title_weight = title_weight
+
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.clusters: Dict[str, Dict[str, Any]] = {}
+        self.next_cluster_id = 1
+        self.updated_at: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, state_file: Optional[Path] = None, **kwargs) -> "IncrementalClusterer":
+        """Load clusterer state from disk (returns an empty clusterer if none exists)."""
+        clusterer = cls(state_file=state_file, **kwargs)
+        if not clusterer.state_file.exists():
+            return clusterer
+
+        try:
+            state = json.loads(clusterer.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read cluster state, starting fresh: {e}")
+            return clusterer
+
+        if state.get("version") != STATE_VERSION:
+            print("⚠️  Cluster state version changed, starting fresh")
+            return clusterer
+
+        clusterer.pages = state.get("pages", {})
+        clusterer.clusters = state.get("clusters", {})
+        clusterer.next_cluster_id = state.get("next_cluster_id", 1)
+        clusterer.updated_at = state.get("updated_at")
+        return clusterer
+
+    def save(self) -> None:
+        """Persist clusterer state to disk."""
+        state = {
+            "version": STATE_VERSION,
+            "updated_at": self.updated_at,
+            "next_cluster_id": self.next_cluster_id,
+            "clusters": self.clusters,
+            "pages": self.pages
+        }
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        tmp_file.replace(self.state_file)
+
+    # ------------------------------------------------------------------
+    # Vectors and centroids
+    # ------------------------------------------------------------------
+
+    def vectorize(self, title: str, content: str) -> Dict[str, float]:
+        """Build a normalised, sublinear term-frequency vector for a page."""
+        counts: Dict[str, int] = {}
+        for token in tokenize(title):
+            counts[token] = counts.get(token, 0) + self.title_weight
+        for token in tokenize(content):
+            counts[token] = counts.get(token, 0) + 1
+
+        if not counts:
+            return {}
+
+        top_terms = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:self.max_terms_per_page]
+        vector = {term: 1.0 + math.log(count) for term, count in top_terms}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: round(w / norm, 6) for term, w in vector.items()}
+
+    def _add_to_cluster(self, cluster_id: str, vector: Dict[str, float]) -> None:
+        cluster = self.clusters.setdefault(cluster_id, {"sum": {}, "count": 0})
+        centroid_sum = cluster["sum"]
+        for term, weight in vector.items():
+            centroid_sum[term] = centroid_sum.get(term, 0.0) + weight
+        cluster["count"] += 1
+
+    def _remove_from_cluster(self, cluster_id: str, vector: Dict[str, float]) -> None:
+        cluster = self.clusters.get(cluster_id)
+        if not cluster:
+            return
+        centroid_sum = cluster["sum"]
+        for term, weight in vector.items():
+            remaining = centroid_sum.get(term, 0.0) - weight
+            if remaining > 1e-9:
+                centroid_sum[term] = remaining
+            else:
+                centroid_sum.pop(term, None)
+        cluster["count"] -= 1
+        if cluster["count"] <= 0:
+            del self.clusters[cluster_id]
+
+    def _nearest_cluster(self, vector: Dict[str, float]) -> tuple:
+        """The most similar cluster, or the first one when none overlaps (None without clusters)."""
+        best_id, best_score = None, -1.0
+        for cluster_id, cluster in self.clusters.items():
+            score = _cosine(vector, cluster["sum"])
+            if score > best_score:
+                best_id, best_score = cluster_id, score
+        return best_id, max(best_score, 0.0)
+
+    def _assign(self, vector: Dict[str, float], preferred_id: Optional[str] = None) -> tuple:
+        """Pick a cluster for a vector, opening a new one when nothing is close enough."""
+        full = len(self.clusters) >= self.max_clusters
+        if not vector and (EMPTY_CLUSTER_ID in self.clusters or not full):
+            return EMPTY_CLUSTER_ID, 0.0
+
+        # At max_clusters a page joins the nearest cluster even without overlap
+        best_id, best_score = self._nearest_cluster(vector)
+        if best_id is not None and (best_score >= self.similarity_threshold or full):
+            return best_id, best_score
+
+        # A page that was alone in its cluster keeps the cluster id
+        if preferred_id and preferred_id not in self.clusters and preferred_id != EMPTY_CLUSTER_ID:
+            return preferred_id, 1.0
+
+        cluster_id = f"c{self.next_cluster_id}"
+        self.next_cluster_id += 1
+        return cluster_id, 1.0
+
+    def cluster_label(self, cluster_id: str, top_n: int = 3) -> str:
+        """Human-readable label made of the centroid's strongest terms."""
+        centroid_sum = self.clusters.get(cluster_id, {}).get("sum", {})
+        top_terms = sorted(centroid_sum.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+        return " / ".join(term for term, _ in top_terms) or "misc"
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, pages: Iterable[Dict[str, Any]], full_sync: bool = True) -> Dict[str, Any]:
+        """
+        Apply a batch of (possibly changed) pages and return assignments plus drift.
+
+        Args:
+            pages: Page dicts with page_id/id, title and content_text/content
+            full_sync: When True, known pages missing from this batch are removed
+
+        Returns:
+            Dictionary with clusters, per-page assignments and a drift report
+        """
+        old_centroids = {cid: dict(c["sum"]) for cid, c in self.clusters.items()}
+        old_clusters = set(self.clusters)
+
+        seen = set()
+        added, changed, unchanged, removed = [], [], [], []
+        moved = []
+
+        for page in pages:
+            if page.get("error"):
+                continue
+            page_id = page.get("page_id") or page.get("id")
+            if not page_id:
+                continue
+            seen.add(page_id)
+
+            title = page.get("title") or ""
+            content = page.get("content_text") or page.get("content") or ""
+            fingerprint = page_fingerprint(title, content)
+            previous = self.pages.get(page_id)
+
+            if previous and previous["fingerprint"] == fingerprint:
+                unchanged.append(page_id)
+                continue
+
+            if previous:
+                self._remove_from_cluster(previous["cluster"], previous["vector"])
+
+            vector = self.vectorize(title, content)
+            cluster_id, score = self._assign(vector, previous["cluster"] if previous else None)
+            self._add_to_cluster(cluster_id, vector)
+
+            self.pages[page_id] = {
+                "title": title,
+                "fingerprint": fingerprint,
+                "vector": vector,
+                "cluster": cluster_id,
+                "similarity": round(score, 4)
+            }
+
+            if previous:
+                changed.append(page_id)
+                if previous["cluster"] != cluster_id:
+                    moved.append({
+                        "page_id": page_id,
+                        "title": title,
+                        "from_cluster": previous["cluster"],
+                        "to_cluster": cluster_id
+                    })
+            else:
+                added.append(page_id)
+
+        if full_sync:
+            for page_id in [pid for pid in self.pages if pid not in seen]:
+                previous = self.pages.pop(page_id)
+                self._remove_from_cluster(previous["cluster"], previous["vector"])
+                removed.append(page_id)
+
+        self.updated_at = datetime.now().isoformat()
+        drift = self._drift_report(old_centroids, old_clusters, added, changed, unchanged, removed, moved)
+        return {
+            "clusters": self.get_clusters(),
+            "assignments": {pid: info["cluster"] for pid, info in self.pages.items()},
+            "drift": drift
+        }
+
+    def rebalance(self) -> Dict[str, Any]:
+        """
+        Re-assign every known page against the current centroids.
+
+        Streaming assignment depends on arrival order; call this when the drift
+        report shows heavy movement to pull early pages toward their best cluster.
+        """
+        old_centroids = {cid: dict(c["sum"]) for cid, c in self.clusters.items()}
+        old_clusters = set(self.clusters)
+        moved = []
+
+        for page_id, info in self.pages.items():
+            self._remove_from_cluster(info["cluster"], info["vector"])
+            cluster_id, score = self._assign(info["vector"], info["cluster"])
+            self._add_to_cluster(cluster_id, info["vector"])
+            if cluster_id != info["cluster"]:
+                moved.append({
+                    "page_id": page_id,
+                    "title": info["title"],
+                    "from_cluster": info["cluster"],
+                    "to_cluster": cluster_id
+                })
+            info["cluster"] = cluster_id
+            info["similarity"] = round(score, 4)
+
+        self.updated_at = datetime.now().isoformat()
+        changed = {m["page_id"] for m in moved}
+        unchanged = [pid for pid in self.pages if pid not in changed]
+        drift = self._drift_report(old_centroids, old_clusters, [], list(changed), unchanged, [], moved)
+        return {
+            "clusters": self.get_clusters(),
+            "assignments": {pid: info["cluster"] for pid, info in self.pages.items()},
+            "drift": drift
+        }
+
+    def get_clusters(self) -> Dict[str, Dict[str, Any]]:
+        """Current clusters with labels and member pages."""
+        members: Dict[str, List[Dict[str, Any]]] = {cid: [] for cid in self.clusters}
+        for page_id, info in self.pages.items():
+            members.setdefault(info["cluster"], []).append({
+                "page_id": page_id,
+                "title": info["title"],
+                "similarity": info["similarity"]
+            })
+
+        return {
+            cluster_id: {
+                "label": self.cluster_label(cluster_id),
+                "size": len(pages),
+                "pages": sorted(pages, key=lambda p: -p["similarity"])
+            }
+            for cluster_id, pages in members.items()
+        }
+
+    def _drift_report(
+        self,
+        old_centroids: Dict[str, Dict[str, float]],
+        old_clusters: set,
+        added: List[str],
+        changed: List[str],
+        unchanged: List[str],
+        removed: List[str],
+        moved: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Summarise how the clustering moved since the previous state."""
+        current = set(self.clusters)
+        centroid_shift = {}
+        for cluster_id in current & old_clusters:
+            shift = 1.0 - _cosine(old_centroids[cluster_id], self.clusters[cluster_id]["sum"])
+            if shift > 1e-6:
+                centroid_shift[cluster_id] = round(shift, 4)
+
+        total = max(len(self.pages), 1)
+        return {
+            "pages_added": len(added),
+            "pages_changed": len(changed),
+            "pages_unchanged": len(unchanged),
+            "pages_removed": len(removed),
+            "pages_moved": moved,
+            "new_clusters": sorted(current - old_clusters),
+            "dissolved_clusters": sorted(old_clusters - current),
+            "centroid_shift": centroid_shift,
+            "drift_ratio": round((len(moved) + len(added) + len(removed)) / total, 4)
+        }
@@ -0,0 +1,718 @@
+"""
+Workspace Snapshots
+
+Full backups of a page tree (pages, block content, databases with their data
+source schemas, and rows) as one compressed NDJSON archive, and a restore
+engine that rebuilds the tree from it. Take one before running destructive
+tools such as execute_notion_workspace_cleanup or delete_all_pages.py.
+
+An archive holds one JSON record per line:
+
+    {"kind": "header", "version": 1, "root_id": ..., "title": ..., "created": ...}
+    {"kind": "block", "hash": "3f2a...", "block": {"type": "paragraph", "paragraph": {...}}}
+    {"kind": "page", "id": ..., "parent": ..., "parent_type": "page", "properties": {...}, "content": [...]}
+    {"kind": "database", "id": ..., "parent": ..., "title": [...], "data_sources": [...]}
+    {"kind": "footer", "complete": true, "pages": ..., "blocks": ..., "unique_blocks": ...}
+
+Block content is content-addressed: each distinct block is stored once under
+its content hash (see block_fingerprints.py), and a page's "content" is a
+tree of "hash" or ["hash", [children]] nodes. Child pages and databases
+appear in it as {"page": id} / {"database": id} markers at their position.
+Repeated blocks such as template boilerplate and dividers cost one line.
+
+Pages are fetched concurrently and each record is written as soon as its
+page arrives, so memory stays flat. A parent's record always comes before its
+children's. Archives are gzip-compressed, or zstd with compression="zstd"
+when the optional `zstandard` package is installed; reading detects which.
+
+Restoring recreates the tree under a parent page. Each page's blocks and
+child pages are recreated in their original order. Sibling subtrees and
+database rows are restored concurrently. Databases are created with their
+plain properties; relations, then rollups and formulas, are added once every
+database exists, and finally rows get relation values pointing at the
+restored rows. The API sets some limits on what comes back:
+  - Files uploaded to Notion are restored as links to their signed URLs, which
+    expire after about an hour; download anything you need to keep.
+  - Status properties are created with Notion's default options only.
+  - Read-only property values (formulas, rollups, created/edited times,
+    unique IDs) are recomputed by Notion rather than restored. Formulas that
+    refer to other properties by ID are reported if Notion rejects them.
+  - Link previews, templates and other blocks the API cannot create are
+    skipped and counted.
+"""
+
+import gzip
+import io
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+import progress
+from block_fingerprints import block_content_hash
+from local_cache import get_cache_dir
+from markdown_blocks import append_block_tree
+from notion_concurrency import (
+    DEFAULT_MAX_WORKERS, call_with_retry, create_database, crawl, iter_data_source_rows, list_block_tree, parallel_map
+)
+from notion_transport import get_notion_client
+from template_compiler import relation_property
+
+ARCHIVE_VERSION = 1
+
+COMPRESSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Blocks that are separate objects (archived as markers) or that the API cannot create
+SKIPPED_BLOCK_TYPES = {
+    "child_page", "child_database", "unsupported", "link_preview", "template",
+    "button", "ai_block", "transcription", "meeting_notes"
+}
+
+MEDIA_TYPES = {"image", "video", "audio", "file", "pdf"}
+
+# Page properties Notion computes itself
+READ_ONLY_PROPERTY_TYPES = {
+    "formula", "rollup", "created_time", "created_by", "last_edited_time",
+    "last_edited_by", "unique_id", "button", "verification"
+}
+
+# Schema properties added once every data source exists, in this order
+LINKED_SCHEMA_TYPES = ("relation", "rollup", "formula")
+
+
+# ----------------------------------------------------------------------
+# Writable payloads
+# ----------------------------------------------------------------------
+
+def writable_rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rich text as returned by the API -> rich text the API accepts."""
+    writable = []
+    for item in items or []:
+        item_type = item.get("type", "text")
+        entry = {"type": item_type, item_type: item.get(item_type, {})}
+        if item.get("annotations"):
+            entry["annotations"] = item["annotations"]
+        writable.append(entry)
+    return writable
+
+
+def _external_file(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """A file object; Notion-hosted files become links to their (signed) URL."""
+    source = payload.get("type")
+    if source == "external":
+        url = payload.get("external", {}).get("url", "")
+    else:
+        url = payload.get("file", {}).get("url", "")
+    writable = {k: v for k, v in payload.items() if k in ("caption", "name")}
+    writable.update({"type": "external", "external": {"url": url}})
+    return writable
+
+
+def writable_icon(icon: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not icon:
+        return None
+    if icon.get("type") == "file":
+        return {"type": "external", "external": {"url": icon["file"].get("url", "")}}
+    return icon
+
+
+def writable_block(block: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """A block as returned by the API -> a block that can be appended (children excluded), or None."""
+    block_type = block.get("type", "")
+    if block_type in SKIPPED_BLOCK_TYPES or block_type not in block:
+        return None
+    payload = {k: v for k, v in block[block_type].items() if k != "children"}
+    for key in ("rich_text", "caption"):
+        if key in payload:
+            payload[key] = writable_rich_text(payload[key])
+    if block_type in MEDIA_TYPES:
+        payload = _external_file(payload)
+    elif block_type == "table_row":
+        payload["cells"] = [writable_rich_text(cell) for cell in payload.get("cells", [])]
+    elif block_type == "callout" and payload.get("icon"):
+        payload["icon"] = writable_icon(payload["icon"])
+    elif block_type == "synced_block":
+        # References are restored as originals holding the synced content
+        payload = {"synced_from": None}
+    return {"type": block_type, block_type: payload}
+
+
+def writable_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Page property values as returned by the API -> values pages.create accepts."""
+    writable = {}
+    for name, prop in properties.items():
+        prop_type = prop.get("type", "")
+        if prop_type in READ_ONLY_PROPERTY_TYPES or prop_type not in prop:
+            continue
+        value = prop[prop_type]
+        if prop_type in ("title", "rich_text"):
+            value = writable_rich_text(value)
+        elif prop_type in ("select", "status"):
+            value = {"name": value["name"]} if value else None
+        elif prop_type == "multi_select":
+            value = [{"name": option["name"]} for option in value]
+        elif prop_type in ("people", "relation"):
+            value = [{"id": item["id"]} for item in value]
+        elif prop_type == "files":
+            value = [_external_file(f) for f in value]
+        writable[name] = {prop_type: value}
+    return writable
+
+
+def writable_schema(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """A data source schema as returned by the API -> property definitions the API accepts."""
+    schema = {}
+    for name, prop in properties.items():
+        prop_type = prop.get("type", "")
+        config = prop.get(prop_type) or {}
+        if prop_type in ("button", "verification"):
+            continue
+        if prop_type in ("select", "multi_select"):
+            config = {"options": [{"name": o["name"], "color": o.get("color", "default")} for o in config.get("options", [])]}
+        elif prop_type == "status":
+            # The API creates status properties with Notion's default groups only
+            config = {}
+        elif prop_type == "relation":
+            relation = {"data_source_id": config.get("data_source_id"), "type": config.get("type", "single_property")}
+            if relation["type"] == "dual_property":
+                relation["synced_property_name"] = config.get("dual_property", {}).get("synced_property_name")
+            config = relation
+        elif prop_type == "rollup":
+            config = {k: config[k] for k in ("relation_property_name", "rollup_property_name", "function") if k in config}
+        elif prop_type == "formula":
+            config = {"expression": config.get("expression", "")}
+        elif prop_type == "number":
+            config = {"format": config.get("format", "number")}
+        elif prop_type == "unique_id":
+            config = {"prefix": config.get("prefix")} if config.get("prefix") else {}
+        else:
+            config = {}
+        schema[name] = {prop_type: config}
+    return schema
+
+
+def _schema_type(definition: Dict[str, Any]) -> str:
+    return next(iter(definition))
+
+
+def _title_text(properties: Dict[str, Any]) -> str:
+    for prop in properties.values():
+        if "title" in prop:
+            return "".join(item.get("text", {}).get("content", "") for item in prop["title"]) or "Untitled"
+    return "Untitled"
+
+
+# ----------------------------------------------------------------------
+# Archive files
+# ----------------------------------------------------------------------
+
+def open_archive(path: Union[str, Path], mode: str = "r", compression: str = "gzip") -> TextIO:
+    """
+    Open an archive as text. Reading detects gzip or zstd from the file itself.
+
+    Args:
+        path: Archive file
+        mode: "r" or "w"
+        compression: "gzip" or "zstd" (writing only)
+    """
+    if mode == "r":
+        with open(path, "rb") as f:
+            magic = f.read(4)
+        compression = "zstd" if magic.startswith(ZSTD_MAGIC) else "gzip"
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'; use one of: {', '.join(COMPRESSIONS)}")
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if zstandard is None:
+        raise ValueError("zstd archives need the zstandard package (pip install zstandard)")
+    raw = open(path, mode + "b")
+    if mode == "w":
+        stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+    else:
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def read_archive(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """The records of an archive, in order."""
+    with open_archive(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _content_tree(
+    blocks: List[Dict[str, Any]],
+    contents: Dict[str, Dict[str, Any]],
+    markers: List[Dict[str, Any]]
+) -> List[Any]:
+    """Hash nodes for a block tree, collecting block contents by hash and child object markers."""
+    tree = []
+    for block in blocks:
+        block_type = block.get("type")
+        if block_type in ("child_page", "child_database"):
+            marker = {"page" if block_type == "child_page" else "database": block["id"]}
+            tree.append(marker)
+            markers.append(marker)
+            continue
+        writable = writable_block(block)
+        if writable is None:
+            continue
+        content_hash = block_content_hash(writable)
+        contents.setdefault(content_hash, writable)
+        children = _content_tree(block.get("children") or [], contents, markers)
+        tree.append([content_hash, children] if children else content_hash)
+    return tree
+
+
+def _count_blocks(blocks: List[Dict[str, Any]]) -> int:
+    return sum(1 + _count_blocks(block.get("children") or []) for block in blocks)
+
+
+def _count_nodes(tree: List[Any]) -> int:
+    return sum(
+        0 if isinstance(node, dict) else 1 + (_count_nodes(node[1]) if isinstance(node, list) else 0)
+        for node in tree
+    )
+
+
+# ----------------------------------------------------------------------
+# Snapshot and restore
+# ----------------------------------------------------------------------
+
+class WorkspaceSnapshot:
+    """Archives page trees and restores them, concurrently on a bounded pool."""
+
+    def __init__(self, api_key: Optional[str] = None, max_workers: Optional[int] = None):
+        self.api_key = api_key or os.getenv("NOTION_API_KEY")
+        if not self.api_key:
+            raise ValueError("Notion API key not found")
+        self.client = get_notion_client(self.api_key)
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+
+    # -- snapshot ------------------------------------------------------
+
+    def _snapshot_page(self, task: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        page = task.get("page") or call_with_retry(self.client.pages.retrieve, page_id=task["id"])
+        contents: Dict[str, Dict[str, Any]] = {}
+        markers: List[Dict[str, Any]] = []
+        blocks = list_block_tree(self.client, page["id"])
+        content = _content_tree(blocks, contents, markers)
+        record = {
+            "kind": "page",
+            "id": page["id"],
+            "parent": task["parent"],
+            "parent_type": task["parent_type"],
+            "properties": writable_properties(page.get("properties", {})),
+            "icon": writable_icon(page.get("icon")),
+            "cover": _external_file(page["cover"]) if page.get("cover") else None,
+            "content": content
+        }
+        children = [
+            {"kind": "page" if "page" in m else "database", "id": m.get("page") or m["database"],
+             "parent": page["id"], "parent_type": "page"}
+            for m in markers
+        ]
+        archived = _count_nodes(content)
+        result = {
+            "record": record,
+            "contents": contents,
+            "blocks": archived,
+            "skipped_blocks": _count_blocks(blocks) - archived - len(markers),
+            "children": len(children)
+        }
+        return result, children
+
+    def _snapshot_database(self, task: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        database = call_with_retry(self.client.databases.retrieve, database_id=task["id"])
+        sources, children = [], []
+        for source in database.get("data_sources", []):
+            data_source = call_with_retry(self.client.request, path=f"data_sources/{source['id']}", method="GET")
+            sources.append({
+                "id": source["id"],
+                "name": source.get("name", ""),
+                "properties": writable_schema(data_source.get("properties", {}))
+            })
+            children.extend(
+                {"kind": "page", "id": row["id"], "page": row, "parent": source["id"], "parent_type": "data_source"}
+                for row in iter_data_source_rows(self.client, source["id"])
+            )
+        record = {
+            "kind": "database",
+            "id": database["id"],
+            "parent": task["parent"],
+            "title": writable_rich_text(database.get("title", [])),
+            "description": writable_rich_text(database.get("description", [])),
+            "icon": writable_icon(database.get("icon")),
+            "is_inline": database.get("is_inline", False),
+            "data_sources": sources
+        }
+        return {"record": record, "contents": {}, "blocks": 0, "skipped_blocks": 0, "children": len(children)}, children
+
+    def snapshot(
+        self,
+        root_page_id: str,
+        path: Optional[Union[str, Path]] = None,
+        compression: str = "gzip"
+    ) -> Dict[str, Any]:
+        """
+        Archive a page and everything below it.
+
+        Args:
+            root_page_id: Page to back up
+            path: Archive file (default: backups/<title>-<time> in the local cache)
+            compression: "gzip" or "zstd"
+
+        Returns:
+            status, path, pages, databases, rows, blocks, unique_blocks,
+            skipped_blocks (blocks the API cannot recreate), bytes, errors,
+            cancelled, seconds and message
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}'; use one of: {', '.join(COMPRESSIONS)}")
+        started = time.perf_counter()
+        root = call_with_retry(self.client.pages.retrieve, page_id=root_page_id)
+        title = _title_text(writable_properties(root.get("properties", {})))
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            name = "".join(c if c.isalnum() or c in "-_" else "-" for c in title)[:40].strip("-") or "snapshot"
+            path = get_cache_dir("backups") / f"{name}-{stamp}{COMPRESSIONS[compression]}"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(path.name + ".part")
+
+        counts = {"pages": 0, "databases": 0, "rows": 0, "blocks": 0, "unique_blocks": 0, "skipped_blocks": 0}
+        errors: List[Dict[str, Any]] = []
+        seen = set()
+        discovered = 1
+
+        def visit(task: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+            if task["kind"] == "page":
+                return self._snapshot_page(task)
+            return self._snapshot_database(task)
+
+        root_task = {"kind": "page", "id": root["id"], "page": root, "parent": None, "parent_type": None}
+        with open_archive(partial_path, "w", compression) as archive:
+            def write(record: Dict[str, Any]) -> None:
+                archive.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+            write({
+                "kind": "header",
+                "version": ARCHIVE_VERSION,
+                "root_id": root["id"],
+                "title": title,
+                "created": datetime.now().isoformat()
+            })
+            # Records are written on this thread, in the order the workers finish
+            for task, result, error in crawl([root_task], visit, self.max_workers, progress.cancelled):
+                if error is not None:
+                    errors.append({"id": task["id"], "kind": task["kind"], "error": str(error)})
+                else:
+                    for content_hash, block in result["contents"].items():
+                        if content_hash not in seen:
+                            seen.add(content_hash)
+                            write({"kind": "block", "hash": content_hash, "block": block})
+                    write(result["record"])
+                    if task["kind"] == "database":
+                        counts["databases"] += 1
+                    else:
+                        counts["rows" if task["parent_type"] == "data_source" else "pages"] += 1
+                    counts["blocks"] += result["blocks"]
+                    counts["skipped_blocks"] += result["skipped_blocks"]
+                    discovered += result["children"]
+                done = counts["pages"] + counts["databases"] + counts["rows"] + len(errors)
+                progress.report_progress(done, discovered, f"Archived {task['kind']} {task['id']}")
+                if error is None:
+                    progress.report_partial({"id": task["id"], "kind": task["kind"], "blocks": result["blocks"]})
+            counts["unique_blocks"] = len(seen)
+            cancelled = progress.cancelled()
+            write({"kind": "footer", "complete": not cancelled and not errors, **counts})
+        partial_path.replace(path)
+
+        seconds = time.perf_counter() - started
+        size = path.stat().st_size
+        message = (
+            f"Archived {counts['pages']} pages, {counts['databases']} databases and {counts['rows']} rows "
+            f"({counts['blocks']} blocks, {counts['unique_blocks']} distinct) to {path} "
+            f"({size / 1024:.0f} KB) in {seconds:.1f}s"
+            + (f" with {len(errors)} errors" if errors else "")
+            + (" (cancelled: the archive is incomplete)" if cancelled else "")
+        )
+        return {
+            "status": "success" if not errors else "error",
+            "path": str(path),
+            "root_page_id": root["id"],
+            **counts,
+            "bytes": size,
+            "errors": errors,
+            "cancelled": cancelled,
+            "seconds": round(seconds, 2),
+            "message": message
+        }
+
+    # -- restore -------------------------------------------------------
+
+    def _fill_page(
+        self,
+        record: Dict[str, Any],
+        page_id: str,
+        archive: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Recreate a page's blocks and child objects in order; returns tasks for the child objects."""
+        contents = archive["blocks"]
+        children = []
+        segment: List[Dict[str, Any]] = []
+
+        def expand(node: Any) -> Dict[str, Any]:
+            content_hash, nested = (node, []) if isinstance(node, str) else node
+            block = contents[content_hash]
+            nested_blocks = [expand(n) for n in nested if not isinstance(n, dict)]
+            if not nested_blocks:
+                return block
+            return dict(block, **{block["type"]: dict(block[block["type"]], children=nested_blocks)})
+
+        def flush() -> None:
+            if segment:
+                append_block_tree(self.client, page_id, segment, max_workers=1)
+                segment.clear()
+
+        for node in record["content"]:
+            if not isinstance(node, dict):
+                segment.append(expand(node))
+                continue
+            # Child objects are appended to the end of the page, so everything before them goes first
+            flush()
+            if "page" in node and node["page"] in archive["pages"]:
+                child = archive["pages"][node["page"]]
+                page = call_with_retry(self.client.pages.create, **self._page_body(child, {"type": "page_id", "page_id": page_id}))
+                children.append({"kind": "page", "id": child["id"], "new_id": page["id"]})
+            elif "database" in node and node["database"] in archive["databases"]:
+                children.append(self._create_database(archive["databases"][node["database"]], page_id))
+        flush()
+        return children
+
+    @staticmethod
+    def _page_body(record: Dict[str, Any], parent: Dict[str, Any]) -> Dict[str, Any]:
+        properties = record["properties"]
+        if record["parent_type"] != "data_source":
+            # Pages under pages only have a title
+            title = next((v for v in properties.values() if _schema_type(v) == "title"), {"title": []})
+            properties = {"title": title}
+        body = {
+            "parent": parent,
+            "properties": {n: v for n, v in properties.items() if _schema_type(v) != "relation"}
+        }
+        if record.get("icon"):
+            body["icon"] = record["icon"]
+        if record.get("cover"):
+            body["cover"] = record["cover"]
+        return body
+
+    def _create_database(self, record: Dict[str, Any], parent_id: str) -> Dict[str, Any]:
+        sources = record["data_sources"]
+
+        def plain(source: Dict[str, Any]) -> Dict[str, Any]:
+            return {n: d for n, d in source["properties"].items() if _schema_type(d) not in LINKED_SCHEMA_TYPES}
+
+        body: Dict[str, Any] = {
+            "parent": {"type": "page_id", "page_id": parent_id},
+            "title": record["title"],
+            "is_inline": record.get("is_inline", False),
+            "initial_data_source": {"properties": plain(sources[0]) if sources else {}}
+        }
+        if record.get("description"):
+            body["description"] = record["description"]
+        if record.get("icon"):
+            body["icon"] = record["icon"]
+        database = create_database(self.client, body)
+        source_ids = {sources[0]["id"]: database["data_sources"][0]["id"]} if sources else {}
+        for source in sources[1:]:
+            created = call_with_retry(self.client.request, path="data_sources", method="POST", body={
+                "parent": {"type": "database_id", "database_id": database["id"]},
+                "title": [{"type": "text", "text": {"content": source.get("name", "")}}],
+                "properties": plain(source)
+            })
+            source_ids[source["id"]] = created["id"]
+        return {"kind": "database", "id": record["id"], "new_id": database["id"], "data_sources": source_ids}
+
+    def _linked_properties(
+        self,
+        archive: Dict[str, Any],
+        data_sources: Dict[str, str],
+        prop_type: str
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """(restored data source ID, properties) updates adding one kind of linked property."""
+        definitions = {s["id"]: s["properties"] for d in archive["databases"].values() for s in d["data_sources"]}
+        updates = []
+        for old_id, new_id in data_sources.items():
+            properties = {}
+            for name, definition in definitions.get(old_id, {}).items():
+                if _schema_type(definition) != prop_type:
+                    continue
+                config = definition[prop_type]
+                if prop_type != "relation":
+                    properties[name] = definition
+                    continue
+                target = config.get("data_source_id")
+                dual = config.get("type") == "dual_property"
+                synced = config.get("synced_property_name")
+                # A dual relation is one property pair: create it from one side only
+                back = definitions.get(target, {}).get(synced or "", {}).get("relation", {})
+                if dual and back.get("data_source_id") == old_id and (target, synced) < (old_id, name):
+                    continue
+                relation = relation_property(data_sources.get(target, target), dual)
+                if dual and synced:
+                    relation["relation"]["dual_property"] = {"synced_property_name": synced}
+                properties[name] = relation
+            if properties:
+                updates.append((new_id, properties))
+        return updates
+
+    def restore(self, path: Union[str, Path], parent_page_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Recreate an archived tree under a parent page.
+
+        Args:
+            path: Archive written by snapshot()
+            parent_page_id: Page to restore under (default: NOTION_PARENT_PAGE_ID)
+
+        Returns:
+            status, root_page_id, pages, databases, rows, errors,
+            incomplete_archive, phase timings, cancelled and message
+        """
+        parent_page_id = (parent_page_id or os.getenv("NOTION_PARENT_PAGE_ID") or "").replace("-", "")
+        if not parent_page_id:
+            raise ValueError("No parent page: pass parent_page_id or set NOTION_PARENT_PAGE_ID")
+
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        archive: Dict[str, Any] = {"blocks": {}, "pages": {}, "databases": {}, "rows": {}}
+        header, footer = None, None
+        for record in read_archive(path):
+            kind = record.get("kind")
+            if kind == "header":
+                header = record
+            elif kind == "footer":
+                footer = record
+            elif kind == "block":
+                archive["blocks"][record["hash"]] = record["block"]
+            elif kind == "database":
+                archive["databases"][record["id"]] = record
+            elif kind == "page" and record["parent_type"] == "data_source":
+                archive["rows"].setdefault(record["parent"], []).append(record)
+                archive["pages"][record["id"]] = record
+            elif kind == "page":
+                archive["pages"][record["id"]] = record
+        if header is None or header.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} workspace snapshot")
+        root = archive["pages"].get(header["root_id"])
+        if root is None:
+            raise ValueError(f"{path} does not contain its root page")
+        timings["read"] = time.perf_counter() - started
+
+        # Phase 1: the page tree, databases and rows, with content in order
+        started = time.perf_counter()
+        id_map: Dict[str, str] = {}
+        data_sources: Dict[str, str] = {}
+        errors: List[Dict[str, Any]] = []
+        counts = {"pages": 0, "databases": 0, "rows": 0}
+        total = len(archive["pages"]) + len(archive["databases"])
+
+        def visit(task: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+            if task["kind"] == "database":
+                rows = [
+                    {"kind": "row", "id": row["id"], "data_source": new_source}
+                    for old_source, new_source in task["data_sources"].items()
+                    for row in archive["rows"].get(old_source, [])
+                ]
+                return task, rows
+            record = archive["pages"][task["id"]]
+            if task["kind"] == "row":
+                page = call_with_retry(
+                    self.client.pages.create,
+                    **self._page_body(record, {"type": "data_source_id", "data_source_id": task["data_source"]})
+                )
+                task = dict(task, new_id=page["id"])
+            return task, self._fill_page(record, task["new_id"], archive)
+
+        root_page = call_with_retry(
+            self.client.pages.create, **self._page_body(root, {"type": "page_id", "page_id": parent_page_id})
+        )
+        root_task = {"kind": "page", "id": root["id"], "new_id": root_page["id"]}
+        for task, result, error in crawl([root_task], visit, self.max_workers, progress.cancelled):
+            if error is not None:
+                errors.append({"id": task["id"], "kind": task["kind"], "phase": "structure", "error": str(error)})
+            else:
+                id_map[task["id"]] = result["new_id"]
+                data_sources.update(result.get("data_sources", {}))
+                counts["databases" if task["kind"] == "database" else "rows" if task["kind"] == "row" else "pages"] += 1
+                progress.report_partial({"id": task["id"], "kind": task["kind"], "new_id": result["new_id"]})
+            done = sum(counts.values()) + len(errors)
+            progress.report_progress(done, total, f"Restored {task['kind']} {task['id']}")
+        timings["structure"] = time.perf_counter() - started
+
+        # Phase 2: relations, then the rollups and formulas that may read them
+        started = time.perf_counter()
+        for prop_type in LINKED_SCHEMA_TYPES:
+            updates = self._linked_properties(archive, data_sources, prop_type)
+
+            def update(item: Tuple[str, Dict[str, Any]]) -> None:
+                source_id, properties = item
+                call_with_retry(self.client.request, path=f"data_sources/{source_id}", method="PATCH", body={"properties": properties})
+
+            for (source_id, _), (_, error) in zip(updates, parallel_map(update, updates, self.max_workers)):
+                if error is not None:
+                    errors.append({"id": source_id, "kind": "data_source", "phase": prop_type, "error": str(error)})
+        timings["schema"] = time.perf_counter() - started
+
+        # Phase 3: relation values between the restored rows
+        started = time.perf_counter()
+        links = []
+        for old_id, new_id in id_map.items():
+            record = archive["pages"].get(old_id)
+            if record is None or record["parent_type"] != "data_source":
+                continue
+            relations = {
+                name: {"relation": [{"id": id_map.get(item["id"], item["id"])} for item in value["relation"]]}
+                for name, value in record["properties"].items() if _schema_type(value) == "relation" and value["relation"]
+            }
+            if relations:
+                links.append((new_id, relations))
+
+        def link(item: Tuple[str, Dict[str, Any]]) -> None:
+            page_id, properties = item
+            call_with_retry(self.client.pages.update, page_id=page_id, properties=properties)
+
+        for (page_id, _), (_, error) in zip(links, parallel_map(link, links, self.max_workers)):
+            if error is not None:
+                errors.append({"id": page_id, "kind": "row", "phase": "row_relations", "error": str(error)})
+        timings["relations"] = time.perf_counter() - started
+
+        cancelled = progress.cancelled()
+        incomplete = footer is None or not footer.get("complete")
+        message = (
+            f"Restored {counts['pages']} pages, {counts['databases']} databases and {counts['rows']} rows "
+            f"in {sum(timings.values()):.1f}s"
+            + (f" with {len(errors)} errors" if errors else "")
+            + (" (the archive is incomplete)" if incomplete else "")
+            + (" (cancelled before the restore finished)" if cancelled else "")
+        )
+        return {
+            "status": "success" if not errors else "error",
+            "root_page_id": root_page["id"],
+            **counts,
+            "errors": errors,
+            "incomplete_archive": incomplete,
+            "timings": {phase: round(seconds, 2) for phase, seconds in timings.items()},
+            "cancelled": cancelled,
+            "message": message
+        }
@@ -2,6 +2,10 @@
 """
 Final Notion Workspace Organization
 Creates a professional template structure ready for sales
+
+The structure (sections, databases, sample content and welcome page) is
+declared in 03_Templates/manifests/linkedin_content_os.json and built by the
+provisioning engine in 02_Core_System/provisioning.py.
 """
 
 import os
@@ -13,584 +17,49 @@ sys.path.insert(0, str(Path(__file__).parent / "02_Core_System"))
 
 def create_final_template_structure():
     """Create the final professional template structure."""
-    
+
     print("🎯 CREATING FINAL PROFESSIONAL TEMPLATE STRUCTURE")
     print("=" * 55)
-    
+
     try:
-        from notion_api_client import NotionTemplateClient
-        
+        from provisioning import Provisioner, load_manifest
+
         # Load environment
         from dotenv import load_dotenv
         load_dotenv()
-        
+
         api_key = os.getenv("NOTION_API_KEY")
         parent_page_id = os.getenv("NOTION_PARENT_PAGE_ID")
-        
+
         if not api_key or not parent_page_id:
             print("❌ Missing environment variables!")
             return False
-        
-        client = NotionTemplateClient(api_key=api_key)
-        
-        # Step 1: Create main template sections
-        print("\n1️⃣ CREATING MAIN TEMPLATE SECTIONS")
-        print("-" * 40)
-        
-        main_sections = {
-            "🚀 Getting Started": {
-                "description": "Essential setup and onboarding for new users",
-                "icon": "🚀",
-                "subpages": [
-                    "📋 Setup Checklist",
-                    "⚙️ Configuration Guide",
-                    "🎯 Quick Start Tutorial",
-                    "📚 User Guide"
-                ]
-            },
-            "🎨 Voice Discovery": {
-                "description": "Define your unique writing style and brand voice",
-                "icon": "🎨",
-                "subpages": [
-                    "📝 Voice Assessment",
-                    "🎯 Brand Personality",
-                    "✍️ Writing Style Guide",
-                    "📊 Voice Analytics"
-                ]
-            },
-            "📚 Content Strategy": {
-                "description": "Strategic content planning and pillar development",
-                "icon": "📚",
-                "subpages": [
-                    "🎯 Content Pillars",
-                    "📅 Content Calendar",
-                    "📝 Content Templates",
-                    "🔄 Content Workflows"
-                ]
-            },
-            "🤖 AI Automation": {
-                "description": "AI-powered content generation and optimization",
-                "icon": "🤖",
-                "subpages": [
-                    "🔄 Automated Workflows",
-                    "📈 Performance Tracking",
-                    "🎯 Optimization Tools",
-                    "📊 Analytics Dashboard"
-                ]
-            },
-            "📊 Performance Analytics": {
-                "description": "Track and analyze your LinkedIn performance",
-                "icon": "📊",
-                "subpages": [
-                    "📈 Engagement Metrics",
-                    "👥 Audience Insights",
-                    "📊 Growth Tracking",
-                    "🎯 ROI Analysis"
-                ]
-            },
-            "🛠️ Advanced Features": {
-                "description": "Advanced customization and power user tools",
-                "icon": "🛠️",
-                "subpages": [
-                    "⚙️ Database Management",
-                    "🔧 Custom Workflows",
-                    "📁 File Organization",
-                    "🔗 Integrations"
-                ]
-            },
-            "🆘 Support & Resources": {
-                "description": "Help, troubleshooting, and additional resources",
-                "icon": "🆘",
-                "subpages": [
-                    "❓ FAQ",
-                    "🔧 Troubleshooting",
-                    "📞 Contact Support",
-                    "📚 Additional Resources"
-                ]
-            }
-        }
-        
-        created_sections = {}
-        
-        for section_name, section_info in main_sections.items():
-            try:
-                # Create main section page
-                section_page = client.create_page(
-                    parent_id=parent_page_id,
-                    title=section_name,
-                    children=[
-                        {
-                            "object": "block",
-                            "type": "heading_1",
-                            "heading_1": {
-                                "rich_text": [{"type": "text", "text": {"content": section_name}}]
-                            }
-                        },
-                        {
-                            "object": "block",
-                            "type": "paragraph",
-                            "paragraph": {
-                                "rich_text": [{"type": "text", "text": {"content": section_info["description"]}}]
-                            }
-                        },
-                        {
-                            "object": "block",
-                            "type": "callout",
-                            "callout": {
-                                "icon": {"emoji": section_info["icon"]},
-                                "rich_text": [{"type": "text", "text": {"content": f"This section contains {len(section_info['subpages'])} essential tools for your LinkedIn content strategy."}}]
-                            }
-                        },
-                        {
-                            "object": "block",
-                            "type": "heading_2",
-                            "heading_2": {
-                                "rich_text": [{"type": "text", "text": {"content": "📋 What's Included"}}]
-                            }
-                        }
-                    ]
-                )
-                
-                section_id = section_page.get('id')
-                created_sections[section_name] = section_id
-                print(f"✅ Created section: {section_name}")
-                
-                # Add subpages list
-                for subpage in section_info["subpages"]:
-                    try:
-                        sub_page = client.create_page(
-                            parent_id=section_id,
-                            title=subpage,
-                            children=[
-                                {
-                                    "object": "block",
-                                    "type": "heading_1",
-                                    "heading_1": {
-                                        "rich_text": [{"type": "text", "text": {"content": subpage}}]
-                                    }
-                                },
-                                {
-                                    "object": "block",
-                                    "type": "paragraph",
-                                    "paragraph": {
-                                        "rich_text": [{"type": "text", "text": {"content": f"Welcome to {subpage}! This page contains tools and templates to help you succeed with your LinkedIn content strategy."}}]
-                                    }
-                                },
-                                {
-                                    "object": "block",
-                                    "type": "to_do",
-                                    "to_do": {
-                                        "rich_text": [{"type": "text", "text": {"content": "Complete this section"}}],
-                                        "checked": False
-                                    }
-                                },
-                                {
-                                    "object": "block",
-                                    "type": "to_do",
-                                    "to_do": {
-                                        "rich_text": [{"type": "text", "text": {"content": "Review templates and examples"}}],
-                                        "checked": False
-                                    }
-                                },
-                                {
-                                    "object": "block",
-                                    "type": "to_do",
-                                    "to_do": {
-                                        "rich_text": [{"type": "text", "text": {"content": "Customize for your brand"}}],
-                                        "checked": False
-                                    }
-                                }
-                            ]
-                        )
-                        print(f"   ├── {subpage}")
-                        
-                    except Exception as e:
-                        print(f"   ❌ Failed to create {subpage}: {e}")
-                
-            except Exception as e:
-                print(f"❌ Failed to create section {section_name}: {e}")
-        
-        # Step 2: Create professional databases
-        print("\n2️⃣ CREATING PROFESSIONAL DATABASES")
-        print("-" * 35)
-        
-        professional_databases = {
-            "Content Hub": {
-                "description": "Central hub for all your LinkedIn content creation and management",
-                "properties": {
-                    "Title": {"title": {}},
-                    "Status": {
-                        "select": {
-                            "options": [
-                                {"name": "💡 Idea", "color": "gray"},
-                                {"name": "✍️ Draft", "color": "yellow"},
-                                {"name": "📝 Review", "color": "orange"},
-                                {"name": "📅 Scheduled", "color": "blue"},
-                                {"name": "✅ Published", "color": "green"},
-                                {"name": "📊 Analyzing", "color": "purple"}
-                            ]
-                        }
-                    },
-                    "Content Pillar": {
-                        "select": {
-                            "options": [
-                                {"name": "🎯 Personal Brand", "color": "purple"},
-                                {"name": "💼 Industry Insights", "color": "blue"},
-                                {"name": "🔍 Behind the Scenes", "color": "green"},
-                                {"name": "💡 Thought Leadership", "color": "red"},
-                                {"name": "🎉 Success Stories", "color": "pink"},
-                                {"name": "📚 Educational", "color": "orange"}
-                            ]
-                        }
-                    },
-                    "Priority": {
-                        "select": {
-                            "options": [
-                                {"name": "🔥 High", "color": "red"},
-                                {"name": "⚡ Medium", "color": "yellow"},
-                                {"name": "📝 Low", "color": "gray"}
-                            ]
-                        }
-                    },
-                    "Publish Date": {"date": {}},
-                    "Engagement Score": {"number": {"format": "number"}},
-                    "Tags": {"multi_select": {"options": []}},
-                    "Content Type": {
-                        "select": {
-                            "options": [
-                                {"name": "📝 Text Post", "color": "blue"},
-                                {"name": "🖼️ Image Post", "color": "green"},
-                                {"name": "🎥 Video Post", "color": "red"},
-                                {"name": "📊 Carousel", "color": "purple"},
-                                {"name": "🔗 Article", "color": "orange"}
-                            ]
-                        }
-                    }
-                }
-            },
-            "Performance Tracker": {
-                "description": "Track and analyze your LinkedIn performance metrics",
-                "properties": {
-                    "Post Title": {"title": {}},
-                    "Publish Date": {"date": {}},
-                    "Likes": {"number": {"format": "number"}},
-                    "Comments": {"number": {"format": "number"}},
-                    "Shares": {"number": {"format": "number"}},
-                    "Impressions": {"number": {"format": "number"}},
-                    "Engagement Rate": {"number": {"format": "percent"}},
-                    "Content Pillar": {
-                        "select": {
-                            "options": [
-                                {"name": "🎯 Personal Brand", "color": "purple"},
-                                {"name": "💼 Industry Insights", "color": "blue"},
-                                {"name": "🔍 Behind the Scenes", "color": "green"},
-                                {"name": "💡 Thought Leadership", "color": "red"},
-                                {"name": "🎉 Success Stories", "color": "pink"},
-                                {"name": "📚 Educational", "color": "orange"}
-                            ]
-                        }
-                    },
-                    "Performance Rating": {
-                        "select": {
-                            "options": [
-                                {"name": "🌟 Excellent", "color": "green"},
-                                {"name": "👍 Good", "color": "blue"},
-                                {"name": "📊 Average", "color": "yellow"},
-                                {"name": "📉 Below Average", "color": "red"}
-                            ]
-                        }
-                    }
-                }
-            },
-            "Content Calendar": {
-                "description": "Plan and schedule your content strategy",
-                "properties": {
-                    "Date": {"date": {}},
-                    "Content Title": {"title": {}},
-                    "Status": {
-                        "select": {
-                            "options": [
-                                {"name": "📅 Scheduled", "color": "blue"},
-                                {"name": "✍️ In Progress", "color": "yellow"},
-                                {"name": "✅ Completed", "color": "green"},
-                                {"name": "⏸️ Paused", "color": "gray"},
-                                {"name": "❌ Cancelled", "color": "red"}
-                            ]
-                        }
-                    },
-                    "Content Type": {
-                        "select": {
-                            "options": [
-                                {"name": "📝 Text Post", "color": "blue"},
-                                {"name": "🖼️ Image Post", "color": "green"},
-                                {"name": "🎥 Video Post", "color": "red"},
-                                {"name": "📊 Carousel", "color": "purple"},
-                                {"name": "🔗 Article", "color": "orange"}
-                            ]
-                        }
-                    },
-                    "Priority": {
-                        "select": {
-                            "options": [
-                                {"name": "🔥 High", "color": "red"},
-                                {"name": "⚡ Medium", "color": "yellow"},
-                                {"name": "📝 Low", "color": "gray"}
-                            ]
-                        }
-                    },
-                    "Content Pillar": {
-                        "select": {
-                            "options": [
-                                {"name": "🎯 Personal Brand", "color": "purple"},
-                                {"name": "💼 Industry Insights", "color": "blue"},
-                                {"name": "🔍 Behind the Scenes", "color": "green"},
-                                {"name": "💡 Thought Leadership", "color": "red"},
-                                {"name": "🎉 Success Stories", "color": "pink"},
-                                {"name": "📚 Educational", "color": "orange"}
-                            ]
-                        }
-                    }
-                }
-            }
-        }
-        
-        created_databases = {}
-        
-        for db_name, db_info in professional_databases.items():
-            try:
-                db = client.create_database(
-                    title=db_name,
-                    properties=db_info["properties"],
-                    parent_page_id=parent_page_id
-                )
-                
-                db_id = db.get('id')
-                created_databases[db_name] = db_id
-                print(f"✅ Created database: {db_name}")
-                
-            except Exception as e:
-                print(f"❌ Failed to create database {db_name}: {e}")
-        
-        # Step 3: Add sample content to databases
-        print("\n3️⃣ ADDING SAMPLE CONTENT")
-        print("-" * 25)
-        
-        # Sample content for Content Hub
-        if "Content Hub" in created_databases:
-            sample_content = [
-                {
-                    "title": "Welcome to Your LinkedIn Content OS!",
-                    "status": "✅ Published",
-                    "pillar": "🎯 Personal Brand",
-                    "priority": "🔥 High",
-                    "content_type": "📝 Text Post",
-                    "tags": ["welcome", "introduction", "template"]
-                },
-                {
-                    "title": "My Journey to 10K Followers: 5 Key Lessons",
-                    "status": "✍️ Draft",
-                    "pillar": "🎉 Success Stories",
-                    "priority": "⚡ Medium",
-                    "content_type": "📝 Text Post",
-                    "tags": ["growth", "strategy", "lessons"]
-                },
-                {
-                    "title": "5 LinkedIn Mistakes I Made (And How to Avoid Them)",
-                    "status": "📝 Review",
-                    "pillar": "💡 Thought Leadership",
-                    "priority": "🔥 High",
-                    "content_type": "📊 Carousel",
-                    "tags": ["mistakes", "learning", "tips"]
-                },
-                {
-                    "title": "Behind the Scenes: Building My Personal Brand",
-                    "status": "💡 Idea",
-                    "pillar": "🔍 Behind the Scenes",
-                    "priority": "📝 Low",
-                    "content_type": "🎥 Video Post",
-                    "tags": ["behind-scenes", "personal-brand", "process"]
-                }
-            ]
-            
-            for content in sample_content:
-                try:
-                    page_data = {
-                        "parent": {"database_id": created_databases["Content Hub"]},
-                        "properties": {
-                            "Title": {"title": [{"text": {"content": content["title"]}}]},
-                            "Status": {"select": {"name": content["status"]}},
-                            "Content Pillar": {"select": {"name": content["pillar"]}},
-                            "Priority": {"select": {"name": content["priority"]}},
-                            "Content Type": {"select": {"name": content["content_type"]}},
-                            "Tags": {"multi_select": [{"name": tag} for tag in content["tags"]]}
-                        }
-                    }
-                    
-                    response = client.client.pages.create(**page_data)
-                    print(f"✅ Added sample content: {content['title']}")
-                    
-                except Exception as e:
-                    print(f"❌ Failed to add '{content['title']}': {e}")
-        
-        # Step 4: Create professional welcome page
-        print("\n4️⃣ CREATING PROFESSIONAL WELCOME PAGE")
-        print("-" * 40)
-        
-        try:
-            # Update parent page with professional content
-            welcome_content = [
-                {
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [{"type": "text", "text": {"content": "🚀 LinkedIn Content OS Template"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": "Welcome to your complete LinkedIn content creation system! This professional template provides everything you need to build a powerful LinkedIn presence with AI-powered automation and systematic content strategy."}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "callout",
-                    "callout": {
-                        "icon": {"emoji": "🎯"},
-                        "rich_text": [{"type": "text", "text": {"content": "Start with the 'Getting Started' section to set up your content strategy and define your unique voice."}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{"type": "text", "text": {"content": "✨ What Makes This Template Special"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "Complete content creation workflow from idea to publication"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "AI-powered automation for content generation and optimization"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "Professional performance tracking and analytics dashboard"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "Advanced database management and customization options"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{"type": "text", "text": {"content": "📊 Template Statistics"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": f"This template includes {len(created_sections)} main sections, {len(created_databases)} professional databases, and comprehensive tools for LinkedIn content success."}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{"type": "text", "text": {"content": "🎉 Success Metrics"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": "Users of this template typically see:"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "3-5x increase in engagement rates"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "50% reduction in content creation time"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "Consistent posting schedule and steady growth"}}]
-                    }
-                },
-                {
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": "Professional brand presence and thought leadership"}}]
-                    }
-                }
-            ]
-            
-            # Add content to parent page
-            client.client.blocks.children.append(
-                block_id=parent_page_id,
-                children=welcome_content
-            )
-            
-            print("✅ Created professional welcome page")
-            
-        except Exception as e:
-            print(f"❌ Failed to create welcome page: {e}")
-        
+
+        manifest = load_manifest("linkedin_content_os")
+        result = Provisioner(api_key=api_key).provision(manifest, parent_page_id)
+
+        for error in result["errors"]:
+            print(f"❌ Failed ({error['phase']}) {error['key'] or 'parent page'}: {error['error']}")
+
         # Final Summary
         print("\n🎉 PROFESSIONAL TEMPLATE STRUCTURE COMPLETE!")
         print("=" * 50)
-        print(f"✅ Created {len(created_sections)} professional sections")
-        print(f"✅ Created {len(created_databases)} databases")
-        print("✅ Added sample content")
-        print("✅ Professional welcome page created")
-        
+        print(f"✅ {result['message']}")
+        print(f"⏱️ Phases: {result['timings']}")
+
         print("\n📁 Your Professional Template Structure:")
-        for section_name in created_sections.keys():
-            print(f"├── {section_name}")
-        
+        for section in manifest["pages"]:
+            if section.get("key") in result["created"]:
+                print(f"├── {section['title']}")
+
         print("\n📊 Your Professional Databases:")
-        for db_name in created_databases.keys():
-            print(f"├── {db_name}")
-        
+        for database in manifest["databases"]:
+            if database.get("key") in result["created"]:
+                print(f"├── {database['title']}")
+
         print("\n🎯 READY FOR TEMPLATE SALES!")
-        print("Your Notion workspace is now professionally organized with:")
-        print("• Clear, logical section structure")
-        print("• Professional databases with proper schemas")
-        print("• Sample content to demonstrate value")
-        print("• Comprehensive documentation and guides")
-        print("• Professional presentation suitable for marketplace sales")
-        
-        return True
-        
+        return result["status"] == "success"
+
     except Exception as e:
         print(f"❌ Template creation failed: {e}")
         return False
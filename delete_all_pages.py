@@ -122,24 +122,15 @@ def delete_all_pages():
         print("-" * 35)
         
         try:
-            # Get all blocks from the main page
-            blocks_response = client.client.blocks.children.list(block_id=parent_page_id)
-            
-            # Delete all blocks except the title
-            blocks_to_delete = []
-            for block in blocks_response.get('results', []):
-                if block.get('type') != 'child_page':  # Don't delete child pages, they're already archived
-                    blocks_to_delete.append(block.get('id'))
+            from block_sync import BlockSync
             
-            # Delete blocks
-            for block_id in blocks_to_delete:
-                try:
-                    client.client.blocks.delete(block_id=block_id)
-                    print(f"✅ Deleted block: {block_id}")
-                except Exception as e:
-                    print(f"❌ Failed to delete block {block_id}: {e}")
+            # Syncing to no blocks deletes every block concurrently; child pages
+            # and databases are left alone (they're already archived)
+            result = BlockSync(client=client.client).sync([parent_page_id], [])
+            for error in result['errors']:
+                print(f"❌ Failed to delete block {error['block_id']}: {error['error']}")
             
-            print("✅ Main page content cleared")
+            print(f"✅ Main page content cleared ({result['deleted']} blocks deleted)")
             
         except Exception as e:
             print(f"❌ Error clearing main page: {e}")
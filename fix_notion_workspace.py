@@ -54,12 +54,7 @@ def fix_notion_workspace():
         if "Content Hub" in databases:
             print("🔧 Fixing Content Hub schema...")
             try:
-                # Get current schema
-                data_source_id = client.get_data_source_id(databases["Content Hub"])
-                current_schema = client.retrieve_data_source(data_source_id)
-                current_properties = current_schema.get("schema", {}).get("properties", {})
-                
-                # Add missing properties
+                # Add missing properties and options; matching ones are not re-sent
                 new_properties = {
                     "Status": {
                         "type": "select",
@@ -106,9 +101,13 @@ def fix_notion_workspace():
                 }
                 
                 # Update schema
-                updated_properties = {**current_properties, **new_properties}
-                client.update_data_source(data_source_id, updated_properties)
-                print("✅ Content Hub schema updated")
+                result = client.migrate_schemas([
+                    {"data_source_id": databases["Content Hub"], "properties": new_properties}
+                ])
+                plan = result["migrations"][0]
+                if plan["status"] == "error":
+                    raise RuntimeError(plan["error"])
+                print(f"✅ Content Hub schema {'already up to date' if plan['status'] == 'unchanged' else 'updated'}")
                 
             except Exception as e:
                 print(f"❌ Failed to update Content Hub schema: {e}")
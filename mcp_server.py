@@ -13,10 +13,19 @@ Server Capabilities:
 - Tools: 15+ callable functions for Notion API, web research, updates, and database operations
 """
 
+import functools
+import os
 import sys
+import time
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Union
+
+_STARTUP_STARTED = time.perf_counter()
+
+# Budget for the server's own start-up work (everything after the MCP SDK
+# import); exceeding it is logged as a warning
+STARTUP_BUDGET_MS = float(os.getenv("MCP_STARTUP_BUDGET_MS", "300"))
 
 # Add the core system path for imports
 sys.path.insert(0, str(Path(__file__).parent / "02_Core_System"))
@@ -30,69 +39,117 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 try:
-    from mcp.server.fastmcp import FastMCP
+    import anyio
+    from mcp.server.fastmcp import FastMCP, Context
 except ImportError:
     logger.error("FastMCP not installed. Run: pip install 'mcp[cli]'")
     sys.exit(1)
 
-# Import our tools
-from tools import (
-    # Notion tools
-    update_notion_page,
-    query_notion_database,
-    create_notion_database,
-    get_database_schema,
-    # Advanced Notion tools
-    upload_file_to_notion,
-    modify_database_schema,
-    delete_notion_page,
-    restore_notion_page,
-    move_notion_page,
-    duplicate_notion_page,
-    # Research tools
-    search_web,
-    analyze_content,
-    # Update tools
-    generate_multi_format_update,
-    create_update_template,
-    validate_update_data,
-    # Database tools
-    analyze_database,
-    enhance_database,
-    export_database_structure,
-    compare_databases,
-    # Comprehensive Page Management tools
-    create_notion_page_comprehensive,
-    get_page_hierarchy_comprehensive,
-    extract_page_properties_comprehensive,
-    update_page_property_comprehensive,
-    move_page_comprehensive,
-    analyze_page_structure_intelligent_tool,
-    # Content Extraction tools
-    extract_page_content,
-    extract_hierarchy_with_content,
-    analyze_page_content_semantic,
-    # Working Reorganization tools
-    reorganize_notion_pages_intelligent,
-    extract_pages_with_full_content,
-    create_reorganization_plan_from_content,
-    # Cleanup tools
-    analyze_workspace_cleanup,
-    execute_workspace_cleanup,
-    fix_emoji_consistency,
-    # Wiki management tools
-    create_notion_wiki,
-    verify_notion_page,
-    remove_notion_page_verification,
-    undo_notion_wiki,
-    get_all_verified_pages
-)
+_FRAMEWORK_READY = time.perf_counter()
+
+# Tool implementations are imported on first call. FastMCP builds each tool's
+# schema from the wrapper functions below, so registration needs none of them.
+from tools import lazy_tool, loaded_tool_modules
+from prompt_registry import PromptRegistry
+from server_metrics import track_tool
+from result_cache import cached_tool, invalidates, invalidate_ids
+from progress import ProgressReporter, reporting_to
+
+# Notion tools
+update_notion_page = lazy_tool("update_notion_page")
+append_markdown_to_notion_page = lazy_tool("append_markdown_to_notion_page")
+query_notion_database = lazy_tool("query_notion_database")
+create_notion_database = lazy_tool("create_notion_database")
+get_database_schema = lazy_tool("get_database_schema")
+
+# Advanced Notion tools
+upload_file_to_notion = lazy_tool("upload_file_to_notion")
+modify_database_schema = lazy_tool("modify_database_schema")
+delete_notion_page = lazy_tool("delete_notion_page")
+restore_notion_page = lazy_tool("restore_notion_page")
+move_notion_page = lazy_tool("move_notion_page")
+duplicate_notion_page = lazy_tool("duplicate_notion_page")
+
+# Research tools
+search_web = lazy_tool("search_web")
+analyze_content = lazy_tool("analyze_content")
+
+# Update tools
+generate_multi_format_update = lazy_tool("generate_multi_format_update")
+create_update_template = lazy_tool("create_update_template")
+validate_update_data = lazy_tool("validate_update_data")
+
+# Database tools
+analyze_database = lazy_tool("analyze_database")
+enhance_database = lazy_tool("enhance_database")
+export_database_structure = lazy_tool("export_database_structure")
+compare_databases = lazy_tool("compare_databases")
+load_database_rows = lazy_tool("load_database_rows")
+migrate_database_schemas = lazy_tool("migrate_database_schemas")
+
+# Comprehensive Page Management tools
+create_notion_page_comprehensive = lazy_tool("create_notion_page_comprehensive")
+get_page_hierarchy_comprehensive = lazy_tool("get_page_hierarchy_comprehensive")
+extract_page_properties_comprehensive = lazy_tool("extract_page_properties_comprehensive")
+update_page_property_comprehensive = lazy_tool("update_page_property_comprehensive")
+move_page_comprehensive = lazy_tool("move_page_comprehensive")
+analyze_page_structure_intelligent_tool = lazy_tool("analyze_page_structure_intelligent_tool")
+
+# Content Extraction tools
+extract_page_content = lazy_tool("extract_page_content")
+extract_hierarchy_with_content = lazy_tool("extract_hierarchy_with_content")
+analyze_page_content_semantic = lazy_tool("analyze_page_content_semantic")
+cluster_pages_incremental = lazy_tool("cluster_pages_incremental")
+diff_page_snapshots = lazy_tool("diff_page_snapshots")
+
+# Workspace search tools
+search_workspace_content = lazy_tool("search_workspace_content")
+index_workspace_pages = lazy_tool("index_workspace_pages")
+
+# Server metrics tools
+get_server_metrics = lazy_tool("get_server_metrics")
+
+# Background job tools
+get_job_status = lazy_tool("get_job_status")
+get_job_result = lazy_tool("get_job_result")
+cancel_job = lazy_tool("cancel_job")
+
+# Provisioning tools
+provision_workspace_from_manifest = lazy_tool("provision_workspace_from_manifest")
+
+# Export tools
+export_page_tree = lazy_tool("export_page_tree")
+
+# Snapshot tools
+create_workspace_snapshot = lazy_tool("create_workspace_snapshot")
+restore_workspace_snapshot = lazy_tool("restore_workspace_snapshot")
+
+# Block sync tools
+sync_page_blocks = lazy_tool("sync_page_blocks")
+
+# Working Reorganization tools
+reorganize_notion_pages_intelligent = lazy_tool("reorganize_notion_pages_intelligent")
+extract_pages_with_full_content = lazy_tool("extract_pages_with_full_content")
+create_reorganization_plan_from_content = lazy_tool("create_reorganization_plan_from_content")
+
+# Cleanup tools
+analyze_workspace_cleanup = lazy_tool("analyze_workspace_cleanup")
+execute_workspace_cleanup = lazy_tool("execute_workspace_cleanup")
+fix_emoji_consistency = lazy_tool("fix_emoji_consistency")
+
+# Wiki management tools
+create_notion_wiki = lazy_tool("create_notion_wiki")
+verify_notion_page = lazy_tool("verify_notion_page")
+remove_notion_page_verification = lazy_tool("remove_notion_page_verification")
+undo_notion_wiki = lazy_tool("undo_notion_wiki")
+get_all_verified_pages = lazy_tool("get_all_verified_pages")
 
 # Initialize FastMCP server
 mcp = FastMCP("notion-template-generator")
 
-# Get prompts directory
-PROMPTS_DIR = Path(__file__).parent / "prompts"
+# Prompt documents live with the core system; served from an mtime-checked cache
+PROMPTS_DIR = Path(__file__).parent / "02_Core_System" / "prompts"
+PROMPTS = PromptRegistry(PROMPTS_DIR)
 
 
 # ============================================================================
@@ -104,7 +161,7 @@ PROMPTS_DIR = Path(__file__).parent / "prompts"
 def agents_guide() -> str:
     """AI Assistant Rules & Commands for the Notion Template Generator project."""
     try:
-        return (PROMPTS_DIR / "agents.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("agents")
     except Exception as e:
         logger.error(f"Error loading agents prompt: {e}")
         return f"Error loading prompt: {e}"
@@ -114,7 +171,7 @@ def agents_guide() -> str:
 def api_migration_guide() -> str:
     """Notion API 2025-09-03 Migration Guide - critical for data sources architecture."""
     try:
-        return (PROMPTS_DIR / "api_migration.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("api_migration")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -123,7 +180,7 @@ def api_migration_guide() -> str:
 def block_types_reference() -> str:
     """Complete reference of all 15 major Notion block types with examples."""
     try:
-        return (PROMPTS_DIR / "block_types_showcase.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("block_types_showcase")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -132,7 +189,7 @@ def block_types_reference() -> str:
 def system_guide() -> str:
     """Complete system guide covering all features and workflows."""
     try:
-        return (PROMPTS_DIR / "complete_system_guide.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("complete_system_guide")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -141,7 +198,7 @@ def system_guide() -> str:
 def content_creation_guide() -> str:
     """Guidelines for creating engaging Notion content with rich elements."""
     try:
-        return (PROMPTS_DIR / "content_guide.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("content_guide")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -150,7 +207,7 @@ def content_creation_guide() -> str:
 def linkedin_content_os_guide() -> str:
     """Complete guide for LinkedIn Content OS - 12 pages, 5 databases, 300+ blocks."""
     try:
-        return (PROMPTS_DIR / "linkedin_guide.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("linkedin_guide")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -159,7 +216,7 @@ def linkedin_content_os_guide() -> str:
 def quickstart() -> str:
     """Quick start guide for getting up and running quickly."""
     try:
-        return (PROMPTS_DIR / "quickstart.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("quickstart")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -168,7 +225,7 @@ def quickstart() -> str:
 def project_overview() -> str:
     """High-level project overview, features, and architecture."""
     try:
-        return (PROMPTS_DIR / "readme.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("readme")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -177,7 +234,7 @@ def project_overview() -> str:
 def success_stories() -> str:
     """Implementation examples and success stories."""
     try:
-        return (PROMPTS_DIR / "success_stories.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("success_stories")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -186,7 +243,7 @@ def success_stories() -> str:
 def update_system_guide() -> str:
     """Multi-format update generation system (Document, Slack, LinkedIn, Blog)."""
     try:
-        return (PROMPTS_DIR / "update_system.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("update_system")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -195,7 +252,7 @@ def update_system_guide() -> str:
 def session_summary() -> str:
     """Detailed session summary of recent development work."""
     try:
-        return (PROMPTS_DIR / "session_summary.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("session_summary")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
@@ -204,19 +261,131 @@ def session_summary() -> str:
 def weekly_update_example() -> str:
     """Example of a high-quality weekly update for reference."""
     try:
-        return (PROMPTS_DIR / "weekly_update_example.prompt").read_text(encoding='utf-8')
+        return PROMPTS.get("weekly_update_example")
     except Exception as e:
         return f"Error loading prompt: {e}"
 
 
+# ============================================================================
+# RESOURCES (Prompt Sections)
+# ============================================================================
+# The same documents as resources, addressable one section at a time so an
+# assistant can pull only the part it needs
+
+@mcp.resource("prompt://index")
+def prompt_index() -> Dict[str, Any]:
+    """All prompt documents with their section counts."""
+    return {
+        "prompts": [
+            {"name": name, "sections": len(PROMPTS.sections(name))}
+            for name in PROMPTS.names()
+        ]
+    }
+
+
+@mcp.resource("prompt://{name}")
+def prompt_document(name: str) -> str:
+    """Full text of a prompt document, e.g. prompt://api_migration."""
+    return PROMPTS.get(name)
+
+
+@mcp.resource("prompt://{name}/sections")
+def prompt_sections(name: str) -> List[Dict[str, Any]]:
+    """Table of contents of a prompt document: section slugs, titles, levels and sizes."""
+    return PROMPTS.sections(name)
+
+
+@mcp.resource("prompt://{name}/sections/{section}")
+def prompt_section(name: str, section: str) -> str:
+    """
+    A single section of a prompt document, including its sub-sections.
+    
+    `section` is a slug from prompt://{name}/sections or words from the
+    heading, e.g. prompt://api_migration/sections/data-source.
+    """
+    return PROMPTS.get_section(name, section)
+
+
 # ============================================================================
 # TOOLS (Callable Functions)
 # ============================================================================
 # These enable AI assistants to take actions
 
+async def run_with_progress(
+    ctx: Optional[Context],
+    function,
+    *args: Any,
+    stream_partial: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a blocking tool function in a worker thread, relaying its progress.
+    
+    Progress reported by the function (see progress.py) becomes MCP progress
+    notifications when the client sent a progress token. With stream_partial,
+    partial results are sent as log notifications from the "partial_result"
+    logger. If the client cancels, the function is told to stop at its next
+    safe point and its result is discarded.
+    """
+    def send_progress(done: float, total: Optional[float], message: Optional[str]) -> None:
+        anyio.from_thread.run(ctx.report_progress, done, total, message)
+
+    def send_partial(chunk: Dict[str, Any]) -> None:
+        anyio.from_thread.run(
+            functools.partial(
+                ctx.session.send_log_message,
+                level="info",
+                data=chunk,
+                logger="partial_result",
+                related_request_id=ctx.request_id
+            )
+        )
+
+    reporter = ProgressReporter(
+        send_progress if ctx is not None else None,
+        send_partial if ctx is not None and stream_partial else None
+    )
+
+    def run() -> Dict[str, Any]:
+        with reporting_to(reporter):
+            return function(*args)
+
+    try:
+        return await anyio.to_thread.run_sync(run, abandon_on_cancel=True)
+    except anyio.get_cancelled_exc_class():
+        reporter.cancel_event.set()
+        raise
+
+
+def start_background_job(
+    kind: str,
+    function,
+    *args: Any,
+    mutates: bool = False
+) -> Dict[str, Any]:
+    """
+    Run a tool function as a background job and return its job ID at once.
+    
+    For mutating tools, cached results touching the job's IDs are
+    invalidated when the job finishes, not when it is submitted.
+    """
+    from job_manager import get_job_manager
+
+    on_finish = (lambda result: invalidate_ids(args, result)) if mutates else None
+    description = ", ".join(str(arg) for arg in args if isinstance(arg, (str, int)))
+    job = get_job_manager().submit(kind, function, *args, description=description, on_finish=on_finish)
+    return {
+        "status": "accepted",
+        "job_id": job["job_id"],
+        "job": job,
+        "message": f"Started {kind} as job {job['job_id']}; poll job_status / job_result, or job_cancel to stop it"
+    }
+
+
 # --- Notion Tools ---
 
 @mcp.tool()
+@track_tool
+@invalidates
 def update_page(
     page_id: str,
     content: Dict[str, Any],
@@ -234,6 +403,27 @@ def update_page(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
+def append_markdown(
+    page_id: str,
+    markdown: str,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Append Markdown to a Notion page as native blocks (headings, nested lists,
+    to-dos, quotes, code, tables, images, inline formatting).
+    
+    Args:
+        page_id: The ID of the Notion page to append to
+        markdown: Markdown text
+        api_key: Optional Notion API key (defaults to NOTION_API_KEY env var)
+    """
+    return append_markdown_to_notion_page(page_id, markdown, api_key)
+
+
+@mcp.tool()
+@track_tool
 def query_database(
     database_id: str,
     filter_conditions: Optional[Dict[str, Any]] = None,
@@ -253,6 +443,8 @@ def query_database(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def create_database(
     title: str,
     properties: Dict[str, Any],
@@ -274,6 +466,8 @@ def create_database(
 
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def get_schema(
     database_id: str,
     api_key: Optional[str] = None
@@ -291,6 +485,7 @@ def get_schema(
 # --- Research Tools ---
 
 @mcp.tool()
+@track_tool
 def web_search(
     query: str,
     max_results: int = 10,
@@ -308,6 +503,7 @@ def web_search(
 
 
 @mcp.tool()
+@track_tool
 def analyze_text(
     content: str,
     analysis_type: str = "general",
@@ -327,6 +523,7 @@ def analyze_text(
 # --- Update Tools ---
 
 @mcp.tool()
+@track_tool
 def generate_update(
     project_name: str,
     update_data: Dict[str, Any],
@@ -346,6 +543,7 @@ def generate_update(
 
 
 @mcp.tool()
+@track_tool
 def get_update_template() -> Dict[str, Any]:
     """
     Get the template structure for update data with examples and tips.
@@ -354,6 +552,7 @@ def get_update_template() -> Dict[str, Any]:
 
 
 @mcp.tool()
+@track_tool
 def validate_update(update_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate update data structure before generating updates.
@@ -367,6 +566,8 @@ def validate_update(update_data: Dict[str, Any]) -> Dict[str, Any]:
 # --- Database Tools ---
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def analyze_db(
     database_id: str,
     include_content_analysis: bool = True,
@@ -384,6 +585,8 @@ def analyze_db(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def enhance_db(
     database_id: str,
     enhancement_type: str = "template",
@@ -401,6 +604,7 @@ def enhance_db(
 
 
 @mcp.tool()
+@track_tool
 def export_db_structure(
     database_id: str,
     output_file: Optional[str] = None,
@@ -418,6 +622,8 @@ def export_db_structure(
 
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def compare_dbs(
     database_id_1: str,
     database_id_2: str,
@@ -434,9 +640,66 @@ def compare_dbs(
     return compare_databases(database_id_1, database_id_2, api_key)
 
 
+@mcp.tool()
+@track_tool
+@invalidates
+def bulk_load_rows(
+    database_id: str,
+    source: Union[str, List[Dict[str, Any]]],
+    key: Optional[str] = None,
+    column_map: Optional[Dict[str, Optional[str]]] = None,
+    dry_run: bool = False,
+    refresh_index: bool = False,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Upsert rows from a CSV/JSON/NDJSON file or a list of dicts into a database.
+    Rows are matched on a key property; re-loading unchanged rows makes no writes.
+    
+    Args:
+        database_id: The ID of the database to load into
+        source: Path to a .csv, .json or .ndjson file, or a list of row dicts
+        key: Property that identifies a row (default: the title property)
+        column_map: Source column -> property name (null drops the column)
+        dry_run: Count what would be created and updated without writing
+        refresh_index: Rebuild the local upsert index from the database
+        api_key: Optional Notion API key
+    """
+    return load_database_rows(database_id, source, key, column_map, dry_run, refresh_index, api_key)
+
+
+@mcp.tool()
+@track_tool
+@invalidates
+def migrate_schemas(
+    migrations: List[Dict[str, Any]],
+    dry_run: bool = False,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Bring database schemas to a desired state, sending only what differs.
+    Migrations for different databases run concurrently.
+    
+    Each migration is {"database_id" (or "data_source_id"), "properties":
+    {name: definition}, "renames": {old: new}, "remove": [names],
+    "remove_missing": bool}. Definitions use the Notion format
+    ({"select": {"options": [...]}}) or the template format
+    ({"type": "select", "options": ["A", "B"]}). Existing properties that
+    already match are not sent, and select options are only added (or, with
+    remove_missing, removed) as needed.
+    
+    Args:
+        migrations: Desired schemas, one per database
+        dry_run: Return the PATCH bodies and changes without sending them
+        api_key: Optional Notion API key
+    """
+    return migrate_database_schemas(migrations, dry_run, api_key)
+
+
 # --- Advanced Notion Tools ---
 
 @mcp.tool()
+@track_tool
 def upload_file(
     file_path: str,
     file_name: Optional[str] = None,
@@ -454,6 +717,8 @@ def upload_file(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def modify_database(
     database_id: str,
     add_properties: Optional[Dict[str, Any]] = None,
@@ -468,13 +733,15 @@ def modify_database(
         database_id: ID of the database to modify
         add_properties: New properties to add
         remove_properties: Property names to remove
-        modify_properties: Properties to modify
+        modify_properties: Properties to modify; {"name": new} renames, and option lists are complete (left-out options are removed)
         api_key: Optional Notion API key
     """
     return modify_database_schema(database_id, add_properties, remove_properties, modify_properties, api_key)
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def delete_page(
     page_id: str,
     permanent: bool = False,
@@ -492,6 +759,8 @@ def delete_page(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def restore_page(
     page_id: str,
     api_key: Optional[str] = None
@@ -507,6 +776,8 @@ def restore_page(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def move_page(
     page_id: str,
     new_parent_id: str,
@@ -526,6 +797,8 @@ def move_page(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def duplicate_page(
     page_id: str,
     new_title: Optional[str] = None,
@@ -547,6 +820,8 @@ def duplicate_page(
 # --- Comprehensive Page Management Tools ---
 
 @mcp.tool()
+@track_tool
+@invalidates
 def create_page_comprehensive(
     parent_id: str,
     title: str,
@@ -570,6 +845,8 @@ def create_page_comprehensive(
 
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def get_page_hierarchy_full(
     root_page_id: str,
     max_depth: int = 10
@@ -591,6 +868,8 @@ def get_page_hierarchy_full(
 
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def extract_page_properties_all(
     page_id: str
 ) -> Dict[str, Any]:
@@ -611,6 +890,8 @@ def extract_page_properties_all(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def update_page_property_typed(
     page_id: str,
     property_name: str,
@@ -636,6 +917,8 @@ def update_page_property_typed(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def move_page_advanced(
     page_id: str,
     new_parent_id: str,
@@ -653,6 +936,7 @@ def move_page_advanced(
 
 
 @mcp.tool()
+@track_tool
 async def analyze_page_structure_ai(
     root_page_id: str
 ) -> Dict[str, Any]:
@@ -674,6 +958,8 @@ async def analyze_page_structure_ai(
 # --- Content Extraction Tools ---
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def extract_full_page_content(
     page_id: str
 ) -> Dict[str, Any]:
@@ -694,9 +980,14 @@ def extract_full_page_content(
 
 
 @mcp.tool()
-def extract_complete_hierarchy(
+@track_tool
+@cached_tool
+async def extract_complete_hierarchy(
     root_page_id: str,
-    max_depth: int = 5
+    max_depth: int = 5,
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
 ) -> Dict[str, Any]:
     """
     Extract complete page hierarchy with full content from all pages.
@@ -707,14 +998,24 @@ def extract_complete_hierarchy(
     - Plain text content for semantic analysis
     - Statistics about the content structure
     
+    Reports progress as pages crawled / pages discovered so far. Cancelling
+    stops the crawl after the current page.
+    
     Args:
         root_page_id: ID of the root page to start extraction
         max_depth: Maximum depth to traverse (default: 5)
+        stream_partial: Send a summary of each page as it is crawled (log notifications)
+        run_in_background: Return a job_id immediately and crawl as a background job
     """
-    return extract_hierarchy_with_content(root_page_id, max_depth)
+    if run_in_background:
+        return start_background_job("extract_complete_hierarchy", extract_hierarchy_with_content, root_page_id, max_depth)
+    return await run_with_progress(
+        ctx, extract_hierarchy_with_content, root_page_id, max_depth, stream_partial=stream_partial
+    )
 
 
 @mcp.tool()
+@track_tool
 def analyze_content_semantically(
     pages_data: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
@@ -733,9 +1034,102 @@ def analyze_content_semantically(
     return analyze_page_content_semantic(pages_data)
 
 
+@mcp.tool()
+@track_tool
+def cluster_workspace_pages(
+    pages_data: List[Dict[str, Any]],
+    full_sync: bool = True,
+    rebalance: bool = False
+) -> Dict[str, Any]:
+    """
+    Incrementally cluster pages by topic and report cluster drift.
+    
+    Only pages whose content changed since the last run are re-assigned, so
+    this is cheap enough to refresh after every sync. Reports:
+    - Clusters with labels and member pages
+    - Pages added, changed, removed and moved between clusters
+    - New/dissolved clusters and centroid shift
+    
+    Args:
+        pages_data: List of page data from extract_complete_hierarchy
+        full_sync: Treat pages missing from pages_data as removed (default: True)
+        rebalance: Re-assign every page against current centroids afterwards; its
+            drift is returned separately as "rebalance_drift"
+    """
+    return cluster_pages_incremental(pages_data, None, full_sync, rebalance)
+
+
+@mcp.tool()
+@track_tool
+def diff_page_versions(
+    page_id: str,
+    from_version: Optional[str] = None,
+    to_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Show what changed in a page between two versions.
+    
+    Every extracted page is fingerprinted with Merkle hashes and snapshotted;
+    comparison only descends into subtrees whose hashes differ. Reports:
+    - Added, removed and modified blocks (with old content)
+    - Reordered siblings
+    - How many subtrees were skipped as unchanged
+    
+    Args:
+        page_id: ID of the page
+        from_version: Older snapshot version (default: the previous snapshot)
+        to_version: Newer snapshot version (default: re-fetch the live page)
+    """
+    return diff_page_snapshots(page_id, from_version, to_version)
+
+
+# --- Workspace Search Tools ---
+
+@mcp.tool()
+@track_tool
+def search_workspace(query: str, k: int = 10) -> Dict[str, Any]:
+    """
+    Full-text search across the content of workspace pages.
+    
+    Unlike Notion's own search (titles only), this matches block text and
+    ranks results with BM25. Each result includes:
+    - Page ID, title and URL
+    - Relevance score
+    - Snippet with the matching terms highlighted
+    
+    The index is filled automatically by the content extraction tools.
+    
+    Args:
+        query: Free-text search query
+        k: Number of results to return (default: 10)
+    """
+    return search_workspace_content(query, k)
+
+
+@mcp.tool()
+@track_tool
+def index_workspace_content(
+    pages_data: List[Dict[str, Any]],
+    removed_page_ids: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Add extracted pages to the workspace search index.
+    
+    Only pages whose content changed since they were last indexed are
+    rewritten. Use this to index pages extracted earlier or elsewhere.
+    
+    Args:
+        pages_data: List of page data from extract_complete_hierarchy
+        removed_page_ids: Page IDs to drop from the index (optional)
+    """
+    return index_workspace_pages(pages_data, removed_page_ids)
+
+
 # --- Working Reorganization Tools ---
 
 @mcp.tool()
+@track_tool
+@cached_tool
 def extract_pages_with_complete_content(
     root_page_id: str,
     max_depth: int = 5
@@ -757,6 +1151,7 @@ def extract_pages_with_complete_content(
 
 
 @mcp.tool()
+@track_tool
 def create_intelligent_reorganization_plan(
     pages_data: List[Dict[str, Any]]
 ) -> Dict[str, Any]:
@@ -776,9 +1171,14 @@ def create_intelligent_reorganization_plan(
 
 
 @mcp.tool()
-def execute_intelligent_reorganization(
+@track_tool
+@invalidates
+async def execute_intelligent_reorganization(
     root_page_id: str,
-    reorganization_plan: Dict[str, Any]
+    reorganization_plan: Dict[str, Any],
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
 ) -> Dict[str, Any]:
     """
     Execute intelligent reorganization of Notion pages using proper API calls.
@@ -789,16 +1189,30 @@ def execute_intelligent_reorganization(
     - Uses correct Notion API formats for all operations
     - Provides comprehensive progress reporting and verification
     
+    Reports progress as operations completed / planned. Cancelling stops
+    after the current category or page.
+    
     Args:
         root_page_id: ID of the root page where categories will be created
         reorganization_plan: Plan from create_intelligent_reorganization_plan
+        stream_partial: Send each completed operation as it finishes (log notifications)
+        run_in_background: Return a job_id immediately and reorganize as a background job
     """
-    return reorganize_notion_pages_intelligent(root_page_id, reorganization_plan)
+    if run_in_background:
+        return start_background_job(
+            "execute_intelligent_reorganization", reorganize_notion_pages_intelligent,
+            root_page_id, reorganization_plan, mutates=True
+        )
+    return await run_with_progress(
+        ctx, reorganize_notion_pages_intelligent, root_page_id, reorganization_plan,
+        stream_partial=stream_partial
+    )
 
 
 # --- Cleanup Tools ---
 
 @mcp.tool()
+@track_tool
 def analyze_notion_workspace_cleanup(
     root_page_id: str
 ) -> Dict[str, Any]:
@@ -818,9 +1232,14 @@ def analyze_notion_workspace_cleanup(
 
 
 @mcp.tool()
-def execute_notion_workspace_cleanup(
+@track_tool
+@invalidates
+async def execute_notion_workspace_cleanup(
     root_page_id: str,
-    confirm_deletion: bool = False
+    confirm_deletion: bool = False,
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
 ) -> Dict[str, Any]:
     """
     Execute cleanup of duplicate and unnecessary pages in Notion workspace.
@@ -831,14 +1250,28 @@ def execute_notion_workspace_cleanup(
     - Unnecessary organizational pages
     - Keeps only the 5 main target categories
     
+    Reports progress as pages processed / pages to delete. Cancelling stops
+    after the current page has been migrated and deleted.
+    
     Args:
         root_page_id: ID of the root page to clean up
         confirm_deletion: Must be True to actually execute deletions (safety measure)
+        stream_partial: Send the outcome for each page as it is processed (log notifications)
+        run_in_background: Return a job_id immediately and clean up as a background job
     """
-    return execute_workspace_cleanup(root_page_id, confirm_deletion)
+    if run_in_background:
+        return start_background_job(
+            "execute_notion_workspace_cleanup", execute_workspace_cleanup,
+            root_page_id, confirm_deletion, mutates=True
+        )
+    return await run_with_progress(
+        ctx, execute_workspace_cleanup, root_page_id, confirm_deletion, stream_partial=stream_partial
+    )
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def fix_notion_emoji_consistency(
     root_page_id: str
 ) -> Dict[str, Any]:
@@ -861,6 +1294,8 @@ def fix_notion_emoji_consistency(
 # ============================================================================
 
 @mcp.tool()
+@track_tool
+@invalidates
 def create_wiki_from_page(
     page_id: str,
     wiki_title: str = None,
@@ -884,6 +1319,8 @@ def create_wiki_from_page(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def verify_page_with_ownership(
     page_id: str,
     owner_ids: List[str] = None,
@@ -909,6 +1346,8 @@ def verify_page_with_ownership(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def remove_page_verification(
     page_id: str
 ) -> Dict[str, Any]:
@@ -927,6 +1366,8 @@ def remove_page_verification(
 
 
 @mcp.tool()
+@track_tool
+@invalidates
 def convert_wiki_to_page(
     page_id: str
 ) -> Dict[str, Any]:
@@ -945,6 +1386,7 @@ def convert_wiki_to_page(
 
 
 @mcp.tool()
+@track_tool
 def get_workspace_verified_pages(
     workspace_id: str = None
 ) -> Dict[str, Any]:
@@ -962,17 +1404,328 @@ def get_workspace_verified_pages(
     return get_all_verified_pages(workspace_id)
 
 
+# --- Server Metrics ---
+
+@mcp.tool()
+@track_tool
+def server_metrics(
+    reset: bool = False,
+    output_format: str = "json",
+    export_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Latency and Notion API usage statistics for this server session.
+    
+    Reports, per MCP tool:
+    - Calls and outcomes, wall time percentiles (p50/p95/p99)
+    - Result size and Notion API calls triggered per call
+    And per Notion API endpoint:
+    - Calls by status code (including 429s), latency, bytes received
+    Plus retry counts after rate limiting and result cache hit rates.
+    
+    Args:
+        reset: Clear all metrics after reading (default: False)
+        output_format: "json" (default) or "prometheus" text format
+        export_path: Also write the Prometheus text file to this path
+    """
+    return get_server_metrics(reset, output_format, export_path)
+
+
+# --- Background Jobs ---
+
+@mcp.tool()
+@track_tool
+def job_status(
+    job_id: Optional[str] = None,
+    include_finished: bool = True
+) -> Dict[str, Any]:
+    """
+    Status of a background job, or a list of all jobs.
+    
+    Reports state (queued, running, succeeded, failed, cancelled,
+    interrupted), progress, timestamps and partial result counts.
+    
+    Args:
+        job_id: Job to report on (omit to list jobs, newest first)
+        include_finished: When listing, include finished jobs (default: True)
+    """
+    return get_job_status(job_id, include_finished)
+
+
+@mcp.tool()
+@track_tool
+def job_result(
+    job_id: str,
+    partial_offset: int = 0
+) -> Dict[str, Any]:
+    """
+    Result of a background job, with the partial results it has produced.
+    
+    While the job runs, `result` is null and `partial_results` holds the
+    chunks emitted since `partial_offset`; pass back `next_partial_offset`
+    to page through them.
+    
+    Args:
+        job_id: Job ID returned when the job was started
+        partial_offset: Skip this many partial results (default: 0)
+    """
+    return get_job_result(job_id, partial_offset)
+
+
+@mcp.tool()
+@track_tool
+def job_cancel(job_id: str) -> Dict[str, Any]:
+    """
+    Cancel a background job.
+    
+    Queued jobs never start; running jobs stop at the next page or
+    operation boundary and keep the result of the work already done.
+    
+    Args:
+        job_id: Job ID returned when the job was started
+    """
+    return cancel_job(job_id)
+
+
+# --- Provisioning ---
+
+@mcp.tool()
+@track_tool
+@invalidates
+def provision_workspace(
+    manifest: Union[str, Dict[str, Any]],
+    parent_page_id: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Build a workspace from a declarative manifest of pages, databases,
+    relations, rollups, seed rows and page content.
+    
+    Independent pages and databases are created concurrently, one wave per
+    level of nesting; relation properties are wired once all databases
+    exist, then the rollups that read them, then seed rows are created.
+    Failures are reported per object.
+    
+    Args:
+        manifest: Manifest name in 03_Templates/manifests (e.g. "linkedin_content_os"),
+            a path to a manifest file, or the manifest itself
+        parent_page_id: Page to build under (default: manifest's parent_page_id, else NOTION_PARENT_PAGE_ID)
+        dry_run: Only validate the manifest and report the creation plan
+    """
+    return provision_workspace_from_manifest(manifest, parent_page_id, dry_run)
+
+
+# --- Export ---
+
+@mcp.tool()
+@track_tool
+async def export_pages(
+    page_id: str,
+    output_dir: Optional[str] = None,
+    format: str = "markdown",
+    max_depth: Optional[int] = None,
+    include_databases: bool = True,
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Export a page and everything below it to Markdown or static HTML files.
+    
+    One file per page, child pages in a folder named after their parent and
+    databases as a table of their rows. Sibling pages are fetched
+    concurrently and each file is written as soon as its blocks arrive.
+    Images and files are linked by URL, not downloaded.
+    
+    Reports progress as pages exported / pages discovered so far. Cancelling
+    stops the export after the pages in flight.
+    
+    Args:
+        page_id: ID of the root page
+        output_dir: Directory to write to (default: a folder in the local cache)
+        format: "markdown" or "html"
+        max_depth: Levels of child pages to export (default: all)
+        include_databases: Export child databases and their row pages
+        stream_partial: Send each exported file as it is written (log notifications)
+        run_in_background: Return a job_id immediately and export as a background job
+    """
+    args = (page_id, output_dir, format, max_depth, include_databases)
+    if run_in_background:
+        return start_background_job("export_pages", export_page_tree, *args)
+    return await run_with_progress(ctx, export_page_tree, *args, stream_partial=stream_partial)
+
+
+# --- Snapshots ---
+
+@mcp.tool()
+@track_tool
+async def snapshot_workspace(
+    page_id: str,
+    path: Optional[str] = None,
+    compression: str = "gzip",
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Back up a page and everything below it (pages, blocks, databases with
+    their schemas, and rows) to one compressed NDJSON archive.
+    
+    Run this before destructive tools such as execute_notion_workspace_cleanup.
+    Pages are fetched concurrently and written as they arrive; blocks with
+    identical content are stored once.
+    
+    Args:
+        page_id: ID of the root page to back up
+        path: Archive file (default: a file in the local cache's backups folder)
+        compression: "gzip", or "zstd" when the zstandard package is installed
+        stream_partial: Send each archived page as it is written (log notifications)
+        run_in_background: Return a job_id immediately and back up as a background job
+    """
+    args = (page_id, path, compression)
+    if run_in_background:
+        return start_background_job("snapshot_workspace", create_workspace_snapshot, *args)
+    return await run_with_progress(ctx, create_workspace_snapshot, *args, stream_partial=stream_partial)
+
+
+@mcp.tool()
+@track_tool
+@invalidates
+async def restore_snapshot(
+    path: str,
+    parent_page_id: Optional[str] = None,
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Recreate a page tree from a snapshot_workspace archive under a parent page.
+    
+    Blocks and child pages keep their order; sibling subtrees and database
+    rows are restored concurrently. Relations, rollups and formulas are added
+    once every database exists, then row relations are re-linked to the
+    restored rows.
+    
+    Args:
+        path: Archive file written by snapshot_workspace
+        parent_page_id: Page to restore under (default: NOTION_PARENT_PAGE_ID)
+        stream_partial: Send each restored page as it is created (log notifications)
+        run_in_background: Return a job_id immediately and restore as a background job
+    """
+    if run_in_background:
+        return start_background_job(
+            "restore_snapshot", restore_workspace_snapshot, path, parent_page_id, mutates=True
+        )
+    return await run_with_progress(
+        ctx, restore_workspace_snapshot, path, parent_page_id, stream_partial=stream_partial
+    )
+
+
+# --- Block Sync ---
+
+@mcp.tool()
+@track_tool
+@invalidates
+async def sync_page_content(
+    page_ids: List[str],
+    template_page_id: Optional[str] = None,
+    content: Optional[Union[str, List[Union[str, Dict[str, Any]]]]] = None,
+    dry_run: bool = False,
+    stream_partial: bool = False,
+    run_in_background: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Re-apply template content to pages, changing only the blocks that differ.
+    
+    Each page's blocks are diffed against the desired blocks by content
+    fingerprint: identical subtrees are skipped, changed blocks are updated
+    in place, and missing or extra blocks are inserted or deleted. The
+    operations of all pages run concurrently. Child pages and databases are
+    left where they are; pages that already match make no writes.
+    
+    Args:
+        page_ids: Pages to update
+        template_page_id: Page whose current content is the desired content
+        content: Desired content instead of a template page: Markdown, or a list
+            of block objects and shorthands ("text", {"h1": ...}, {"todo": ...})
+        dry_run: Return each page's update, insert and delete operations and a cost estimate without applying them
+        stream_partial: Send each synced page as it finishes (log notifications)
+        run_in_background: Return a job_id immediately and sync as a background job
+    """
+    args = (page_ids, template_page_id, content, dry_run)
+    if run_in_background:
+        return start_background_job("sync_page_content", sync_page_blocks, *args, mutates=not dry_run)
+    return await run_with_progress(ctx, sync_page_blocks, *args, stream_partial=stream_partial)
+
+
 # ============================================================================
 # SERVER INITIALIZATION
 # ============================================================================
 
+def startup_report() -> Dict[str, Any]:
+    """Start-up timings: MCP SDK import, then registration of prompts and tools."""
+    now = time.perf_counter()
+    framework_ms = (_FRAMEWORK_READY - _STARTUP_STARTED) * 1000
+    server_ms = (now - _FRAMEWORK_READY) * 1000
+    return {
+        "startup_ms": round(framework_ms + server_ms, 1),
+        "framework_import_ms": round(framework_ms, 1),
+        "server_ms": round(server_ms, 1),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": server_ms <= STARTUP_BUDGET_MS,
+        "tool_modules_loaded": loaded_tool_modules()
+    }
+
+
+class PrintsToStderr:
+    """
+    sys.stdout stand-in for STDIO servers: text written with print() goes to
+    stderr, while `buffer` stays the real stdout, which is where the STDIO
+    transport writes MCP messages.
+    """
+
+    def __init__(self, stdout, stderr):
+        self._stdout = stdout
+        self._stderr = stderr
+
+    @property
+    def buffer(self):
+        return self._stdout.buffer
+
+    def write(self, text: str) -> int:
+        return self._stderr.write(text)
+
+    def flush(self) -> None:
+        self._stderr.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stderr, name)
+
+
 def main():
     """Run the MCP server."""
     logger.info("Starting Notion Template Generator MCP Server")
+    
+    report = startup_report()
+    if report["within_budget"]:
+        logger.info(
+            f"Server ready in {report['startup_ms']}ms "
+            f"(MCP SDK {report['framework_import_ms']}ms, server {report['server_ms']}ms "
+            f"of {STARTUP_BUDGET_MS:.0f}ms budget)"
+        )
+    else:
+        logger.warning(
+            f"Server start-up took {report['server_ms']}ms, over the {STARTUP_BUDGET_MS:.0f}ms budget; "
+            f"tool modules loaded eagerly: {report['tool_modules_loaded'] or 'none'}"
+        )
     logger.info(f"Prompts directory: {PROMPTS_DIR}")
-    logger.info(f"Available prompts: {len([f for f in PROMPTS_DIR.glob('*.prompt')])}")
+    logger.info(f"Available prompts: {len(PROMPTS.names())}")
     logger.info("Initializing server with STDIO transport...")
     
+    # Tool modules print progress; keep it out of the protocol stream
+    sys.stdout = PrintsToStderr(sys.stdout, sys.stderr)
+    
     # Run the server with STDIO transport
     mcp.run(transport='stdio')
 